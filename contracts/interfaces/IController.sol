@@ -1,10 +1,26 @@
 // SPDX-License-Identifier: MIT
 pragma solidity 0.8.21;
 
+import {ConfigTypes} from "../libraries/types/ConfigTypes.sol";
+
 interface IController {
     function triggerStrategyAction(
         address strategyWorkerAddress,
         address strategyVaultAddress,
         address depositorAddress
     ) external;
+
+    function triggerStrategyActionWithPaths(
+        address strategyWorkerAddress,
+        address strategyVaultAddress,
+        address depositorAddress,
+        address[][] calldata swapPaths
+    ) external;
+
+    function triggerStrategyActionWithRoutes(
+        address strategyWorkerAddress,
+        address strategyVaultAddress,
+        address depositorAddress,
+        ConfigTypes.SwapRoute[] calldata swapRoutes
+    ) external;
 }
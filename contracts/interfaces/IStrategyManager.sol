@@ -3,6 +3,7 @@ pragma solidity 0.8.21;
 
 import {Enums} from "../libraries/types/Enums.sol";
 import {ConfigTypes} from "../libraries/types/ConfigTypes.sol";
+import {IPriceFeedsDataConsumer} from "./IPriceFeedsDataConsumer.sol";
 
 interface IStrategyManager {
     function addWhitelistedDepositAssets(
@@ -35,6 +36,11 @@ interface IStrategyManager {
         view
         returns (address[] memory);
 
+    function priceFeedsDataConsumer()
+        external
+        view
+        returns (IPriceFeedsDataConsumer);
+
     function getWhitelistedDepositAsset(
         address depositAssetAddress
     ) external view returns (ConfigTypes.WhitelistedDepositAsset memory);
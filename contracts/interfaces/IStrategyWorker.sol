@@ -8,4 +8,16 @@ interface IStrategyWorker {
         address strategyVaultAddress,
         address depositorAddress
     ) external;
+
+    function executeStrategyActionWithPaths(
+        address strategyVaultAddress,
+        address depositorAddress,
+        address[][] calldata swapPaths
+    ) external;
+
+    function executeStrategyActionWithRoutes(
+        address strategyVaultAddress,
+        address depositorAddress,
+        ConfigTypes.SwapRoute[] calldata swapRoutes
+    ) external;
 }
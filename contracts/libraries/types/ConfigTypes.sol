@@ -39,6 +39,15 @@ library ConfigTypes {
         address strategyManager;
     }
 
+    /**
+     * @dev Swap of one buy asset routed and quoted off-chain. `quotedAmountOut` is the output expected along
+     *      `path`, a 0 quote has the path quoted by the dex router instead.
+     */
+    struct SwapRoute {
+        address[] path;
+        uint256 quotedAmountOut;
+    }
+
     struct WhitelistedDepositAsset {
         address assetAddress;
         Enums.AssetTypes assetType;
@@ -18,6 +18,11 @@ library Errors {
 
     error SwapPathNotFound(string message);
 
+    error SwapQuoteBelowReference(
+        uint256 quotedAmountOut,
+        uint256 referenceAmountOut
+    );
+
     error InvalidTxEtherAmount(string message);
 
     error NotEnoughEther(string message);
@@ -0,0 +1,49 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.21;
+
+/**
+ * @title   Mock UniswapV2 factory (local testing only).
+ * @author  Pulsar Finance
+ * @dev     VERSION: 1.0
+ *          DATE:    2026.10.19
+ */
+import {IUniswapV2Factory} from "../interfaces/IUniswapV2Factory.sol";
+import {MockUniswapV2Pair} from "./MockUniswapV2Pair.sol";
+
+contract MockUniswapV2Factory is IUniswapV2Factory {
+    mapping(address => mapping(address => address))
+        public
+        override getPair;
+    address[] public allPairs;
+
+    event PairCreated(
+        address indexed token0,
+        address indexed token1,
+        address pair,
+        uint256
+    );
+
+    function allPairsLength() external view returns (uint256) {
+        return allPairs.length;
+    }
+
+    function createPair(
+        address tokenA,
+        address tokenB
+    ) external returns (address pair) {
+        require(tokenA != tokenB, "UniswapV2: IDENTICAL_ADDRESSES");
+        (address token0, address token1) = tokenA < tokenB
+            ? (tokenA, tokenB)
+            : (tokenB, tokenA);
+        require(token0 != address(0), "UniswapV2: ZERO_ADDRESS");
+        require(
+            getPair[token0][token1] == address(0),
+            "UniswapV2: PAIR_EXISTS"
+        );
+        pair = address(new MockUniswapV2Pair(token0, token1));
+        getPair[token0][token1] = pair;
+        getPair[token1][token0] = pair;
+        allPairs.push(pair);
+        emit PairCreated(token0, token1, pair, allPairs.length);
+    }
+}
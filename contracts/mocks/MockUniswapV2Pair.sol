@@ -0,0 +1,90 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.21;
+
+/**
+ * @title   Mock UniswapV2 pair (local testing only).
+ * @author  Pulsar Finance
+ * @dev     VERSION: 1.0
+ *          DATE:    2026.10.19
+ *          The reserves are the pair's token balances, set by sending tokens to the pair and calling sync.
+ */
+import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+
+contract MockUniswapV2Pair {
+    using SafeERC20 for IERC20;
+
+    address public immutable factory;
+    address public immutable token0;
+    address public immutable token1;
+
+    uint112 private _reserve0;
+    uint112 private _reserve1;
+    uint32 private _blockTimestampLast;
+
+    event Sync(uint112 reserve0, uint112 reserve1);
+
+    constructor(address _token0, address _token1) {
+        factory = msg.sender;
+        token0 = _token0;
+        token1 = _token1;
+    }
+
+    function getReserves()
+        external
+        view
+        returns (uint112, uint112, uint32)
+    {
+        return (_reserve0, _reserve1, _blockTimestampLast);
+    }
+
+    function swap(uint256 amount0Out, uint256 amount1Out, address to) external {
+        require(
+            amount0Out > 0 || amount1Out > 0,
+            "UniswapV2: INSUFFICIENT_OUTPUT_AMOUNT"
+        );
+        require(
+            amount0Out < _reserve0 && amount1Out < _reserve1,
+            "UniswapV2: INSUFFICIENT_LIQUIDITY"
+        );
+        if (amount0Out > 0) IERC20(token0).safeTransfer(to, amount0Out);
+        if (amount1Out > 0) IERC20(token1).safeTransfer(to, amount1Out);
+        uint256 balance0 = IERC20(token0).balanceOf(address(this));
+        uint256 balance1 = IERC20(token1).balanceOf(address(this));
+        uint256 amount0In = balance0 > _reserve0 - amount0Out
+            ? balance0 - (_reserve0 - amount0Out)
+            : 0;
+        uint256 amount1In = balance1 > _reserve1 - amount1Out
+            ? balance1 - (_reserve1 - amount1Out)
+            : 0;
+        require(
+            amount0In > 0 || amount1In > 0,
+            "UniswapV2: INSUFFICIENT_INPUT_AMOUNT"
+        );
+        require(
+            (balance0 * 1000 - amount0In * 3) *
+                (balance1 * 1000 - amount1In * 3) >=
+                uint256(_reserve0) * _reserve1 * 1000 ** 2,
+            "UniswapV2: K"
+        );
+        _update(balance0, balance1);
+    }
+
+    function sync() external {
+        _update(
+            IERC20(token0).balanceOf(address(this)),
+            IERC20(token1).balanceOf(address(this))
+        );
+    }
+
+    function _update(uint256 balance0, uint256 balance1) private {
+        require(
+            balance0 <= type(uint112).max && balance1 <= type(uint112).max,
+            "UniswapV2: OVERFLOW"
+        );
+        _reserve0 = uint112(balance0);
+        _reserve1 = uint112(balance1);
+        _blockTimestampLast = uint32(block.timestamp);
+        emit Sync(_reserve0, _reserve1);
+    }
+}
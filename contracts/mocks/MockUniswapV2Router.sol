@@ -0,0 +1,124 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.21;
+
+/**
+ * @title   Mock UniswapV2 router (local testing only).
+ * @author  Pulsar Finance
+ * @dev     VERSION: 1.0
+ *          DATE:    2026.10.19
+ *          Constant product quotes with the UniswapV2 0.3% fee, over the reserves of the mock factory pairs.
+ */
+import {IUniswapV2Router} from "../interfaces/IUniswapV2Router.sol";
+import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import {MockUniswapV2Factory} from "./MockUniswapV2Factory.sol";
+import {MockUniswapV2Pair} from "./MockUniswapV2Pair.sol";
+
+contract MockUniswapV2Router is IUniswapV2Router {
+    using SafeERC20 for IERC20;
+
+    MockUniswapV2Factory public immutable factory;
+
+    constructor(address _factory) {
+        factory = MockUniswapV2Factory(_factory);
+    }
+
+    function swapExactTokensForTokens(
+        uint256 amountIn,
+        uint256 amountOutMin,
+        address[] calldata path,
+        address to,
+        uint256 deadline
+    ) external override returns (uint256[] memory amounts) {
+        require(deadline >= block.timestamp, "UniswapV2Router: EXPIRED");
+        amounts = getAmountsOut(amountIn, path);
+        require(
+            amounts[amounts.length - 1] >= amountOutMin,
+            "UniswapV2Router: INSUFFICIENT_OUTPUT_AMOUNT"
+        );
+        IERC20(path[0]).safeTransferFrom(
+            msg.sender,
+            _pairFor(path[0], path[1]),
+            amounts[0]
+        );
+        _swap(amounts, path, to);
+    }
+
+    function getAmountsOut(
+        uint256 amountIn,
+        address[] calldata path
+    ) public view override returns (uint256[] memory amounts) {
+        require(path.length >= 2, "UniswapV2Library: INVALID_PATH");
+        amounts = new uint256[](path.length);
+        amounts[0] = amountIn;
+        for (uint256 i; i < path.length - 1; ) {
+            (uint256 reserveIn, uint256 reserveOut) = _getReserves(
+                path[i],
+                path[i + 1]
+            );
+            amounts[i + 1] = _getAmountOut(amounts[i], reserveIn, reserveOut);
+            unchecked {
+                ++i;
+            }
+        }
+    }
+
+    function _swap(
+        uint256[] memory amounts,
+        address[] calldata path,
+        address to
+    ) private {
+        for (uint256 i; i < path.length - 1; ) {
+            (address input, address output) = (path[i], path[i + 1]);
+            (uint256 amount0Out, uint256 amount1Out) = input < output
+                ? (uint256(0), amounts[i + 1])
+                : (amounts[i + 1], uint256(0));
+            address recipient = i < path.length - 2
+                ? _pairFor(output, path[i + 2])
+                : to;
+            MockUniswapV2Pair(_pairFor(input, output)).swap(
+                amount0Out,
+                amount1Out,
+                recipient
+            );
+            unchecked {
+                ++i;
+            }
+        }
+    }
+
+    function _getAmountOut(
+        uint256 amountIn,
+        uint256 reserveIn,
+        uint256 reserveOut
+    ) private pure returns (uint256) {
+        require(amountIn > 0, "UniswapV2Library: INSUFFICIENT_INPUT_AMOUNT");
+        require(
+            reserveIn > 0 && reserveOut > 0,
+            "UniswapV2Library: INSUFFICIENT_LIQUIDITY"
+        );
+        uint256 amountInWithFee = amountIn * 997;
+        return
+            (amountInWithFee * reserveOut) /
+            (reserveIn * 1000 + amountInWithFee);
+    }
+
+    function _getReserves(
+        address tokenA,
+        address tokenB
+    ) private view returns (uint256 reserveA, uint256 reserveB) {
+        MockUniswapV2Pair pair = MockUniswapV2Pair(_pairFor(tokenA, tokenB));
+        (uint256 reserve0, uint256 reserve1, ) = pair.getReserves();
+        (reserveA, reserveB) = tokenA == pair.token0()
+            ? (reserve0, reserve1)
+            : (reserve1, reserve0);
+    }
+
+    function _pairFor(
+        address tokenA,
+        address tokenB
+    ) private view returns (address pair) {
+        pair = factory.getPair(tokenA, tokenB);
+        require(pair != address(0), "UniswapV2Library: PAIR_NOT_FOUND");
+    }
+}
@@ -0,0 +1,68 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.21;
+
+/**
+ * @title   Mock Chainlink data feed with a settable answer (local testing only).
+ * @author  Pulsar Finance
+ * @dev     VERSION: 1.0
+ *          DATE:    2026.10.19
+ */
+import {AggregatorV3Interface} from "@chainlink/contracts/src/v0.8/interfaces/AggregatorV3Interface.sol";
+
+contract MockV3Aggregator is AggregatorV3Interface {
+    uint8 public immutable override decimals;
+    int256 public latestAnswer;
+    uint256 public latestTimestamp;
+    uint80 public latestRound;
+
+    constructor(uint8 _decimals, int256 _initialAnswer) {
+        decimals = _decimals;
+        updateAnswer(_initialAnswer);
+    }
+
+    function updateAnswer(int256 answer) public {
+        latestAnswer = answer;
+        latestTimestamp = block.timestamp;
+        ++latestRound;
+    }
+
+    function description() external pure override returns (string memory) {
+        return "MockV3Aggregator";
+    }
+
+    function version() external pure override returns (uint256) {
+        return 4;
+    }
+
+    function getRoundData(
+        uint80 _roundId
+    )
+        external
+        view
+        override
+        returns (uint80, int256, uint256, uint256, uint80)
+    {
+        return (
+            _roundId,
+            latestAnswer,
+            latestTimestamp,
+            latestTimestamp,
+            _roundId
+        );
+    }
+
+    function latestRoundData()
+        external
+        view
+        override
+        returns (uint80, int256, uint256, uint256, uint80)
+    {
+        return (
+            latestRound,
+            latestAnswer,
+            latestTimestamp,
+            latestTimestamp,
+            latestRound
+        );
+    }
+}
@@ -9,6 +9,7 @@ pragma solidity 0.8.21;
  */
 
 import {Roles} from "../libraries/roles/Roles.sol";
+import {ConfigTypes} from "../libraries/types/ConfigTypes.sol";
 import {IController} from "../interfaces/IController.sol";
 import {IStrategyWorker} from "../interfaces/IStrategyWorker.sol";
 import {AccessControl} from "@openzeppelin/contracts/access/AccessControl.sol";
@@ -30,4 +31,32 @@ contract Controller is IController, AccessControl {
             depositorAddress
         );
     }
+
+    function triggerStrategyActionWithPaths(
+        address strategyWorkerAddress,
+        address strategyVaultAddress,
+        address depositorAddress,
+        address[][] calldata swapPaths
+    ) external onlyRole(Roles.CONTROLLER_CALLER) {
+        IStrategyWorker strategyWorker = IStrategyWorker(strategyWorkerAddress);
+        strategyWorker.executeStrategyActionWithPaths(
+            strategyVaultAddress,
+            depositorAddress,
+            swapPaths
+        );
+    }
+
+    function triggerStrategyActionWithRoutes(
+        address strategyWorkerAddress,
+        address strategyVaultAddress,
+        address depositorAddress,
+        ConfigTypes.SwapRoute[] calldata swapRoutes
+    ) external onlyRole(Roles.CONTROLLER_CALLER) {
+        IStrategyWorker strategyWorker = IStrategyWorker(strategyWorkerAddress);
+        strategyWorker.executeStrategyActionWithRoutes(
+            strategyVaultAddress,
+            depositorAddress,
+            swapRoutes
+        );
+    }
 }
@@ -14,17 +14,22 @@ import {Errors} from "../libraries/types/Errors.sol";
 import {ConfigTypes} from "../libraries/types/ConfigTypes.sol";
 import {ITreasuryVault} from "../interfaces/ITreasuryVault.sol";
 import {IStrategyWorker} from "../interfaces/IStrategyWorker.sol";
+import {IStrategyManager} from "../interfaces/IStrategyManager.sol";
 import {IUniswapV2Router} from "../interfaces/IUniswapV2Router.sol";
 import {PercentageMath} from "../libraries/math/PercentageMath.sol";
 import {AutomatedVaultERC4626, IERC20} from "./AutomatedVaultERC4626.sol";
+import {Math} from "@openzeppelin/contracts/utils/math/Math.sol";
 import {AccessControl} from "@openzeppelin/contracts/access/AccessControl.sol";
+import {IPriceFeedsDataConsumer} from "../interfaces/IPriceFeedsDataConsumer.sol";
 import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import {IERC20Metadata} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
 
 contract StrategyWorker is IStrategyWorker, AccessControl {
     using SafeERC20 for IERC20;
     using PercentageMath for uint256;
 
     uint16 public constant MAX_SLIPPAGE_PERC = 5e1; // 0.5%
+    uint16 public constant MAX_QUOTE_DEVIATION_PERC = 3e2; // 3%
 
     address public dexRouter;
     address public controller;
@@ -45,6 +50,65 @@ contract StrategyWorker is IStrategyWorker, AccessControl {
         address strategyVaultAddress,
         address depositorAddress
     ) external onlyRole(Roles.CONTROLLER) {
+        _executeStrategyAction(
+            strategyVaultAddress,
+            depositorAddress,
+            new ConfigTypes.SwapRoute[](0)
+        );
+    }
+
+    /**
+     * @dev Same as executeStrategyAction, with the swap path of every buy asset routed off-chain. Each path must
+     *      start at the vault deposit asset and end at its buy asset, swaps keep the MAX_SLIPPAGE_PERC bound over
+     *      the highest router quote of the given path and of the direct or dex main token path, so a routed path
+     *      never returns less than the default one would.
+     */
+    function executeStrategyActionWithPaths(
+        address strategyVaultAddress,
+        address depositorAddress,
+        address[][] calldata swapPaths
+    ) external onlyRole(Roles.CONTROLLER) {
+        uint256 swapPathsLength = swapPaths.length;
+        ConfigTypes.SwapRoute[] memory swapRoutes = new ConfigTypes.SwapRoute[](
+            swapPathsLength
+        );
+        for (uint256 i; i < swapPathsLength; ) {
+            swapRoutes[i].path = swapPaths[i];
+            unchecked {
+                ++i;
+            }
+        }
+        _executeStrategyAction(
+            strategyVaultAddress,
+            depositorAddress,
+            swapRoutes
+        );
+    }
+
+    /**
+     * @dev Same as executeStrategyActionWithPaths, with the output of every swap also quoted off-chain. Quoted
+     *      swaps don't call the router before swapping: a quote can't be more than MAX_QUOTE_DEVIATION_PERC below
+     *      the swapped amount valued at the strategy manager oracle prices, and the swap reverts when it returns
+     *      more than MAX_SLIPPAGE_PERC less than the quote. Assets without a price feed are checked against the
+     *      router quote of the direct or dex main token path instead.
+     */
+    function executeStrategyActionWithRoutes(
+        address strategyVaultAddress,
+        address depositorAddress,
+        ConfigTypes.SwapRoute[] calldata swapRoutes
+    ) external onlyRole(Roles.CONTROLLER) {
+        _executeStrategyAction(
+            strategyVaultAddress,
+            depositorAddress,
+            swapRoutes
+        );
+    }
+
+    function _executeStrategyAction(
+        address strategyVaultAddress,
+        address depositorAddress,
+        ConfigTypes.SwapRoute[] memory swapRoutes
+    ) private {
         AutomatedVaultERC4626 strategyVault = AutomatedVaultERC4626(
             strategyVaultAddress
         );
@@ -58,11 +122,9 @@ contract StrategyWorker is IStrategyWorker, AccessControl {
             revert Errors.UpdateConditionsNotMet();
         }
 
-        (
-            address depositAsset,
-            address[] memory buyAssets,
-            uint256[] memory buyAmounts
-        ) = _getSwapParams(strategyVault, depositorAddress);
+        (address depositAsset, address[] memory buyAssets) = _getSwapParams(
+            strategyVault
+        );
 
         ConfigTypes.InitMultiAssetVaultParams
             memory initMultiAssetVaultParams = strategyVault
@@ -76,12 +138,10 @@ contract StrategyWorker is IStrategyWorker, AccessControl {
             buyAmountsAfterFee,
             totalFee
         ) = _calculateAmountsAfterFee(
-            buyAmounts,
+            strategyVault.getDepositorBuyAmounts(depositorAddress),
             initMultiAssetVaultParams.treasuryPercentageFeeOnBalanceUpdate
         );
 
-        uint256 totalBuyAmount = amountToWithdraw - totalFee;
-
         strategyVault.setLastUpdatePerDepositor(depositorAddress);
 
         strategyVault.withdraw(
@@ -90,14 +150,15 @@ contract StrategyWorker is IStrategyWorker, AccessControl {
             depositorAddress /** @dev owner */
         );
 
-        address[2] memory spenders = [
-            dexRouter,
-            initMultiAssetVaultParams.treasury
-        ];
-        _ensureApprovedERC20(depositAsset, spenders);
+        _ensureApprovedERC20(
+            depositAsset,
+            [dexRouter, initMultiAssetVaultParams.treasury]
+        );
 
         uint256[] memory swappedAssetAmounts = _swapTokens(
             depositorAddress,
+            swapRoutes,
+            strategyVault,
             depositAsset,
             buyAssets,
             buyAmountsAfterFee
@@ -112,7 +173,7 @@ contract StrategyWorker is IStrategyWorker, AccessControl {
             strategyVaultAddress,
             depositorAddress,
             depositAsset,
-            totalBuyAmount,
+            amountToWithdraw - totalFee,
             buyAssets,
             swappedAssetAmounts,
             totalFee
@@ -120,23 +181,13 @@ contract StrategyWorker is IStrategyWorker, AccessControl {
     }
 
     function _getSwapParams(
-        AutomatedVaultERC4626 strategyVault,
-        address depositorAddress
-    )
-        private
-        view
-        returns (
-            address depositAsset,
-            address[] memory buyAssets,
-            uint256[] memory buyAmounts
-        )
-    {
+        AutomatedVaultERC4626 strategyVault
+    ) private view returns (address depositAsset, address[] memory buyAssets) {
         ConfigTypes.InitMultiAssetVaultParams
             memory initMultiAssetVaultParams = strategyVault
                 .getInitMultiAssetVaultParams();
         depositAsset = address(initMultiAssetVaultParams.depositAsset);
         buyAssets = strategyVault.getBuyAssetAddresses();
-        buyAmounts = strategyVault.getDepositorBuyAmounts(depositorAddress);
     }
 
     function _calculateAmountsAfterFee(
@@ -169,20 +220,46 @@ contract StrategyWorker is IStrategyWorker, AccessControl {
         }
     }
 
+    /**
+     * @dev Without swap routes every buy asset is swapped through the direct or dex main token path
+     */
     function _swapTokens(
         address depositorAddress,
+        ConfigTypes.SwapRoute[] memory swapRoutes,
+        AutomatedVaultERC4626 strategyVault,
         address depositAsset,
         address[] memory buyAssets,
         uint256[] memory buyAmountsAfterFee
     ) internal returns (uint256[] memory amountsOut) {
         uint256 buyAssetsLength = buyAssets.length;
+        if (swapRoutes.length != 0 && swapRoutes.length != buyAssetsLength) {
+            revert Errors.SwapPathNotFound(
+                "Swap paths length doesn't match buy assets length"
+            );
+        }
+        uint256[] memory oracleAmountsOut = _getOracleAmountsOut(
+            strategyVault,
+            swapRoutes,
+            depositAsset,
+            buyAssets,
+            buyAmountsAfterFee
+        );
         amountsOut = new uint256[](buyAssetsLength);
         for (uint256 i; i < buyAssetsLength; ) {
+            address[] memory defaultPath = _getPath(depositAsset, buyAssets[i]);
+            ConfigTypes.SwapRoute memory swapRoute;
+            if (swapRoutes.length != 0) {
+                swapRoute = swapRoutes[i];
+                _validatePath(swapRoute.path, depositAsset, buyAssets[i]);
+            } else {
+                swapRoute.path = defaultPath;
+            }
             uint256 amountOut = _swapToken(
                 depositorAddress,
-                depositAsset,
-                buyAssets[i],
-                buyAmountsAfterFee[i]
+                swapRoute,
+                defaultPath,
+                buyAmountsAfterFee[i],
+                oracleAmountsOut[i]
             );
             amountsOut[i] = amountOut;
             unchecked {
@@ -191,67 +268,168 @@ contract StrategyWorker is IStrategyWorker, AccessControl {
         }
     }
 
+    /**
+     * @dev oracleAmountOut is the oracle value of buyAmountAfterFee in buy asset, 0 when the swap isn't quoted or
+     *      an asset has no price feed
+     */
     function _swapToken(
         address depositorAddress,
-        address depositAsset,
-        address buyAsset,
-        uint256 buyAmountAfterFee
+        ConfigTypes.SwapRoute memory swapRoute,
+        address[] memory defaultPath,
+        uint256 buyAmountAfterFee,
+        uint256 oracleAmountOut
     ) internal returns (uint256 amountOut) {
         IUniswapV2Router dexRouterContract = IUniswapV2Router(dexRouter);
 
-        if (buyAsset != dexMainToken && depositAsset != dexMainToken) {
-            address[] memory indirectPath = _getIndirectPath(
-                depositAsset,
-                buyAsset
-            );
-            uint256[] memory minAmountsOut = dexRouterContract.getAmountsOut(
-                buyAmountAfterFee,
-                indirectPath
-            );
-            uint256 minAmountOut = minAmountsOut[minAmountsOut.length - 1];
-
-            uint256 amountOutMin = minAmountOut.percentMul(
-                PercentageMath.PERCENTAGE_FACTOR - MAX_SLIPPAGE_PERC
-            );
-
-            uint256[] memory amountsOut = dexRouterContract
-                .swapExactTokensForTokens(
-                    buyAmountAfterFee,
-                    amountOutMin,
-                    indirectPath,
-                    depositorAddress /** @notice swapped tokens sent directly to vault depositor */,
-                    block.timestamp + 600 /** @notice 10 min max to execute */
+        uint256 minAmountOut = swapRoute.quotedAmountOut;
+        if (minAmountOut != 0) {
+            /** @dev a keeper quote can't switch the slippage protection off */
+            uint256 referenceAmountOut = oracleAmountOut != 0
+                ? oracleAmountOut
+                : _getAmountOut(buyAmountAfterFee, defaultPath);
+            if (
+                minAmountOut <
+                referenceAmountOut.percentMul(
+                    PercentageMath.PERCENTAGE_FACTOR - MAX_QUOTE_DEVIATION_PERC
+                )
+            ) {
+                revert Errors.SwapQuoteBelowReference(
+                    minAmountOut,
+                    referenceAmountOut
                 );
-            amountOut = amountsOut[
-                amountsOut.length - 1
-            ]; /** @dev amounts out contains results from all the pools in the choosen route */
+            }
         } else {
-            address[] memory directPath = _getDirectPath(
-                depositAsset,
-                buyAsset
-            );
-            uint256[] memory minAmountsOut = dexRouterContract.getAmountsOut(
-                buyAmountAfterFee,
-                directPath
-            );
-            uint256 minAmountOut = minAmountsOut[minAmountsOut.length - 1];
+            minAmountOut = _getAmountOut(buyAmountAfterFee, defaultPath);
+            if (!_isSamePath(swapRoute.path, defaultPath)) {
+                /** @dev a routed path is bounded by the default path quote, not only by its own */
+                uint256 routedAmountOut = _getAmountOut(
+                    buyAmountAfterFee,
+                    swapRoute.path
+                );
+                if (routedAmountOut > minAmountOut) {
+                    minAmountOut = routedAmountOut;
+                }
+            }
+        }
+
+        uint256 amountOutMin = minAmountOut.percentMul(
+            PercentageMath.PERCENTAGE_FACTOR - MAX_SLIPPAGE_PERC
+        );
 
-            uint256 amountOutMin = minAmountOut.percentMul(
-                PercentageMath.PERCENTAGE_FACTOR - MAX_SLIPPAGE_PERC
+        uint256[] memory amountsOut = dexRouterContract
+            .swapExactTokensForTokens(
+                buyAmountAfterFee,
+                amountOutMin,
+                swapRoute.path,
+                depositorAddress /** @notice swapped tokens sent directly to vault depositor */,
+                block.timestamp + 600 /** @notice 10 min max to execute */
             );
+        amountOut = amountsOut[
+            amountsOut.length - 1
+        ]; /** @dev amounts out contains results from all the pools in the choosen route */
+    }
 
-            uint256[] memory amountsOut = dexRouterContract
-                .swapExactTokensForTokens(
-                    buyAmountAfterFee,
-                    amountOutMin,
-                    directPath,
-                    depositorAddress /** @notice swapped tokens sent directly to vault depositor */,
-                    block.timestamp + 600 /** @notice 10 min max to execute */
+    /**
+     * @dev Oracle value in buy asset of the deposit asset amount of every quoted swap, from the price feeds the
+     *      vault strategy manager whitelists the assets with. Left at 0 for the swaps without a quote and when
+     *      either asset has no price feed.
+     */
+    function _getOracleAmountsOut(
+        AutomatedVaultERC4626 strategyVault,
+        ConfigTypes.SwapRoute[] memory swapRoutes,
+        address depositAsset,
+        address[] memory buyAssets,
+        uint256[] memory buyAmountsAfterFee
+    ) private view returns (uint256[] memory oracleAmountsOut) {
+        oracleAmountsOut = new uint256[](buyAssets.length);
+        if (!_hasQuotedSwap(swapRoutes)) {
+            return oracleAmountsOut;
+        }
+        IStrategyManager strategyManager = IStrategyManager(
+            strategyVault.getStrategyParams().strategyManager
+        );
+        IPriceFeedsDataConsumer priceFeedsDataConsumer = strategyManager
+            .priceFeedsDataConsumer();
+        (uint256 depositAssetPrice, uint256 depositAssetUnit) = _getOraclePrice(
+            strategyManager,
+            priceFeedsDataConsumer,
+            depositAsset
+        );
+        if (depositAssetPrice == 0) {
+            return oracleAmountsOut;
+        }
+        for (uint256 i; i < buyAssets.length; ) {
+            if (swapRoutes[i].quotedAmountOut != 0) {
+                (uint256 buyAssetPrice, uint256 buyAssetUnit) = _getOraclePrice(
+                    strategyManager,
+                    priceFeedsDataConsumer,
+                    buyAssets[i]
                 );
-            amountOut = amountsOut[
-                amountsOut.length - 1
-            ]; /** @dev amounts out contains results from all the pools in the choosen route */
+                if (buyAssetPrice != 0) {
+                    oracleAmountsOut[i] = Math.mulDiv(
+                        buyAmountsAfterFee[i],
+                        depositAssetPrice * buyAssetUnit,
+                        buyAssetPrice * depositAssetUnit
+                    );
+                }
+            }
+            unchecked {
+                ++i;
+            }
+        }
+    }
+
+    /**
+     * @dev Price of an asset and 10 ** (price decimals + asset decimals), (0, 0) when it has no price feed
+     */
+    function _getOraclePrice(
+        IStrategyManager strategyManager,
+        IPriceFeedsDataConsumer priceFeedsDataConsumer,
+        address asset
+    ) private view returns (uint256 price, uint256 unit) {
+        address oracleAddress = strategyManager
+            .getWhitelistedDepositAsset(asset)
+            .oracleAddress;
+        if (oracleAddress == address(0)) {
+            return (0, 0);
+        }
+        uint256 priceDecimals;
+        (price, priceDecimals) = priceFeedsDataConsumer
+            .getDataFeedLatestPriceAndDecimals(oracleAddress);
+        unit = 10 ** (priceDecimals + IERC20Metadata(asset).decimals());
+    }
+
+    function _hasQuotedSwap(
+        ConfigTypes.SwapRoute[] memory swapRoutes
+    ) private pure returns (bool) {
+        uint256 swapRoutesLength = swapRoutes.length;
+        for (uint256 i; i < swapRoutesLength; ) {
+            if (swapRoutes[i].quotedAmountOut != 0) {
+                return true;
+            }
+            unchecked {
+                ++i;
+            }
         }
+        return false;
+    }
+
+    function _getAmountOut(
+        uint256 amountIn,
+        address[] memory path
+    ) private view returns (uint256) {
+        uint256[] memory amountsOut = IUniswapV2Router(dexRouter)
+            .getAmountsOut(amountIn, path);
+        return amountsOut[amountsOut.length - 1];
+    }
+
+    function _isSamePath(
+        address[] memory path,
+        address[] memory otherPath
+    ) private pure returns (bool) {
+        return
+            keccak256(abi.encodePacked(path)) ==
+            keccak256(abi.encodePacked(otherPath));
     }
 
     function _ensureApprovedERC20(
@@ -274,6 +452,32 @@ contract StrategyWorker is IStrategyWorker, AccessControl {
         }
     }
 
+    function _getPath(
+        address depositAsset,
+        address buyAsset
+    ) private view returns (address[] memory) {
+        if (buyAsset != dexMainToken && depositAsset != dexMainToken) {
+            return _getIndirectPath(depositAsset, buyAsset);
+        }
+        return _getDirectPath(depositAsset, buyAsset);
+    }
+
+    function _validatePath(
+        address[] memory path,
+        address depositAsset,
+        address buyAsset
+    ) private pure {
+        if (
+            path.length < 2 ||
+            path[0] != depositAsset ||
+            path[path.length - 1] != buyAsset
+        ) {
+            revert Errors.SwapPathNotFound(
+                "Swap path doesn't go from deposit asset to buy asset"
+            );
+        }
+    }
+
     function _getDirectPath(
         address depositAsset,
         address buyAsset
@@ -1,1173 +0,0 @@
-treasury_abi = [
-    {"inputs": [], "name": "constructor", "stateMutability": "nonpayable", "type": "constructor"},
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "internalType": "address", "name": "sender", "type": "address"},
-            {"indexed": False, "internalType": "uint256", "name": "amount", "type": "uint256"},
-            {"indexed": False, "internalType": "address", "name": "asset", "type": "address"},
-        ],
-        "name": "ERC20Received",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "internalType": "address", "name": "owner", "type": "address"},
-            {"indexed": True, "internalType": "address", "name": "token", "type": "address"},
-            {"indexed": False, "internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "ERC20Withdrawal",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "internalType": "address", "name": "sender", "type": "address"},
-            {"indexed": False, "internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "EtherReceived",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "internalType": "address", "name": "owner", "type": "address"},
-            {"indexed": False, "internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "NativeWithdrawal",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "internalType": "address", "name": "previousOwner", "type": "address"},
-            {"indexed": True, "internalType": "address", "name": "newOwner", "type": "address"},
-        ],
-        "name": "OwnershipTransferred",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": False, "internalType": "address", "name": "creator", "type": "address"},
-            {"indexed": False, "internalType": "address", "name": "treasuryAddress", "type": "address"},
-        ],
-        "name": "TreasuryCreated",
-        "type": "event",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-            {"internalType": "address", "name": "asset", "type": "address"},
-        ],
-        "name": "depositERC20",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "owner",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {"inputs": [], "name": "renounceOwnership", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
-    {
-        "inputs": [{"internalType": "address", "name": "newOwner", "type": "address"}],
-        "name": "transferOwnership",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "tokenAddress", "type": "address"},
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "withdrawERC20",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "amount", "type": "uint256"}],
-        "name": "withdrawNative",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {"stateMutability": "payable", "type": "receive"},
-]
-
-vaults_factory_abi = [
-    {
-        "inputs": [
-            {"internalType": "address", "name": "_uniswapV2Factory", "type": "address"},
-            {"internalType": "address", "name": "_dexMainToken", "type": "address"},
-            {"internalType": "address payable", "name": "_treasury", "type": "address"},
-            {"internalType": "uint256", "name": "_treasuryFixedFeeOnVaultCreation", "type": "uint256"},
-            {"internalType": "uint256", "name": "_creatorPercentageFeeOnDeposit", "type": "uint256"},
-            {"internalType": "uint256", "name": "_treasuryPercentageFeeOnBalanceUpdate", "type": "uint256"},
-        ],
-        "name": "constructor",
-        "stateMutability": "nonpayable",
-        "type": "constructor",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": False, "internalType": "address", "name": "creator", "type": "address"},
-            {"indexed": False, "internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "TreasuryFeeTransfered",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "internalType": "address", "name": "creator", "type": "address"},
-            {"indexed": True, "internalType": "address", "name": "depositAsset", "type": "address"},
-            {"indexed": False, "internalType": "address[]", "name": "buyAssets", "type": "address[]"},
-            {"indexed": False, "internalType": "address", "name": "vaultAddress", "type": "address"},
-            {"indexed": False, "internalType": "uint256[]", "name": "buyPercentages", "type": "uint256[]"},
-            {"indexed": False, "internalType": "enum Enums.BuyFrequency", "name": "buyFrequency", "type": "uint8"},
-            {"indexed": False, "internalType": "enum Enums.StrategyType", "name": "strategyType", "type": "uint8"},
-        ],
-        "name": "VaultCreated",
-        "type": "event",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "depositAsset", "type": "address"},
-            {"internalType": "address[]", "name": "buyAssets", "type": "address[]"},
-        ],
-        "name": "allPairsExistForBuyAssets",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "allVaultsLength",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {
-                "components": [
-                    {"internalType": "string", "name": "name", "type": "string"},
-                    {"internalType": "string", "name": "symbol", "type": "string"},
-                    {"internalType": "address", "name": "depositAsset", "type": "address"},
-                    {"internalType": "address[]", "name": "buyAssets", "type": "address[]"},
-                ],
-                "internalType": "struct ConfigTypes.InitMultiAssetVaultFactoryParams",
-                "name": "initMultiAssetVaultFactoryParams",
-                "type": "tuple",
-            },
-            {
-                "components": [
-                    {"internalType": "uint256[]", "name": "buyPercentages", "type": "uint256[]"},
-                    {"internalType": "enum Enums.BuyFrequency", "name": "buyFrequency", "type": "uint8"},
-                    {"internalType": "enum Enums.StrategyType", "name": "strategyType", "type": "uint8"},
-                    {"internalType": "address", "name": "strategyWorker", "type": "address"},
-                ],
-                "internalType": "struct ConfigTypes.StrategyParams",
-                "name": "strategyParams",
-                "type": "tuple",
-            },
-        ],
-        "name": "createVault",
-        "outputs": [{"internalType": "address", "name": "newVaultAddress", "type": "address"}],
-        "stateMutability": "payable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "creatorPercentageFeeOnDeposit",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "dexMainToken",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "", "type": "address"},
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-        ],
-        "name": "getUserVaults",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "i", "type": "uint256"}],
-        "name": "getVaultAddress",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "depositAsset", "type": "address"},
-            {"internalType": "address", "name": "buyAsset", "type": "address"},
-        ],
-        "name": "pairExistsForBuyAsset",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "treasury",
-        "outputs": [{"internalType": "address payable", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "treasuryFixedFeeOnVaultCreation",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "treasuryPercentageFeeOnBalanceUpdate",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-]
-
-vault_abi = [
-    {
-        "inputs": [
-            {
-                "components": [
-                    {"internalType": "string", "name": "name", "type": "string"},
-                    {"internalType": "string", "name": "symbol", "type": "string"},
-                    {"internalType": "address payable", "name": "treasury", "type": "address"},
-                    {"internalType": "address payable", "name": "creator", "type": "address"},
-                    {"internalType": "address", "name": "factory", "type": "address"},
-                    {"internalType": "bool", "name": "isActive", "type": "bool"},
-                    {"internalType": "contract IERC20", "name": "depositAsset", "type": "address"},
-                    {"internalType": "contract IERC20[]", "name": "buyAssets", "type": "address[]"},
-                    {"internalType": "uint256", "name": "creatorPercentageFeeOnDeposit", "type": "uint256"},
-                    {"internalType": "uint256", "name": "treasuryPercentageFeeOnBalanceUpdate", "type": "uint256"},
-                ],
-                "internalType": "struct ConfigTypes.InitMultiAssetVaultParams",
-                "name": "_initMultiAssetVaultParams",
-                "type": "tuple",
-            },
-            {
-                "components": [
-                    {"internalType": "uint256[]", "name": "buyPercentages", "type": "uint256[]"},
-                    {"internalType": "enum Enums.BuyFrequency", "name": "buyFrequency", "type": "uint8"},
-                    {"internalType": "enum Enums.StrategyType", "name": "strategyType", "type": "uint8"},
-                    {"internalType": "address", "name": "strategyWorker", "type": "address"},
-                ],
-                "internalType": "struct ConfigTypes.StrategyParams",
-                "name": "_strategyParams",
-                "type": "tuple",
-            },
-        ],
-        "name": "constructor",
-        "stateMutability": "nonpayable",
-        "type": "constructor",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "receiver", "type": "address"},
-            {"internalType": "uint256", "name": "assets", "type": "uint256"},
-            {"internalType": "uint256", "name": "max", "type": "uint256"},
-        ],
-        "name": "ERC4626ExceededMaxDeposit",
-        "type": "error",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "internalType": "address", "name": "owner", "type": "address"},
-            {"indexed": True, "internalType": "address", "name": "spender", "type": "address"},
-            {"indexed": False, "internalType": "uint256", "name": "value", "type": "uint256"},
-        ],
-        "name": "Approval",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "internalType": "address", "name": "vault", "type": "address"},
-            {"indexed": True, "internalType": "address", "name": "depositor", "type": "address"},
-            {"indexed": True, "internalType": "address", "name": "creator", "type": "address"},
-            {"indexed": False, "internalType": "uint256", "name": "shares", "type": "uint256"},
-        ],
-        "name": "CreatorFeeTransfered",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "internalType": "address", "name": "sender", "type": "address"},
-            {"indexed": True, "internalType": "address", "name": "owner", "type": "address"},
-            {"indexed": False, "internalType": "uint256", "name": "assets", "type": "uint256"},
-            {"indexed": False, "internalType": "uint256", "name": "shares", "type": "uint256"},
-        ],
-        "name": "Deposit",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "internalType": "address", "name": "from", "type": "address"},
-            {"indexed": True, "internalType": "address", "name": "to", "type": "address"},
-            {"indexed": False, "internalType": "uint256", "name": "value", "type": "uint256"},
-        ],
-        "name": "Transfer",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "internalType": "address", "name": "sender", "type": "address"},
-            {"indexed": True, "internalType": "address", "name": "receiver", "type": "address"},
-            {"indexed": True, "internalType": "address", "name": "owner", "type": "address"},
-            {"indexed": False, "internalType": "uint256", "name": "assets", "type": "uint256"},
-            {"indexed": False, "internalType": "uint256", "name": "shares", "type": "uint256"},
-        ],
-        "name": "Withdraw",
-        "type": "event",
-    },
-    {
-        "inputs": [],
-        "name": "MAX_NUMBER_OF_BUY_ASSETS",
-        "outputs": [{"internalType": "uint8", "name": "", "type": "uint8"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "name": "allDepositorAddresses",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "allDepositorsLength",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "owner", "type": "address"},
-            {"internalType": "address", "name": "spender", "type": "address"},
-        ],
-        "name": "allowance",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "spender", "type": "address"},
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "approve",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "asset",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
-        "name": "balanceOf",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "name": "buyAssetAddresses",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "buyAssetsLength",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "shares", "type": "uint256"}],
-        "name": "convertToAssets",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "assets", "type": "uint256"}],
-        "name": "convertToShares",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "decimals",
-        "outputs": [{"internalType": "uint8", "name": "", "type": "uint8"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "spender", "type": "address"},
-            {"internalType": "uint256", "name": "subtractedValue", "type": "uint256"},
-        ],
-        "name": "decreaseAllowance",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "assets", "type": "uint256"},
-            {"internalType": "address", "name": "receiver", "type": "address"},
-        ],
-        "name": "deposit",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "getBuyAssetAddresses",
-        "outputs": [{"internalType": "address[]", "name": "", "type": "address[]"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "depositor", "type": "address"}],
-        "name": "getDepositorBuyAmounts",
-        "outputs": [{"internalType": "uint256[]", "name": "", "type": "uint256[]"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "getInitMultiAssetVaultParams",
-        "outputs": [
-            {
-                "components": [
-                    {"internalType": "string", "name": "name", "type": "string"},
-                    {"internalType": "string", "name": "symbol", "type": "string"},
-                    {"internalType": "address payable", "name": "treasury", "type": "address"},
-                    {"internalType": "address payable", "name": "creator", "type": "address"},
-                    {"internalType": "address", "name": "factory", "type": "address"},
-                    {"internalType": "bool", "name": "isActive", "type": "bool"},
-                    {"internalType": "contract IERC20", "name": "depositAsset", "type": "address"},
-                    {"internalType": "contract IERC20[]", "name": "buyAssets", "type": "address[]"},
-                    {"internalType": "uint256", "name": "creatorPercentageFeeOnDeposit", "type": "uint256"},
-                    {"internalType": "uint256", "name": "treasuryPercentageFeeOnBalanceUpdate", "type": "uint256"},
-                ],
-                "internalType": "struct ConfigTypes.InitMultiAssetVaultParams",
-                "name": "",
-                "type": "tuple",
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "depositor", "type": "address"}],
-        "name": "getInitialDepositBalance",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "getStrategyParams",
-        "outputs": [
-            {
-                "components": [
-                    {"internalType": "uint256[]", "name": "buyPercentages", "type": "uint256[]"},
-                    {"internalType": "enum Enums.BuyFrequency", "name": "buyFrequency", "type": "uint8"},
-                    {"internalType": "enum Enums.StrategyType", "name": "strategyType", "type": "uint8"},
-                    {"internalType": "address", "name": "strategyWorker", "type": "address"},
-                ],
-                "internalType": "struct ConfigTypes.StrategyParams",
-                "name": "",
-                "type": "tuple",
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "getUpdateFrequencyTimestamp",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "spender", "type": "address"},
-            {"internalType": "uint256", "name": "addedValue", "type": "uint256"},
-        ],
-        "name": "increaseAllowance",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "initMultiAssetVaultParams",
-        "outputs": [
-            {"internalType": "string", "name": "name", "type": "string"},
-            {"internalType": "string", "name": "symbol", "type": "string"},
-            {"internalType": "address payable", "name": "treasury", "type": "address"},
-            {"internalType": "address payable", "name": "creator", "type": "address"},
-            {"internalType": "address", "name": "factory", "type": "address"},
-            {"internalType": "bool", "name": "isActive", "type": "bool"},
-            {"internalType": "contract IERC20", "name": "depositAsset", "type": "address"},
-            {"internalType": "uint256", "name": "creatorPercentageFeeOnDeposit", "type": "uint256"},
-            {"internalType": "uint256", "name": "treasuryPercentageFeeOnBalanceUpdate", "type": "uint256"},
-        ],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "depositor", "type": "address"}],
-        "name": "lastUpdateOf",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "name": "maxDeposit",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "name": "maxMint",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "owner", "type": "address"}],
-        "name": "maxRedeem",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "owner", "type": "address"}],
-        "name": "maxWithdraw",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "shares", "type": "uint256"},
-            {"internalType": "address", "name": "receiver", "type": "address"},
-        ],
-        "name": "mint",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "name",
-        "outputs": [{"internalType": "string", "name": "", "type": "string"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "assets", "type": "uint256"}],
-        "name": "previewDeposit",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "shares", "type": "uint256"}],
-        "name": "previewMint",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "shares", "type": "uint256"}],
-        "name": "previewRedeem",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "assets", "type": "uint256"}],
-        "name": "previewWithdraw",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "shares", "type": "uint256"},
-            {"internalType": "address", "name": "receiver", "type": "address"},
-            {"internalType": "address", "name": "owner", "type": "address"},
-        ],
-        "name": "redeem",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "depositor", "type": "address"}],
-        "name": "setLastUpdatePerDepositor",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "strategyParams",
-        "outputs": [
-            {"internalType": "enum Enums.BuyFrequency", "name": "buyFrequency", "type": "uint8"},
-            {"internalType": "enum Enums.StrategyType", "name": "strategyType", "type": "uint8"},
-            {"internalType": "address", "name": "strategyWorker", "type": "address"},
-        ],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "symbol",
-        "outputs": [{"internalType": "string", "name": "", "type": "string"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "totalAssets",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "totalSupply",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "transfer",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "from", "type": "address"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "transferFrom",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "assets", "type": "uint256"},
-            {"internalType": "address", "name": "receiver", "type": "address"},
-            {"internalType": "address", "name": "owner", "type": "address"},
-        ],
-        "name": "withdraw",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-]
-
-
-erc20_abi = [
-    {
-        "constant": True,
-        "inputs": [],
-        "name": "name",
-        "outputs": [{"name": "", "type": "string"}],
-        "payable": False,
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "constant": False,
-        "inputs": [{"name": "_spender", "type": "address"}, {"name": "_value", "type": "uint256"}],
-        "name": "approve",
-        "outputs": [{"name": "", "type": "bool"}],
-        "payable": False,
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "constant": True,
-        "inputs": [],
-        "name": "totalSupply",
-        "outputs": [{"name": "", "type": "uint256"}],
-        "payable": False,
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "constant": False,
-        "inputs": [
-            {"name": "_from", "type": "address"},
-            {"name": "_to", "type": "address"},
-            {"name": "_value", "type": "uint256"},
-        ],
-        "name": "transferFrom",
-        "outputs": [{"name": "", "type": "bool"}],
-        "payable": False,
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "constant": True,
-        "inputs": [],
-        "name": "decimals",
-        "outputs": [{"name": "", "type": "uint8"}],
-        "payable": False,
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "constant": True,
-        "inputs": [{"name": "_owner", "type": "address"}],
-        "name": "balanceOf",
-        "outputs": [{"name": "balance", "type": "uint256"}],
-        "payable": False,
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "constant": True,
-        "inputs": [],
-        "name": "symbol",
-        "outputs": [{"name": "", "type": "string"}],
-        "payable": False,
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "constant": False,
-        "inputs": [{"name": "_to", "type": "address"}, {"name": "_value", "type": "uint256"}],
-        "name": "transfer",
-        "outputs": [{"name": "", "type": "bool"}],
-        "payable": False,
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "constant": True,
-        "inputs": [{"name": "_owner", "type": "address"}, {"name": "_spender", "type": "address"}],
-        "name": "allowance",
-        "outputs": [{"name": "", "type": "uint256"}],
-        "payable": False,
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {"payable": True, "stateMutability": "payable", "type": "fallback"},
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "name": "owner", "type": "address"},
-            {"indexed": True, "name": "spender", "type": "address"},
-            {"indexed": False, "name": "value", "type": "uint256"},
-        ],
-        "name": "Approval",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {"indexed": True, "name": "from", "type": "address"},
-            {"indexed": True, "name": "to", "type": "address"},
-            {"indexed": False, "name": "value", "type": "uint256"},
-        ],
-        "name": "Transfer",
-        "type": "event",
-    },
-]
-
-univ2_dex_router_abi = [
-    {
-        "inputs": [
-            {"internalType": "address", "name": "_factory", "type": "address"},
-            {"internalType": "address", "name": "_WETH", "type": "address"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "constructor",
-    },
-    {
-        "inputs": [],
-        "name": "WETH",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "tokenA", "type": "address"},
-            {"internalType": "address", "name": "tokenB", "type": "address"},
-            {"internalType": "uint256", "name": "amountADesired", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountBDesired", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountAMin", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountBMin", "type": "uint256"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "addLiquidity",
-        "outputs": [
-            {"internalType": "uint256", "name": "amountA", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountB", "type": "uint256"},
-            {"internalType": "uint256", "name": "liquidity", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "token", "type": "address"},
-            {"internalType": "uint256", "name": "amountTokenDesired", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountTokenMin", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountETHMin", "type": "uint256"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "addLiquidityETH",
-        "outputs": [
-            {"internalType": "uint256", "name": "amountToken", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountETH", "type": "uint256"},
-            {"internalType": "uint256", "name": "liquidity", "type": "uint256"},
-        ],
-        "stateMutability": "payable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "factory",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountOut", "type": "uint256"},
-            {"internalType": "uint256", "name": "reserveIn", "type": "uint256"},
-            {"internalType": "uint256", "name": "reserveOut", "type": "uint256"},
-        ],
-        "name": "getAmountIn",
-        "outputs": [{"internalType": "uint256", "name": "amountIn", "type": "uint256"}],
-        "stateMutability": "pure",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
-            {"internalType": "uint256", "name": "reserveIn", "type": "uint256"},
-            {"internalType": "uint256", "name": "reserveOut", "type": "uint256"},
-        ],
-        "name": "getAmountOut",
-        "outputs": [{"internalType": "uint256", "name": "amountOut", "type": "uint256"}],
-        "stateMutability": "pure",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountOut", "type": "uint256"},
-            {"internalType": "address[]", "name": "path", "type": "address[]"},
-        ],
-        "name": "getAmountsIn",
-        "outputs": [{"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
-            {"internalType": "address[]", "name": "path", "type": "address[]"},
-        ],
-        "name": "getAmountsOut",
-        "outputs": [{"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountA", "type": "uint256"},
-            {"internalType": "uint256", "name": "reserveA", "type": "uint256"},
-            {"internalType": "uint256", "name": "reserveB", "type": "uint256"},
-        ],
-        "name": "quote",
-        "outputs": [{"internalType": "uint256", "name": "amountB", "type": "uint256"}],
-        "stateMutability": "pure",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "tokenA", "type": "address"},
-            {"internalType": "address", "name": "tokenB", "type": "address"},
-            {"internalType": "uint256", "name": "liquidity", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountAMin", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountBMin", "type": "uint256"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "removeLiquidity",
-        "outputs": [
-            {"internalType": "uint256", "name": "amountA", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountB", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "token", "type": "address"},
-            {"internalType": "uint256", "name": "liquidity", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountTokenMin", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountETHMin", "type": "uint256"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "removeLiquidityETH",
-        "outputs": [
-            {"internalType": "uint256", "name": "amountToken", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountETH", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "token", "type": "address"},
-            {"internalType": "uint256", "name": "liquidity", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountTokenMin", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountETHMin", "type": "uint256"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "removeLiquidityETHSupportingFeeOnTransferTokens",
-        "outputs": [{"internalType": "uint256", "name": "amountETH", "type": "uint256"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "token", "type": "address"},
-            {"internalType": "uint256", "name": "liquidity", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountTokenMin", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountETHMin", "type": "uint256"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-            {"internalType": "bool", "name": "approveMax", "type": "bool"},
-            {"internalType": "uint8", "name": "v", "type": "uint8"},
-            {"internalType": "bytes32", "name": "r", "type": "bytes32"},
-            {"internalType": "bytes32", "name": "s", "type": "bytes32"},
-        ],
-        "name": "removeLiquidityETHWithPermit",
-        "outputs": [
-            {"internalType": "uint256", "name": "amountToken", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountETH", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "token", "type": "address"},
-            {"internalType": "uint256", "name": "liquidity", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountTokenMin", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountETHMin", "type": "uint256"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-            {"internalType": "bool", "name": "approveMax", "type": "bool"},
-            {"internalType": "uint8", "name": "v", "type": "uint8"},
-            {"internalType": "bytes32", "name": "r", "type": "bytes32"},
-            {"internalType": "bytes32", "name": "s", "type": "bytes32"},
-        ],
-        "name": "removeLiquidityETHWithPermitSupportingFeeOnTransferTokens",
-        "outputs": [{"internalType": "uint256", "name": "amountETH", "type": "uint256"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "tokenA", "type": "address"},
-            {"internalType": "address", "name": "tokenB", "type": "address"},
-            {"internalType": "uint256", "name": "liquidity", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountAMin", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountBMin", "type": "uint256"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-            {"internalType": "bool", "name": "approveMax", "type": "bool"},
-            {"internalType": "uint8", "name": "v", "type": "uint8"},
-            {"internalType": "bytes32", "name": "r", "type": "bytes32"},
-            {"internalType": "bytes32", "name": "s", "type": "bytes32"},
-        ],
-        "name": "removeLiquidityWithPermit",
-        "outputs": [
-            {"internalType": "uint256", "name": "amountA", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountB", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountOut", "type": "uint256"},
-            {"internalType": "address[]", "name": "path", "type": "address[]"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "swapETHForExactTokens",
-        "outputs": [{"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}],
-        "stateMutability": "payable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountOutMin", "type": "uint256"},
-            {"internalType": "address[]", "name": "path", "type": "address[]"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "swapExactETHForTokens",
-        "outputs": [{"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}],
-        "stateMutability": "payable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountOutMin", "type": "uint256"},
-            {"internalType": "address[]", "name": "path", "type": "address[]"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "swapExactETHForTokensSupportingFeeOnTransferTokens",
-        "outputs": [],
-        "stateMutability": "payable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountOutMin", "type": "uint256"},
-            {"internalType": "address[]", "name": "path", "type": "address[]"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "swapExactTokensForETH",
-        "outputs": [{"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountOutMin", "type": "uint256"},
-            {"internalType": "address[]", "name": "path", "type": "address[]"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "swapExactTokensForETHSupportingFeeOnTransferTokens",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountOutMin", "type": "uint256"},
-            {"internalType": "address[]", "name": "path", "type": "address[]"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "swapExactTokensForTokens",
-        "outputs": [{"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountIn", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountOutMin", "type": "uint256"},
-            {"internalType": "address[]", "name": "path", "type": "address[]"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "swapExactTokensForTokensSupportingFeeOnTransferTokens",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountOut", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountInMax", "type": "uint256"},
-            {"internalType": "address[]", "name": "path", "type": "address[]"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "swapTokensForExactETH",
-        "outputs": [{"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amountOut", "type": "uint256"},
-            {"internalType": "uint256", "name": "amountInMax", "type": "uint256"},
-            {"internalType": "address[]", "name": "path", "type": "address[]"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "deadline", "type": "uint256"},
-        ],
-        "name": "swapTokensForExactTokens",
-        "outputs": [{"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {"stateMutability": "payable", "type": "receive"},
-]
@@ -0,0 +1,17 @@
+from docs.abis.registry import AbiRegistry, EventDecoder, abi_registry
+
+# Module level names kept for scripts written against the old docs/abis.py literals.
+# They are resolved lazily, so importing this package doesn't parse any ABI.
+_LEGACY_ABI_NAMES = {
+    "treasury_abi": "treasury",
+    "vaults_factory_abi": "vaults_factory",
+    "vault_abi": "vault",
+    "erc20_abi": "erc20",
+    "univ2_dex_router_abi": "univ2_dex_router",
+}
+
+
+def __getattr__(name: str):
+    if name in _LEGACY_ABI_NAMES:
+        return abi_registry.get(_LEGACY_ABI_NAMES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
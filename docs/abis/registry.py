@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+from threading import Lock
+from eth_abi import abi
+from typing import Callable, Dict, List, Tuple
+from eth_utils.abi import collapse_if_tuple, event_abi_to_log_topic, function_abi_to_4byte_selector
+
+ABIS_PATH = Path(__file__).resolve().parent / "json"
+
+
+def _is_hashed_topic_type(type_str: str) -> bool:
+    return type_str in ("string", "bytes") or type_str.endswith("]") or type_str.startswith("(")
+
+
+class EventDecoder:
+    __slots__ = ("name", "topic", "indexed_names", "indexed_types", "data_names", "data_types")
+
+    def __init__(self, event_abi: dict):
+        self.name = event_abi["name"]
+        self.topic = event_abi_to_log_topic(event_abi)
+        inputs = event_abi.get("inputs", [])
+        self.indexed_names = [abi_input["name"] for abi_input in inputs if abi_input["indexed"]]
+        self.indexed_types = [collapse_if_tuple(abi_input) for abi_input in inputs if abi_input["indexed"]]
+        self.data_names = [abi_input["name"] for abi_input in inputs if not abi_input["indexed"]]
+        self.data_types = [collapse_if_tuple(abi_input) for abi_input in inputs if not abi_input["indexed"]]
+
+    def decode(self, topics: List[bytes], data: bytes) -> dict:
+        # topics[0] is the event signature, dynamic indexed values are kept as their keccak hash
+        args = {}
+        for name, type_str, topic in zip(self.indexed_names, self.indexed_types, topics[1:]):
+            args[name] = topic if _is_hashed_topic_type(type_str) else abi.decode([type_str], topic)[0]
+        args.update(zip(self.data_names, abi.decode(self.data_types, data)))
+        return args
+
+
+# ABI json artifacts are only parsed when first requested by name, selector/topic tables are built once per ABI
+class AbiRegistry:
+    def __init__(self, abis_path: Path = ABIS_PATH):
+        self.abis_path = abis_path
+        self._lock = Lock()
+        self._abis: Dict[str, List[dict]] = {}
+        self._function_selectors: Dict[str, Dict[bytes, dict]] = {}
+        self._error_selectors: Dict[str, Dict[bytes, dict]] = {}
+        self._event_decoders: Dict[str, Dict[bytes, EventDecoder]] = {}
+        self._decoders: Dict[Tuple[str, ...], Callable[[bytes], tuple]] = {}
+
+    def names(self) -> List[str]:
+        return sorted(path.stem for path in self.abis_path.glob("*.json"))
+
+    def get(self, name: str) -> List[dict]:
+        contract_abi = self._abis.get(name)
+        if contract_abi is None:
+            with self._lock:
+                contract_abi = self._abis.get(name)
+                if contract_abi is None:
+                    with open(self.abis_path / f"{name}.json") as file:
+                        contract_abi = json.load(file)
+                    self._abis[name] = contract_abi
+        return contract_abi
+
+    def function_selectors(self, name: str) -> Dict[bytes, dict]:
+        selectors = self._function_selectors.get(name)
+        if selectors is None:
+            selectors = {
+                function_abi_to_4byte_selector(entry): entry for entry in self.get(name) if entry["type"] == "function"
+            }
+            self._function_selectors[name] = selectors
+        return selectors
+
+    def error_selectors(self, name: str) -> Dict[bytes, dict]:
+        selectors = self._error_selectors.get(name)
+        if selectors is None:
+            selectors = {
+                function_abi_to_4byte_selector(entry): entry for entry in self.get(name) if entry["type"] == "error"
+            }
+            self._error_selectors[name] = selectors
+        return selectors
+
+    def event_decoders(self, name: str) -> Dict[bytes, EventDecoder]:
+        decoders = self._event_decoders.get(name)
+        if decoders is None:
+            decoders = {}
+            for entry in self.get(name):
+                if entry["type"] == "event" and not entry.get("anonymous"):
+                    event_decoder = EventDecoder(entry)
+                    decoders[event_decoder.topic] = event_decoder
+            self._event_decoders[name] = decoders
+        return decoders
+
+    def function_abi(self, name: str, function_name: str) -> dict:
+        return self.function_selectors(name)[self.selector(name, function_name)]
+
+    def selector(self, name: str, function_name: str) -> bytes:
+        for selector, entry in self.function_selectors(name).items():
+            if entry["name"] == function_name:
+                return selector
+        raise KeyError(f"Function {function_name} not found in {name} ABI")
+
+    def event_decoder(self, name: str, event_name: str) -> EventDecoder:
+        for event_decoder in self.event_decoders(name).values():
+            if event_decoder.name == event_name:
+                return event_decoder
+        raise KeyError(f"Event {event_name} not found in {name} ABI")
+
+    def decoder(self, types: Tuple[str, ...]) -> Callable[[bytes], tuple]:
+        decoder = self._decoders.get(types)
+        if decoder is None:
+            type_list = list(types)
+
+            def _decode(data: bytes) -> tuple:
+                return abi.decode(type_list, data)
+
+            decoder = self._decoders.setdefault(types, _decode)
+        return decoder
+
+    def output_decoder(self, name: str, function_name: str) -> Callable[[bytes], tuple]:
+        outputs = self.function_abi(name, function_name)["outputs"]
+        return self.decoder(tuple(collapse_if_tuple(output) for output in outputs))
+
+
+abi_registry = AbiRegistry()
@@ -6,14 +6,24 @@ from math import floor
 from eth_abi import abi
 from eth_utils.abi import function_abi_to_4byte_selector, collapse_if_tuple
 from brownie import (
+    Contract,
     AutomatedVaultERC4626,
     AutomatedVaultsFactory,
     accounts,
     config,
     network,
+    web3,
+)
+from docs.abis import abi_registry
+from scripts.backend.contract_cache import contract_handles
+from scripts.backend.token_metadata import (
+    TOKEN_METADATA_PATH,
+    TokenMetadataCache,
+    is_persistent_network,
 )
 
 NULL_ADDRESS = "0x0000000000000000000000000000000000000000"
+LOCAL_BLOCKCHAIN_ENVIRONMENTS = ["development", "anvil", "hardhat", "geth-dev"]
 CONSOLE_SEPARATOR = (
     "--------------------------------------------------------------------------"
 )
@@ -24,14 +34,55 @@ def get_account_from_pk(index: int) -> object:
     # return accounts.add(config["wallets"][f"from_key_{index}"])
 
 
+def is_local_network() -> bool:
+    return network.show_active() in LOCAL_BLOCKCHAIN_ENVIRONMENTS
+
+
 def check_network_is_mainnet_fork():
     if network.show_active() == "development" or "fork" not in network.show_active():
         pytest.skip("Only for mainnet-fork testing!")
 
 
+def check_network_is_local_or_mainnet_fork():
+    if not is_local_network() and "fork" not in network.show_active():
+        pytest.skip("Only for local or mainnet-fork testing!")
+
+
 def get_strategy_vault(index: int = 0) -> AutomatedVaultERC4626:
     created_strategy_vault_address = AutomatedVaultsFactory[-1].getVaultAddress(index)
-    return AutomatedVaultERC4626.at(created_strategy_vault_address)
+    return get_contract_at(AutomatedVaultERC4626, created_strategy_vault_address)
+
+
+def get_contract_at(contract_container, address: str) -> Contract:
+    return contract_handles.get(
+        network.show_active(),
+        contract_container._name,
+        address,
+        lambda: contract_container.at(address),
+    )
+
+
+def get_contract_from_abi(contract_name: str, address: str, abi_name: str) -> Contract:
+    return contract_handles.get(
+        network.show_active(),
+        f"{contract_name}:{abi_name}",
+        address,
+        lambda: Contract.from_abi(contract_name, address, abi_registry.get(abi_name)),
+    )
+
+
+_token_metadata_caches = {}
+
+
+# Token metadata and dex pairs of the active network, shared by the scripts and tests
+def get_token_metadata() -> TokenMetadataCache:
+    network_name = network.show_active()
+    if network_name not in _token_metadata_caches:
+        path = TOKEN_METADATA_PATH if is_persistent_network(network_name) else None
+        _token_metadata_caches[network_name] = TokenMetadataCache(
+            web3, web3.eth.chain_id, path
+        )
+    return _token_metadata_caches[network_name]
 
 
 def perc_mul_contracts_simulate(value: int, percentage: int) -> int:
@@ -0,0 +1,78 @@
+import random
+from typing import Dict, Iterable, List, Set
+from docs.abis import abi_registry
+from scripts.backend.runtime import Runtime
+from scripts.backend.metrics import Metrics, metrics
+from scripts.backend.depositor_store import DepositorStore
+from scripts.backend.helpers import LOG_BLOCK_RANGE, event_strategy_action_executed
+
+# Number of depositors checked against lastUpdateOf on every reconciliation round
+RECONCILE_SAMPLE_SIZE = 32
+
+
+# StrategyActionExecuted logs are the source of truth for every depositor lastUpdate and cumulative amounts,
+# each tick only the logs emitted since the previous one are fetched and applied to the store rows
+class ActionIndexer:
+    def __init__(self, runtime: Runtime, store: DepositorStore, from_block: int, metrics: Metrics = metrics):
+        self.runtime = runtime
+        self.store = store
+        self.metrics = metrics
+        self.block_number = from_block
+        self.decoder = abi_registry.event_decoder("strategy_worker", event_strategy_action_executed)
+
+    # applies the logs up to to_block (included) and returns the ids of the vaults having executed actions
+    def update(self, to_block: int) -> Set[int]:
+        updated_vault_ids = set()
+        block_timestamps: Dict[int, int] = {}
+        for start_block in range(self.block_number, to_block + 1, LOG_BLOCK_RANGE):
+            logs = self.runtime.web3.eth.get_logs(
+                {
+                    "address": self.runtime.worker_address,
+                    "topics": [self.decoder.topic],
+                    "fromBlock": start_block,
+                    "toBlock": min(start_block + LOG_BLOCK_RANGE - 1, to_block),
+                }
+            )
+            for log in logs:
+                block_number = log["blockNumber"]
+                if block_number not in block_timestamps:
+                    block_timestamps[block_number] = self.runtime.web3.eth.get_block(block_number)["timestamp"]
+                vault_id = self.apply(self.decoder.decode(log["topics"], log["data"]), block_timestamps[block_number])
+                if vault_id is not None:
+                    updated_vault_ids.add(vault_id)
+            self.metrics.increment("action_indexer.events", len(logs))
+        self.block_number = max(self.block_number, to_block + 1)
+        return updated_vault_ids
+
+    def apply(self, action: dict, timestamp: int):
+        store = self.store
+        vault_id = store.addresses.id_of(action["vault"])
+        depositor_id = store.addresses.id_of(action["depositor"])
+        row = None if vault_id is None or depositor_id is None else store.row_of(vault_id, depositor_id)
+        if row is None:
+            # vaults/depositors not followed by this keeper
+            self.metrics.increment("action_indexer.ignored_events")
+            return None
+        store.last_updates[row] = max(store.last_updates[row], timestamp)
+        store.spent_amounts[row] += action["tokenInAmount"]
+        for asset_index, amount in enumerate(action["tokensOutAmounts"]):
+            store.add_bought_amount(row, asset_index, amount)
+        return vault_id
+
+    # Compares rows against lastUpdateOf, any drift (missed logs, reorgs) is fixed and counted.
+    # Returns the ids of the vaults whose rows were corrected.
+    def reconcile(self, rows: Iterable[int]) -> Set[int]:
+        store = self.store
+        corrected_vault_ids = set()
+        for row in rows:
+            vault_contract = self.runtime.contract("vault", store.vault_address(row))
+            last_update = vault_contract.functions.lastUpdateOf(store.depositor_address(row)).call()
+            self.metrics.increment("action_indexer.reconciled_rows")
+            if last_update != store.last_updates[row]:
+                self.metrics.increment("action_indexer.reconcile_mismatches")
+                store.last_updates[row] = last_update
+                corrected_vault_ids.add(store.vault_ids[row])
+        return corrected_vault_ids
+
+    def sample_rows(self, sample_size: int = RECONCILE_SAMPLE_SIZE) -> List[int]:
+        return random.sample(range(len(self.store)), min(sample_size, len(self.store)))
@@ -0,0 +1,165 @@
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from docs.abis import abi_registry
+from scripts.backend.runtime import Runtime
+from scripts.backend.metrics import metrics
+from scripts.backend.multicall import Call
+from scripts.backend.depositor_store import DepositorStore, Uint256Column
+from scripts.backend.helpers import LOG_BLOCK_RANGE, event_approval, event_strategy_action_executed, event_transfer
+
+MAX_UINT256 = 2**256 - 1
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+# Columns read for the rows of the store at a single block, values are aligned with rows
+class DepositorSnapshot(NamedTuple):
+    block_number: int
+    rows: array
+    balances: Uint256Column
+    allowances: Uint256Column
+    periodic_buy_amounts: Uint256Column
+    # (totalSupply, totalAssets) of the vaults of the rows
+    vault_totals: Dict[int, Tuple[int, int]]
+
+
+# Share balances and share allowances to the strategy worker of every depositor row, kept up to date from the vault
+# Transfer/Approval logs emitted since the previous tick. Rows are read once when they are added, at the last
+# indexed block, so the logs applied afterwards are never counted twice.
+class BalanceIndexer:
+    def __init__(self, runtime: Runtime, store: DepositorStore, from_block: int):
+        self.runtime = runtime
+        self.store = store
+        self.block_number = from_block
+        self.transfer_decoder = abi_registry.event_decoder("vault", event_transfer)
+        self.approval_decoder = abi_registry.event_decoder("vault", event_approval)
+        self.action_decoder = abi_registry.event_decoder("strategy_worker", event_strategy_action_executed)
+        metrics.register_gauge("balance_index.active_rows", lambda: self.store.active_rows_length())
+
+    # returns the ids of the vaults whose rows were read
+    def initialize_rows(self, rows: Iterable[int]) -> Set[int]:
+        store = self.store
+        snapshot = self.snapshot_rows(rows, self.block_number - 1)
+        initialized_vault_ids = set()
+        for vault_id, (total_supply, total_assets) in snapshot.vault_totals.items():
+            store.set_vault_totals(vault_id, total_supply, total_assets)
+        for index, row in enumerate(snapshot.rows):
+            store.balances[row] = snapshot.balances[index]
+            store.allowances[row] = snapshot.allowances[index]
+            store.periodic_buy_amounts[row] = snapshot.periodic_buy_amounts[index]
+            store.refresh_activity(row)
+            initialized_vault_ids.add(store.vault_ids[row])
+        metrics.increment("balance_index.initialized_rows", len(snapshot.rows))
+        return initialized_vault_ids
+
+    # Share balance, share allowance to the worker and total periodic buy amount of every row, plus the share price of
+    # their vaults, read through Multicall3 in chunked batches all pinned to block_number. Reads failing (vault
+    # without code) are left at 0.
+    def snapshot_rows(self, rows: Iterable[int], block_number: int) -> DepositorSnapshot:
+        store = self.store
+        worker_address = self.runtime.worker_address
+        rows = array("I", rows)
+        vault_ids = sorted({store.vault_ids[row] for row in rows})
+        calls = []
+        for row in rows:
+            vault_address, depositor_address = store.vault_address(row), store.depositor_address(row)
+            calls.append(Call(vault_address, "vault", "balanceOf", (depositor_address,)))
+            calls.append(Call(vault_address, "vault", "allowance", (depositor_address, worker_address)))
+            calls.append(Call(vault_address, "vault", "getDepositorTotalPeriodicBuyAmount", (depositor_address,)))
+        for vault_id in vault_ids:
+            vault_address = store.addresses.address(vault_id)
+            calls.append(Call(vault_address, "vault", "totalSupply", ()))
+            calls.append(Call(vault_address, "vault", "totalAssets", ()))
+        results = [0 if result is None else result[0] for result in self.runtime.multicall.call(calls, block_number)]
+        vault_results = results[3 * len(rows) :]
+        vault_totals = {
+            vault_id: (vault_results[2 * index], vault_results[2 * index + 1])
+            for index, vault_id in enumerate(vault_ids)
+        }
+        snapshot = DepositorSnapshot(
+            block_number, rows, Uint256Column(), Uint256Column(), Uint256Column(), vault_totals
+        )
+        for index in range(len(rows)):
+            snapshot.balances.append(results[3 * index])
+            snapshot.allowances.append(results[3 * index + 1])
+            snapshot.periodic_buy_amounts.append(results[3 * index + 2])
+        # set on the first deposit and never changed afterwards, the rows deposited after block_number read it at
+        # the latest block
+        unset_indexes = [index for index in range(len(rows)) if snapshot.periodic_buy_amounts[index] == 0]
+        if unset_indexes:
+            latest_results = self.runtime.multicall.call([calls[3 * index + 2] for index in unset_indexes])
+            for index, result in zip(unset_indexes, latest_results):
+                snapshot.periodic_buy_amounts[index] = 0 if result is None else result[0]
+        metrics.increment("balance_index.snapshot_reads", len(calls))
+        return snapshot
+
+    # applies the logs up to to_block (included) and returns the ids of the vaults having rows changing activity
+    def update(self, to_block: int) -> Set[int]:
+        store = self.store
+        changed_vault_ids = set()
+        vault_addresses = [store.addresses.address(vault_id) for vault_id in store.vault_ids_with_rows()]
+        if not vault_addresses:
+            self.block_number = max(self.block_number, to_block + 1)
+            return changed_vault_ids
+        for start_block in range(self.block_number, to_block + 1, LOG_BLOCK_RANGE):
+            logs = self.runtime.web3.eth.get_logs(
+                {
+                    "address": vault_addresses + [self.runtime.worker_address],
+                    "topics": [[self.transfer_decoder.topic, self.approval_decoder.topic, self.action_decoder.topic]],
+                    "fromBlock": start_block,
+                    "toBlock": min(start_block + LOG_BLOCK_RANGE - 1, to_block),
+                }
+            )
+            # the worker withdraws with transferFrom semantics but a spent allowance emits no Approval log, the
+            # shares burned in a strategy action transaction are taken from the allowance instead
+            action_transactions = {
+                log["transactionHash"] for log in logs if log["topics"][0] == self.action_decoder.topic
+            }
+            for log in logs:
+                topic = log["topics"][0]
+                vault_id = store.addresses.id_of(log["address"])
+                if topic == self.transfer_decoder.topic:
+                    transfer = self.transfer_decoder.decode(log["topics"], log["data"])
+                    rows = self.apply_transfer(vault_id, transfer, log["transactionHash"] in action_transactions)
+                elif topic == self.approval_decoder.topic:
+                    rows = self.apply_approval(vault_id, self.approval_decoder.decode(log["topics"], log["data"]))
+                else:
+                    continue
+                for row in rows:
+                    if store.refresh_activity(row):
+                        changed_vault_ids.add(vault_id)
+                        metrics.increment(
+                            "balance_index.revived_rows" if store.is_active(row) else "balance_index.pruned_rows"
+                        )
+            metrics.increment("balance_index.events", len(logs) - len(action_transactions))
+        self.block_number = max(self.block_number, to_block + 1)
+        return changed_vault_ids
+
+    def apply_transfer(self, vault_id: Optional[int], transfer: dict, spent_by_worker: bool) -> List[int]:
+        store = self.store
+        value = transfer["value"]
+        rows = []
+        sender_row = self._row(vault_id, transfer["from"])
+        if sender_row is not None:
+            store.balances[sender_row] = max(0, store.balances[sender_row] - value)
+            allowance = store.allowances[sender_row]
+            if spent_by_worker and transfer["to"] == ZERO_ADDRESS and allowance != MAX_UINT256:
+                store.allowances[sender_row] = max(0, allowance - value)
+            rows.append(sender_row)
+        receiver_row = self._row(vault_id, transfer["to"])
+        if receiver_row is not None:
+            store.balances[receiver_row] += value
+            rows.append(receiver_row)
+        return rows
+
+    def apply_approval(self, vault_id: Optional[int], approval: dict) -> List[int]:
+        if approval["spender"].lower() != self.runtime.worker_address.lower():
+            return []
+        row = self._row(vault_id, approval["owner"])
+        if row is None:
+            return []
+        self.store.allowances[row] = approval["value"]
+        return [row]
+
+    def _row(self, vault_id: Optional[int], address: str) -> Optional[int]:
+        depositor_id = self.store.addresses.id_of(address)
+        return None if vault_id is None or depositor_id is None else self.store.row_of(vault_id, depositor_id)
@@ -0,0 +1,81 @@
+import time
+from collections import deque
+from typing import Callable, Optional
+from scripts.backend.metrics import Metrics, metrics
+
+# Weight of the last block interval in the rolling block cadence
+EWMA_ALPHA = 0.2
+# Number of recent block intervals the guaranteed timestamp increment is taken from
+INTERVAL_WINDOW = 64
+# Upper bound of a scheduler wait, new heads are read at least this often
+MAX_WAIT_SECONDS = 60
+
+
+# Chain time as seen by the contracts: StrategyWorker.executeStrategyAction and Resolver._canExec compare
+# block.timestamp to lastUpdateOf + buy frequency, so due checks use the latest block timestamp and the observed
+# block cadence instead of the local clock. A transaction sent after the latest block lands in a block whose
+# timestamp is at least the latest one plus the smallest recently observed interval (0 on chains like Arbitrum
+# where consecutive blocks can share a timestamp), which is what a depositor has to be due at to never revert.
+class ChainClock:
+    def __init__(self, wall_clock: Callable[[], float] = time.time, metrics: Metrics = metrics):
+        self.wall_clock = wall_clock
+        self.metrics = metrics
+        self.block_number: Optional[int] = None
+        self.timestamp: Optional[int] = None
+        # local time at which the latest block was observed
+        self.observed_at = 0.0
+        self.block_interval = 0.0
+        self._intervals = deque(maxlen=INTERVAL_WINDOW)
+        metrics.register_gauge("chain_clock.block_interval", lambda: self.block_interval)
+        metrics.register_gauge("chain_clock.skew", lambda: self.skew)
+
+    def observe(self, block_number: int, timestamp: int):
+        if self.block_number is not None and block_number <= self.block_number:
+            return
+        if self.block_number is not None:
+            interval = (timestamp - self.timestamp) / (block_number - self.block_number)
+            self._intervals.append(interval)
+            # the first sample replaces the initial cadence of 0
+            if self.block_interval == 0:
+                self.block_interval = interval
+            else:
+                self.block_interval = EWMA_ALPHA * interval + (1 - EWMA_ALPHA) * self.block_interval
+        self.block_number, self.timestamp = block_number, timestamp
+        self.observed_at = self.wall_clock()
+
+    def observe_block(self, block: dict):
+        self.observe(block["number"], block["timestamp"])
+
+    def refresh(self, web3) -> int:
+        self.observe_block(web3.eth.get_block("latest"))
+        return self.block_number
+
+    @property
+    def skew(self) -> float:
+        return 0.0 if self.timestamp is None else self.observed_at - self.timestamp
+
+    # Smallest timestamp increment the next block is expected to have
+    @property
+    def min_block_increment(self) -> float:
+        return max(0.0, min(self._intervals, default=0.0))
+
+    def next_block_timestamp(self) -> float:
+        return self.timestamp + self.min_block_increment
+
+    def due_at(self, last_update: int, frequency: int) -> int:
+        return 0 if last_update == 0 else last_update + frequency
+
+    # True when a transaction sent now is valid in the block it lands in
+    def is_due(self, last_update: int, frequency: int) -> bool:
+        return self.next_block_timestamp() >= self.due_at(last_update, frequency)
+
+    # Local seconds until the latest block is expected to be followed by one valid at chain time due_at: the chain
+    # time still missing, advanced from the time the latest block was seen and rounded up to the block cadence
+    def seconds_until(self, due_at: int) -> float:
+        missing = due_at - self.next_block_timestamp()
+        if missing <= 0:
+            return 0.0
+        if self.block_interval > 0:
+            missing = -(-missing // self.block_interval) * self.block_interval
+        elapsed = self.wall_clock() - self.observed_at
+        return min(MAX_WAIT_SECONDS, max(0.0, missing - elapsed))
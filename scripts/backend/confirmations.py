@@ -0,0 +1,123 @@
+from hexbytes import HexBytes
+from eth_utils import to_checksum_address, to_hex
+from typing import Dict, List, NamedTuple, Optional
+from docs.abis import abi_registry
+from scripts.backend.runtime import Runtime
+from scripts.backend.metrics import Metrics, metrics
+from scripts.backend.helpers import event_strategy_action_executed
+
+# Transactions still without a receipt this many blocks after being sent are considered dropped
+DROPPED_AFTER_BLOCKS = 50
+
+
+class PendingTransaction(NamedTuple):
+    tx_hash: HexBytes
+    row: int
+    sent_at_block: int
+    gas_limit: int
+    # whether the gas limit came from the gas model rather than from eth_estimateGas
+    predicted_gas: bool
+
+
+class Confirmation(NamedTuple):
+    transaction: PendingTransaction
+    receipt: Optional[dict]
+    # StrategyActionExecuted arguments found in the receipt logs, None when the transaction reverted or was dropped
+    action: Optional[dict]
+
+    @property
+    def row(self) -> int:
+        return self.transaction.row
+
+    @property
+    def succeeded(self) -> bool:
+        return self.action is not None
+
+
+def _to_int(value) -> int:
+    return value if isinstance(value, int) else int(value, 16)
+
+
+# Raw JSON-RPC receipts (batched requests) and web3 formatted ones are reduced to the same fields
+def _normalize_receipt(receipt: dict) -> dict:
+    return {
+        "transactionHash": HexBytes(receipt["transactionHash"]),
+        "status": _to_int(receipt["status"]),
+        "blockNumber": _to_int(receipt["blockNumber"]),
+        "gasUsed": _to_int(receipt["gasUsed"]),
+        "logs": [
+            {
+                "address": to_checksum_address(log["address"]),
+                "topics": [HexBytes(topic) for topic in log["topics"]],
+                "data": HexBytes(log["data"]),
+            }
+            for log in receipt["logs"]
+        ],
+    }
+
+
+# Strategy actions are sent without waiting for them: every pending hash is tracked here and all their receipts
+# are requested in a single JSON-RPC batch once per new block, outcomes are handed back to the keeper
+class ConfirmationTracker:
+    def __init__(self, runtime: Runtime, metrics: Metrics = metrics):
+        self.runtime = runtime
+        self.metrics = metrics
+        self.pending: Dict[int, PendingTransaction] = {}
+        self.polled_block = -1
+        self.action_decoder = abi_registry.event_decoder("strategy_worker", event_strategy_action_executed)
+        metrics.register_gauge("confirmations.pending", lambda: len(self.pending))
+
+    def track(self, tx_hash: HexBytes, row: int, block_number: int, gas_limit: int, predicted_gas: bool = False):
+        self.pending[row] = PendingTransaction(HexBytes(tx_hash), row, block_number, gas_limit, predicted_gas)
+
+    def is_pending(self, row: int) -> bool:
+        return row in self.pending
+
+    def poll(self, block_number: int) -> List[Confirmation]:
+        if not self.pending or block_number <= self.polled_block:
+            return []
+        self.polled_block = block_number
+        pending_transactions = list(self.pending.values())
+        receipts = self.fetch_receipts([pending.tx_hash for pending in pending_transactions])
+        self.metrics.increment("confirmations.polls")
+        confirmations = []
+        for pending, receipt in zip(pending_transactions, receipts):
+            if receipt is None:
+                if block_number - pending.sent_at_block < DROPPED_AFTER_BLOCKS:
+                    continue
+                self.metrics.increment("confirmations.dropped")
+                confirmations.append(Confirmation(pending, None, None))
+            else:
+                action = self.find_action(receipt) if receipt["status"] == 1 else None
+                self.metrics.increment("confirmations.succeeded" if action is not None else "confirmations.reverted")
+                confirmations.append(Confirmation(pending, receipt, action))
+            del self.pending[pending.row]
+        return confirmations
+
+    def fetch_receipts(self, tx_hashes: List[HexBytes]) -> List[Optional[dict]]:
+        provider = self.runtime.web3.provider
+        if hasattr(provider, "make_batch_request"):
+            responses = provider.make_batch_request(
+                [("eth_getTransactionReceipt", [to_hex(tx_hash)]) for tx_hash in tx_hashes]
+            )
+            # a failed lookup is retried on the next block like a receipt that is not there yet
+            return [
+                _normalize_receipt(response["result"]) if response.get("result") else None for response in responses
+            ]
+        # providers without batching (brownie's) are asked one receipt at a time, still without blocking
+        from web3.exceptions import TransactionNotFound
+
+        receipts = []
+        for tx_hash in tx_hashes:
+            try:
+                receipts.append(_normalize_receipt(self.runtime.web3.eth.get_transaction_receipt(tx_hash)))
+            except TransactionNotFound:
+                receipts.append(None)
+        return receipts
+
+    def find_action(self, receipt: dict) -> Optional[dict]:
+        worker_address = self.runtime.worker_address
+        for log in receipt["logs"]:
+            if log["address"] == worker_address and log["topics"][0] == self.action_decoder.topic:
+                return self.action_decoder.decode(log["topics"], log["data"])
+        return None
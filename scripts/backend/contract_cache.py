@@ -0,0 +1,64 @@
+from threading import Lock
+from collections import OrderedDict
+from typing import Callable, Tuple, TypeVar
+from scripts.backend.metrics import Metrics, metrics
+
+DEFAULT_MAX_CONTRACT_HANDLES = 4096
+
+T = TypeVar("T")
+
+
+# Bounded LRU of contract objects keyed by (network, contract type, address), shared by every caller in the process
+# so hot loops don't rebuild brownie/web3 contract objects (and refetch code) for addresses already seen. The network
+# is part of the key since a handle is bound to the chain it was built on, and the same address can exist on several.
+class ContractHandleCache:
+    def __init__(
+        self, maxsize: int = DEFAULT_MAX_CONTRACT_HANDLES, metrics: Metrics = metrics, name: str = "contract_handles"
+    ):
+        self.maxsize = maxsize
+        self.name = name
+        self.metrics = metrics
+        self._lock = Lock()
+        self._handles: "OrderedDict[Tuple[str, str, str], object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        metrics.register_gauge(f"{name}.size", lambda: len(self._handles))
+        metrics.register_gauge(f"{name}.hit_rate", self.hit_rate)
+
+    def get(self, network_name: str, contract_type: str, address: str, factory: Callable[[], T]) -> T:
+        key = (network_name, contract_type, address.lower())
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is not None:
+                self._handles.move_to_end(key)
+                self.hits += 1
+                self.metrics.increment(f"{self.name}.hits")
+                return handle
+        # built outside the lock, a concurrent miss on the same key just builds the handle twice
+        handle = factory()
+        with self._lock:
+            self.misses += 1
+            self.metrics.increment(f"{self.name}.misses")
+            self._handles[key] = handle
+            self._handles.move_to_end(key)
+            while len(self._handles) > self.maxsize:
+                self._handles.popitem(last=False)
+                self.evictions += 1
+                self.metrics.increment(f"{self.name}.evictions")
+        return handle
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._handles.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+
+contract_handles = ContractHandleCache()
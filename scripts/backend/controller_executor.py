@@ -1,18 +1,128 @@
-from brownie import Controller, config, network, accounts
+from hexbytes import HexBytes
+from eth_utils import to_hex
+from typing import List, NamedTuple, Optional
+from scripts.backend.runtime import Runtime
+from scripts.backend.routing import SwapRoute
+from scripts.backend.failures import RevertedTransactionError
 
-BACKEND_BOT_WALLET = accounts.add(config["wallets"]["from_key_1"])
-controller_address = config["networks"][network.show_active()]["controller_address"]
-controller_contract = Controller.at(controller_address)
-worker_address = config["networks"][network.show_active()]["worker_address"]
+FEE_PARAMS = ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas")
+# JSON-RPC error code of a node that does not serve a method
+METHOD_NOT_FOUND_CODE = -32601
+
+
+class SignedAction(NamedTuple):
+    vault_address: str
+    depositor_address: str
+    sender: str
+    nonce: int
+    gas: int
+    fee_params: dict
+    tx_hash: HexBytes
+    raw_transaction: HexBytes
+
+    # journal record, see scripts/backend/journal.py
+    def intent(self) -> dict:
+        return {
+            "vault": self.vault_address,
+            "depositor": self.depositor_address,
+            "sender": self.sender,
+            "nonce": self.nonce,
+            "gas": self.gas,
+            "fee_params": self.fee_params,
+            "hash": to_hex(self.tx_hash),
+            "raw": to_hex(self.raw_transaction),
+        }
 
 
 class ControllerExecutor:
-    def trigger_strategy_action(
-        self, vault_address: str, depositor_address: str
-    ) -> object:
-        return controller_contract.triggerStrategyAction(
-            worker_address,
+    def __init__(self, runtime: Runtime):
+        self.runtime = runtime
+        self._nonce = None
+        self._trace_supported = True
+
+    # Signs a strategy action with the next nonce without broadcasting it, the gas limit is estimated when not given.
+    # With swap routes (one per buy asset) the worker swaps through their paths instead of its own direct/main token
+    # ones, bounded by their quotes.
+    def sign_strategy_action(
+        self,
+        vault_address: str,
+        depositor_address: str,
+        gas: Optional[int] = None,
+        swap_routes: Optional[List[SwapRoute]] = None,
+    ) -> SignedAction:
+        runtime = self.runtime
+        sender = runtime.account.address
+        if self._nonce is None:
+            self._nonce = runtime.web3.eth.get_transaction_count(sender, "pending")
+        tx_params = {"from": sender, "nonce": self._nonce}
+        if gas is not None:
+            tx_params["gas"] = gas
+        controller_functions = runtime.controller.functions
+        if swap_routes is None:
+            call = controller_functions.triggerStrategyAction(runtime.worker_address, vault_address, depositor_address)
+        else:
+            call = controller_functions.triggerStrategyActionWithRoutes(
+                runtime.worker_address,
+                vault_address,
+                depositor_address,
+                [(route.path, route.quoted_amount_out) for route in swap_routes],
+            )
+        tx = call.build_transaction(tx_params)
+        signed_tx = runtime.account.sign_transaction(tx)
+        self._nonce += 1
+        return SignedAction(
             vault_address,
             depositor_address,
-            {"from": BACKEND_BOT_WALLET},
+            sender,
+            tx["nonce"],
+            tx["gas"],
+            {name: tx[name] for name in FEE_PARAMS if name in tx},
+            HexBytes(signed_tx.hash),
+            HexBytes(signed_tx.rawTransaction),
         )
+
+    def broadcast(self, raw_transaction: HexBytes) -> HexBytes:
+        return self.runtime.web3.eth.send_raw_transaction(raw_transaction)
+
+    def wait_for_receipt(self, tx_hash: HexBytes) -> dict:
+        return self.runtime.web3.eth.wait_for_transaction_receipt(tx_hash)
+
+    # the pending nonce is read again, after a dropped transaction left a gap
+    def reset_nonce(self):
+        self._nonce = None
+
+    # Error of a reverted transaction, the revert data is not part of its receipt. The transaction is traced at its
+    # position in its block when the node serves debug_traceTransaction, otherwise it is replayed on the state before
+    # its block, where a revert caused by an earlier transaction of the same block does not reproduce.
+    def revert_error(self, tx_hash: HexBytes, receipt: dict) -> Exception:
+        if self._trace_supported:
+            error = self._traced_revert_error(tx_hash)
+            if error is not None:
+                return error
+        return self._replayed_revert_error(tx_hash, receipt)
+
+    def _traced_revert_error(self, tx_hash: HexBytes) -> Optional[RevertedTransactionError]:
+        response = self.runtime.web3.provider.make_request(
+            "debug_traceTransaction", [to_hex(tx_hash), {"tracer": "callTracer", "tracerConfig": {"onlyTopCall": True}}]
+        )
+        if "error" in response:
+            if response["error"].get("code") == METHOD_NOT_FOUND_CODE:
+                self._trace_supported = False
+            return None
+        trace = response["result"]
+        return RevertedTransactionError(
+            f"Transaction {tx_hash.hex()} reverted: {trace.get('error', 'execution reverted')}", trace.get("output")
+        )
+
+    def _replayed_revert_error(self, tx_hash: HexBytes, receipt: dict) -> Exception:
+        from web3.exceptions import ContractLogicError
+
+        web3 = self.runtime.web3
+        tx = web3.eth.get_transaction(tx_hash)
+        try:
+            web3.eth.call(
+                {"from": tx["from"], "to": tx["to"], "data": tx["input"], "gas": tx["gas"]}, receipt["blockNumber"] - 1
+            )
+        except ContractLogicError as error:
+            return error
+        return RevertedTransactionError(f"Transaction {tx_hash.hex()} reverted", reproduced=False)
@@ -1,13 +1,96 @@
-from typing import List
-from dataclasses import dataclass
+from typing import Iterator, List
+from scripts.backend.depositor_store import Buffer, DepositorStore
 
 
-@dataclass
+# Vault level fields only, depositors live as rows of the shared DepositorStore and are referenced by id
 class StrategyVault:
-    address: str
-    creator: str
-    deposit_token_address: str
-    token_addresses_to_buy: List[str]
-    depositor_addresses: List[str]
-    buy_frequency_timestamp: int
-    last_update_timestamp: int
+    __slots__ = (
+        "store",
+        "vault_id",
+        "creator_id",
+        "deposit_token_id",
+        "buy_token_ids",
+        "buy_frequency_timestamp",
+        "last_update_timestamp",
+    )
+
+    def __init__(
+        self,
+        store: DepositorStore,
+        address: str,
+        creator: str,
+        deposit_token_address: str,
+        token_addresses_to_buy: List[str],
+        buy_frequency_timestamp: int,
+        last_update_timestamp: int = 0,
+    ):
+        self.store = store
+        self.vault_id = store.addresses.intern(address)
+        self.creator_id = store.addresses.intern(creator)
+        self.deposit_token_id = store.addresses.intern(deposit_token_address)
+        self.buy_token_ids = tuple(store.addresses.intern(token_address) for token_address in token_addresses_to_buy)
+        self.buy_frequency_timestamp = buy_frequency_timestamp
+        self.last_update_timestamp = last_update_timestamp
+
+    # Id based form stored in snapshot manifests, ids refer to the store's AddressBook
+    def to_record(self) -> list:
+        return [
+            self.vault_id,
+            self.creator_id,
+            self.deposit_token_id,
+            list(self.buy_token_ids),
+            self.buy_frequency_timestamp,
+            self.last_update_timestamp,
+        ]
+
+    @classmethod
+    def from_record(cls, store: DepositorStore, record: list) -> "StrategyVault":
+        vault = cls.__new__(cls)
+        vault.store = store
+        vault.vault_id, vault.creator_id, vault.deposit_token_id = record[0], record[1], record[2]
+        vault.buy_token_ids = tuple(record[3])
+        vault.buy_frequency_timestamp, vault.last_update_timestamp = record[4], record[5]
+        return vault
+
+    # The vault is due as soon as its least recently updated active depositor is due
+    def refresh_last_update_timestamp(self):
+        last_updates = self.store.last_updates
+        self.last_update_timestamp = min(
+            (last_updates[row] for row in self.store.active_vault_rows(self.vault_id)), default=0
+        )
+
+    @property
+    def address(self) -> str:
+        return self.store.addresses.address(self.vault_id)
+
+    @property
+    def creator(self) -> str:
+        return self.store.addresses.address(self.creator_id)
+
+    @property
+    def deposit_token_address(self) -> str:
+        return self.store.addresses.address(self.deposit_token_id)
+
+    @property
+    def token_addresses_to_buy(self) -> List[str]:
+        return [self.store.addresses.address(token_id) for token_id in self.buy_token_ids]
+
+    @property
+    def depositor_addresses(self) -> Iterator[str]:
+        return self.store.iter_depositor_addresses(self.vault_id)
+
+    @property
+    def depositors_length(self) -> int:
+        return self.store.depositors_length(self.vault_id)
+
+    @property
+    def active_rows(self) -> Buffer:
+        return self.store.active_vault_rows(self.vault_id)
+
+    def __repr__(self) -> str:
+        return (
+            f"StrategyVault(address={self.address}, creator={self.creator}, "
+            f"deposit_token_address={self.deposit_token_address}, token_addresses_to_buy={self.token_addresses_to_buy}, "
+            f"depositors_length={self.depositors_length}, buy_frequency_timestamp={self.buy_frequency_timestamp}, "
+            f"last_update_timestamp={self.last_update_timestamp})"
+        )
@@ -0,0 +1,402 @@
+from array import array
+from bisect import bisect_left
+from eth_utils import to_checksum_address
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Columns are either owned (array/bytearray) or mapped read-only from a snapshot (memoryview). Mapped
+# columns are copied into an owned buffer the first time they need to grow.
+Buffer = Union[array, bytearray, memoryview]
+
+UINT256_WIDTH = 32
+# AutomatedVaultERC4626.MAX_NUMBER_OF_BUY_ASSETS, bought amounts take this many uint256 slots per row
+MAX_NUMBER_OF_BUY_ASSETS = 5
+# AbstractAutomatedVaultERC4626._decimalsOffset(), one unit of deposit asset is worth about 10**18 shares
+VAULT_DECIMALS_OFFSET = 18
+
+
+def _owned_array(typecode: str, values: Buffer) -> array:
+    if isinstance(values, array):
+        return values
+    owned_values = array(typecode)
+    owned_values.frombytes(memoryview(values).cast("B"))
+    return owned_values
+
+
+def _owned_bytes(values: Buffer) -> bytearray:
+    return values if isinstance(values, bytearray) else bytearray(values)
+
+
+# Rows grouped by vault as (vault_id, start, length) triplets into one flat array of rows
+def _export_grouped_rows(grouped_rows: Dict[int, Buffer]) -> Tuple[array, array]:
+    offsets, rows = array("I"), array("I")
+    for vault_id, vault_rows in grouped_rows.items():
+        offsets.extend((vault_id, len(rows), len(vault_rows)))
+        rows.frombytes(memoryview(vault_rows).cast("B"))
+    return offsets, rows
+
+
+def _import_grouped_rows(offsets: Buffer, rows: Buffer) -> Dict[int, Buffer]:
+    grouped_rows = {}
+    for offset in range(0, len(offsets), 3):
+        vault_id, start, length = offsets[offset : offset + 3]
+        grouped_rows[vault_id] = rows[start : start + length]
+    return grouped_rows
+
+
+def _canonical_address(address: str) -> bytes:
+    canonical_address = bytes.fromhex(address[2:] if address[:2] in ("0x", "0X") else address)
+    if len(canonical_address) != 20:
+        raise ValueError(f"Invalid address: {address}")
+    return canonical_address
+
+
+class ArrayColumn:
+    __slots__ = ("typecode", "_values")
+
+    def __init__(self, typecode: str, values: Optional[Buffer] = None):
+        self.typecode = typecode
+        self._values = array(typecode) if values is None else values
+
+    def append(self, value: int):
+        if not isinstance(self._values, array):
+            self._values = _owned_array(self.typecode, self._values)
+        self._values.append(value)
+
+    def __getitem__(self, index: int) -> int:
+        return self._values[index]
+
+    def __setitem__(self, index: int, value: int):
+        self._values[index] = value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._values)
+
+    @property
+    def buffer(self) -> Buffer:
+        return self._values
+
+
+# Open addressing (linear probing) hash table holding ids only. Keys are never stored, callers compare
+# candidates against their own columns, which keeps lookups at a few bytes per entry instead of a dict entry
+# plus two int objects.
+class IdTable:
+    __slots__ = ("_slots", "_mask", "_count")
+
+    def __init__(self, capacity: int = 1024, slots: Optional[Buffer] = None, count: int = 0):
+        if slots is None:
+            capacity = max(8, 1 << (capacity - 1).bit_length())
+            slots = array("I", [0]) * capacity
+        self._slots = slots
+        self._mask = len(slots) - 1
+        self._count = count
+
+    def find(self, key_hash: int, matches: Callable[[int], bool]) -> Optional[int]:
+        slots, mask = self._slots, self._mask
+        index = key_hash & mask
+        while True:
+            slot = slots[index]
+            if slot == 0:
+                return None
+            if matches(slot - 1):
+                return slot - 1
+            index = (index + 1) & mask
+
+    def insert(self, key_hash: int, value: int, hash_of: Callable[[int], int]):
+        if (self._count + 1) * 2 > len(self._slots):
+            self._resize(len(self._slots) * 2, hash_of)
+        self._place(key_hash, value)
+        self._count += 1
+
+    def _place(self, key_hash: int, value: int):
+        slots, mask = self._slots, self._mask
+        index = key_hash & mask
+        while slots[index]:
+            index = (index + 1) & mask
+        slots[index] = value + 1
+
+    def _resize(self, capacity: int, hash_of: Callable[[int], int]):
+        values = [slot - 1 for slot in self._slots if slot]
+        self._slots = array("I", [0]) * capacity
+        self._mask = capacity - 1
+        for value in values:
+            self._place(hash_of(value), value)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def slots(self) -> Buffer:
+        return self._slots
+
+
+# Every address seen by the backend (vaults, tokens, depositors) is stored once as 20 raw bytes
+# and referred to everywhere else by its integer id.
+class AddressBook:
+    __slots__ = ("_raw", "_index")
+
+    def __init__(self, raw: Optional[Buffer] = None, index: Optional[IdTable] = None):
+        self._raw = bytearray() if raw is None else raw
+        self._index = IdTable() if index is None else index
+
+    def _hash_of(self, address_id: int) -> int:
+        offset = address_id * 20
+        return int.from_bytes(self._raw[offset : offset + 8], "big")
+
+    def _find(self, canonical_address: bytes) -> Optional[int]:
+        raw = self._raw
+        return self._index.find(
+            int.from_bytes(canonical_address[:8], "big"),
+            lambda address_id: raw[address_id * 20 : address_id * 20 + 20] == canonical_address,
+        )
+
+    def intern(self, address: str) -> int:
+        canonical_address = _canonical_address(address)
+        address_id = self._find(canonical_address)
+        if address_id is None:
+            address_id = len(self._index)
+            self._raw = _owned_bytes(self._raw)
+            self._raw += canonical_address
+            self._index.insert(int.from_bytes(canonical_address[:8], "big"), address_id, self._hash_of)
+        return address_id
+
+    def id_of(self, address: str) -> Optional[int]:
+        return self._find(_canonical_address(address))
+
+    def raw(self, address_id: int) -> bytes:
+        offset = address_id * 20
+        return bytes(self._raw[offset : offset + 20])
+
+    def address(self, address_id: int) -> str:
+        return to_checksum_address(self.raw(address_id))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def raw_buffer(self) -> Buffer:
+        return self._raw
+
+    @property
+    def index(self) -> IdTable:
+        return self._index
+
+
+# Fixed width (32 bytes, big endian) column of uint256 values kept in a single buffer
+class Uint256Column:
+    __slots__ = ("_buffer",)
+
+    def __init__(self, buffer: Optional[Buffer] = None):
+        self._buffer = bytearray() if buffer is None else buffer
+
+    def append(self, value: int):
+        self._buffer = _owned_bytes(self._buffer)
+        self._buffer += value.to_bytes(UINT256_WIDTH, "big")
+
+    def __getitem__(self, index: int) -> int:
+        offset = index * UINT256_WIDTH
+        return int.from_bytes(self._buffer[offset : offset + UINT256_WIDTH], "big")
+
+    def __setitem__(self, index: int, value: int):
+        offset = index * UINT256_WIDTH
+        self._buffer[offset : offset + UINT256_WIDTH] = value.to_bytes(UINT256_WIDTH, "big")
+
+    def __len__(self) -> int:
+        return len(self._buffer) // UINT256_WIDTH
+
+    @property
+    def buffer(self) -> Buffer:
+        return self._buffer
+
+
+def _row_hash(vault_id: int, depositor_id: int) -> int:
+    # multiplicative hashing spreads the sequential ids over the table
+    return ((vault_id << 32 | depositor_id) * 0x9E3779B97F4A7C15 >> 16) & 0xFFFFFFFFFFFF
+
+
+# Struct-of-arrays store with one row per (vault, depositor) pair. Rows are only ever appended,
+# matching the on-chain getDepositorAddress list which never removes depositors.
+class DepositorStore:
+    __slots__ = (
+        "addresses",
+        "vault_ids",
+        "depositor_ids",
+        "last_updates",
+        "balances",
+        "allowances",
+        "periodic_buy_amounts",
+        "spent_amounts",
+        "bought_amounts",
+        "_row_index",
+        "_vault_rows",
+        "_active_vault_rows",
+        "_vault_share_rates",
+    )
+
+    def __init__(self, addresses: Optional[AddressBook] = None):
+        self.addresses = AddressBook() if addresses is None else addresses
+        self.vault_ids = ArrayColumn("I")
+        self.depositor_ids = ArrayColumn("I")
+        self.last_updates = ArrayColumn("Q")
+        self.balances = Uint256Column()
+        self.allowances = Uint256Column()
+        self.periodic_buy_amounts = Uint256Column()
+        self.spent_amounts = Uint256Column()
+        self.bought_amounts = Uint256Column()
+        self._row_index = IdTable()
+        self._vault_rows: Dict[int, Buffer] = {}
+        # sorted rows of every vault passing is_active, kept in step with the balance/allowance columns by
+        # refresh_activity
+        self._active_vault_rows: Dict[int, Buffer] = {}
+        # (totalSupply() + 10 ** _decimalsOffset(), totalAssets() + 1) of every vault, a vault never read is priced
+        # like an empty one
+        self._vault_share_rates: Dict[int, Tuple[int, int]] = {}
+
+    def _hash_of(self, row: int) -> int:
+        return _row_hash(self.vault_ids[row], self.depositor_ids[row])
+
+    def add_depositor(self, vault_id: int, depositor_address: str) -> int:
+        depositor_id = self.addresses.intern(depositor_address)
+        row = self.row_of(vault_id, depositor_id)
+        if row is None:
+            row = len(self.vault_ids)
+            self.vault_ids.append(vault_id)
+            self.depositor_ids.append(depositor_id)
+            self.last_updates.append(0)
+            self.balances.append(0)
+            self.allowances.append(0)
+            self.periodic_buy_amounts.append(0)
+            self.spent_amounts.append(0)
+            for _ in range(MAX_NUMBER_OF_BUY_ASSETS):
+                self.bought_amounts.append(0)
+            vault_rows = self._vault_rows[vault_id] = _owned_array("I", self._vault_rows.get(vault_id, b""))
+            vault_rows.append(row)
+            self._row_index.insert(_row_hash(vault_id, depositor_id), row, self._hash_of)
+        return row
+
+    def add_depositors(self, vault_id: int, depositor_addresses: Iterable[str]) -> List[int]:
+        return [self.add_depositor(vault_id, depositor_address) for depositor_address in depositor_addresses]
+
+    def row_of(self, vault_id: int, depositor_id: int) -> Optional[int]:
+        vault_ids, depositor_ids = self.vault_ids, self.depositor_ids
+        return self._row_index.find(
+            _row_hash(vault_id, depositor_id),
+            lambda row: depositor_ids[row] == depositor_id and vault_ids[row] == vault_id,
+        )
+
+    def vault_rows(self, vault_id: int) -> Buffer:
+        return self._vault_rows.get(vault_id, array("I"))
+
+    def vault_ids_with_rows(self) -> List[int]:
+        return list(self._vault_rows)
+
+    # cumulative amount of the asset_index-th vault buy asset bought for the row
+    def bought_amount(self, row: int, asset_index: int) -> int:
+        return self.bought_amounts[row * MAX_NUMBER_OF_BUY_ASSETS + asset_index]
+
+    def add_bought_amount(self, row: int, asset_index: int, amount: int):
+        self.bought_amounts[row * MAX_NUMBER_OF_BUY_ASSETS + asset_index] += amount
+
+    def set_vault_totals(self, vault_id: int, total_supply: int, total_assets: int):
+        self._vault_share_rates[vault_id] = (total_supply + 10**VAULT_DECIMALS_OFFSET, total_assets + 1)
+
+    def vault_share_rates(self) -> Dict[int, Tuple[int, int]]:
+        return dict(self._vault_share_rates)
+
+    # AbstractAutomatedVaultERC4626.previewWithdraw, shares burned (and spent from the worker allowance) when the
+    # worker withdraws assets for a depositor of the vault
+    def withdrawal_shares(self, vault_id: int, assets: int) -> int:
+        shares_numerator, assets_denominator = self._vault_share_rates.get(vault_id, (10**VAULT_DECIMALS_OFFSET, 1))
+        return -(-assets * shares_numerator // assets_denominator)
+
+    # A row can pay for a strategy action while its share balance and its share allowance to the strategy worker
+    # both cover the shares withdrawn for the periodic buy amount. Other rows are left out of the scans until a
+    # Transfer or Approval log revives them.
+    def is_active(self, row: int) -> bool:
+        balance = self.balances[row]
+        withdrawal_shares = self.withdrawal_shares(self.vault_ids[row], self.periodic_buy_amounts[row])
+        return balance > 0 and balance >= withdrawal_shares and self.allowances[row] >= withdrawal_shares
+
+    # returns whether the row switched between active and inactive
+    def refresh_activity(self, row: int) -> bool:
+        vault_id = self.vault_ids[row]
+        active_rows = self._active_vault_rows.get(vault_id, array("I"))
+        index = bisect_left(active_rows, row)
+        was_active = index < len(active_rows) and active_rows[index] == row
+        if self.is_active(row) == was_active:
+            return False
+        active_rows = self._active_vault_rows[vault_id] = _owned_array("I", active_rows)
+        if was_active:
+            del active_rows[index]
+        else:
+            active_rows.insert(index, row)
+        return True
+
+    # Sorted live view, only valid until the next refresh_activity of a row of the vault
+    def active_vault_rows(self, vault_id: int) -> Buffer:
+        return self._active_vault_rows.get(vault_id, array("I"))
+
+    def active_rows_length(self) -> int:
+        return sum(len(active_rows) for active_rows in self._active_vault_rows.values())
+
+    def depositors_length(self, vault_id: int) -> int:
+        return len(self._vault_rows.get(vault_id, ()))
+
+    def depositor_address(self, row: int) -> str:
+        return self.addresses.address(self.depositor_ids[row])
+
+    def vault_address(self, row: int) -> str:
+        return self.addresses.address(self.vault_ids[row])
+
+    def iter_depositor_addresses(self, vault_id: int) -> Iterator[str]:
+        for row in self.vault_rows(vault_id):
+            yield self.addresses.address(self.depositor_ids[row])
+
+    def __len__(self) -> int:
+        return len(self.vault_ids)
+
+    # Flat fixed width buffers describing the whole store, see scripts/backend/snapshots.py
+    def export_columns(self) -> Dict[str, Buffer]:
+        vault_row_offsets, grouped_vault_rows = _export_grouped_rows(self._vault_rows)
+        active_vault_row_offsets, grouped_active_vault_rows = _export_grouped_rows(self._active_vault_rows)
+        return {
+            "addresses": self.addresses.raw_buffer,
+            "address_index": self.addresses.index.slots,
+            "vault_ids": self.vault_ids.buffer,
+            "depositor_ids": self.depositor_ids.buffer,
+            "last_updates": self.last_updates.buffer,
+            "balances": self.balances.buffer,
+            "allowances": self.allowances.buffer,
+            "periodic_buy_amounts": self.periodic_buy_amounts.buffer,
+            "spent_amounts": self.spent_amounts.buffer,
+            "bought_amounts": self.bought_amounts.buffer,
+            "row_index": self._row_index.slots,
+            "vault_row_offsets": vault_row_offsets,
+            "vault_rows": grouped_vault_rows,
+            "active_vault_row_offsets": active_vault_row_offsets,
+            "active_vault_rows": grouped_active_vault_rows,
+        }
+
+    @classmethod
+    def from_columns(
+        cls, columns: Dict[str, memoryview], vault_share_rates: Optional[Dict[int, Tuple[int, int]]] = None
+    ) -> "DepositorStore":
+        addresses_length = len(columns["addresses"]) // 20
+        store = cls(AddressBook(columns["addresses"], IdTable(slots=columns["address_index"], count=addresses_length)))
+        store._vault_share_rates.update(vault_share_rates or {})
+        store.vault_ids = ArrayColumn("I", columns["vault_ids"])
+        store.depositor_ids = ArrayColumn("I", columns["depositor_ids"])
+        store.last_updates = ArrayColumn("Q", columns["last_updates"])
+        store.balances = Uint256Column(columns["balances"])
+        store.allowances = Uint256Column(columns["allowances"])
+        store.periodic_buy_amounts = Uint256Column(columns["periodic_buy_amounts"])
+        store.spent_amounts = Uint256Column(columns["spent_amounts"])
+        store.bought_amounts = Uint256Column(columns["bought_amounts"])
+        store._row_index = IdTable(slots=columns["row_index"], count=len(store.vault_ids))
+        store._vault_rows = _import_grouped_rows(columns["vault_row_offsets"], columns["vault_rows"])
+        store._active_vault_rows = _import_grouped_rows(
+            columns["active_vault_row_offsets"], columns["active_vault_rows"]
+        )
+        return store
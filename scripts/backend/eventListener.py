@@ -1,21 +1,28 @@
 from typing import List
-from brownie import web3
-from brownie import config, AutomatedVaultsFactory, network
-
-factory_address = config["networks"][network.show_active()]["vaults_factory_address"]
-vaults_factory_contract = AutomatedVaultsFactory.at(factory_address)
+from docs.abis import abi_registry
+from scripts.backend.runtime import Runtime
+from scripts.backend.helpers import event_vault_creation
 
 
 class EventListener:
-    def __init__(self):
-        self.block_number = web3.eth.blockNumber
+    def __init__(self, runtime: Runtime):
+        self.runtime = runtime
+        self.vault_created_decoder = abi_registry.event_decoder("vaults_factory", event_vault_creation)
+        self.block_number = runtime.web3.eth.block_number
 
     # returns the new vaults addresses
     def event_listener_vaults_update(self) -> List[str]:
-        event_filter = vaults_factory_contract.events.VaultCreated.createFilter(
-            fromBlock=self.block_number
+        latest_block_number = self.runtime.web3.eth.block_number
+        if latest_block_number < self.block_number:
+            return []
+        logs = self.runtime.web3.eth.get_logs(
+            {
+                "address": self.runtime.vaults_factory.address,
+                "topics": [self.vault_created_decoder.topic],
+                "fromBlock": self.block_number,
+                "toBlock": latest_block_number,
+            }
         )
-        entries = event_filter.get_all_entries()
-        self.block_number = web3.eth.blockNumber
+        self.block_number = latest_block_number + 1
 
-        return [entry.args.vaultAddress for entry in entries]
+        return [self.vault_created_decoder.decode(log["topics"], log["data"])["vaultAddress"] for log in logs]
@@ -0,0 +1,134 @@
+from eth_abi import abi
+from typing import Dict, NamedTuple, Optional, Tuple
+from docs.abis import abi_registry
+from scripts.backend.metrics import Metrics, metrics
+from scripts.backend.depositor_store import DepositorStore
+
+NOT_DUE = "not_due"
+NOTHING_TO_WITHDRAW = "nothing_to_withdraw"
+ALLOWANCE_SHORTFALL = "allowance_shortfall"
+SLIPPAGE = "slippage"
+UNKNOWN_REVERT = "unknown_revert"
+# Reverted on chain but not when replayed on the state before its block: an earlier transaction of the same block
+# made it revert and its error is unknown, backed off on the timer like an unknown revert
+NOT_REPRODUCED = "not_reproduced"
+
+# Custom errors of the strategy worker and of the vault (OZ ERC20/ERC4626) a strategy action can revert with
+FAILURE_KINDS_BY_ERROR = {
+    "UpdateConditionsNotMet": NOT_DUE,
+    "ZeroOrNegativeVaultWithdrawAmount": NOTHING_TO_WITHDRAW,
+    "ERC20InsufficientAllowance": ALLOWANCE_SHORTFALL,
+    "ERC20InsufficientBalance": ALLOWANCE_SHORTFALL,
+    "ERC4626ExceededMaxWithdraw": ALLOWANCE_SHORTFALL,
+    "SwapQuoteBelowReference": SLIPPAGE,
+}
+ERROR_STRING_SELECTOR = bytes.fromhex("08c379a0")
+# UniswapV2Router require messages of a swap below amountOutMin
+SLIPPAGE_REASONS = ("INSUFFICIENT_OUTPUT_AMOUNT", "EXCESSIVE_INPUT_AMOUNT")
+# Timer only failures are backed off for BASE_BACKOFF_SECONDS * 2 ** (consecutive failures - 1) of chain time
+BASE_BACKOFF_SECONDS = 60
+MAX_BACKOFF_SECONDS = 86400
+
+
+class RevertedTransactionError(Exception):
+    def __init__(self, message: str, data: Optional[str] = None, reproduced: bool = True):
+        super().__init__(message, data)
+        self.message = message
+        self.data = data
+        self.reproduced = reproduced
+
+
+# Raw revert data of a web3 ContractLogicError (or RevertedTransactionError), "Reverted 0x..." strings included
+def revert_data(error: Exception) -> bytes:
+    data = getattr(error, "data", None)
+    if isinstance(data, dict):
+        data = data.get("data")
+    if not isinstance(data, str):
+        return b""
+    data = data.split(" ")[-1]
+    try:
+        return bytes.fromhex(data[2:] if data.startswith("0x") else data)
+    except ValueError:
+        return b""
+
+
+def _revert_reason(error: Exception) -> str:
+    data = revert_data(error)
+    if data[:4] == ERROR_STRING_SELECTOR:
+        try:
+            return abi.decode(["string"], data[4:])[0]
+        except Exception:
+            pass
+    return str(getattr(error, "message", "") or "")
+
+
+# Returns the failure kind of a reverted strategy action, None for errors that say nothing about the depositor
+# (transport errors, timeouts), which are simply retried on the next tick
+def classify_failure(error: Exception) -> Optional[str]:
+    if not hasattr(error, "data"):
+        return None
+    if not getattr(error, "reproduced", True):
+        return NOT_REPRODUCED
+    selector = revert_data(error)[:4]
+    for abi_name in ("strategy_worker", "vault"):
+        error_abi = abi_registry.error_selectors(abi_name).get(selector)
+        if error_abi is not None:
+            return FAILURE_KINDS_BY_ERROR.get(error_abi["name"], UNKNOWN_REVERT)
+    if any(reason in _revert_reason(error) for reason in SLIPPAGE_REASONS):
+        return SLIPPAGE
+    return UNKNOWN_REVERT
+
+
+class Backoff(NamedTuple):
+    kind: str
+    # chain timestamp the backoff expires at
+    until: int
+    # store values the failure depends on, the backoff is lifted as soon as an indexed log changes them
+    fingerprint: Tuple[int, ...]
+
+
+# Negative cache of failing depositor rows: a failed strategy action is not retried until the on-chain state it
+# depends on changes (a StrategyActionExecuted log for a not due row, a Transfer/Approval log for a row short on
+# shares or allowance) or its timer expires. Consecutive failures of timer only kinds back off exponentially.
+class FailureTracker:
+    def __init__(self, store: DepositorStore, metrics: Metrics = metrics):
+        self.store = store
+        self.metrics = metrics
+        self.backoffs: Dict[int, Backoff] = {}
+        self.consecutive_failures: Dict[int, int] = {}
+        metrics.register_gauge("failures.backed_off_rows", lambda: len(self.backoffs))
+
+    def fingerprint(self, row: int, kind: str) -> Tuple[int, ...]:
+        store = self.store
+        if kind == NOT_DUE:
+            return (store.last_updates[row],)
+        if kind in (NOTHING_TO_WITHDRAW, ALLOWANCE_SHORTFALL):
+            return (store.balances[row], store.allowances[row])
+        return ()
+
+    def record_failure(self, row: int, kind: str, now: int, buy_frequency: int) -> Backoff:
+        failures = self.consecutive_failures[row] = self.consecutive_failures.get(row, 0) + 1
+        if kind == NOT_DUE:
+            # another executor updated the depositor, its log brings the real last update
+            delay = buy_frequency
+        elif kind in (NOTHING_TO_WITHDRAW, ALLOWANCE_SHORTFALL):
+            delay = MAX_BACKOFF_SECONDS
+        else:
+            delay = min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** (failures - 1))
+        backoff = self.backoffs[row] = Backoff(kind, now + delay, self.fingerprint(row, kind))
+        self.metrics.increment(f"failures.{kind}")
+        return backoff
+
+    def record_success(self, row: int):
+        self.backoffs.pop(row, None)
+        self.consecutive_failures.pop(row, None)
+
+    def is_backed_off(self, row: int, now: int) -> bool:
+        backoff = self.backoffs.get(row)
+        if backoff is None:
+            return False
+        if now >= backoff.until or self.fingerprint(row, backoff.kind) != backoff.fingerprint:
+            del self.backoffs[row]
+            self.metrics.increment("failures.rearmed_rows")
+            return False
+        return True
@@ -0,0 +1,71 @@
+from typing import Dict, List, NamedTuple, Optional
+from eth_utils import to_checksum_address
+from scripts.backend.metrics import Metrics, metrics
+from scripts.backend.dataclasses import StrategyVault
+
+# Gas limit set over the largest gas used observed for a shape. On Arbitrum the gas used also pays for the L1
+# calldata at the current L1 price, which moves between transactions of the same shape.
+GAS_LIMIT_MARGIN = 1.25
+# Weight of the last transaction in the rolling prediction error
+EWMA_ALPHA = 0.2
+
+
+# What executeStrategyAction gas depends on: one swap per buy asset, direct or through the dex main token (WETH),
+# indirect_swaps counts every hop past the first of the routed paths
+class GasShape(NamedTuple):
+    vault_id: int
+    buy_assets: int
+    indirect_swaps: int
+
+
+class GasSamples:
+    __slots__ = ("max_gas_used", "samples")
+
+    def __init__(self):
+        self.max_gas_used = 0
+        self.samples = 0
+
+
+# Gas limits learned from the receipts of the strategy actions already executed, per vault shape. Unknown shapes
+# (and shapes whose prediction ran out of gas) are left to eth_estimateGas until a receipt is observed. The
+# first-time approvals of _ensureApprovedERC20 make the first action of a deposit asset the most expensive one,
+# which the max keeps covered.
+class GasModel:
+    def __init__(self, dex_main_token_address: str, metrics: Metrics = metrics):
+        self.dex_main_token_address = to_checksum_address(dex_main_token_address)
+        self.metrics = metrics
+        self.shapes: Dict[GasShape, GasSamples] = {}
+        self.prediction_error = 0.0
+        metrics.register_gauge("gas_model.prediction_error", lambda: self.prediction_error)
+
+    def shape(self, vault: StrategyVault, swap_paths: Optional[List[List[str]]] = None) -> GasShape:
+        buy_assets = vault.token_addresses_to_buy
+        if swap_paths is not None:
+            return GasShape(vault.vault_id, len(buy_assets), sum(len(path) - 2 for path in swap_paths))
+        direct = vault.deposit_token_address == self.dex_main_token_address
+        indirect_swaps = 0 if direct else sum(buy_asset != self.dex_main_token_address for buy_asset in buy_assets)
+        return GasShape(vault.vault_id, len(buy_assets), indirect_swaps)
+
+    # None when the gas limit has to be estimated
+    def gas_limit(self, shape: GasShape) -> Optional[int]:
+        samples = self.shapes.get(shape)
+        if samples is None:
+            self.metrics.increment("gas_model.estimates")
+            return None
+        self.metrics.increment("gas_model.predictions")
+        return int(samples.max_gas_used * GAS_LIMIT_MARGIN)
+
+    def observe(self, shape: GasShape, gas_used: int, gas_limit: int, succeeded: bool, predicted: bool):
+        if not succeeded:
+            if gas_used >= gas_limit:
+                # out of gas, the shape is estimated again on its next transaction
+                self.shapes.pop(shape, None)
+                self.metrics.increment("gas_model.out_of_gas")
+            return
+        samples = self.shapes.setdefault(shape, GasSamples())
+        samples.max_gas_used = max(samples.max_gas_used, gas_used)
+        samples.samples += 1
+        if predicted:
+            # relative gas limit headroom over what was used, the lower the closer the prediction
+            error = (gas_limit - gas_used) / gas_used
+            self.prediction_error = EWMA_ALPHA * error + (1 - EWMA_ALPHA) * self.prediction_error
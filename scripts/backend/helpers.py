@@ -1,4 +1,16 @@
 event_vault_creation = "VaultCreated"
+event_strategy_action_executed = "StrategyActionExecuted"
+event_deposit = "Deposit"
+event_transfer = "Transfer"
+event_approval = "Approval"
+event_sync = "Sync"
+event_pair_created = "PairCreated"
+
+# Max number of addresses requested per getBatchVaults/getBatchDepositorAddresses call
+BATCH_READ_LIMIT = 500
+
+# Max number of blocks requested per eth_getLogs call when catching up on past events
+LOG_BLOCK_RANGE = 5000
 
 buy_frequency_enum_to_seconds_map = {
     0: 60,  # TODO: Change After Testing -> This one should be 86400 (DAILY)
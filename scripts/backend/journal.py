@@ -0,0 +1,102 @@
+import os
+import json
+from pathlib import Path
+from typing import Dict, List
+from scripts.backend.metrics import Metrics, metrics
+
+INTENT = "intent"
+RESOLVED = "resolved"
+# Resolved records are dropped from the journal once it grows past this size and nothing is in flight
+COMPACT_AFTER_BYTES = 1 << 20
+
+
+def _fsync_directory(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Append-only JSON lines journal of the strategy action transactions sent by the keeper. Intents (vault, depositor,
+# nonce, hash, gas and fee params, signed transaction) are buffered and written with a single fsync per group of
+# transactions before any of them is broadcast, resolutions are appended once the outcome is known. A torn last line
+# left by a crash is ignored on replay.
+class TransactionJournal:
+    def __init__(self, path: Path, metrics: Metrics = metrics):
+        self.path = Path(path)
+        self.metrics = metrics
+        self.intents: Dict[str, dict] = {}
+        self._buffer: List[str] = []
+        torn = self._replay()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        created = not self.path.exists()
+        self._file = open(self.path, "a")
+        if created:
+            _fsync_directory(self.path.parent)
+        if torn:
+            # later records must not be appended to the torn line
+            self.compact()
+        metrics.register_gauge("journal.in_flight", lambda: len(self.intents))
+
+    def _replay(self) -> bool:
+        torn = False
+        if not self.path.exists():
+            return torn
+        with open(self.path) as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.metrics.increment("journal.torn_records")
+                    torn = True
+                    continue
+                if record["type"] == INTENT:
+                    self.intents[record["hash"]] = record
+                else:
+                    self.intents.pop(record["hash"], None)
+        return torn
+
+    def record_intent(self, intent: dict):
+        record = dict(intent, type=INTENT)
+        self.intents[record["hash"]] = record
+        self._buffer.append(json.dumps(record))
+
+    def resolve(self, tx_hash: str, outcome: str):
+        if self.intents.pop(tx_hash, None) is not None:
+            self._buffer.append(json.dumps({"type": RESOLVED, "hash": tx_hash, "outcome": outcome}))
+
+    # Group commit: every record buffered since the previous commit is made durable with one fsync
+    def commit(self):
+        if not self._buffer:
+            return
+        self._file.write("\n".join(self._buffer) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.metrics.increment("journal.commits")
+        self.metrics.increment("journal.records", len(self._buffer))
+        self._buffer = []
+        if not self.intents and self._file.tell() > COMPACT_AFTER_BYTES:
+            self.compact()
+
+    # Intents without a resolution, in nonce order
+    def in_flight(self) -> List[dict]:
+        return sorted(self.intents.values(), key=lambda intent: intent["nonce"])
+
+    # Rewrites the journal with the in flight intents only, atomically replacing the previous file
+    def compact(self):
+        self.commit()
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp_path, "w") as file:
+            for intent in self.in_flight():
+                file.write(json.dumps(intent) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        _fsync_directory(self.path.parent)
+        self._file = open(self.path, "a")
+
+    def close(self):
+        self.commit()
+        self._file.close()
@@ -0,0 +1,489 @@
+import time
+from hexbytes import HexBytes
+from eth_utils import to_checksum_address, to_hex
+from typing import Dict, List, NamedTuple, Optional, Union
+from scripts.backend.runtime import Runtime
+from scripts.backend.metrics import metrics
+from scripts.backend.chain_clock import ChainClock
+from scripts.backend.journal import TransactionJournal
+from scripts.backend.eventListener import EventListener
+from scripts.backend.failures import FailureTracker, classify_failure
+from scripts.backend.confirmations import ConfirmationTracker
+from scripts.backend.gas_model import GasModel, GasShape
+from scripts.backend.routing import PlannedAction, ReserveGraph, SwapRouter
+from scripts.backend.dataclasses import StrategyVault
+from scripts.backend.strategy_fetcher import StrategyFetcher
+from scripts.backend.snapshots import Snapshot, SnapshotManager
+from scripts.backend.action_indexer import ActionIndexer
+from scripts.backend.balance_index import BalanceIndexer
+from scripts.backend.sharding import ShardAssignment, ShardCoordinator
+from scripts.backend.subscriptions import ChainSubscriber, PushedEvents
+from scripts.backend.controller_executor import ControllerExecutor, SignedAction
+from scripts.backend.helpers import CONSOLE_SEPARATOR, buy_frequency_enum_to_seconds_map
+
+# Shortest wait between two ticks when a vault becomes due before the polling interval elapses
+MIN_TICK_WAIT_SECONDS = 1
+# Node errors of a raw transaction that is already in the mempool, a rebroadcast is then a no-op
+KNOWN_TRANSACTION_ERRORS = ("already known", "known transaction")
+
+
+def is_known_transaction(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(known in message for known in KNOWN_TRANSACTION_ERRORS)
+
+
+class UnsentAction(NamedTuple):
+    row: int
+    gas_shape: GasShape
+    # whether the gas limit came from the gas model rather than from eth_estimateGas
+    predicted_gas: bool
+    action: SignedAction
+
+
+class Keeper:
+    def __init__(
+        self,
+        runtime: Runtime,
+        snapshot_manager: Union[SnapshotManager, None] = None,
+        snapshot_interval: int = 10,
+        reconcile_interval: int = 10,
+        shard_coordinator: Union[ShardCoordinator, None] = None,
+        subscriber: Union[ChainSubscriber, None] = None,
+        journal: Union[TransactionJournal, None] = None,
+    ):
+        self.runtime = runtime
+        self.strategy_fetcher = StrategyFetcher(runtime)
+        self.controller_executor = ControllerExecutor(runtime)
+        self.event_listener = EventListener(runtime)
+        self.action_indexer = ActionIndexer(runtime, self.strategy_fetcher.store, self.event_listener.block_number)
+        self.balance_indexer = BalanceIndexer(runtime, self.strategy_fetcher.store, self.event_listener.block_number)
+        # every vault created by the factory
+        self.vault_addresses: List[str] = []
+        # the followed vaults: all of them, or in sharded mode the ones owned by this worker so far
+        self.all_vaults: List[StrategyVault] = []
+        self.snapshot_manager = snapshot_manager
+        self.snapshot_interval = snapshot_interval
+        self.ticks_since_snapshot = 0
+        self.reconcile_interval = reconcile_interval
+        self.ticks_since_reconcile = 0
+        self.shard_coordinator = shard_coordinator
+        # ring the vaults of the current tick are assigned with, its epoch fences their broadcast
+        self.shard_assignment: Optional[ShardAssignment] = None
+        self.subscriber = subscriber
+        self.pushed_events: Optional[PushedEvents] = None
+        self.last_full_tick_at = 0.0
+        self.clock = ChainClock()
+        self.failures = FailureTracker(self.strategy_fetcher.store)
+        self.confirmations = ConfirmationTracker(runtime)
+        self.gas_model = GasModel(runtime.network_settings["dex_main_token_address"])
+        self.swap_router = SwapRouter(runtime, ReserveGraph(runtime, self.event_listener.block_number))
+        self.journal = journal
+        # strategy actions signed this tick and not broadcast yet
+        self.unsent_actions: List[UnsentAction] = []
+        # gas shape of the pending transactions, routed paths included
+        self.gas_shapes: Dict[int, GasShape] = {}
+
+    def run(self):
+        if self.shard_coordinator:
+            self.shard_coordinator.start()
+        if self.subscriber:
+            self.subscriber.start()
+        try:
+            self._run()
+        finally:
+            if self.subscriber:
+                self.subscriber.stop()
+            if self.shard_coordinator:
+                self.shard_coordinator.stop()
+
+    def _run(self):
+        snapshot = self.snapshot_manager.load() if self.snapshot_manager else None
+        if snapshot is None:
+            self.bootstrap()
+        else:
+            self.restore(snapshot)
+
+        print("STARTING SCHEDULER...")
+        while True:
+            self.tick()
+            self.wait_for_next_tick()
+
+    # In push mode the next tick starts as soon as a new head or a followed log is pushed. The wait is bounded by
+    # the polling interval and by the time the next owned vault is predicted to become due on-chain.
+    def wait_for_next_tick(self):
+        timeout = self.next_tick_timeout()
+        if self.subscriber is None:
+            time.sleep(timeout)
+            print("ENDING SLEEP TIME...")
+        else:
+            self.pushed_events = self.subscriber.wait(timeout)
+
+    def next_tick_timeout(self) -> float:
+        timeout = buy_frequency_enum_to_seconds_map[0]
+        if self.clock.timestamp is None:
+            return timeout
+        next_block_timestamp = self.clock.next_block_timestamp()
+        # vaults already due were just triggered, a failure is retried on the next tick as usual
+        due_times = [
+            due_at
+            for due_at in (
+                self.clock.due_at(vault.last_update_timestamp, vault.buy_frequency_timestamp)
+                for vault in self.all_vaults
+                if self.owns_vault(vault.address) and vault.active_rows
+            )
+            if due_at > next_block_timestamp
+        ]
+        if due_times:
+            timeout = min(timeout, max(MIN_TICK_WAIT_SECONDS, self.clock.seconds_until(min(due_times))))
+        # pending transactions are confirmed on the next block
+        if self.confirmations.pending:
+            timeout = min(timeout, max(MIN_TICK_WAIT_SECONDS, self.clock.block_interval))
+        return timeout
+
+    def bootstrap(self):
+        self.refresh_shard_assignment()
+        self.vault_addresses = list(map(to_checksum_address, self.strategy_fetcher.fetch_vault_addresses()))
+        self.all_vaults = self.strategy_fetcher.fetch_vaults(list(filter(self.owns_vault, self.vault_addresses)))
+        # without the worker deployment block the logs history can't be indexed, the current lastUpdateOf of every
+        # depositor is read once instead and only the logs emitted from now on are indexed
+        worker_deployment_block = self.runtime.network_settings.get("worker_deployment_block")
+        if worker_deployment_block is None:
+            self.action_indexer.reconcile(range(len(self.strategy_fetcher.store)))
+        else:
+            self.action_indexer.block_number = worker_deployment_block
+            self.action_indexer.update(self.event_listener.block_number - 1)
+        self.balance_indexer.initialize_rows(range(len(self.strategy_fetcher.store)))
+        for vault in self.all_vaults:
+            vault.refresh_last_update_timestamp()
+        self.swap_router.follow_vaults(self.all_vaults)
+        self.swap_router.graph.update(self.clock.refresh(self.runtime.web3))
+        print()
+        print("ALL VAULTS:")
+        print(self.all_vaults)
+        print(CONSOLE_SEPARATOR)
+        self.recover_journal()
+
+        print("UPDATING STRATEGY VAULTS...")
+        for vault in self.all_vaults:
+            self.update_vault(vault)
+            print("VAULT DETAILS:")
+            print(vault)
+            print(self.strategy_fetcher.describe_tokens(vault))
+            print()
+        self.send_actions()
+
+        print("STRATEGY VAULTS FIRST UPDATE CONCLUDED!")
+        if self.snapshot_manager:
+            self.write_snapshot()
+        self.watch_vaults(self.all_vaults)
+        self.wait_for_next_tick()
+
+    # Start from the mapped snapshot and only catch up on what happened after its block: vaults created since
+    # are picked up by the event listener, new depositors by fetch_new_depositors and executed strategy actions
+    # by the action indexer on the next tick
+    def restore(self, snapshot: Snapshot):
+        print(f"RESTORING STATE FROM SNAPSHOT AT BLOCK {snapshot.block_number}...")
+        self.strategy_fetcher.store = snapshot.store
+        self.action_indexer = ActionIndexer(self.runtime, snapshot.store, snapshot.block_number + 1)
+        self.balance_indexer = BalanceIndexer(self.runtime, snapshot.store, snapshot.block_number + 1)
+        self.failures = FailureTracker(snapshot.store)
+        self.vault_addresses = list(map(to_checksum_address, self.strategy_fetcher.fetch_vault_addresses()))
+        self.all_vaults = snapshot.vaults
+        self.swap_router.follow_vaults(self.all_vaults)
+        self.event_listener.block_number = snapshot.block_number + 1
+        self.watch_vaults(self.all_vaults)
+        print(f"RESTORED {len(self.all_vaults)} VAULTS AND {len(snapshot.store)} DEPOSITORS")
+        print(CONSOLE_SEPARATOR)
+        self.recover_journal()
+
+    def write_snapshot(self):
+        # every vault created, action executed and share transfer/approval up to the last block scanned is part of
+        # the state
+        block_number = (
+            min(self.event_listener.block_number, self.action_indexer.block_number, self.balance_indexer.block_number)
+            - 1
+        )
+        snapshot_path = self.snapshot_manager.write(self.strategy_fetcher.store, self.all_vaults, block_number)
+        self.ticks_since_snapshot = 0
+        print(f"STATE SNAPSHOT WRITTEN TO {snapshot_path}")
+
+    def tick(self):
+        print("STARTING NEW ITERATION...")
+        current_time = time.time()
+        print(f"Current Time: {current_time}")
+        pushed_events, self.pushed_events = self.pushed_events, None
+        # Polling ticks (and in push mode: one tick per polling interval, after a reconnect gap or when nothing was
+        # pushed for a whole interval) check every vault. Pushed ticks only look at what the subscription reported.
+        full_tick = (
+            pushed_events is None
+            or pushed_events.backfill_from is not None
+            or current_time - self.last_full_tick_at >= buy_frequency_enum_to_seconds_map[0]
+        )
+        if full_tick:
+            self.last_full_tick_at = current_time
+        # depositors are fetched at a state at least as recent as latest_block, so every action indexed up to it
+        # belongs to a known row
+        if pushed_events is not None and pushed_events.head_timestamp is not None and not full_tick:
+            self.clock.observe(pushed_events.head, pushed_events.head_timestamp)
+            latest_block = pushed_events.head
+        else:
+            latest_block = self.clock.refresh(self.runtime.web3)
+        print(f"Chain Time: {self.clock.timestamp} (block {latest_block})")
+
+        new_rows = []
+        self.refresh_shard_assignment()
+        # check if more vaults were created adding them to the list of all vaults
+        if full_tick or pushed_events.vault_created:
+            new_vaults_addresses = list(map(to_checksum_address, self.event_listener.event_listener_vaults_update()))
+            self.vault_addresses.extend(new_vaults_addresses)
+            new_vaults = self.follow_vaults(list(filter(self.owns_vault, new_vaults_addresses)))
+            print("NEW VAULTS ADDED")
+            print(new_vaults)
+            print("-----------------------")
+            for vault in new_vaults:
+                new_rows.extend(self.strategy_fetcher.store.vault_rows(vault.vault_id))
+        # vaults taken over from a dead worker (or moved to this one when a worker joined) are read from their current
+        # state, the actions executed on them before are not in the indexed logs
+        followed_vault_addresses = {vault.address for vault in self.all_vaults}
+        taken_over_vaults = self.follow_vaults(
+            [
+                vault_address
+                for vault_address in self.vault_addresses
+                if vault_address not in followed_vault_addresses and self.owns_vault(vault_address)
+            ]
+        )
+        if taken_over_vaults:
+            print(f"{len(taken_over_vaults)} VAULTS TAKEN OVER")
+            taken_over_rows = [
+                row for vault in taken_over_vaults for row in self.strategy_fetcher.store.vault_rows(vault.vault_id)
+            ]
+            self.action_indexer.reconcile(taken_over_rows)
+            new_rows.extend(taken_over_rows)
+
+        for vault in self.all_vaults:
+            if (full_tick or vault.address in pushed_events.deposit_vaults) and self.owns_vault(vault.address):
+                new_rows.extend(self.strategy_fetcher.fetch_new_depositors(vault))
+        # receipts first: the actions they confirm are indexed right after, before the rows are checked again
+        self.resolve_confirmations(latest_block)
+        updated_vault_ids = self.balance_indexer.initialize_rows(new_rows)
+        updated_vault_ids |= self.balance_indexer.update(latest_block)
+        updated_vault_ids |= self.action_indexer.update(latest_block)
+        self.swap_router.graph.update(latest_block)
+        if full_tick:
+            self.ticks_since_reconcile += 1
+        if self.ticks_since_reconcile >= self.reconcile_interval:
+            updated_vault_ids |= self.action_indexer.reconcile(self.action_indexer.sample_rows())
+            self.ticks_since_reconcile = 0
+
+        print("UPDATING STRATEGY VAULTS...")
+        for vault in self.all_vaults:
+            if vault.vault_id in updated_vault_ids:
+                vault.refresh_last_update_timestamp()
+            # Due-ness is checked against chain time, the way the worker checks it with block.timestamp
+            print(f"Vault {vault.address} last updated timestamp: {vault.last_update_timestamp}")
+            if (
+                vault.active_rows
+                and self.clock.is_due(vault.last_update_timestamp, vault.buy_frequency_timestamp)
+                and self.owns_vault(vault.address)
+            ):
+                self.update_vault(vault)
+                print("VAULT DETAILS:")
+                print(vault)
+                print(self.strategy_fetcher.describe_tokens(vault))
+                print()
+        self.send_actions()
+        print("STRATEGY VAULTS UPDATED")
+        if self.snapshot_manager and full_tick:
+            self.ticks_since_snapshot += 1
+            if self.ticks_since_snapshot >= self.snapshot_interval:
+                self.write_snapshot()
+        print("METRICS:")
+        print(metrics.report())
+
+    def watch_vaults(self, vaults: List[StrategyVault]):
+        if self.subscriber and vaults:
+            self.subscriber.watch_vaults(vault.address for vault in vaults)
+
+    def follow_vaults(self, vault_addresses: List[str]) -> List[StrategyVault]:
+        vaults = self.strategy_fetcher.fetch_vaults(vault_addresses) if vault_addresses else []
+        self.all_vaults.extend(vaults)
+        self.watch_vaults(vaults)
+        self.swap_router.follow_vaults(vaults)
+        return vaults
+
+    def refresh_shard_assignment(self):
+        if self.shard_coordinator:
+            self.shard_assignment = self.shard_coordinator.assignment()
+
+    # In sharded mode a worker only reads, indexes and subscribes to the vaults it owned at some point, and only
+    # triggers the strategy actions of the ones it owns in the ring of the current tick. A vault moved away is still
+    # indexed from the logs, so its rows are current again if it comes back.
+    def owns_vault(self, vault_address: str) -> bool:
+        return self.shard_assignment is None or self.shard_assignment.owns(vault_address)
+
+    def update_vault(self, vault: StrategyVault):
+        store = self.strategy_fetcher.store
+        vault_address = vault.address
+        due_rows = []
+        # depositors without shares or allowance left would revert, they are revived by their next Transfer/Approval
+        for row in vault.active_rows:
+            # depositors updated less than a buy frequency ago would revert with UpdateConditionsNotMet
+            if not self.clock.is_due(store.last_updates[row], vault.buy_frequency_timestamp):
+                continue
+            if self.confirmations.is_pending(row):
+                continue
+            if self.failures.is_backed_off(row, self.clock.timestamp):
+                metrics.increment("failures.skipped_rows")
+                continue
+            due_rows.append(row)
+        if not due_rows:
+            return
+        # the swaps of every due depositor are quoted off-chain, the ones moving the pools too much wait a block
+        try:
+            planned_actions = self.swap_router.plan_actions(vault, due_rows)
+        except Exception as error:
+            print(f"SWAP ROUTES NOT PLANNED FOR VAULT: {vault_address} ({error})")
+            planned_actions = [PlannedAction(row, None) for row in due_rows]
+        if len(planned_actions) < len(due_rows):
+            print(f"{len(due_rows) - len(planned_actions)} STRATEGY ACTIONS DEFERRED FOR VAULT: {vault_address}")
+        for row, routes in planned_actions:
+            depositor_address = store.depositor_address(row)
+            try:
+                swap_paths = None if routes is None else [route.path for route in routes]
+                gas_shape = self.gas_model.shape(vault, swap_paths)
+                predicted_gas = self.gas_model.gas_limit(gas_shape)
+                action = self.controller_executor.sign_strategy_action(
+                    vault_address, depositor_address, predicted_gas, routes
+                )
+                self.unsent_actions.append(UnsentAction(row, gas_shape, predicted_gas is not None, action))
+            except Exception as error:
+                failure_kind = self.record_failure(row, vault, error)
+                print(f"TRANSACTION FAILED FOR WALLET: {depositor_address} ({failure_kind or error})")
+
+    # Write-ahead: the intents of every action signed this tick (and the resolutions of the previous ones) are made
+    # durable with a single fsync before the first of them is broadcast, so a restart never signs a depositor again
+    # while its transaction may still be mined
+    def send_actions(self):
+        unsent_actions, self.unsent_actions = self.unsent_actions, []
+        # The ring the actions were planned with is fenced by its epoch: a worker stalled past its lease, or whose
+        # vaults moved meanwhile, drops them before they are journaled and plans again on the next tick
+        if (
+            unsent_actions
+            and self.shard_assignment is not None
+            and not self.shard_coordinator.holds_lease(self.shard_assignment)
+        ):
+            metrics.increment("sharding.fenced_actions", len(unsent_actions))
+            print(f"SHARD LEASE LOST, {len(unsent_actions)} STRATEGY ACTIONS NOT SENT")
+            self.controller_executor.reset_nonce()
+            return
+        if self.journal:
+            for unsent_action in unsent_actions:
+                self.journal.record_intent(unsent_action.action.intent())
+            self.journal.commit()
+        for index, (row, gas_shape, predicted_gas, action) in enumerate(unsent_actions):
+            try:
+                self.controller_executor.broadcast(action.raw_transaction)
+            except Exception as error:
+                if not is_known_transaction(error):
+                    # the nonces signed after this one can't be mined, they are signed again on the next tick
+                    self.controller_executor.reset_nonce()
+                    if self.journal:
+                        for abandoned in unsent_actions[index:]:
+                            self.journal.resolve(to_hex(abandoned.action.tx_hash), "abandoned")
+                    vault_id = self.strategy_fetcher.store.vault_ids[row]
+                    vault = next(vault for vault in self.all_vaults if vault.vault_id == vault_id)
+                    failure_kind = self.record_failure(row, vault, error)
+                    print(f"TRANSACTION FAILED FOR WALLET: {action.depositor_address} ({failure_kind or error})")
+                    break
+            self.confirmations.track(action.tx_hash, row, self.clock.block_number, action.gas, predicted_gas)
+            self.gas_shapes[row] = gas_shape
+            print(f"WALLET: {action.depositor_address} STRATEGY ACTION SENT ({action.tx_hash.hex()})")
+
+    # Reconciles the intents left in flight by a previous run against the chain: mined transactions are confirmed as
+    # usual, the ones whose nonce was used by another transaction are resolved and the others are broadcast again
+    # with the same signed payload. Their rows stay pending meanwhile, so no duplicate action is signed for them.
+    def recover_journal(self):
+        if not self.journal:
+            return
+        in_flight = self.journal.in_flight()
+        if not in_flight:
+            return
+        print(f"RECOVERING {len(in_flight)} IN FLIGHT TRANSACTIONS FROM THE JOURNAL...")
+        web3 = self.runtime.web3
+        store = self.strategy_fetcher.store
+        block_number = self.clock.refresh(web3)
+        receipts = self.confirmations.fetch_receipts([HexBytes(intent["hash"]) for intent in in_flight])
+        mined_nonces = {}
+        for intent, receipt in zip(in_flight, receipts):
+            tx_hash = HexBytes(intent["hash"])
+            sender = intent["sender"]
+            if sender not in mined_nonces:
+                mined_nonces[sender] = web3.eth.get_transaction_count(sender, "latest")
+            if receipt is None and intent["nonce"] < mined_nonces[sender]:
+                self.journal.resolve(intent["hash"], "replaced")
+                metrics.increment("journal.replaced")
+                continue
+            if receipt is None:
+                try:
+                    self.controller_executor.broadcast(HexBytes(intent["raw"]))
+                except Exception as error:
+                    if not is_known_transaction(error):
+                        self.journal.resolve(intent["hash"], "abandoned")
+                        print(f"TRANSACTION {intent['hash']} COULD NOT BE BROADCAST AGAIN ({error})")
+                        continue
+                metrics.increment("journal.rebroadcast")
+            vault_id = store.addresses.id_of(intent["vault"])
+            depositor_id = store.addresses.id_of(intent["depositor"])
+            row = None if vault_id is None or depositor_id is None else store.row_of(vault_id, depositor_id)
+            if row is None:
+                # not followed by this keeper anymore, the action indexer picks up its log if it is mined
+                self.journal.resolve(intent["hash"], "untracked")
+                continue
+            self.confirmations.track(tx_hash, row, block_number, intent["gas"])
+        self.controller_executor.reset_nonce()
+        self.journal.compact()
+        print(f"{len(self.journal.in_flight())} JOURNALED TRANSACTIONS STILL PENDING")
+
+    # Outcomes of the transactions sent on previous ticks. The last update of a confirmed row is set by the action
+    # indexer from the same StrategyActionExecuted log.
+    def resolve_confirmations(self, latest_block: int):
+        store = self.strategy_fetcher.store
+        vaults_by_id = {vault.vault_id: vault for vault in self.all_vaults}
+        for confirmation in self.confirmations.poll(latest_block):
+            if self.journal:
+                if confirmation.receipt is None:
+                    outcome = "dropped"
+                else:
+                    outcome = "succeeded" if confirmation.succeeded else "reverted"
+                self.journal.resolve(to_hex(confirmation.transaction.tx_hash), outcome)
+            depositor_address = store.depositor_address(confirmation.row)
+            vault = vaults_by_id[store.vault_ids[confirmation.row]]
+            transaction, receipt = confirmation.transaction, confirmation.receipt
+            # the swap paths of the transactions recovered from the journal are not known, nor is their gas shape
+            gas_shape = self.gas_shapes.pop(confirmation.row, None)
+            if receipt is not None and gas_shape is not None:
+                self.gas_model.observe(
+                    gas_shape,
+                    receipt["gasUsed"],
+                    transaction.gas_limit,
+                    confirmation.succeeded,
+                    transaction.predicted_gas,
+                )
+            if confirmation.succeeded:
+                self.failures.record_success(confirmation.row)
+                print(f"WALLET: {depositor_address} BALANCES SWAPPED AND SENT TO DESTINATION WALLET")
+            elif receipt is None:
+                self.controller_executor.reset_nonce()
+                print(f"TRANSACTION DROPPED FOR WALLET: {depositor_address}")
+            else:
+                error = self.controller_executor.revert_error(transaction.tx_hash, receipt)
+                failure_kind = self.record_failure(confirmation.row, vault, error)
+                print(f"TRANSACTION REVERTED FOR WALLET: {depositor_address} ({failure_kind})")
+
+    def record_failure(self, row: int, vault: StrategyVault, error: Exception) -> Optional[str]:
+        metrics.increment("failures.wasted_calls")
+        # a revert backs the depositor off until the state it depends on changes, other errors are retried
+        failure_kind = classify_failure(error)
+        if failure_kind is not None:
+            self.failures.record_failure(row, failure_kind, self.clock.timestamp, vault.buy_frequency_timestamp)
+        return failure_kind
@@ -0,0 +1,39 @@
+from threading import Lock
+from collections import defaultdict
+from typing import Callable, Dict
+
+
+# Process-wide counters/gauges printed by the keeper at the end of every tick
+class Metrics:
+    def __init__(self):
+        self._lock = Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, Callable[[], float]] = {}
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def set(self, name: str, value: float):
+        with self._lock:
+            self._counters[name] = value
+
+    def register_gauge(self, name: str, gauge: Callable[[], float]):
+        self._gauges[name] = gauge
+
+    def get(self, name: str) -> float:
+        if name in self._gauges:
+            return self._gauges[name]()
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            values = dict(self._counters)
+        values.update({name: gauge() for name, gauge in self._gauges.items()})
+        return dict(sorted(values.items()))
+
+    def report(self) -> str:
+        return "\n".join(f"{name}: {value:g}" for name, value in self.snapshot().items())
+
+
+metrics = Metrics()
@@ -0,0 +1,97 @@
+from eth_abi import abi
+from eth_abi.exceptions import DecodingError
+from eth_utils.abi import collapse_if_tuple
+from eth_utils import to_checksum_address
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Sequence, Union
+from docs.abis import abi_registry
+from scripts.backend.metrics import Metrics, metrics
+
+if TYPE_CHECKING:
+    from web3 import Web3
+
+# Multicall3 is deployed at the same address on every chain supporting it
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+# Max number of calls aggregated in a single eth_call
+MULTICALL_BATCH_SIZE = 500
+
+BlockIdentifier = Union[int, str]
+
+
+class Call(NamedTuple):
+    target: str
+    abi_name: str
+    function_name: str
+    args: tuple = ()
+
+    def calldata(self) -> bytes:
+        function_abi = abi_registry.function_abi(self.abi_name, self.function_name)
+        types = [collapse_if_tuple(abi_input) for abi_input in function_abi["inputs"]]
+        return abi_registry.selector(self.abi_name, self.function_name) + abi.encode(types, list(self.args))
+
+    def decode(self, return_data: bytes) -> tuple:
+        return abi_registry.output_decoder(self.abi_name, self.function_name)(return_data)
+
+
+# Read calls aggregated through Multicall3.aggregate3, MULTICALL_BATCH_SIZE calls per eth_call, every batch read at
+# the same block. Reverted calls and results that don't decode come back as None. Fresh local chains don't have
+# Multicall3, the calls are then sent one by one.
+class Multicall:
+    def __init__(
+        self,
+        web3: "Web3",
+        address: str = MULTICALL3_ADDRESS,
+        batch_size: int = MULTICALL_BATCH_SIZE,
+        metrics: Metrics = metrics,
+    ):
+        self.web3 = web3
+        self.address = to_checksum_address(address)
+        self.batch_size = batch_size
+        self.metrics = metrics
+        self._deployed: Optional[bool] = None
+
+    def is_deployed(self) -> bool:
+        if self._deployed is None:
+            self._deployed = len(self.web3.eth.get_code(self.address)) > 0
+        return self._deployed
+
+    def call(self, calls: Sequence[Call], block_identifier: BlockIdentifier = "latest") -> List[Optional[tuple]]:
+        return [
+            None if return_data is None else _decode(call, return_data)
+            for call, return_data in zip(calls, self.call_raw(calls, block_identifier))
+        ]
+
+    def call_raw(self, calls: Sequence[Call], block_identifier: BlockIdentifier = "latest") -> List[Optional[bytes]]:
+        results: List[Optional[bytes]] = []
+        for start in range(0, len(calls), self.batch_size):
+            batch = calls[start : start + self.batch_size]
+            if self.is_deployed():
+                results.extend(self._aggregate(batch, block_identifier))
+                self.metrics.increment("multicall.batches")
+            else:
+                results.extend(self._call(call, block_identifier) for call in batch)
+            self.metrics.increment("multicall.calls", len(batch))
+        return results
+
+    def _aggregate(self, batch: Sequence[Call], block_identifier: BlockIdentifier) -> List[Optional[bytes]]:
+        data = abi_registry.selector("multicall3", "aggregate3") + abi.encode(
+            ["(address,bool,bytes)[]"], [[(call.target, True, call.calldata()) for call in batch]]
+        )
+        return_data = self.web3.eth.call({"to": self.address, "data": data}, block_identifier)
+        (results,) = abi_registry.output_decoder("multicall3", "aggregate3")(return_data)
+        return [result if success and result else None for success, result in results]
+
+    def _call(self, call: Call, block_identifier: BlockIdentifier) -> Optional[bytes]:
+        from web3.exceptions import ContractLogicError
+
+        try:
+            return_data = self.web3.eth.call({"to": call.target, "data": call.calldata()}, block_identifier)
+        except ContractLogicError:
+            return None
+        return bytes(return_data) or None
+
+
+def _decode(call: Call, return_data: bytes) -> Optional[tuple]:
+    try:
+        return call.decode(return_data)
+    except DecodingError:
+        return None
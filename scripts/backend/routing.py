@@ -0,0 +1,409 @@
+from eth_utils import to_checksum_address
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from docs.abis import abi_registry
+from scripts.backend.runtime import Runtime
+from scripts.backend.metrics import Metrics, metrics
+from scripts.backend.dataclasses import StrategyVault
+from scripts.backend.helpers import LOG_BLOCK_RANGE, event_pair_created, event_sync
+
+# UniswapV2Library.getAmountOut 0.3% swap fee
+FEE_NUMERATOR = 997
+FEE_DENOMINATOR = 1000
+# Longest path searched, in swaps
+MAX_HOPS = 3
+# PercentageMath
+PERCENTAGE_FACTOR = 10_000
+HALF_PERCENTAGE_FACTOR = PERCENTAGE_FACTOR // 2
+# Every extra hop costs a swap worth of gas, a route replaces the worker's own path when it returns this much more
+MIN_ROUTE_IMPROVEMENT_PERC = 10  # 0.1%
+# StrategyWorker.MAX_SLIPPAGE_PERC, a swap reverts when it returns this much less than its quote
+MAX_SLIPPAGE_PERC = 50  # 0.5%
+# Price move allowed on a pair by the strategy actions of a block, past it the next actions trading the pair wait for
+# the following block. Kept at the worker slippage so the actions would still pass if quoted from the block reserves.
+MAX_BLOCK_PRICE_IMPACT_PERC = MAX_SLIPPAGE_PERC
+# StrategyWorker.MAX_QUOTE_DEVIATION_PERC, a quote this much below the oracle value of the swapped amount reverts
+MAX_QUOTE_DEVIATION_PERC = 300  # 3%
+# Price move allowed on a pair by a single strategy action, even the first one trading it in the block. The worker
+# swaps the whole buy amount of an action at once, so a larger action waits for deeper reserves instead of being sent
+# with a quote the oracle bound would reject.
+MAX_ACTION_PRICE_IMPACT_PERC = MAX_QUOTE_DEVIATION_PERC
+
+
+def amount_out(amount_in: int, reserve_in: int, reserve_out: int) -> int:
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in_with_fee = amount_in * FEE_NUMERATOR
+    return amount_in_with_fee * reserve_out // (reserve_in * FEE_DENOMINATOR + amount_in_with_fee)
+
+
+def percent_mul(value: int, percentage: int) -> int:
+    return (value * percentage + HALF_PERCENTAGE_FACTOR) // PERCENTAGE_FACTOR
+
+
+# How much the price of token in (in token out) dropped between the start and the current reserves of a pair
+def price_impact_perc(start_reserve_in: int, start_reserve_out: int, reserve_in: int, reserve_out: int) -> int:
+    if start_reserve_out <= 0 or reserve_in <= 0:
+        return 0
+    return PERCENTAGE_FACTOR - reserve_out * start_reserve_in * PERCENTAGE_FACTOR // (start_reserve_out * reserve_in)
+
+
+class Pair:
+    __slots__ = ("address", "token0", "token1", "reserve0", "reserve1")
+
+    def __init__(self, address: str, token0: str, token1: str, reserve0: int, reserve1: int):
+        self.address = address
+        self.token0 = token0
+        self.token1 = token1
+        self.reserve0 = reserve0
+        self.reserve1 = reserve1
+
+    # (reserve in, reserve out) of a swap selling token_in
+    def reserves(self, token_in: str) -> Tuple[int, int]:
+        return (self.reserve0, self.reserve1) if token_in == self.token0 else (self.reserve1, self.reserve0)
+
+
+class Route(NamedTuple):
+    path: Tuple[str, ...]
+    amount_out: int
+
+
+# UniswapV2 pairs between the tokens of the followed vaults, with their reserves kept up to date from the pairs
+# Sync logs. Sync carries the absolute reserves, so a pair read at the latest block and then caught up from an older
+# block still ends on the reserves of the last indexed block. Best paths are searched once per (token in, token out,
+# amount magnitude) and reused until the reserves change, a full tick only quotes the cached paths. Pairs created
+# afterwards between followed tokens are picked up from the dex factory PairCreated logs.
+class ReserveGraph:
+    def __init__(self, runtime: Runtime, from_block: int, metrics: Metrics = metrics):
+        self.runtime = runtime
+        self.metrics = metrics
+        self.block_number = from_block
+        self.tokens: Set[str] = set()
+        self.pairs: Dict[str, Pair] = {}
+        # token -> other token -> pair
+        self.adjacency: Dict[str, Dict[str, Pair]] = {}
+        self._best_paths: Dict[Tuple[str, str, int], Optional[Tuple[str, ...]]] = {}
+        self.sync_decoder = abi_registry.event_decoder("univ2_pair", event_sync)
+        self.pair_created_decoder = abi_registry.event_decoder("univ2_dex_factory", event_pair_created)
+        metrics.register_gauge("routing.pairs", lambda: len(self.pairs))
+
+    @property
+    def factory_address(self) -> str:
+        return to_checksum_address(self.runtime.network_settings["dex_factory_address"])
+
+    # The pairs between new tokens and the already followed ones come from the token metadata cache, the ones never
+    # looked up are read together
+    def add_tokens(self, tokens: Iterable[str]):
+        new_tokens = [token for token in dict.fromkeys(map(to_checksum_address, tokens)) if token not in self.tokens]
+        token_pairs = []
+        for index, token in enumerate(new_tokens):
+            token_pairs.extend((token, other_token) for other_token in [*self.tokens, *new_tokens[:index]])
+        self.metrics.increment("routing.pair_lookups", len(token_pairs))
+        pair_addresses = self.runtime.token_metadata.pairs(self.factory_address, token_pairs)
+        for pair_address in pair_addresses.values():
+            if pair_address is not None:
+                self.add_pair(pair_address)
+        self.tokens.update(new_tokens)
+
+    def add_pair(self, pair_address: str):
+        pair_functions = self.runtime.contract("univ2_pair", pair_address).functions
+        reserve0, reserve1, _ = pair_functions.getReserves().call()
+        self.set_pair(pair_address, pair_functions.token0().call(), pair_functions.token1().call(), reserve0, reserve1)
+
+    def set_pair(self, pair_address: str, token0: str, token1: str, reserve0: int, reserve1: int):
+        token0, token1 = to_checksum_address(token0), to_checksum_address(token1)
+        pair = Pair(to_checksum_address(pair_address), token0, token1, reserve0, reserve1)
+        self.pairs[pair.address] = pair
+        self.adjacency.setdefault(token0, {})[token1] = pair
+        self.adjacency.setdefault(token1, {})[token0] = pair
+        self._best_paths.clear()
+
+    def apply_sync(self, pair_address: str, reserve0: int, reserve1: int):
+        pair = self.pairs.get(to_checksum_address(pair_address))
+        if pair is not None:
+            pair.reserve0, pair.reserve1 = reserve0, reserve1
+
+    # A pair created between followed tokens is followed from now on, and replaces the missing pair cached for them
+    def apply_pair_created(self, pair_created: dict):
+        token0, token1 = to_checksum_address(pair_created["token0"]), to_checksum_address(pair_created["token1"])
+        self.runtime.token_metadata.apply_pair_created(self.factory_address, token0, token1, pair_created["pair"])
+        if token0 in self.tokens and token1 in self.tokens:
+            self.add_pair(pair_created["pair"])
+            self.metrics.increment("routing.created_pairs")
+
+    # applies the Sync logs of the followed pairs and the PairCreated logs of the dex factory up to to_block (included)
+    def update(self, to_block: int):
+        addresses = list(self.pairs)
+        if self.tokens:
+            addresses.append(self.factory_address)
+        if not addresses:
+            self.block_number = max(self.block_number, to_block + 1)
+            return
+        synced = 0
+        for start_block in range(self.block_number, to_block + 1, LOG_BLOCK_RANGE):
+            logs = self.runtime.web3.eth.get_logs(
+                {
+                    "address": addresses,
+                    "topics": [[self.sync_decoder.topic, self.pair_created_decoder.topic]],
+                    "fromBlock": start_block,
+                    "toBlock": min(start_block + LOG_BLOCK_RANGE - 1, to_block),
+                }
+            )
+            for log in logs:
+                if log["topics"][0] == self.pair_created_decoder.topic:
+                    self.apply_pair_created(self.pair_created_decoder.decode(log["topics"], log["data"]))
+                    continue
+                sync = self.sync_decoder.decode(log["topics"], log["data"])
+                self.apply_sync(log["address"], sync["reserve0"], sync["reserve1"])
+                synced += 1
+        if synced:
+            self._best_paths.clear()
+            self.metrics.increment("routing.syncs", synced)
+        self.block_number = max(self.block_number, to_block + 1)
+
+    def quote(self, path: Tuple[str, ...], amount_in: int) -> int:
+        return self.quote_many(path, [amount_in])[0]
+
+    # Quotes every amount along the same path at once, the reserves of each hop are looked up a single time.
+    # 0 when a pair of the path is not followed.
+    def quote_many(self, path: Tuple[str, ...], amounts_in: List[int]) -> List[int]:
+        amounts = amounts_in
+        for token_in, token_out in zip(path, path[1:]):
+            pair = self.adjacency.get(token_in, {}).get(token_out)
+            if pair is None:
+                return [0] * len(amounts_in)
+            reserve_in, reserve_out = pair.reserves(token_in)
+            amounts = [amount_out(amount, reserve_in, reserve_out) for amount in amounts]
+        return amounts
+
+    def best_route(self, token_in: str, token_out: str, amount_in: int) -> Optional[Route]:
+        # the best path only changes with the order of magnitude of the amount for the same reserves
+        key = (token_in, token_out, amount_in.bit_length())
+        if key in self._best_paths:
+            path = self._best_paths[key]
+        else:
+            route = self._search(token_in, token_out, amount_in)
+            path = self._best_paths[key] = None if route is None else route.path
+            self.metrics.increment("routing.searches")
+        return None if path is None else Route(path, self.quote(path, amount_in))
+
+    # Bellman-Ford over at most MAX_HOPS swaps, keeping the largest amount reaching every token at each hop
+    def _search(self, token_in: str, token_out: str, amount_in: int) -> Optional[Route]:
+        best_route = None
+        frontier = {token_in: (amount_in, (token_in,))}
+        for _ in range(MAX_HOPS):
+            next_frontier: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+            for token, (amount, path) in frontier.items():
+                for other_token, pair in self.adjacency.get(token, {}).items():
+                    if other_token in path:
+                        continue
+                    amount_reached = amount_out(amount, *pair.reserves(token))
+                    if amount_reached <= 0:
+                        continue
+                    if other_token == token_out:
+                        if best_route is None or amount_reached > best_route.amount_out:
+                            best_route = Route(path + (other_token,), amount_reached)
+                    elif amount_reached > next_frontier.get(other_token, (0,))[0]:
+                        next_frontier[other_token] = (amount_reached, path + (other_token,))
+            frontier = next_frontier
+        return best_route
+
+
+class SwapParams(NamedTuple):
+    buy_percentages: Tuple[int, ...]
+    treasury_fee_percentage: int
+
+
+# Reserves of the pairs traded by the strategy actions planned for the current block, on top of the indexed ones
+class PlannedReserves:
+    def __init__(self, graph: ReserveGraph, reserves: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.graph = graph
+        self.block_number = graph.block_number
+        self.reserves: Dict[str, Tuple[int, int]] = dict(reserves or {})
+
+    def copy(self) -> "PlannedReserves":
+        return PlannedReserves(self.graph, self.reserves)
+
+    # Swaps along the path on the planned reserves, returns the amount out and the price impact on each traded pair
+    # since the indexed reserves
+    def swap(self, path: Tuple[str, ...], amount_in: int) -> Tuple[int, Dict[str, int]]:
+        impacts: Dict[str, int] = {}
+        amount = amount_in
+        for token_in, token_out in zip(path, path[1:]):
+            pair = self.graph.adjacency.get(token_in, {}).get(token_out)
+            if pair is None:
+                return 0, impacts
+            zero_for_one = token_in == pair.token0
+            reserve0, reserve1 = self.reserves.get(pair.address, (pair.reserve0, pair.reserve1))
+            reserve_in, reserve_out = (reserve0, reserve1) if zero_for_one else (reserve1, reserve0)
+            swapped_amount = amount_out(amount, reserve_in, reserve_out)
+            reserve_in, reserve_out = reserve_in + amount, reserve_out - swapped_amount
+            self.reserves[pair.address] = (reserve_in, reserve_out) if zero_for_one else (reserve_out, reserve_in)
+            impacts[pair.address] = price_impact_perc(*pair.reserves(token_in), reserve_in, reserve_out)
+            amount = swapped_amount
+        return amount, impacts
+
+    # Swaps of a whole strategy action, returns the amounts out and the largest price impact on each traded pair
+    def swap_all(self, paths: List[Tuple[str, ...]], amounts_in: List[int]) -> Tuple[List[int], Dict[str, int]]:
+        amounts_out = []
+        impacts: Dict[str, int] = {}
+        for path, amount_in in zip(paths, amounts_in):
+            swapped_amount, swap_impacts = self.swap(path, amount_in)
+            amounts_out.append(swapped_amount)
+            for pair_address, impact in swap_impacts.items():
+                impacts[pair_address] = max(impact, impacts.get(pair_address, impact))
+        return amounts_out, impacts
+
+
+# ConfigTypes.SwapRoute, a 0 quote has the worker quote the path on the dex router
+class SwapRoute(NamedTuple):
+    path: List[str]
+    quoted_amount_out: int
+
+
+# Strategy action to send this block, swap_routes None when every swap is left to the worker
+class PlannedAction(NamedTuple):
+    row: int
+    swap_routes: Optional[List[SwapRoute]]
+
+
+# Picks the swap path of every buy asset of a strategy action and quotes it from the cached reserves, so the worker
+# checks the quote against its oracle prices instead of calling getAmountsOut. The direct or dex main token path is
+# kept unless a route beats it. The actions of a block are quoted one after the other on the reserves left by the
+# previous ones. The ones pushing an already traded pair past MAX_BLOCK_PRICE_IMPACT_PERC are deferred to the next
+# block, and the ones moving any pair past MAX_ACTION_PRICE_IMPACT_PERC until its reserves are deep enough.
+class SwapRouter:
+    def __init__(self, runtime: Runtime, graph: ReserveGraph, metrics: Metrics = metrics):
+        self.runtime = runtime
+        self.graph = graph
+        self.metrics = metrics
+        self.dex_main_token_address = to_checksum_address(runtime.network_settings["dex_main_token_address"])
+        self._swap_params: Dict[int, SwapParams] = {}
+        self._planned_reserves = PlannedReserves(graph)
+        # reserves left by the same actions all quoted from the indexed reserves, without any deferral
+        self._unplanned_reserves = PlannedReserves(graph)
+        self._traded_pairs: Set[str] = set()
+        metrics.register_gauge("impact.revert_rate_avoided", self.revert_rate_avoided)
+
+    def follow_vaults(self, vaults: Iterable[StrategyVault]):
+        tokens = {self.dex_main_token_address}
+        for vault in vaults:
+            tokens.add(vault.deposit_token_address)
+            tokens.update(vault.token_addresses_to_buy)
+        self.graph.add_tokens(sorted(tokens))
+
+    # set at vault creation and never changed afterwards
+    def swap_params(self, vault: StrategyVault) -> SwapParams:
+        swap_params = self._swap_params.get(vault.vault_id)
+        if swap_params is None:
+            vault_functions = self.runtime.contract("vault", vault.address).functions
+            swap_params = self._swap_params[vault.vault_id] = SwapParams(
+                tuple(vault_functions.getStrategyParams().call()[0]),
+                vault_functions.getInitMultiAssetVaultParams().call()[9],
+            )
+        return swap_params
+
+    # Amounts swapped for each buy asset by StrategyWorker._calculateAmountsAfterFee. The per asset buy amounts are
+    # derived from the stored total, which can be a few wei off the vault's own rounding.
+    def buy_amounts_after_fee(self, vault: StrategyVault, row: int) -> List[int]:
+        buy_percentages, fee_percentage = self.swap_params(vault)
+        percentages_sum = sum(buy_percentages)
+        if not percentages_sum:
+            return [0] * len(buy_percentages)
+        initial_deposit = vault.store.periodic_buy_amounts[row] * PERCENTAGE_FACTOR // percentages_sum
+        buy_amounts = [percent_mul(initial_deposit, percentage) for percentage in buy_percentages]
+        return [buy_amount - percent_mul(buy_amount, fee_percentage) for buy_amount in buy_amounts]
+
+    def default_path(self, deposit_token: str, buy_token: str) -> Tuple[str, ...]:
+        main_token = self.dex_main_token_address
+        if buy_token != main_token and deposit_token != main_token:
+            return (deposit_token, main_token, buy_token)
+        return (deposit_token, buy_token)
+
+    def choose_path(self, deposit_token: str, buy_token: str, amount_in: int) -> Tuple[str, ...]:
+        path = self.default_path(deposit_token, buy_token)
+        route = self.graph.best_route(deposit_token, buy_token, amount_in) if amount_in else None
+        if route is not None and route.path != path:
+            default_amount_out = self.graph.quote(path, amount_in)
+            if route.amount_out > default_amount_out + percent_mul(default_amount_out, MIN_ROUTE_IMPROVEMENT_PERC):
+                self.metrics.increment("routing.routed_swaps")
+                return route.path
+        return path
+
+    # Strategy actions of the due rows to send this block, in sending order. Smaller actions go first so as many of
+    # them as possible share the block, an action pushing an already traded pair past MAX_BLOCK_PRICE_IMPACT_PERC is
+    # left for the next block, where it trades on the reserves restored by arbitrage. An action moving a pair past
+    # MAX_ACTION_PRICE_IMPACT_PERC on its own is left out until the pair reserves grow.
+    def plan_actions(self, vault: StrategyVault, rows: List[int]) -> List[PlannedAction]:
+        if self._planned_reserves.block_number != self.graph.block_number:
+            self._planned_reserves = PlannedReserves(self.graph)
+            self._unplanned_reserves = PlannedReserves(self.graph)
+            self._traded_pairs = set()
+        deposit_token = vault.deposit_token_address
+        buy_tokens = vault.token_addresses_to_buy
+        buy_amounts = [self.buy_amounts_after_fee(vault, row) for row in rows]
+        paths = [
+            [self.choose_path(deposit_token, buy_token, amount_in) for buy_token, amount_in in zip(buy_tokens, amounts)]
+            for amounts in buy_amounts
+        ]
+        self.metrics.increment("impact.due_actions", len(rows))
+        self.metrics.increment("impact.expected_reverts_avoided", self._expected_reverts(paths, buy_amounts))
+        planned_actions = []
+        order = sorted(
+            range(len(rows)),
+            key=lambda index: max(
+                self._planned_reserves.copy().swap_all(paths[index], buy_amounts[index])[1].values(), default=0
+            ),
+        )
+        for index in order:
+            reserves = self._planned_reserves.copy()
+            amounts_out, impacts = reserves.swap_all(paths[index], buy_amounts[index])
+            if any(
+                impact > MAX_ACTION_PRICE_IMPACT_PERC
+                or (impact > MAX_BLOCK_PRICE_IMPACT_PERC and pair_address in self._traded_pairs)
+                for pair_address, impact in impacts.items()
+            ):
+                self.metrics.increment("impact.deferred_actions")
+                continue
+            self._planned_reserves = reserves
+            self._traded_pairs.update(impacts)
+            self.metrics.increment("routing.quoted_swaps", len(amounts_out))
+            swap_routes = (
+                [SwapRoute(list(path), quoted_amount_out) for path, quoted_amount_out in zip(paths[index], amounts_out)]
+                if any(amounts_out)
+                else None
+            )
+            planned_actions.append(PlannedAction(rows[index], swap_routes))
+        return planned_actions
+
+    # Actions that would revert if every due action was sent with quotes from the indexed reserves: each one trades
+    # on the reserves moved by the previous successful ones, and reverts once it returns MAX_SLIPPAGE_PERC less than
+    # its quote.
+    # The swaps going through the same path are quoted together.
+    def _expected_reverts(self, paths: List[List[Tuple[str, ...]]], buy_amounts: List[List[int]]) -> int:
+        swaps_by_path: Dict[Tuple[str, ...], List[Tuple[int, int]]] = {}
+        for row_index, row_paths in enumerate(paths):
+            for asset_index, path in enumerate(row_paths):
+                swaps_by_path.setdefault(path, []).append((row_index, asset_index))
+        quotes = [[0] * len(row_paths) for row_paths in paths]
+        for path, swaps in swaps_by_path.items():
+            amounts_out = self.graph.quote_many(
+                path, [buy_amounts[row_index][asset_index] for row_index, asset_index in swaps]
+            )
+            for (row_index, asset_index), quoted_amount_out in zip(swaps, amounts_out):
+                quotes[row_index][asset_index] = quoted_amount_out
+        expected_reverts = 0
+        for row_paths, row_amounts, row_quotes in zip(paths, buy_amounts, quotes):
+            reserves = self._unplanned_reserves.copy()
+            amounts_out, _ = reserves.swap_all(row_paths, row_amounts)
+            if any(
+                amount < percent_mul(quote, PERCENTAGE_FACTOR - MAX_SLIPPAGE_PERC)
+                for amount, quote in zip(amounts_out, row_quotes)
+            ):
+                expected_reverts += 1
+            else:
+                self._unplanned_reserves = reserves
+        return expected_reverts
+
+    def revert_rate_avoided(self) -> float:
+        due_actions = self.metrics.get("impact.due_actions")
+        return self.metrics.get("impact.expected_reverts_avoided") / due_actions if due_actions else 0
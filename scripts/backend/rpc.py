@@ -0,0 +1,289 @@
+import time
+import requests
+from threading import Lock
+from requests.adapters import HTTPAdapter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from web3.types import RPCEndpoint, RPCResponse
+from web3.providers import JSONBaseProvider
+from web3._utils.encoding import FriendlyJsonSerde, Web3JsonEncoder
+from scripts.backend.metrics import Metrics, metrics
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_REQUEST_TIMEOUT = 10
+# Weight of the last sample in the rolling latency/error rate of an endpoint
+EWMA_ALPHA = 0.2
+# An endpoint failing every request scores as if it were (1 + ERROR_PENALTY) times slower
+ERROR_PENALTY = 10
+# After this many consecutive failures an endpoint is only tried once every other endpoint failed, until the
+# cooldown elapses
+MAX_CONSECUTIVE_FAILURES = 3
+FAILURE_COOLDOWN_SECONDS = 30
+# Reads still pending after max(MIN_HEDGE_DELAY, HEDGE_LATENCY_FACTOR * rolling latency) are sent to the next
+# endpoint as well, the first answer wins. Log and block reads are left out: a node behind the requested range
+# answers them with an empty result instead of an error.
+MIN_HEDGE_DELAY = 0.05
+HEDGE_LATENCY_FACTOR = 3
+HEDGED_METHODS = frozenset(
+    [
+        "eth_call",
+        "eth_chainId",
+        "eth_getCode",
+        "eth_gasPrice",
+        "eth_getBalance",
+        "eth_blockNumber",
+        "eth_feeHistory",
+        "eth_estimateGas",
+        "eth_getStorageAt",
+        "eth_getBlockByHash",
+        "eth_maxPriorityFeePerGas",
+        "eth_getTransactionCount",
+        "eth_getTransactionByHash",
+        "eth_getTransactionReceipt",
+    ]
+)
+# Position of the block parameter of the reads pinned to a block number. eth_getLogs is pinned by its toBlock.
+BLOCK_PARAM_INDEXES = {
+    "eth_call": 1,
+    "eth_getCode": 1,
+    "eth_getBalance": 1,
+    "eth_getStorageAt": 2,
+    "eth_getBlockByNumber": 0,
+    "eth_getTransactionCount": 1,
+}
+HEAD_REQUEST = b'{"jsonrpc": "2.0", "method": "eth_blockNumber", "params": [], "id": 0}'
+# JSON-RPC errors that come from the provider (rate limits, overload) rather than from the request itself
+RETRYABLE_RPC_ERROR_CODES = frozenset([-32005, 429])
+RETRYABLE_HTTP_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class RpcTransportError(Exception):
+    pass
+
+
+class RpcUnavailableError(Exception):
+    pass
+
+
+# Raised without sending a block pinned read to an endpoint whose head is below the block
+class RpcLaggingError(RpcTransportError):
+    pass
+
+
+class RpcEndpoint:
+    def __init__(self, url: str, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        # keep-alive connections reused by every thread of the process
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = Lock()
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        # highest block number the endpoint answered eth_blockNumber with
+        self.head = -1
+
+    @property
+    def score(self) -> float:
+        return self.latency * (1 + ERROR_PENALTY * self.error_rate)
+
+    def available(self, now: float) -> bool:
+        return self.consecutive_failures < MAX_CONSECUTIVE_FAILURES or now >= self.cooldown_until
+
+    def record_success(self, latency: float):
+        with self._lock:
+            # the first sample replaces the optimistic initial latency of 0
+            self.latency = latency if self.latency == 0 else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency
+            self.error_rate *= 1 - EWMA_ALPHA
+            self.consecutive_failures = 0
+
+    def record_failure(self, latency: float):
+        with self._lock:
+            self.latency = max(self.latency, latency)
+            self.error_rate = EWMA_ALPHA + (1 - EWMA_ALPHA) * self.error_rate
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                self.cooldown_until = time.monotonic() + FAILURE_COOLDOWN_SECONDS
+
+    def observe_head(self, decoded: Any):
+        result = decoded.get("result") if isinstance(decoded, dict) else None
+        if isinstance(result, str):
+            with self._lock:
+                self.head = max(self.head, int(result, 16))
+
+    def fetch_head(self) -> int:
+        self.observe_head(self.post(HEAD_REQUEST))
+        return self.head
+
+    def post(self, payload: bytes) -> Any:
+        started_at = time.monotonic()
+        try:
+            response = self.session.post(
+                self.url, data=payload, headers={"Content-Type": "application/json"}, timeout=self.timeout
+            )
+            if response.status_code in RETRYABLE_HTTP_STATUSES:
+                raise RpcTransportError(f"Status {response.status_code} from {self.url}")
+            response.raise_for_status()
+            decoded = response.json()
+        except (requests.RequestException, ValueError) as error:
+            self.record_failure(time.monotonic() - started_at)
+            raise RpcTransportError(f"{self.url}: {error}") from error
+        except RpcTransportError:
+            self.record_failure(time.monotonic() - started_at)
+            raise
+        for item in decoded if isinstance(decoded, list) else [decoded]:
+            if item.get("error", {}).get("code") in RETRYABLE_RPC_ERROR_CODES:
+                self.record_failure(time.monotonic() - started_at)
+                raise RpcTransportError(f"{self.url}: {item['error']}")
+        self.record_success(time.monotonic() - started_at)
+        return decoded
+
+
+# Block number a read is pinned to, None for the reads at "latest" (or any other tag) and for every other method
+def pinned_block(method: str, params: Any) -> Optional[int]:
+    params = params or []
+    if method == "eth_getLogs":
+        block = params[0].get("toBlock") if params and isinstance(params[0], dict) else None
+    elif method in BLOCK_PARAM_INDEXES and len(params) > BLOCK_PARAM_INDEXES[method]:
+        block = params[BLOCK_PARAM_INDEXES[method]]
+    else:
+        return None
+    if isinstance(block, int):
+        return block
+    if isinstance(block, str) and block.startswith("0x"):
+        return int(block, 16)
+    return None
+
+
+# web3 provider over several endpoints: every request goes to the endpoint with the best rolling latency/error
+# rate, fails over to the next ones on transport errors and, for reads, is hedged on the next endpoint when the
+# first one is slower than usual. Node errors (reverts, invalid params) are returned as they are. Reads pinned to
+# a block are only sent to endpoints whose head reached it, so a lagging node can't answer them with empty logs.
+class PooledRpcProvider(JSONBaseProvider):
+    def __init__(
+        self,
+        urls: Sequence[str],
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        hedge: bool = True,
+        metrics: Metrics = metrics,
+        name: str = "rpc",
+    ):
+        super().__init__()
+        if not urls:
+            raise ValueError("At least one RPC url is required")
+        self.endpoints = [RpcEndpoint(url, pool_size, timeout) for url in urls]
+        self.hedge = hedge
+        self.metrics = metrics
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=pool_size * len(self.endpoints), thread_name_prefix=name)
+        for index, endpoint in enumerate(self.endpoints):
+            metrics.register_gauge(
+                f"{name}.endpoint_{index}.latency_ms", lambda endpoint=endpoint: endpoint.latency * 1000
+            )
+            metrics.register_gauge(f"{name}.endpoint_{index}.error_rate", lambda endpoint=endpoint: endpoint.error_rate)
+
+    def __str__(self) -> str:
+        return f"PooledRpcProvider({', '.join(endpoint.url for endpoint in self.endpoints)})"
+
+    def ranked_endpoints(self) -> List[RpcEndpoint]:
+        now = time.monotonic()
+        return sorted(self.endpoints, key=lambda endpoint: (not endpoint.available(now), endpoint.score))
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        self.metrics.increment(f"{self.name}.requests")
+        return self._send(
+            self.encode_rpc_request(method, params),
+            self.hedge and method in HEDGED_METHODS,
+            pinned_block(method, params),
+            method == "eth_blockNumber",
+        )
+
+    # Sends every call in a single JSON-RPC batch and returns the responses in the order of the calls
+    def make_batch_request(self, calls: Sequence[Tuple[str, Any]]) -> List[RPCResponse]:
+        if not calls:
+            return []
+        request_ids = [next(self.request_counter) for _ in calls]
+        batch = [
+            {"jsonrpc": "2.0", "method": method, "params": params or [], "id": request_id}
+            for (method, params), request_id in zip(calls, request_ids)
+        ]
+        payload = FriendlyJsonSerde().json_encode(batch, Web3JsonEncoder).encode()
+        self.metrics.increment(f"{self.name}.batches")
+        self.metrics.increment(f"{self.name}.requests", len(calls))
+        pinned_blocks = [pinned_block(method, params) for method, params in calls]
+        responses = self._send(
+            payload,
+            self.hedge and all(method in HEDGED_METHODS for method, _ in calls),
+            max((block for block in pinned_blocks if block is not None), default=None),
+        )
+        if not isinstance(responses, list):
+            # some nodes answer a whole batch with a single error object
+            return [responses] * len(calls)
+        responses_by_id: Dict[Any, RPCResponse] = {response.get("id"): response for response in responses}
+        return [
+            responses_by_id.get(request_id, {"jsonrpc": "2.0", "id": request_id, "error": {"message": "missing"}})
+            for request_id in request_ids
+        ]
+
+    def _send(self, payload: bytes, hedge: bool, min_block: Optional[int] = None, head_request: bool = False) -> Any:
+        ranked_endpoints = self.ranked_endpoints()
+        if min_block is not None:
+            # endpoints already known to have reached the block first, the others have their head read before
+            ranked_endpoints.sort(key=lambda endpoint: endpoint.head < min_block)
+        candidates = iter(ranked_endpoints)
+        pending: Dict[Future, RpcEndpoint] = {}
+        errors: List[str] = []
+
+        def submit_next() -> bool:
+            endpoint = next(candidates, None)
+            if endpoint is None:
+                return False
+            pending[self._executor.submit(self._post, endpoint, payload, min_block, head_request)] = endpoint
+            return True
+
+        submit_next()
+        while pending:
+            hedge_delay = None
+            if hedge and len(pending) == 1:
+                (endpoint,) = pending.values()
+                hedge_delay = max(MIN_HEDGE_DELAY, HEDGE_LATENCY_FACTOR * endpoint.latency)
+            done, _ = wait(pending, timeout=hedge_delay, return_when=FIRST_COMPLETED)
+            if not done:
+                if submit_next():
+                    self.metrics.increment(f"{self.name}.hedged")
+                else:
+                    hedge = False
+                continue
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    return future.result()
+                except RpcTransportError as error:
+                    errors.append(str(error))
+                    if not pending and submit_next():
+                        self.metrics.increment(f"{self.name}.failovers")
+        self.metrics.increment(f"{self.name}.unavailable")
+        raise RpcUnavailableError(f"Every RPC endpoint failed: {errors}")
+
+    def _post(self, endpoint: RpcEndpoint, payload: bytes, min_block: Optional[int], head_request: bool) -> Any:
+        if min_block is not None and endpoint.head < min_block and endpoint.fetch_head() < min_block:
+            self.metrics.increment(f"{self.name}.lagging")
+            raise RpcLaggingError(f"{endpoint.url}: head {endpoint.head} is below block {min_block}")
+        decoded = endpoint.post(payload)
+        if head_request:
+            endpoint.observe_head(decoded)
+        return decoded
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        for endpoint in self.endpoints:
+            endpoint.session.close()
+
+
+def parse_rpc_urls(value: Optional[str]) -> List[str]:
+    return [url.strip() for url in (value or "").split(",") if url.strip()]
@@ -0,0 +1,77 @@
+import os
+import argparse
+from docs.abis import abi_registry
+from scripts.backend.keeper import Keeper
+from scripts.backend.journal import TransactionJournal
+from scripts.backend.runtime import Runtime
+from scripts.backend.rpc import parse_rpc_urls
+from scripts.backend.snapshots import SnapshotManager
+from scripts.backend.sharding import LeaseTable, ShardCoordinator
+from scripts.backend.subscriptions import ChainSubscriber
+from scripts.backend.helpers import event_deposit, event_vault_creation
+
+# Standalone entry point: only web3/eth_abi and the ABI json artifacts in docs/abis are loaded,
+# the brownie project is never compiled. Private keys are read from the environment (source .env first).
+# EXECUTE IN PROJECT ROOT:
+# python -m scripts.backend.run --network arbitrum-main --rpc-url <RPC_URL> [--rpc-url <FALLBACK_RPC_URL> ...]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Strategy vaults keeper bot")
+    parser.add_argument("--network", required=True, help="network id as defined in brownie-config.yaml")
+    parser.add_argument(
+        "--rpc-url",
+        action="append",
+        dest="rpc_urls",
+        help="repeat to route between several endpoints, defaults to the comma separated RPC_URL env var",
+    )
+    parser.add_argument(
+        "--ws-url",
+        default=os.getenv("WS_URL"),
+        help="websocket endpoint, enables reacting to new heads and vault/deposit logs instead of polling",
+    )
+    parser.add_argument("--private-key-env", default="PRIVATE_KEY_1", help="env var holding the bot private key")
+    parser.add_argument("--snapshot-dir", help="directory where depositor state snapshots are kept and restored from")
+    parser.add_argument("--snapshot-interval", type=int, default=10, help="number of iterations between snapshots")
+    parser.add_argument(
+        "--shard-db", help="sqlite lease table shared by the keeper workers, enables sharding the vaults between them"
+    )
+    parser.add_argument(
+        "--journal", help="write-ahead journal of the sent transactions, reconciled against the chain on restart"
+    )
+    parser.add_argument("--worker-id", help="unique worker name in the lease table, defaults to <hostname>-<pid>")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    rpc_urls = args.rpc_urls or parse_rpc_urls(os.getenv("RPC_URL"))
+    if not rpc_urls:
+        raise SystemExit("An RPC url must be provided through --rpc-url or the RPC_URL env var")
+    private_key = os.getenv(args.private_key_env)
+    if not private_key:
+        raise SystemExit(f"{args.private_key_env} env var is not set")
+    snapshot_manager = SnapshotManager(args.snapshot_dir) if args.snapshot_dir else None
+    shard_coordinator = ShardCoordinator(LeaseTable(args.shard_db), args.worker_id) if args.shard_db else None
+    journal = TransactionJournal(args.journal) if args.journal else None
+    runtime = Runtime.standalone(args.network, rpc_urls, private_key)
+    subscriber = None
+    if args.ws_url:
+        subscriber = ChainSubscriber(
+            args.ws_url,
+            runtime.network_settings["vaults_factory_address"],
+            abi_registry.event_decoder("vaults_factory", event_vault_creation).topic,
+            abi_registry.event_decoder("vault", event_deposit).topic,
+        )
+    Keeper(
+        runtime,
+        snapshot_manager=snapshot_manager,
+        snapshot_interval=args.snapshot_interval,
+        shard_coordinator=shard_coordinator,
+        subscriber=subscriber,
+        journal=journal,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+from pathlib import Path
+from functools import cached_property
+from docs.abis import abi_registry
+from eth_utils import to_checksum_address
+from typing import TYPE_CHECKING, Callable, List
+from scripts.deployment_manifest import DeploymentManifest
+from scripts.backend.multicall import Multicall
+from scripts.backend.contract_cache import ContractHandleCache, contract_handles
+from scripts.backend.token_metadata import TOKEN_METADATA_PATH, TokenMetadataCache, is_persistent_network
+
+if TYPE_CHECKING:
+    from web3 import Web3
+
+CONFIG_PATH = Path(__file__).resolve().parents[2] / "brownie-config.yaml"
+
+
+def load_network_settings(network_name: str, config_path: Path = CONFIG_PATH) -> dict:
+    # PyYAML is only needed here, so it is imported on demand
+    import yaml
+
+    with open(config_path) as file:
+        network_settings = yaml.safe_load(file)["networks"][network_name]
+    # addresses written by scripts/deploy.py take precedence over the ones copied into the config
+    return DeploymentManifest(network_name).apply_to_network_settings(network_settings)
+
+
+# Everything that needs a node (connection, chain id, contract objects) is created on first use,
+# which keeps the bot startup down to importing web3 and reading the network settings.
+class Runtime:
+    def __init__(
+        self,
+        network_name: str,
+        network_settings: dict,
+        web3_factory: Callable[[], "Web3"],
+        private_key: str,
+        contract_cache: ContractHandleCache = contract_handles,
+    ):
+        self.network_name = network_name
+        self.network_settings = network_settings
+        self._web3_factory = web3_factory
+        self._private_key = private_key
+        self._contract_cache = contract_cache
+
+    @classmethod
+    def from_brownie(cls) -> "Runtime":
+        from brownie import config, network, web3
+
+        network_name = network.show_active()
+        return cls(network_name, config["networks"][network_name], lambda: web3, config["wallets"]["from_key_1"])
+
+    @classmethod
+    def standalone(cls, network_name: str, rpc_urls: List[str], private_key: str) -> "Runtime":
+        def connect() -> "Web3":
+            from web3 import Web3
+            from scripts.backend.rpc import PooledRpcProvider
+
+            return Web3(PooledRpcProvider(rpc_urls))
+
+        return cls(network_name, load_network_settings(network_name), connect, private_key)
+
+    @cached_property
+    def web3(self) -> "Web3":
+        return self._web3_factory()
+
+    @cached_property
+    def account(self):
+        from eth_account import Account
+
+        return Account.from_key(self._private_key)
+
+    @cached_property
+    def chain_id(self) -> int:
+        return self.web3.eth.chain_id
+
+    @cached_property
+    def multicall(self) -> Multicall:
+        return Multicall(self.web3)
+
+    # shared by the strategy fetcher and the route engine, only persisted on live networks
+    @cached_property
+    def token_metadata(self) -> TokenMetadataCache:
+        path = TOKEN_METADATA_PATH if is_persistent_network(self.network_name) else None
+        return TokenMetadataCache(self.web3, self.chain_id, path, multicall=self.multicall)
+
+    @property
+    def worker_address(self) -> str:
+        return to_checksum_address(self.network_settings["worker_address"])
+
+    @property
+    def controller(self):
+        return self.contract("controller", self.network_settings["controller_address"])
+
+    @property
+    def vaults_factory(self):
+        return self.contract("vaults_factory", self.network_settings["vaults_factory_address"])
+
+    @property
+    def strategy_worker(self):
+        return self.contract("strategy_worker", self.network_settings["worker_address"])
+
+    def contract(self, abi_name: str, address: str):
+        return self._contract_cache.get(
+            self.network_name,
+            abi_name,
+            address,
+            lambda: self.web3.eth.contract(address=to_checksum_address(address), abi=abi_registry.get(abi_name)),
+        )
@@ -0,0 +1,176 @@
+import os
+import time
+import socket
+import sqlite3
+import hashlib
+from bisect import bisect
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+from scripts.backend.metrics import metrics
+
+# Virtual nodes per worker, spreads the vaults evenly and limits the share moved when a worker joins or leaves
+RING_REPLICAS = 256
+LEASE_SECONDS = 30
+# Share of the lease that must be left for a worker to broadcast, heartbeats renew it every third of a lease
+FENCING_MARGIN = 1 / 3
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _ring_point(key: str) -> int:
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    def __init__(self, members: List[str], replicas: int = RING_REPLICAS):
+        self.members = tuple(sorted(members))
+        points: List[Tuple[int, str]] = sorted(
+            (_ring_point(f"{member}#{replica}"), member) for member in self.members for replica in range(replicas)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [member for _, member in points]
+
+    def owner(self, key: str) -> str:
+        if not self._points:
+            raise ValueError("Hash ring has no members")
+        return self._owners[bisect(self._points, _ring_point(key.lower())) % len(self._points)]
+
+
+class Membership(NamedTuple):
+    # bumped on every join and leave, used as the fencing token of the ring computed from the workers
+    epoch: int
+    workers: List[str]
+
+
+# Workers hold a lease row renewed by heartbeats, a worker whose lease expired is considered dead and its
+# vaults are taken over by the remaining ones. The database only needs to be reachable by every worker
+# (same host or a shared filesystem).
+class LeaseTable:
+    def __init__(self, path: Path, lease_seconds: float = LEASE_SECONDS):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        with self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS leases (worker_id TEXT PRIMARY KEY, expires_at REAL)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS membership (id INTEGER PRIMARY KEY CHECK (id = 0), epoch INTEGER NOT NULL)"
+            )
+            connection.execute("INSERT OR IGNORE INTO membership (id, epoch) VALUES (0, 0)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=self.lease_seconds)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    # Renews the worker lease and drops the expired ones. Joining (again, after an expiry) or dropping a worker
+    # bumps the epoch, all in the same transaction the returned membership is read in.
+    def heartbeat(self, worker_id: str, now: Optional[float] = None) -> Membership:
+        now = time.time() if now is None else now
+        with self._connect() as connection:
+            renewed = connection.execute(
+                "UPDATE leases SET expires_at = ? WHERE worker_id = ? AND expires_at > ?",
+                (now + self.lease_seconds, worker_id, now),
+            ).rowcount
+            if not renewed:
+                connection.execute(
+                    "INSERT OR REPLACE INTO leases (worker_id, expires_at) VALUES (?, ?)",
+                    (worker_id, now + self.lease_seconds),
+                )
+            expired = connection.execute("DELETE FROM leases WHERE expires_at <= ?", (now,)).rowcount
+            if not renewed or expired:
+                connection.execute("UPDATE membership SET epoch = epoch + 1")
+            return self._membership(connection)
+
+    def release(self, worker_id: str):
+        with self._connect() as connection:
+            if connection.execute("DELETE FROM leases WHERE worker_id = ?", (worker_id,)).rowcount:
+                connection.execute("UPDATE membership SET epoch = epoch + 1")
+
+    # Whether the membership is still the one of `epoch` and the worker lease is not about to expire. Checked right
+    # before broadcasting, so a worker stalled past its lease never sends the actions of vaults taken over meanwhile.
+    def holds_lease(self, worker_id: str, epoch: int, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        with self._connect() as connection:
+            membership = self._membership(connection)
+            lease = connection.execute("SELECT expires_at FROM leases WHERE worker_id = ?", (worker_id,)).fetchone()
+        return membership.epoch == epoch and lease is not None and lease[0] - now > self.lease_seconds * FENCING_MARGIN
+
+    def _membership(self, connection: sqlite3.Connection) -> Membership:
+        (epoch,) = connection.execute("SELECT epoch FROM membership").fetchone()
+        rows = connection.execute("SELECT worker_id FROM leases").fetchall()
+        return Membership(epoch, sorted(worker_id for worker_id, in rows))
+
+
+# Ring computed by a worker from the membership of `epoch`
+class ShardAssignment(NamedTuple):
+    epoch: int
+    ring: HashRing
+    worker_id: str
+
+    def owns(self, vault_address: str) -> bool:
+        return self.ring.owner(vault_address) == self.worker_id
+
+
+# Vaults are assigned to the live workers by consistent hashing on the vault address. Every worker computes
+# the same ring from the lease table, so no assignment is stored and a dead worker's vaults are rebalanced as
+# soon as its lease expires.
+class ShardCoordinator:
+    def __init__(self, lease_table: LeaseTable, worker_id: Optional[str] = None):
+        self.lease_table = lease_table
+        self.worker_id = default_worker_id() if worker_id is None else worker_id
+        self._lock = Lock()
+        # never held before the first heartbeat
+        self._assignment = ShardAssignment(-1, HashRing([self.worker_id]), self.worker_id)
+        self._stopped = Event()
+        self._heartbeat_thread = None
+        metrics.register_gauge("sharding.workers", lambda: len(self._assignment.ring.members))
+
+    # heartbeats run in their own thread so a long tick (waiting for receipts) never lets the lease expire
+    def start(self):
+        self.refresh()
+        self._heartbeat_thread = Thread(target=self._heartbeat_loop, name="shard-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self.lease_table.release(self.worker_id)
+
+    def _heartbeat_loop(self):
+        while not self._stopped.wait(self.lease_table.lease_seconds / 3):
+            try:
+                self.refresh()
+            except sqlite3.Error as error:
+                metrics.increment("sharding.heartbeat_errors")
+                print(f"SHARD HEARTBEAT FAILED: {error}")
+
+    # returns whether the members changed
+    def refresh(self, now: Optional[float] = None) -> bool:
+        membership = self.lease_table.heartbeat(self.worker_id, now)
+        with self._lock:
+            previous_ring = self._assignment.ring
+            if membership.epoch == self._assignment.epoch:
+                return False
+            ring = previous_ring if tuple(membership.workers) == previous_ring.members else HashRing(membership.workers)
+            self._assignment = ShardAssignment(membership.epoch, ring, self.worker_id)
+        if ring is previous_ring:
+            return False
+        metrics.increment("sharding.rebalances")
+        print(f"SHARD MEMBERS CHANGED: {membership.workers}")
+        return True
+
+    def assignment(self) -> ShardAssignment:
+        with self._lock:
+            return self._assignment
+
+    def owns(self, vault_address: str) -> bool:
+        return self.assignment().owns(vault_address)
+
+    def holds_lease(self, assignment: ShardAssignment, now: Optional[float] = None) -> bool:
+        return self.lease_table.holds_lease(self.worker_id, assignment.epoch, now)
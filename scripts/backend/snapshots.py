@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import mmap
+import shutil
+from pathlib import Path
+from array import array
+from typing import Dict, List, Optional
+from scripts.backend.dataclasses import StrategyVault
+from scripts.backend.depositor_store import DepositorStore
+
+SNAPSHOT_FORMAT_VERSION = 5
+CURRENT_POINTER = "CURRENT"
+MANIFEST = "manifest.json"
+
+# memoryview formats of every DepositorStore column, "B" columns hold fixed width raw values (20/32 bytes)
+COLUMN_FORMATS = {
+    "addresses": "B",
+    "address_index": "I",
+    "vault_ids": "I",
+    "depositor_ids": "I",
+    "last_updates": "Q",
+    "balances": "B",
+    "allowances": "B",
+    "periodic_buy_amounts": "B",
+    "spent_amounts": "B",
+    "bought_amounts": "B",
+    "row_index": "I",
+    "vault_row_offsets": "I",
+    "vault_rows": "I",
+    "active_vault_row_offsets": "I",
+    "active_vault_rows": "I",
+}
+
+
+class Snapshot:
+    __slots__ = ("block_number", "store", "vaults", "path")
+
+    def __init__(self, block_number: int, store: DepositorStore, vaults: List[StrategyVault], path: Path):
+        self.block_number = block_number
+        self.store = store
+        self.vaults = vaults
+        self.path = path
+
+
+def _fsync_directory(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _map_column(path: Path, column_format: str) -> memoryview:
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return memoryview(array(column_format) if column_format != "B" else bytearray())
+        # ACCESS_COPY: pages are shared with the file until written, writes never reach the snapshot
+        mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    return memoryview(mapped_file).cast(column_format)
+
+
+# Every snapshot generation is a directory named after its block number holding one raw file per column.
+# A generation is written under a temporary name, fsynced and renamed, and only then the CURRENT pointer is
+# atomically replaced, so a crash at any point leaves the previous generation in place.
+class SnapshotManager:
+    def __init__(self, directory: Path, keep: int = 2):
+        self.directory = Path(directory)
+        self.keep = max(keep, 1)
+        self._mapped_generation: Optional[Path] = None
+
+    def generations(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(path for path in self.directory.iterdir() if path.is_dir() and path.name.isdigit())
+
+    def write(self, store: DepositorStore, vaults: List[StrategyVault], block_number: int) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        generation = self.directory / f"{block_number:012d}"
+        if generation.exists():
+            return generation
+        tmp_generation = self.directory / f".tmp-{generation.name}-{os.getpid()}"
+        shutil.rmtree(tmp_generation, ignore_errors=True)
+        tmp_generation.mkdir()
+        for name, buffer in store.export_columns().items():
+            with open(tmp_generation / f"{name}.bin", "wb") as file:
+                file.write(memoryview(buffer).cast("B"))
+                file.flush()
+                os.fsync(file.fileno())
+        manifest = {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "itemsizes": {column_format: array(column_format).itemsize for column_format in ("I", "Q")},
+            "block_number": block_number,
+            "vaults": [vault.to_record() for vault in vaults],
+            "vault_share_rates": [
+                [vault_id, *share_rate] for vault_id, share_rate in store.vault_share_rates().items()
+            ],
+        }
+        with open(tmp_generation / MANIFEST, "w") as file:
+            json.dump(manifest, file)
+            file.flush()
+            os.fsync(file.fileno())
+        _fsync_directory(tmp_generation)
+        os.rename(tmp_generation, generation)
+        self._write_current_pointer(generation.name)
+        self._prune()
+        return generation
+
+    def load(self) -> Optional[Snapshot]:
+        try:
+            generation = self.directory / (self.directory / CURRENT_POINTER).read_text().strip()
+            with open(generation / MANIFEST) as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return None
+        if (
+            manifest["version"] != SNAPSHOT_FORMAT_VERSION
+            or manifest["byteorder"] != sys.byteorder
+            or manifest["itemsizes"] != {column_format: array(column_format).itemsize for column_format in ("I", "Q")}
+        ):
+            print(f"SNAPSHOT {generation} WAS WRITTEN WITH AN INCOMPATIBLE LAYOUT, IGNORING IT")
+            return None
+        columns: Dict[str, memoryview] = {
+            name: _map_column(generation / f"{name}.bin", column_format)
+            for name, column_format in COLUMN_FORMATS.items()
+        }
+        vault_share_rates = {vault_id: (shares, assets) for vault_id, shares, assets in manifest["vault_share_rates"]}
+        store = DepositorStore.from_columns(columns, vault_share_rates)
+        vaults = [StrategyVault.from_record(store, record) for record in manifest["vaults"]]
+        self._mapped_generation = generation
+        return Snapshot(manifest["block_number"], store, vaults, generation)
+
+    def _write_current_pointer(self, generation_name: str):
+        tmp_pointer = self.directory / f".{CURRENT_POINTER}.tmp"
+        with open(tmp_pointer, "w") as file:
+            file.write(generation_name)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_pointer, self.directory / CURRENT_POINTER)
+        _fsync_directory(self.directory)
+
+    def _prune(self):
+        # the generation a running store was mapped from is never removed under it
+        for generation in self.generations()[: -self.keep]:
+            if generation != self._mapped_generation:
+                shutil.rmtree(generation, ignore_errors=True)
@@ -1,16 +1,24 @@
 from typing import List, Union
+from scripts.backend.runtime import Runtime
 from scripts.backend.dataclasses import StrategyVault
-from scripts.backend.helpers import buy_frequency_enum_to_seconds_map
-from brownie import config, AutomatedVaultERC4626, AutomatedVaultsFactory, network
-
-factory_address = config["networks"][network.show_active()]["vaults_factory_address"]
-vaults_factory_contract = AutomatedVaultsFactory.at(factory_address)
+from scripts.backend.depositor_store import DepositorStore
+from scripts.backend.helpers import BATCH_READ_LIMIT, buy_frequency_enum_to_seconds_map
 
 
 class StrategyFetcher:
+    def __init__(self, runtime: Runtime, store: Union[DepositorStore, None] = None):
+        self.runtime = runtime
+        self.store = DepositorStore() if store is None else store
+
     def fetch_vault_addresses(self) -> List[str]:
-        number_of_vaults = vaults_factory_contract.allVaultsLength()
-        return [vaults_factory_contract.allVaults(i) for i in range(number_of_vaults)]
+        vaults_factory_contract = self.runtime.vaults_factory
+        number_of_vaults = vaults_factory_contract.functions.allVaultsLength().call()
+        vault_addresses = []
+        for start_after in range(0, number_of_vaults, BATCH_READ_LIMIT):
+            vault_addresses.extend(
+                vaults_factory_contract.functions.getBatchVaults(BATCH_READ_LIMIT, start_after).call()
+            )
+        return vault_addresses
 
     def fetch_vaults(
         self,
@@ -22,35 +30,54 @@ class StrategyFetcher:
         else:
             vaults_list = []
             for vault_address in vault_addresses:
-                vault_contract = AutomatedVaultERC4626.at(vault_address)
-                strategy_params = vault_contract.getStrategyParams()
+                vault_contract = self.runtime.contract("vault", vault_address)
+                strategy_params = vault_contract.functions.getStrategyParams().call()
                 vault_buy_frequency_timestamp = self.__get_vault_buy_frequency_timestamp(strategy_params)
                 if buy_frequency_timestamp and buy_frequency_timestamp != vault_buy_frequency_timestamp:
                     continue
-                vault_params = vault_contract.initMultiAssetVaultParams()
-                token_addresses_to_buy_length = vault_contract.buyAssetsLength()
-                all_depositors_length = vault_contract.allDepositorsLength()
+                vault_params = vault_contract.functions.getInitMultiAssetVaultParams().call()
                 vault = StrategyVault(
+                    store=self.store,
                     address=vault_contract.address,
                     creator=vault_params[3],
                     deposit_token_address=vault_params[6],
-                    token_addresses_to_buy=self.__get_token_addresses_to_buy(
-                        vault_contract, token_addresses_to_buy_length
-                    ),
-                    depositor_addresses=self.__get_depositor_addresses(vault_contract, all_depositors_length),
+                    token_addresses_to_buy=vault_contract.functions.getBuyAssetAddresses().call(),
                     buy_frequency_timestamp=vault_buy_frequency_timestamp,
-                    last_update_timestamp=vault_contract.lastUpdate(),
                 )
+                self.fetch_new_depositors(vault)
                 vaults_list.append(vault)
+            # the tokens of every fetched vault are read in one batch, the known ones come from the cache
+            self.runtime.token_metadata.tokens(
+                token_address
+                for vault in vaults_list
+                for token_address in (vault.deposit_token_address, *vault.token_addresses_to_buy)
+            )
             return vaults_list
 
-    def __get_vault_buy_frequency_timestamp(self, strategy_params: tuple) -> int:
-        return buy_frequency_enum_to_seconds_map[strategy_params[1]]
+    # Depositors are never removed on-chain, so only the ones past the already stored rows are requested
+    def fetch_new_depositors(self, vault: StrategyVault) -> List[int]:
+        vault_contract = self.runtime.contract("vault", vault.address)
+        all_depositors_length = vault_contract.functions.allDepositorsLength().call()
+        new_rows = []
+        for start_after in range(vault.depositors_length, all_depositors_length, BATCH_READ_LIMIT):
+            depositor_addresses = vault_contract.functions.getBatchDepositorAddresses(
+                BATCH_READ_LIMIT, start_after
+            ).call()
+            new_rows.extend(self.store.add_depositors(vault.vault_id, depositor_addresses))
+        if new_rows:
+            # new depositors start at 0 (never updated), their actions come from the action indexer
+            vault.refresh_last_update_timestamp()
+        return new_rows
 
-    def __get_token_addresses_to_buy(
-        self, vault_contract: AutomatedVaultERC4626, token_addresses_to_buy_length: int
-    ) -> List[str]:
-        return [vault_contract.buyAssetAddresses(i) for i in range(token_addresses_to_buy_length)]
+    # "USDC -> GMX, ARB", tokens without metadata are shown by address
+    def describe_tokens(self, vault: StrategyVault) -> str:
+        token_addresses = [vault.deposit_token_address, *vault.token_addresses_to_buy]
+        token_metadata = self.runtime.token_metadata.tokens(token_addresses)
+        symbols = [
+            token_metadata[token_address].symbol if token_address in token_metadata else token_address
+            for token_address in token_addresses
+        ]
+        return f"{symbols[0]} -> {', '.join(symbols[1:])}"
 
-    def __get_depositor_addresses(self, vault_contract: AutomatedVaultERC4626, all_depositors_length: int) -> List[str]:
-        return [vault_contract.allDepositorAddresses(i) for i in range(all_depositors_length)]
+    def __get_vault_buy_frequency_timestamp(self, strategy_params: tuple) -> int:
+        return buy_frequency_enum_to_seconds_map[strategy_params[1]]
@@ -0,0 +1,170 @@
+import json
+import asyncio
+import websockets
+from threading import Condition, Event, Thread
+from typing import Dict, Iterable, NamedTuple, Optional, Set
+from eth_utils import to_checksum_address
+from scripts.backend.metrics import Metrics, metrics
+
+RECONNECT_DELAY = 1
+MAX_RECONNECT_DELAY = 30
+# Max time a recv waits before the watched vaults are checked for changes
+RECV_TIMEOUT = 1
+HEADS = "heads"
+VAULT_CREATED = "vault_created"
+DEPOSITS = "deposits"
+
+
+class PushedEvents(NamedTuple):
+    head: Optional[int]
+    head_timestamp: Optional[int]
+    vault_created: bool
+    deposit_vaults: Set[str]
+    # set after a reconnect: logs emitted from this block on may have been missed while the socket was down
+    backfill_from: Optional[int]
+
+
+# Websocket subscriptions to newHeads, to the factory VaultCreated logs and to the Deposit logs of the followed
+# vaults, held by a background thread. Notifications are accumulated until the keeper takes them with `wait`,
+# the socket is reopened with exponential backoff whenever it drops.
+class ChainSubscriber:
+    def __init__(
+        self,
+        ws_url: str,
+        factory_address: str,
+        vault_created_topic: bytes,
+        deposit_topic: bytes,
+        metrics: Metrics = metrics,
+    ):
+        self.ws_url = ws_url
+        self.factory_address = to_checksum_address(factory_address)
+        self.vault_created_topic = "0x" + vault_created_topic.hex()
+        self.deposit_topic = "0x" + deposit_topic.hex()
+        self.metrics = metrics
+        self._condition = Condition()
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+        self._watched_vaults: Set[str] = set()
+        self._watched_changed = False
+        self._head: Optional[int] = None
+        self._head_timestamp: Optional[int] = None
+        self._last_seen_head: Optional[int] = None
+        self._vault_created = False
+        self._deposit_vaults: Set[str] = set()
+        self._backfill_from: Optional[int] = None
+        self._has_news = False
+
+    def start(self):
+        self._thread = Thread(target=lambda: asyncio.run(self._run()), name="chain-subscriber", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=RECV_TIMEOUT * 2)
+
+    def watch_vaults(self, vault_addresses: Iterable[str]):
+        with self._condition:
+            self._watched_vaults.update(to_checksum_address(address) for address in vault_addresses)
+            self._watched_changed = True
+
+    # Blocks until something was pushed or the timeout elapsed, returns (and clears) what was pushed meanwhile
+    def wait(self, timeout: float) -> PushedEvents:
+        with self._condition:
+            self._condition.wait_for(lambda: self._has_news or self._stopped.is_set(), timeout=timeout)
+            events = PushedEvents(
+                self._head, self._head_timestamp, self._vault_created, self._deposit_vaults, self._backfill_from
+            )
+            self._vault_created, self._deposit_vaults, self._backfill_from = False, set(), None
+            self._has_news = False
+            return events
+
+    async def _run(self):
+        delay = RECONNECT_DELAY
+        while not self._stopped.is_set():
+            try:
+                async with websockets.connect(self.ws_url) as socket:
+                    await self._listen(socket)
+                    delay = RECONNECT_DELAY
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as error:
+                self.metrics.increment("subscriptions.disconnects")
+                print(f"SUBSCRIPTION SOCKET ERROR: {error}, RECONNECTING IN {delay}s")
+            with self._condition:
+                if self._last_seen_head is not None:
+                    self._backfill_from = self._last_seen_head + 1
+                    self._has_news = True
+                    self._condition.notify_all()
+            if not self._stopped.is_set():
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _listen(self, socket):
+        subscriptions: Dict[str, str] = {}
+        pending_requests: Dict[int, Optional[str]] = {}
+        request_ids = iter(range(1, 2**63))
+
+        # kind is the subscription kind an eth_subscribe result is registered under, None for other requests
+        async def request(method: str, params: list, kind: Optional[str] = None):
+            request_id = next(request_ids)
+            pending_requests[request_id] = kind
+            await socket.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+
+        await request("eth_subscribe", ["newHeads"], HEADS)
+        await request(
+            "eth_subscribe",
+            ["logs", {"address": self.factory_address, "topics": [self.vault_created_topic]}],
+            VAULT_CREATED,
+        )
+        # a new socket starts without any Deposit subscription
+        deposits_subscribed = False
+        while not self._stopped.is_set():
+            with self._condition:
+                watched_vaults = None
+                if self._watched_vaults and (self._watched_changed or not deposits_subscribed):
+                    watched_vaults = sorted(self._watched_vaults)
+                self._watched_changed = False
+            if watched_vaults:
+                deposits_subscribed = True
+                # the Deposit subscription is replaced by one covering the new vault list
+                for subscription_id in [key for key, kind in subscriptions.items() if kind == DEPOSITS]:
+                    del subscriptions[subscription_id]
+                    await request("eth_unsubscribe", [subscription_id])
+                await request(
+                    "eth_subscribe", ["logs", {"address": watched_vaults, "topics": [self.deposit_topic]}], DEPOSITS
+                )
+            try:
+                message = json.loads(await asyncio.wait_for(socket.recv(), timeout=RECV_TIMEOUT))
+            except asyncio.TimeoutError:
+                continue
+            if "id" in message:
+                kind = pending_requests.pop(message["id"], None)
+                if kind is not None and "result" in message:
+                    subscriptions[message["result"]] = kind
+                elif "error" in message:
+                    print(f"SUBSCRIPTION REQUEST FAILED: {message['error']}")
+                continue
+            params = message.get("params", {})
+            kind = subscriptions.get(params.get("subscription"))
+            if kind is not None:
+                self._push(kind, params["result"])
+
+    def _push(self, kind: str, result: dict):
+        with self._condition:
+            if kind == HEADS:
+                self._head = int(result["number"], 16)
+                self._head_timestamp = int(result["timestamp"], 16) if "timestamp" in result else None
+                self._last_seen_head = self._head
+                self.metrics.increment("subscriptions.heads")
+            elif result.get("removed"):
+                # reorged out logs, the reconciliation of the action indexer covers what they changed
+                return
+            elif kind == VAULT_CREATED:
+                self._vault_created = True
+                self.metrics.increment("subscriptions.vault_created_logs")
+            elif kind == DEPOSITS:
+                self._deposit_vaults.add(to_checksum_address(result["address"]))
+                self.metrics.increment("subscriptions.deposit_logs")
+            self._has_news = True
+            self._condition.notify_all()
@@ -0,0 +1,183 @@
+import os
+import json
+from pathlib import Path
+from threading import Lock
+from eth_abi import abi
+from eth_abi.exceptions import DecodingError
+from eth_utils import to_checksum_address
+from typing import TYPE_CHECKING, Dict, Iterable, NamedTuple, Optional, Tuple
+from scripts.backend.metrics import Metrics, metrics
+from scripts.backend.multicall import Call, Multicall
+
+if TYPE_CHECKING:
+    from web3 import Web3
+
+TOKEN_METADATA_PATH = Path(__file__).resolve().parents[2] / "cache" / "token_metadata.json"
+# Local chains reuse their chain id for every fresh deployment and forks share it with the forked chain, so the
+# metadata read on them is never persisted
+LOCAL_NETWORKS = ("development", "anvil", "hardhat", "geth-dev")
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def is_persistent_network(network_name: str) -> bool:
+    return network_name not in LOCAL_NETWORKS and "fork" not in network_name
+
+
+class TokenMetadata(NamedTuple):
+    decimals: int
+    symbol: str
+
+
+def _decode_decimals(return_data: Optional[bytes]) -> Optional[int]:
+    if return_data is None:
+        return None
+    try:
+        return abi.decode(["uint8"], return_data)[0]
+    except DecodingError:
+        return None
+
+
+def _decode_symbol(return_data: Optional[bytes]) -> str:
+    if return_data is None:
+        return ""
+    # a few early tokens (MKR, SAI) return their symbol as bytes32
+    if len(return_data) == 32:
+        return return_data.rstrip(b"\0").decode(errors="replace")
+    try:
+        return abi.decode(["string"], return_data)[0]
+    except DecodingError:
+        return ""
+
+
+# Decimals and symbols of tokens and the UniswapV2 factory pairs between them, keyed by (chain id, address). None of
+# them changes once read, except for a missing pair, which is only replaced when the factory emits its PairCreated.
+# Misses are read in bulk through Multicall3 and the cache file is atomically rewritten after every fill. Without a
+# path the cache only lives in memory.
+class TokenMetadataCache:
+    def __init__(
+        self,
+        web3: "Web3",
+        chain_id: int,
+        path: Optional[Path] = TOKEN_METADATA_PATH,
+        metrics: Metrics = metrics,
+        multicall: Optional[Multicall] = None,
+    ):
+        self.chain_id = chain_id
+        self.path = None if path is None else Path(path)
+        self.metrics = metrics
+        self.multicall = Multicall(web3, metrics=metrics) if multicall is None else multicall
+        self._lock = Lock()
+        self._tokens: Dict[Tuple[int, str], TokenMetadata] = {}
+        # (chain id, factory, token0, token1) -> pair address, ZERO_ADDRESS when the factory has no pair for them
+        self._pairs: Dict[Tuple[int, str, str, str], str] = {}
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def _load(self):
+        with open(self.path) as file:
+            chains = json.load(file)
+        for chain_id, entries in chains.items():
+            for address, (decimals, symbol) in entries["tokens"].items():
+                self._tokens[(int(chain_id), address)] = TokenMetadata(decimals, symbol)
+            for key, pair_address in entries["pairs"].items():
+                factory, token0, token1 = key.split(":")
+                self._pairs[(int(chain_id), factory, token0, token1)] = pair_address
+
+    def token(self, address: str) -> Optional[TokenMetadata]:
+        return self.tokens([address]).get(to_checksum_address(address))
+
+    # Metadata of the given tokens by checksum address, the ones never read are read together. Addresses not
+    # answering decimals() are left out and read again next time.
+    def tokens(self, addresses: Iterable[str]) -> Dict[str, TokenMetadata]:
+        addresses = list(dict.fromkeys(map(to_checksum_address, addresses)))
+        missing = [address for address in addresses if (self.chain_id, address.lower()) not in self._tokens]
+        self.metrics.increment("token_metadata.hits", len(addresses) - len(missing))
+        if missing:
+            self.metrics.increment("token_metadata.misses", len(missing))
+            results = self.multicall.call_raw(
+                [
+                    Call(address, "erc20", function_name)
+                    for address in missing
+                    for function_name in ("decimals", "symbol")
+                ]
+            )
+            read_tokens = {}
+            for address, decimals_data, symbol_data in zip(missing, results[::2], results[1::2]):
+                decimals = _decode_decimals(decimals_data)
+                if decimals is not None:
+                    read_tokens[(self.chain_id, address.lower())] = TokenMetadata(decimals, _decode_symbol(symbol_data))
+            if read_tokens:
+                with self._lock:
+                    self._tokens.update(read_tokens)
+                self.save()
+        metadata = {}
+        for address in addresses:
+            token_metadata = self._tokens.get((self.chain_id, address.lower()))
+            if token_metadata is not None:
+                metadata[address] = token_metadata
+        return metadata
+
+    def pair(self, factory_address: str, token_a: str, token_b: str) -> Optional[str]:
+        return self.pairs(factory_address, [(token_a, token_b)]).get((token_a, token_b))
+
+    # Pair address (None without a pair) of every given couple of tokens, the ones never looked up are read together
+    def pairs(
+        self, factory_address: str, token_pairs: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Optional[str]]:
+        keys = {token_pair: self._pair_key(factory_address, *token_pair) for token_pair in token_pairs}
+        missing = [token_pair for token_pair, key in keys.items() if key not in self._pairs]
+        self.metrics.increment("token_metadata.hits", len(keys) - len(missing))
+        if missing:
+            self.metrics.increment("token_metadata.misses", len(missing))
+            factory_address = to_checksum_address(factory_address)
+            results = self.multicall.call(
+                [
+                    Call(
+                        factory_address,
+                        "univ2_dex_factory",
+                        "getPair",
+                        (to_checksum_address(token_a), to_checksum_address(token_b)),
+                    )
+                    for token_a, token_b in missing
+                ]
+            )
+            read_pairs = {keys[token_pair]: result[0].lower() for token_pair, result in zip(missing, results) if result}
+            if read_pairs:
+                with self._lock:
+                    self._pairs.update(read_pairs)
+                self.save()
+        pair_addresses: Dict[Tuple[str, str], Optional[str]] = {}
+        for token_pair, key in keys.items():
+            pair_address = self._pairs.get(key)
+            if pair_address is not None:
+                pair_addresses[token_pair] = None if pair_address == ZERO_ADDRESS else to_checksum_address(pair_address)
+        return pair_addresses
+
+    # The only invalidation: a pair cached as missing exists once the factory emitted PairCreated for it
+    def apply_pair_created(self, factory_address: str, token0: str, token1: str, pair_address: str):
+        with self._lock:
+            self._pairs[self._pair_key(factory_address, token0, token1)] = pair_address.lower()
+        self.metrics.increment("token_metadata.pairs_created")
+        self.save()
+
+    def _pair_key(self, factory_address: str, token_a: str, token_b: str) -> Tuple[int, str, str, str]:
+        token0, token1 = sorted((token_a.lower(), token_b.lower()))
+        return (self.chain_id, factory_address.lower(), token0, token1)
+
+    def save(self):
+        if self.path is None:
+            return
+        with self._lock:
+            chains: Dict[str, Dict[str, dict]] = {}
+            for (chain_id, address), token_metadata in self._tokens.items():
+                chains.setdefault(str(chain_id), {"tokens": {}, "pairs": {}})["tokens"][address] = list(token_metadata)
+            for (chain_id, factory_address, token0, token1), pair_address in self._pairs.items():
+                entries = chains.setdefault(str(chain_id), {"tokens": {}, "pairs": {}})
+                entries["pairs"][f"{factory_address}:{token0}:{token1}"] = pair_address
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as file:
+                json.dump(chains, file, indent=2, sort_keys=True)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
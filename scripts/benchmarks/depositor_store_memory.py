@@ -0,0 +1,124 @@
+import os
+import gc
+import argparse
+import tracemalloc
+from typing import Callable, List
+from dataclasses import dataclass
+from scripts.backend.dataclasses import StrategyVault
+from scripts.backend.depositor_store import DepositorStore
+
+# Compares the memory held by the former StrategyVault dataclass (lists of checksum address strings, plus the
+# per depositor fields kept in address keyed dicts) against the DepositorStore representation. Both builders decode
+# the address strings themselves from the raw addresses read on-chain, so the strings kept by the dataclass are
+# measured while the ones only interned by the store are freed before the measure.
+# EXECUTE IN PROJECT ROOT:
+# python -m scripts.benchmarks.depositor_store_memory --vaults 10 --depositors 100000
+
+MAX_UINT256 = 2**256 - 1
+
+
+@dataclass
+class LegacyStrategyVault:
+    address: str
+    creator: str
+    deposit_token_address: str
+    token_addresses_to_buy: List[str]
+    depositor_addresses: List[str]
+    buy_frequency_timestamp: int
+    last_update_timestamp: int
+
+
+def random_address() -> bytes:
+    return os.urandom(20)
+
+
+def decode_addresses(raw_addresses: List[bytes]) -> List[str]:
+    return ["0x" + raw_address.hex() for raw_address in raw_addresses]
+
+
+def build_legacy(
+    raw_vault_addresses: List[bytes], raw_depositor_addresses: List[List[bytes]], raw_buy_tokens: List[bytes]
+) -> list:
+    vaults, depositor_columns = [], {}
+    buy_tokens = decode_addresses(raw_buy_tokens)
+    for vault_address, raw_vault_depositors in zip(decode_addresses(raw_vault_addresses), raw_depositor_addresses):
+        vault_depositors = decode_addresses(raw_vault_depositors)
+        vaults.append(
+            LegacyStrategyVault(
+                address=vault_address,
+                creator=vault_depositors[0],
+                deposit_token_address=buy_tokens[0],
+                token_addresses_to_buy=list(buy_tokens[1:]),
+                depositor_addresses=vault_depositors,
+                buy_frequency_timestamp=86400,
+                last_update_timestamp=0,
+            )
+        )
+        for index, depositor_address in enumerate(vault_depositors):
+            depositor_columns[(vault_address, depositor_address)] = {
+                "last_update": 1_700_000_000 + index,
+                "balance": 10**24 + index,
+                "allowance": MAX_UINT256 - index,
+                "periodic_buy_amount": 10**21 + index,
+            }
+    return [vaults, depositor_columns]
+
+
+def build_store(
+    raw_vault_addresses: List[bytes], raw_depositor_addresses: List[List[bytes]], raw_buy_tokens: List[bytes]
+) -> list:
+    store = DepositorStore()
+    vaults = []
+    buy_tokens = decode_addresses(raw_buy_tokens)
+    for vault_address, raw_vault_depositors in zip(decode_addresses(raw_vault_addresses), raw_depositor_addresses):
+        vault_depositors = decode_addresses(raw_vault_depositors)
+        vault = StrategyVault(
+            store=store,
+            address=vault_address,
+            creator=vault_depositors[0],
+            deposit_token_address=buy_tokens[0],
+            token_addresses_to_buy=buy_tokens[1:],
+            buy_frequency_timestamp=86400,
+        )
+        for index, row in enumerate(store.add_depositors(vault.vault_id, vault_depositors)):
+            store.last_updates[row] = 1_700_000_000 + index
+            store.balances[row] = 10**24 + index
+            store.allowances[row] = MAX_UINT256 - index
+            store.periodic_buy_amounts[row] = 10**21 + index
+        vaults.append(vault)
+    return [vaults, store]
+
+
+def measure(builder: Callable[[], list]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = builder()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DepositorStore memory benchmark")
+    parser.add_argument("--vaults", type=int, default=10)
+    parser.add_argument("--depositors", type=int, default=100_000, help="depositors per vault")
+    args = parser.parse_args()
+
+    # addresses are shared across vaults in the same way real users deposit into several vaults
+    unique_depositors = [random_address() for _ in range(args.depositors)]
+    vault_addresses = [random_address() for _ in range(args.vaults)]
+    depositor_addresses = [unique_depositors for _ in vault_addresses]
+    buy_tokens = [random_address() for _ in range(4)]
+
+    legacy_bytes = measure(lambda: build_legacy(vault_addresses, depositor_addresses, buy_tokens))
+    store_bytes = measure(lambda: build_store(vault_addresses, depositor_addresses, buy_tokens))
+    rows = args.vaults * args.depositors
+    print(f"ROWS (vault, depositor): {rows}")
+    print(f"DATACLASS + DICTS: {legacy_bytes / 2**20:.1f} MiB ({legacy_bytes / rows:.0f} B/row)")
+    print(f"DEPOSITOR STORE:   {store_bytes / 2**20:.1f} MiB ({store_bytes / rows:.0f} B/row)")
+    print(f"REDUCTION:         {legacy_bytes / store_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+from typing import List
 from brownie import config, network
 from helpers import get_account_from_pk, CONSOLE_SEPARATOR
+from scripts.deployment_manifest import DeploymentManifest
+from scripts.deployment import DeploymentEngine, DeploymentStep, Ref
 from brownie import (
     Contract,
     Resolver,
@@ -30,61 +33,58 @@ def main():
     creator_percentage_fee_on_deposit = 25  # 0.25%
     treasury_percentage_fee_on_balance_update = 25  # 0.25%
 
-    print(CONSOLE_SEPARATOR)
-    print("TREASURY VAULT DEPLOYMENT:")
-    treasury_vault = deploy_treasury_vault(dev_wallet, verify_flag)
-    treasury_address = treasury_vault.address
-
-    print(CONSOLE_SEPARATOR)
-    print("CONTROLLER DEPLOYMENT:")
-    controller = deploy_controller(dev_wallet, verify_flag)
-    controller_address = controller.address
-
-    print(CONSOLE_SEPARATOR)
-    print("STRATEGY WORKER DEPLOYMENT:")
-    strategy_worker = deploy_strategy_worker(
-        dev_wallet,
-        verify_flag,
+    steps = deployment_steps(
         dex_router_address,
-        dex_main_token_address,
-        controller_address,
-    )
-    strategy_worker_address = strategy_worker.address
-
-    print(CONSOLE_SEPARATOR)
-    print("PRICE FEEDS DATA CONSUMER DEPLOYMENT:")
-    price_feeds_data_consumer = deploy_price_feeds_data_consumer(
-        dev_wallet, verify_flag, native_token_data_feed_address
-    )
-    price_feeds_data_consumer_address = price_feeds_data_consumer.address
-
-    print(CONSOLE_SEPARATOR)
-    print("STRATEGY MANAGER DEPLOYMENT:")
-    strategy_manager = deploy_strategy_manager(dev_wallet, verify_flag, price_feeds_data_consumer_address)
-    strategy_manager_address = strategy_manager.address
-
-    print(CONSOLE_SEPARATOR)
-    print("STRATEGY VAULTS FACTORY DEPLOYMENT:")
-    automated_vaults_factory = deploy_automated_vaults_factory(
-        dev_wallet,
-        verify_flag,
         dex_factory_address,
         dex_main_token_address,
-        treasury_address,
-        strategy_manager_address,
+        native_token_data_feed_address,
         treasury_fixed_fee_on_vault_creation,
         creator_percentage_fee_on_deposit,
         treasury_percentage_fee_on_balance_update,
     )
-    automated_vaults_factory_address = automated_vaults_factory.address
-
+    manifest = DeploymentManifest(network.show_active())
     print(CONSOLE_SEPARATOR)
-    print("RESOLVER DEPLOYMENT:")
-    deploy_resolver(dev_wallet, verify_flag, automated_vaults_factory_address, strategy_worker_address)
+    print(f"DEPLOYING CONTRACTS (MANIFEST: {manifest.path}):")
+    contracts, _ = DeploymentEngine(dev_wallet, manifest, verify_flag).deploy(steps)
 
+    # checked on every run, a whitelisting that failed or assets added to the config since are caught up
     print(CONSOLE_SEPARATOR)
     print("WHITELISTING DEPOSIT ASSETS:")
-    whitelist_deposit_assets(strategy_manager, dev_wallet)
+    whitelist_deposit_assets(contracts["StrategyManager"], dev_wallet)
+
+
+def deployment_steps(
+    dex_router_address: str,
+    dex_factory_address: str,
+    dex_main_token_address: str,
+    native_token_data_feed_address: str,
+    treasury_fixed_fee_on_vault_creation: int,
+    creator_percentage_fee_on_deposit: int,
+    treasury_percentage_fee_on_balance_update: int,
+) -> List[DeploymentStep]:
+    return [
+        DeploymentStep("TreasuryVault", TreasuryVault),
+        DeploymentStep("Controller", Controller),
+        DeploymentStep(
+            "StrategyWorker", StrategyWorker, (dex_router_address, dex_main_token_address, Ref("Controller"))
+        ),
+        DeploymentStep("PriceFeedsDataConsumer", PriceFeedsDataConsumer, (native_token_data_feed_address,)),
+        DeploymentStep("StrategyManager", StrategyManager, (Ref("PriceFeedsDataConsumer"),)),
+        DeploymentStep(
+            "AutomatedVaultsFactory",
+            AutomatedVaultsFactory,
+            (
+                dex_factory_address,
+                dex_main_token_address,
+                Ref("TreasuryVault"),
+                Ref("StrategyManager"),
+                treasury_fixed_fee_on_vault_creation,
+                creator_percentage_fee_on_deposit,
+                treasury_percentage_fee_on_balance_update,
+            ),
+        ),
+        DeploymentStep("Resolver", Resolver, (Ref("AutomatedVaultsFactory"), Ref("StrategyWorker"))),
+    ]
 
 
 def deploy_treasury_vault(wallet_address: str, verify_flag: bool) -> Contract:
@@ -164,5 +164,27 @@ def deploy_resolver(
 
 
 def whitelist_deposit_assets(strategy_manager: Contract, wallet_address: str):
-    assets_to_whitelist = config["networks"][network.show_active()]["whitelisted_deposit_assets"]
+    configured_assets = config["networks"][network.show_active()]["whitelisted_deposit_assets"]
+    assets_to_whitelist = missing_deposit_assets(
+        configured_assets,
+        [strategy_manager.getWhitelistedDepositAsset(asset[0]) for asset in configured_assets],
+    )
+    if not assets_to_whitelist:
+        print("DEPOSIT ASSETS ALREADY WHITELISTED")
+        return
     strategy_manager.addWhitelistedDepositAssets(assets_to_whitelist, {"from": wallet_address})
+    print(f"{len(assets_to_whitelist)} DEPOSIT ASSETS WHITELISTED")
+
+
+# Configured assets not whitelisted yet, or whitelisted with another asset type or oracle. Assets deactivated
+# on-chain are left as they are, they are only reactivated by whitelisting them again explicitly.
+def missing_deposit_assets(configured_assets: List[list], whitelisted_assets: List[tuple]) -> List[list]:
+    return [
+        configured_asset
+        for configured_asset, (asset_address, asset_type, oracle_address, _) in zip(
+            configured_assets, whitelisted_assets
+        )
+        if asset_address.lower() != configured_asset[0].lower()
+        or asset_type != configured_asset[1]
+        or oracle_address.lower() != configured_asset[2].lower()
+    ]
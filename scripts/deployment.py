@@ -0,0 +1,84 @@
+from eth_utils import keccak
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Tuple
+from scripts.deployment_manifest import DeploymentManifest
+
+# brownie is only needed to deploy, planning the levels of the steps works without it
+if TYPE_CHECKING:
+    from brownie.network.account import Account
+    from brownie.network.contract import Contract, ContractContainer
+
+
+# Constructor argument resolved to the address of another step of the same deployment
+class Ref(NamedTuple):
+    name: str
+
+
+class DeploymentStep(NamedTuple):
+    name: str
+    container: "ContractContainer"
+    args: Tuple = ()
+
+    @property
+    def dependencies(self) -> List[str]:
+        return [arg.name for arg in self.args if isinstance(arg, Ref)]
+
+
+# Groups the steps in levels (Kahn's algorithm), every step only depends on steps of previous levels
+def deployment_levels(steps: List[DeploymentStep]) -> List[List[DeploymentStep]]:
+    steps_by_name = {step.name: step for step in steps}
+    for step in steps:
+        unknown_dependencies = set(step.dependencies) - set(steps_by_name)
+        if unknown_dependencies:
+            raise ValueError(f"{step.name} depends on unknown steps {sorted(unknown_dependencies)}")
+    resolved, levels = set(), []
+    while len(resolved) < len(steps):
+        level = [step for step in steps if step.name not in resolved and set(step.dependencies) <= resolved]
+        if not level:
+            raise ValueError(f"Dependency cycle between {sorted(set(steps_by_name) - resolved)}")
+        levels.append(level)
+        resolved.update(step.name for step in level)
+    return levels
+
+
+# Deploys every level at once: the transactions of a level are sent back to back with locally assigned nonces
+# (required_confs=0) and only then awaited. A step whose bytecode and constructor args match the manifest entry,
+# with code still at the recorded address, is reused instead of redeployed. Redeploying a contract changes the
+# args of the steps referencing it, so they are redeployed as well.
+class DeploymentEngine:
+    def __init__(self, account: "Account", manifest: DeploymentManifest, publish_source: bool = False):
+        self.account = account
+        self.manifest = manifest
+        self.publish_source = publish_source
+
+    def deploy(self, steps: List[DeploymentStep]) -> Tuple[Dict[str, "Contract"], List[str]]:
+        from brownie import web3
+
+        contracts: Dict[str, "Contract"] = {}
+        deployed_names = []
+        for level in deployment_levels(steps):
+            pending = []
+            nonce = self.account.nonce
+            for step in level:
+                args = [contracts[arg.name].address if isinstance(arg, Ref) else arg for arg in step.args]
+                fingerprint = keccak(hexstr=step.container.deploy.encode_input(*args)).hex()
+                entry = self.manifest.get(step.name)
+                if entry and entry["fingerprint"] == fingerprint and web3.eth.get_code(entry["address"]):
+                    print(f"{step.name} UNCHANGED, USING {entry['address']}")
+                    contracts[step.name] = step.container.at(entry["address"])
+                    continue
+                tx = step.container.deploy(*args, {"from": self.account, "nonce": nonce, "required_confs": 0})
+                print(f"{step.name} DEPLOYMENT SENT: {tx.txid}")
+                pending.append((step, tx, fingerprint))
+                nonce += 1
+            for step, tx, fingerprint in pending:
+                tx.wait(1)
+                if tx.status != 1:
+                    raise RuntimeError(f"{step.name} deployment reverted: {tx.txid}")
+                self.manifest.record(step.name, tx.contract_address, fingerprint, tx.txid, tx.block_number)
+                contracts[step.name] = step.container.at(tx.contract_address)
+                deployed_names.append(step.name)
+                print(f"{step.name} DEPLOYED AT {tx.contract_address}")
+            if self.publish_source:
+                for step, _, _ in pending:
+                    step.container.publish_source(contracts[step.name])
+        return contracts, deployed_names
@@ -0,0 +1,62 @@
+import os
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional
+
+DEPLOYMENTS_PATH = Path(__file__).resolve().parents[1] / "deployments"
+
+# brownie-config.yaml network settings overridden by the manifest addresses
+NETWORK_SETTINGS_KEYS = {
+    "TreasuryVault": "treasury_address",
+    "Controller": "controller_address",
+    "StrategyWorker": "worker_address",
+    "AutomatedVaultsFactory": "vaults_factory_address",
+    "Resolver": "resolver_address",
+}
+
+
+# deployments/<network>.json: address, deployment fingerprint (bytecode + constructor args) and transaction
+# of every contract deployed by scripts/deploy.py. Kept free of brownie imports so the backend can read it.
+class DeploymentManifest:
+    def __init__(self, network_name: str, deployments_path: Path = DEPLOYMENTS_PATH):
+        self.network_name = network_name
+        self.path = Path(deployments_path) / f"{network_name}.json"
+        self._lock = Lock()
+        self.contracts: Dict[str, dict] = {}
+        if self.path.exists():
+            with open(self.path) as file:
+                self.contracts = json.load(file)["contracts"]
+
+    def get(self, name: str) -> Optional[dict]:
+        return self.contracts.get(name)
+
+    def address(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        entry = self.contracts.get(name)
+        return default if entry is None else entry["address"]
+
+    def record(self, name: str, address: str, fingerprint: str, tx_hash: str, block_number: int):
+        with self._lock:
+            self.contracts[name] = {
+                "address": address,
+                "fingerprint": fingerprint,
+                "tx_hash": tx_hash,
+                "block_number": block_number,
+            }
+            self._save()
+
+    def apply_to_network_settings(self, network_settings: dict) -> dict:
+        network_settings = dict(network_settings)
+        for name, settings_key in NETWORK_SETTINGS_KEYS.items():
+            if name in self.contracts:
+                network_settings[settings_key] = self.contracts[name]["address"]
+        return network_settings
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp_path, "w") as file:
+            json.dump({"network": self.network_name, "contracts": self.contracts}, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,149 @@
+import io
+import os
+import json
+import time
+import requests
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional
+
+VERIFIED = "verified"
+FAILED = "failed"
+
+
+class ExplorerError(Exception):
+    pass
+
+
+# https://etherscan.io/contract-license-types
+def license_type(license_identifier: str) -> int:
+    identifier = license_identifier.lower()
+    if "unlicensed" in identifier:
+        return 2
+    if "mit" in identifier:
+        return 3
+    if "agpl" in identifier and "3.0" in identifier:
+        return 13
+    if "lgpl" in identifier:
+        return 6 if "2.1" in identifier else 7 if "3.0" in identifier else 1
+    if "gpl" in identifier:
+        return 4 if "2.0" in identifier else 5 if "3.0" in identifier else 1
+    if "bsd-2-clause" in identifier:
+        return 8
+    if "bsd-3-clause" in identifier:
+        return 9
+    if "mpl" in identifier and "2.0" in identifier:
+        return 10
+    if identifier.startswith("osl") and "3.0" in identifier:
+        return 11
+    if "apache" in identifier and "2.0" in identifier:
+        return 12
+    return 1
+
+
+# Client for the etherscan style verification API (etherscan, arbiscan, ...). The api url is a parameter so any
+# compatible explorer, or a local stand-in server, can be used.
+class ExplorerClient:
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str,
+        poll_interval: float = 10,
+        max_polls: int = 30,
+        session: Optional[requests.Session] = None,
+    ):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.poll_interval = poll_interval
+        self.max_polls = max_polls
+        self.session = requests.Session() if session is None else session
+
+    def _request(self, method: str, **kwargs) -> dict:
+        response = self.session.request(method, self.api_url, timeout=30, **kwargs)
+        if response.status_code != 200:
+            raise ExplorerError(f"Status {response.status_code} when querying {self.api_url}: {response.text}")
+        return response.json()
+
+    def is_verified(self, address: str) -> bool:
+        data = self._request(
+            "GET",
+            params={"apikey": self.api_key, "module": "contract", "action": "getsourcecode", "address": address},
+        )
+        return int(data["status"]) == 1 and bool(data["result"][0].get("SourceCode"))
+
+    def submit(self, address: str, verification_info: dict, contract_name: str, constructor_arguments: str) -> str:
+        data = self._request(
+            "POST",
+            data={
+                "apikey": self.api_key,
+                "module": "contract",
+                "action": "verifysourcecode",
+                "contractaddress": address,
+                "sourceCode": io.StringIO(json.dumps(verification_info["standard_json_input"])),
+                "codeformat": "solidity-standard-json-input",
+                "contractname": contract_name,
+                "compilerversion": f"v{verification_info['compiler_version']}",
+                "optimizationUsed": 1 if verification_info["optimizer_enabled"] else 0,
+                "runs": verification_info["optimizer_runs"],
+                "constructorArguements": constructor_arguments,
+                "licenseType": license_type(verification_info["license_identifier"]),
+            },
+        )
+        if int(data["status"]) != 1:
+            if "already verified" in str(data["result"]).lower():
+                return ""
+            raise ExplorerError(f"Failed to submit verification request for {address}: {data['result']}")
+        return data["result"]
+
+    def wait(self, guid: str) -> bool:
+        for _ in range(self.max_polls):
+            time.sleep(self.poll_interval)
+            data = self._request(
+                "GET",
+                params={"apikey": self.api_key, "module": "contract", "action": "checkverifystatus", "guid": guid},
+            )
+            if data["result"] != "Pending in queue":
+                return data["message"] == "OK" or "already verified" in str(data["result"]).lower()
+        raise ExplorerError(f"Verification {guid} still pending after {self.max_polls} polls")
+
+    def publish_source(
+        self, address: str, verification_info: dict, contract_name: str, constructor_arguments: str
+    ) -> bool:
+        guid = self.submit(address, verification_info, contract_name, constructor_arguments)
+        return guid == "" or self.wait(guid)
+
+
+# Per-vault verification results keyed by the vault index in the factory. The file is rewritten atomically
+# (tmp file + os.replace) after every vault so an interrupted run resumes from the vaults left to verify.
+class VerificationProgress:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = Lock()
+        with open(self.path) as file:
+            self.data = json.load(file)
+        self.data.setdefault("last_verified_vault", -1)
+        self.vaults: Dict[str, dict] = self.data.setdefault("vaults", {})
+
+    @property
+    def last_verified_vault(self) -> int:
+        return self.data["last_verified_vault"]
+
+    def is_verified(self, index: int) -> bool:
+        return index <= self.last_verified_vault or self.vaults.get(str(index), {}).get("status") == VERIFIED
+
+    def record(self, index: int, address: str, status: str, error: Optional[str] = None):
+        with self._lock:
+            self.vaults[str(index)] = {"address": address, "status": status, "error": error}
+            # every vault up to last_verified_vault is verified, their entries are no longer needed
+            while self.vaults.get(str(self.last_verified_vault + 1), {}).get("status") == VERIFIED:
+                self.data["last_verified_vault"] += 1
+                del self.vaults[str(self.last_verified_vault)]
+            self._save()
+
+    def _save(self):
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp_path, "w") as file:
+            json.dump(self.data, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,25 @@
+import json
+from brownie import project
+from docs.abis import abi_registry
+
+# Refreshes the ABI json artifacts read by docs/abis and the standalone backend from the compiled project.
+# EXECUTE IN PROJECT ROOT:
+# brownie run scripts/export_abis.py
+
+EXPORTED_CONTRACTS = {
+    "vault": "AutomatedVaultERC4626",
+    "vaults_factory": "AutomatedVaultsFactory",
+    "controller": "Controller",
+    "strategy_worker": "StrategyWorker",
+    "resolver": "Resolver",
+    "treasury": "TreasuryVault",
+}
+
+
+def main():
+    active_project = project.get_loaded_projects()[0]
+    for abi_name, contract_name in EXPORTED_CONTRACTS.items():
+        with open(abi_registry.abis_path / f"{abi_name}.json", "w") as file:
+            json.dump(active_project[contract_name].abi, file, indent=2)
+            file.write("\n")
+        print(f"{contract_name} ABI exported to {abi_name}.json")
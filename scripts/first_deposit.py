@@ -7,8 +7,10 @@ from helpers import (
     perc_mul_contracts_simulate,
     check_network_is_mainnet_fork,
     NULL_ADDRESS,
+    get_contract_at,
+    get_contract_from_abi,
 )
-from docs.abis import erc20_abi, univ2_dex_router_abi
+from scripts.deployment_manifest import DeploymentManifest
 
 dev_wallet = get_account_from_pk(1)
 deployer_wallet = get_account_from_pk(2)
@@ -19,11 +21,12 @@ active_network_configs = config["networks"][network.show_active()]
 protocol_params = config["protocol-params"]
 strategy_params = config["strategy-params"]
 
-strategy_manager_address = "0xEBF39FB51c23918F2FcbbD0600Bb6dE1546a37C3"
-strategy_worker_address = "0x43Cc4744343fC5d44F27f4Ff2d97D18b261aEeC8"
-factory_address = "0xF45309A5269a28e4F49Ab3aDd7aAFC70b1362E85"
+deployment_manifest = DeploymentManifest(network.show_active())
+strategy_manager_address = deployment_manifest.address("StrategyManager", "0xEBF39FB51c23918F2FcbbD0600Bb6dE1546a37C3")
+strategy_worker_address = deployment_manifest.address("StrategyWorker", "0x43Cc4744343fC5d44F27f4Ff2d97D18b261aEeC8")
+factory_address = deployment_manifest.address("AutomatedVaultsFactory", "0xF45309A5269a28e4F49Ab3aDd7aAFC70b1362E85")
 
-vaults_factory = AutomatedVaultsFactory.at(factory_address)
+vaults_factory = get_contract_at(AutomatedVaultsFactory, factory_address)
 
 active_network_configs = config["networks"][network.show_active()]
 protocol_params = config["protocol-params"]
@@ -68,16 +71,16 @@ def __get_default_strategy_and_init_vault_params(configs: dict):
     init_vault_from_factory_params,
 ) = __get_default_strategy_and_init_vault_params(configs)
 
-deposit_token = Contract.from_abi(
+deposit_token = get_contract_from_abi(
     "ERC20",
     config["networks"][network.show_active()]["deposit_token_address"],
-    erc20_abi,
+    "erc20",
 )
 
 # deposit_token.approve(vaults_factory.address, deposit_amount, {"from": dev_wallet})
 
 vault_address = vaults_factory.getBatchVaults(1, 0)[0]
-vault = AutomatedVaultERC4626.at(vault_address)
+vault = get_contract_at(AutomatedVaultERC4626, vault_address)
 
 vault.approve(
     "0x43Cc4744343fC5d44F27f4Ff2d97D18b261aEeC8", 999_999_999_999_999_999_999_999_999_999, {"from": dev_wallet}
@@ -0,0 +1,144 @@
+from typing import Dict, List, NamedTuple, Optional
+from brownie import MockERC20, MockV3Aggregator, MockUniswapV2Pair, MockUniswapV2Factory, MockUniswapV2Router
+from brownie.network.account import Account
+from brownie.network.contract import Contract
+from helpers import get_token_metadata
+
+# Offline stand-in for the dex, tokens and price feeds of the arbitrum-main-fork network configs. Every token but
+# LON (never paired) gets a WETH pair holding LIQUIDITY_USD of each side at the price of its feed.
+PRICE_FEED_DECIMALS = 8
+LIQUIDITY_USD = 10_000_000
+FUNDED_WALLET_NATIVE_AMOUNT = 10 * 10**18
+FUNDED_WALLET_DEPOSIT_TOKEN_USD = 1_000_000
+DEX_MAIN_TOKEN = "WETH"
+DEPOSIT_TOKEN = "USDC.e"
+BUY_TOKENS = ["GMX", "ARB"]
+TOO_MANY_BUY_TOKENS = ["GMX", "WETH", "ARB", "LINK", "UNI", "CRV"]
+TOKEN_NOT_PAIRED_WITH_WETH = "LON"
+NOT_WHITELISTED_TOKEN = "AIDOGE"
+
+
+class MarketToken(NamedTuple):
+    symbol: str
+    decimals: int
+    usd_price: float
+    asset_type: Optional[int]  # None for the tokens that are not whitelisted deposit assets
+
+
+# Same order as the whitelisted_deposit_assets of brownie-config.yaml: STABLE (0), ETH_BTC (1), BLUE_CHIP (2)
+MARKET_TOKENS = [
+    MarketToken("USDC.e", 6, 1, 0),
+    MarketToken("USDC", 6, 1, 0),
+    MarketToken("USDT", 6, 1, 0),
+    MarketToken("DAI", 18, 1, 0),
+    MarketToken("WETH", 18, 2_000, 1),
+    MarketToken("WBTC", 8, 40_000, 1),
+    MarketToken("LINK", 18, 10, 2),
+    MarketToken("UNI", 18, 5, 2),
+    MarketToken("CRV", 18, 0.5, 2),
+    MarketToken("GMX", 18, 40, 2),
+    MarketToken("ARB", 18, 1, 2),
+    MarketToken("LON", 18, 1, None),
+    MarketToken("AIDOGE", 18, 0.0001, None),
+]
+
+
+class LocalMarket(NamedTuple):
+    tokens: Dict[str, Contract]
+    price_feeds: Dict[str, Contract]
+    dex_factory: Contract
+    dex_router: Contract
+    network_configs: dict
+
+
+def deploy_local_market(deployer: Account, funded_wallets: List[Account]) -> LocalMarket:
+    tx_params = {"from": deployer}
+    tokens, price_feeds = {}, {}
+    for token in MARKET_TOKENS:
+        tokens[token.symbol] = MockERC20.deploy(token.symbol, token.symbol, token.decimals, tx_params)
+        price_feeds[token.symbol] = MockV3Aggregator.deploy(
+            PRICE_FEED_DECIMALS, to_price_feed_answer(token.usd_price), tx_params
+        )
+    dex_factory = MockUniswapV2Factory.deploy(tx_params)
+    dex_router = MockUniswapV2Router.deploy(dex_factory.address, tx_params)
+    dex_main_token = tokens[DEX_MAIN_TOKEN]
+    main_token_price = _market_token(DEX_MAIN_TOKEN).usd_price
+    for token in MARKET_TOKENS:
+        if token.symbol in (DEX_MAIN_TOKEN, TOKEN_NOT_PAIRED_WITH_WETH):
+            continue
+        set_pair_reserves(
+            dex_factory,
+            tokens[token.symbol],
+            dex_main_token,
+            to_token_amount(LIQUIDITY_USD / token.usd_price, token.decimals),
+            to_token_amount(LIQUIDITY_USD / main_token_price, 18),
+            deployer,
+        )
+    deposit_token = _market_token(DEPOSIT_TOKEN)
+    for wallet in funded_wallets:
+        deployer.transfer(wallet, FUNDED_WALLET_NATIVE_AMOUNT)
+        tokens[DEPOSIT_TOKEN].mint(
+            wallet,
+            to_token_amount(FUNDED_WALLET_DEPOSIT_TOKEN_USD / deposit_token.usd_price, deposit_token.decimals),
+            tx_params,
+        )
+    network_configs = {
+        "verify": False,
+        "dex_router_address": dex_router.address,
+        "dex_factory_address": dex_factory.address,
+        "dex_main_token_address": dex_main_token.address,
+        "native_token_data_feed_address": price_feeds[DEX_MAIN_TOKEN].address,
+        "deposit_token_address": tokens[DEPOSIT_TOKEN].address,
+        "buy_token_addresses": [tokens[symbol].address for symbol in BUY_TOKENS],
+        "vault_name": "GMX/ARB DCA Vault",
+        "vault_symbol": "GMX/ARB_DCA",
+        "token_not_paired_with_weth_address": tokens[TOKEN_NOT_PAIRED_WITH_WETH].address,
+        "too_many_buy_token_addresses": [tokens[symbol].address for symbol in TOO_MANY_BUY_TOKENS],
+        "whitelisted_deposit_assets": [
+            [tokens[token.symbol].address, token.asset_type, price_feeds[token.symbol].address, True]
+            for token in MARKET_TOKENS
+            if token.asset_type is not None
+        ],
+        "not_whitelisted_token_address_example": tokens[NOT_WHITELISTED_TOKEN].address,
+    }
+    return LocalMarket(tokens, price_feeds, dex_factory, dex_router, network_configs)
+
+
+# Creates the pair if needed, then mints/burns the pair balances to the requested reserves and syncs them
+def set_pair_reserves(
+    dex_factory: Contract, token_a: Contract, token_b: Contract, reserve_a: int, reserve_b: int, account: Account
+) -> Contract:
+    tx_params = {"from": account}
+    token_metadata = get_token_metadata()
+    pair_address = token_metadata.pair(dex_factory.address, token_a.address, token_b.address)
+    if pair_address is None:
+        pair_created = dex_factory.createPair(token_a.address, token_b.address, tx_params).events["PairCreated"]
+        token_metadata.apply_pair_created(
+            dex_factory.address, pair_created["token0"], pair_created["token1"], pair_created["pair"]
+        )
+        pair_address = pair_created["pair"]
+    for token, reserve in ((token_a, reserve_a), (token_b, reserve_b)):
+        balance = token.balanceOf(pair_address)
+        if reserve > balance:
+            token.mint(pair_address, reserve - balance, tx_params)
+        elif reserve < balance:
+            token.burn(pair_address, balance - reserve, tx_params)
+    pair = MockUniswapV2Pair.at(pair_address)
+    pair.sync(tx_params)
+    return pair
+
+
+def set_price_feed_answer(price_feed: Contract, usd_price: float, account: Account):
+    price_feed.updateAnswer(to_price_feed_answer(usd_price), {"from": account})
+
+
+def to_price_feed_answer(usd_price: float) -> int:
+    return round(usd_price * 10**PRICE_FEED_DECIMALS)
+
+
+def to_token_amount(amount: float, decimals: int) -> int:
+    return round(amount * 10**decimals)
+
+
+def _market_token(symbol: str) -> MarketToken:
+    return next(token for token in MARKET_TOKENS if token.symbol == symbol)
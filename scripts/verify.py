@@ -1,17 +1,61 @@
-import json
+import os
 
+from eth_abi import abi
+from eth_utils.abi import collapse_if_tuple
 from pathlib import Path
-from helpers import CONSOLE_SEPARATOR
+from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from docs.abis import abi_registry
+from helpers import CONSOLE_SEPARATOR, get_contract_at
+from scripts.explorer import FAILED, VERIFIED, ExplorerClient, VerificationProgress
+from scripts.backend.helpers import BATCH_READ_LIMIT
 from brownie import (
     config,
     network,
     AutomatedVaultERC4626,
     AutomatedVaultsFactory,
 )
+from brownie._config import CONFIG
+from brownie.network.contract import _explorer_tokens
 
 PATH_TO_DATA = str(Path("./scripts/data/script_data.json").resolve())
 FACTORY_ADDRESS = config["networks"][network.show_active()]["vaults_factory_address"]
 
+# Explorers rate limit the api keys, keep the number of verifications in flight low
+MAX_CONCURRENT_VERIFICATIONS = 4
+
+
+# The api url defaults to the brownie network explorer, EXPLORER_API_URL/EXPLORER_API_KEY override it
+def get_explorer_client() -> ExplorerClient:
+    api_url = os.getenv("EXPLORER_API_URL") or CONFIG.active_network.get("explorer")
+    if api_url is None:
+        raise ValueError("Explorer API not set for this network")
+    api_key = os.getenv("EXPLORER_API_KEY") or next(
+        (os.getenv(env_token) for name, env_token in _explorer_tokens.items() if name in api_url), None
+    )
+    if api_key is None:
+        raise ValueError("An explorer API token is required, set EXPLORER_API_KEY")
+    return ExplorerClient(api_url, api_key)
+
+
+def fetch_vault_addresses(factory_contract, start: int, vault_length: int) -> List[str]:
+    vault_addresses = []
+    for start_after in range(start, vault_length, BATCH_READ_LIMIT):
+        vault_addresses.extend(factory_contract.getBatchVaults(BATCH_READ_LIMIT, start_after))
+    return vault_addresses
+
+
+# Vaults are deployed by the factory, so the constructor arguments are rebuilt from the vault getters
+# (isActive is always false at deployment) instead of being read from a creation transaction.
+def get_vault_constructor_arguments(vault_contract) -> str:
+    init_params = list(vault_contract.getInitMultiAssetVaultParams())
+    init_params[5] = False
+    constructor_types = [
+        collapse_if_tuple(abi_registry.function_abi("vault", function_name)["outputs"][0])
+        for function_name in ("getInitMultiAssetVaultParams", "getStrategyParams")
+    ]
+    return abi.encode(constructor_types, [init_params, vault_contract.getStrategyParams()]).hex()
+
 
 def main():
     # NETWORK
@@ -19,35 +63,57 @@ def main():
     print("CURRENT NETWORK: ", network.show_active())
     print(CONSOLE_SEPARATOR)
 
-    with open(PATH_TO_DATA) as file:
-        data = json.load(file)
-        last_verified_vault = data["last_verified_vault"]
-        factory_contract = AutomatedVaultsFactory.at(FACTORY_ADDRESS)
-        vault_length = factory_contract.allVaultsLength()
-
-        if vault_length == 0:
-            print('No vaults have been deployed!')
-            return
-        if vault_length - last_verified_vault == 1:
-            print("All vaults have been verified.")
-            return
-        
-        vaults_verified = []
-        vaults_failed_to_verify = []
-        start_after = last_verified_vault + 1
-        vaults = factory_contract.getBatchVault(vault_length, start_after)
-
-        for i, vault in enumerate(vaults, start=start_after):
-            vault_contract = AutomatedVaultERC4626.at(vault)
-            published = AutomatedVaultERC4626.publish_source(vault_contract)
-            if not published:
-                vaults_failed_to_verify.append((i, vault))
-            else:
-                vaults_verified.append((i, vault))
-
-        # If all contracts are sucessfully verified the last verified vault is length - 1 else is the first failed vault index
-        data["last_verified_vault"] = vaults_failed_to_verify[0][0] - 1 if vaults_failed_to_verify else vault_length-1
-        data = json.dump(data)
-        file.write(data)
-        print(f"Execution completed!\n Validated Vaults: {[vault for _, vault in vaults_verified]}.\n Vaults that failed during validation: {[vault for _, vault in vaults_failed_to_verify]}")
-        
+    progress = VerificationProgress(PATH_TO_DATA)
+    factory_contract = get_contract_at(AutomatedVaultsFactory, FACTORY_ADDRESS)
+    vault_length = factory_contract.allVaultsLength()
+
+    if vault_length == 0:
+        print("No vaults have been deployed!")
+        return
+
+    start = progress.last_verified_vault + 1
+    pending_vaults: List[Tuple[int, str]] = [
+        (index, vault_address)
+        for index, vault_address in enumerate(fetch_vault_addresses(factory_contract, start, vault_length), start=start)
+        if not progress.is_verified(index)
+    ]
+    if not pending_vaults:
+        print("All vaults have been verified.")
+        return
+
+    explorer_client = get_explorer_client()
+    verification_info = AutomatedVaultERC4626.get_verification_info()
+    flattener = AutomatedVaultERC4626._flattener
+    contract_name = f"{flattener.contract_file}:{flattener.contract_name}"
+    # chain reads stay on the main thread, only the explorer requests run in the pool
+    constructor_arguments = {
+        vault_address: get_vault_constructor_arguments(get_contract_at(AutomatedVaultERC4626, vault_address))
+        for _, vault_address in pending_vaults
+    }
+
+    vaults_verified, vaults_failed_to_verify = [], []
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_VERIFICATIONS) as executor:
+        futures = {
+            executor.submit(
+                explorer_client.publish_source,
+                vault_address,
+                verification_info,
+                contract_name,
+                constructor_arguments[vault_address],
+            ): (index, vault_address)
+            for index, vault_address in pending_vaults
+        }
+        for future in as_completed(futures):
+            index, vault_address = futures[future]
+            try:
+                published, error = future.result(), None
+            except Exception as exception:
+                published, error = False, str(exception)
+            progress.record(index, vault_address, VERIFIED if published else FAILED, error)
+            (vaults_verified if published else vaults_failed_to_verify).append(vault_address)
+            print(f"Vault {index} ({vault_address}): {'VERIFIED' if published else f'FAILED {error}'}")
+
+    print(
+        f"Execution completed!\n Validated Vaults: {vaults_verified}.\n"
+        f" Vaults that failed during validation: {vaults_failed_to_verify}"
+    )
@@ -1,80 +1,251 @@
-import json
+import os
 import pytest
-import requests
-from typing import List
-from brownie import config, network, Contract
-from helpers import check_network_is_mainnet_fork
-from docs.abis import erc20_abi, univ2_dex_router_abi
+from eth_utils import keccak
+from typing import Callable, List, NamedTuple, Optional, Tuple
+from brownie import config, network, chain, web3, accounts, Contract, AutomatedVaultERC4626
+from brownie.network.transaction import TransactionReceipt
+from scripts.local_market import LocalMarket, deploy_local_market
+from helpers import (
+    is_local_network,
+    get_account_from_pk,
+    get_contract_at,
+    get_contract_from_abi,
+    check_network_is_local_or_mainnet_fork,
+)
+from scripts.deploy import (
+    deploy_resolver,
+    deploy_controller,
+    deploy_treasury_vault,
+    deploy_strategy_worker,
+    deploy_strategy_manager,
+    deploy_automated_vaults_factory,
+    deploy_price_feeds_data_consumer,
+)
 
+# Without keys in .env (offline runs) the test wallets get fixed keys, the local market funds wallets 1 and 2 and
+# wallet 3 stays empty. Real keys are loaded by brownie before this module is imported.
+for wallet_index in (1, 2, 3):
+    os.environ.setdefault(f"PRIVATE_KEY_{wallet_index}", keccak(text=f"PRIVATE_KEY_{wallet_index}").hex())
 
-@pytest.fixture()
-def configs() -> dict:
-    check_network_is_mainnet_fork()
-    active_network_configs = config["networks"][network.show_active()]
+dev_wallet = get_account_from_pk(1)
+dev_wallet2 = get_account_from_pk(2)
+
+DEPOSIT_TOKEN_ALLOWANCE_AMOUNT = 999_999_999_999_999_999_999_999_999_999
+CREATOR_DEPOSIT_TOKEN_AMOUNT = 20_000
+
+
+class DeployedProtocol(NamedTuple):
+    treasury_vault: Contract
+    controller: Contract
+    strategy_worker: Contract
+    price_feeds_data_consumer: Contract
+    strategy_manager: Contract
+    vaults_factory: Contract
+    resolver: Contract
+    # First vault, created by dev_wallet with a CREATOR_DEPOSIT_TOKEN_AMOUNT deposit
+    strategy_vault: Contract
+    vault_creation_tx: TransactionReceipt
+    creator_native_balance_before_vault_creation: int
+    creator_native_balance_after_vault_creation: int
+    treasury_native_balance_before_vault_creation: int
+    treasury_erc20_balance_before_vault_creation: int
+
+
+# Mock tokens, price feeds and dex deployed on local (non fork) networks, None on forks
+@pytest.fixture(scope="session")
+def local_market() -> Optional[LocalMarket]:
+    if not is_local_network():
+        return None
+    return deploy_local_market(accounts[0], [dev_wallet, dev_wallet2])
+
+
+@pytest.fixture(scope="session")
+def network_configs(local_market) -> dict:
+    if local_market is not None:
+        return local_market.network_configs
+    return config["networks"][network.show_active()]
+
+
+@pytest.fixture(scope="session")
+def configs(network_configs) -> dict:
+    check_network_is_local_or_mainnet_fork()
     protocol_params = config["protocol-params"]
     strategy_params = config["strategy-params"]
     return {
-        "dex_main_token_address": active_network_configs["dex_main_token_address"],
-        "dex_router_address": active_network_configs["dex_router_address"],
-        "dex_factory_address": active_network_configs["dex_factory_address"],
-        "native_token_data_feed_address": active_network_configs["native_token_data_feed_address"],
-        "deposit_token_address": active_network_configs["deposit_token_address"],
-        "whitelisted_deposit_assets": active_network_configs["whitelisted_deposit_assets"],
-        "not_whitelisted_token_address_example": active_network_configs["not_whitelisted_token_address_example"],
-        "buy_token_addresses": active_network_configs["buy_token_addresses"],
-        "vault_name": active_network_configs["vault_name"],
-        "vault_symbol": active_network_configs["vault_symbol"],
+        "dex_main_token_address": network_configs["dex_main_token_address"],
+        "dex_router_address": network_configs["dex_router_address"],
+        "dex_factory_address": network_configs["dex_factory_address"],
+        "native_token_data_feed_address": network_configs["native_token_data_feed_address"],
+        "deposit_token_address": network_configs["deposit_token_address"],
+        "whitelisted_deposit_assets": network_configs["whitelisted_deposit_assets"],
+        "not_whitelisted_token_address_example": network_configs["not_whitelisted_token_address_example"],
+        "buy_token_addresses": network_configs["buy_token_addresses"],
+        "vault_name": network_configs["vault_name"],
+        "vault_symbol": network_configs["vault_symbol"],
         "treasury_fixed_fee_on_vault_creation": protocol_params["treasury_fixed_fee_on_vault_creation"],
         "creator_percentage_fee_on_deposit": protocol_params["creator_percentage_fee_on_deposit"],
         "treasury_percentage_fee_on_balance_update": protocol_params["treasury_percentage_fee_on_balance_update"],
         "max_slippage_perc": protocol_params["max_slippage_perc"],
         "buy_percentages": strategy_params["buy_percentages"],
         "buy_frequency": strategy_params["buy_frequency"],
-        "token_not_paired_with_weth_address": active_network_configs["token_not_paired_with_weth_address"],
-        "too_many_buy_token_addresses": active_network_configs["too_many_buy_token_addresses"],
+        "token_not_paired_with_weth_address": network_configs["token_not_paired_with_weth_address"],
+        "too_many_buy_token_addresses": network_configs["too_many_buy_token_addresses"],
     }
 
 
-@pytest.fixture()
-def deposit_token() -> Contract:
-    return Contract.from_abi(
-        "ERC20",
-        config["networks"][network.show_active()]["deposit_token_address"],
-        erc20_abi,
-    )
+@pytest.fixture(scope="session")
+def deposit_token(network_configs) -> Contract:
+    return get_contract_from_abi("ERC20", network_configs["deposit_token_address"], "erc20")
 
 
-@pytest.fixture()
-def buy_tokens() -> List[Contract]:
+@pytest.fixture(scope="session")
+def buy_tokens(network_configs) -> List[Contract]:
     return [
-        Contract.from_abi("ERC20", buy_token_address, erc20_abi)
-        for buy_token_address in config["networks"][network.show_active()]["buy_token_addresses"]
+        get_contract_from_abi("ERC20", buy_token_address, "erc20")
+        for buy_token_address in network_configs["buy_token_addresses"]
     ]
 
 
-@pytest.fixture()
-def dex_router() -> Contract:
-    return Contract.from_abi(
-        "ROUTER",
-        config["networks"][network.show_active()]["dex_router_address"],
-        univ2_dex_router_abi,
+@pytest.fixture(scope="session")
+def dex_router(network_configs) -> Contract:
+    return get_contract_from_abi("ROUTER", network_configs["dex_router_address"], "univ2_dex_router")
+
+
+# Gas price of the connected chain, no external api is queried
+@pytest.fixture(scope="session")
+def gas_price() -> int:
+    return web3.eth.gas_price
+
+
+# Deploys and sets up the protocol once per session, then snapshots the chain: every test using `protocol`
+# starts from this state and is reverted to it afterwards.
+@pytest.fixture(scope="session")
+def deployment(configs, network_configs, deposit_token, gas_price) -> DeployedProtocol:
+    verify_flag = network_configs["verify"]
+    treasury_vault = deploy_treasury_vault(dev_wallet, verify_flag)
+    controller = deploy_controller(dev_wallet, verify_flag)
+    strategy_worker = deploy_strategy_worker(
+        dev_wallet,
+        verify_flag,
+        configs["dex_router_address"],
+        configs["dex_main_token_address"],
+        controller.address,
+    )
+    price_feeds_data_consumer = deploy_price_feeds_data_consumer(
+        dev_wallet, verify_flag, configs["native_token_data_feed_address"]
+    )
+    strategy_manager = deploy_strategy_manager(dev_wallet, verify_flag, price_feeds_data_consumer.address)
+    # setMaxExpectedGasUnits must be changed to a unrealistically low value in order to avoid erros when testing for low balances.
+    # Such a low minimum allowed deposit makes the vaults prone to Inflation attacks if
+    # (see https://github.com/OpenZeppelin/openzeppelin-contracts/blob/master/contracts/token/ERC20/extensions/ERC4626.sol)
+    # Make sure to set maxExpectedGasUnits with a real value in prod!!
+    strategy_manager.setMaxExpectedGasUnits(
+        config["protocol-params"]["worker_max_expected_gas_units_wei"], {"from": dev_wallet}
+    )
+    vaults_factory = deploy_automated_vaults_factory(
+        dev_wallet,
+        verify_flag,
+        configs["dex_factory_address"],
+        configs["dex_main_token_address"],
+        treasury_vault.address,
+        strategy_manager.address,
+        configs["treasury_fixed_fee_on_vault_creation"],
+        configs["creator_percentage_fee_on_deposit"],
+        configs["treasury_percentage_fee_on_balance_update"],
+    )
+    resolver = deploy_resolver(dev_wallet, verify_flag, vaults_factory.address, strategy_worker.address)
+    strategy_manager.addWhitelistedDepositAssets([configs["whitelisted_deposit_assets"][0]], {"from": dev_wallet})
+    deposit_token.approve(vaults_factory.address, DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": dev_wallet})
+    creator_native_balance_before_vault_creation = dev_wallet.balance()
+    treasury_native_balance_before_vault_creation = treasury_vault.balance()
+    treasury_erc20_balance_before_vault_creation = deposit_token.balanceOf(treasury_vault.address)
+    strategy_params, init_vault_from_factory_params = _default_vault_params(configs, strategy_worker, strategy_manager)
+    vault_creation_tx = vaults_factory.createVault(
+        init_vault_from_factory_params,
+        strategy_params,
+        CREATOR_DEPOSIT_TOKEN_AMOUNT,
+        {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"], "gas_price": gas_price},
+    )
+    creator_native_balance_after_vault_creation = dev_wallet.balance()
+    strategy_vault = get_contract_at(AutomatedVaultERC4626, vault_creation_tx.events["VaultCreated"]["vaultAddress"])
+    strategy_vault.approve(strategy_worker.address, DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": dev_wallet})
+    deposit_token.approve(strategy_vault.address, DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": dev_wallet})
+    chain.snapshot()
+    return DeployedProtocol(
+        treasury_vault,
+        controller,
+        strategy_worker,
+        price_feeds_data_consumer,
+        strategy_manager,
+        vaults_factory,
+        resolver,
+        strategy_vault,
+        vault_creation_tx,
+        creator_native_balance_before_vault_creation,
+        creator_native_balance_after_vault_creation,
+        treasury_native_balance_before_vault_creation,
+        treasury_erc20_balance_before_vault_creation,
     )
 
 
 @pytest.fixture()
-def gas_price() -> int:
-    current_network = network.show_active()
-    current_network_mainnet = (
-        current_network if current_network.split("-")[-1] != "fork" else current_network[: -len("-fork")]
+def protocol(deployment) -> DeployedProtocol:
+    yield deployment
+    chain.revert()
+
+
+# Overrides brownie's module_isolation, which resets the chain to its state before the session deployment. brownie
+# only runs the suite on xdist workers (`brownie test -n`) when every test requests module_isolation; the
+# isolation itself is done per test by `protocol`, so the modules of a worker share its deployment.
+@pytest.fixture(scope="module", autouse=True)
+def module_isolation():
+    yield
+
+
+# (strategy_params, init_vault_from_factory_params) of the vault created by `deployment`. The address lists are
+# copies, tests can modify them without changing the session configs.
+@pytest.fixture()
+def vault_params(configs, protocol) -> Tuple[Tuple, Tuple]:
+    return _default_vault_params(configs, protocol.strategy_worker, protocol.strategy_manager)
+
+
+@pytest.fixture()
+def create_strategy_vault(configs, protocol, vault_params, gas_price) -> Callable[[], Contract]:
+    def _create_strategy_vault(deposit_amount: int = CREATOR_DEPOSIT_TOKEN_AMOUNT) -> Contract:
+        strategy_params, init_vault_from_factory_params = vault_params
+        tx = protocol.vaults_factory.createVault(
+            init_vault_from_factory_params,
+            strategy_params,
+            deposit_amount,
+            {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"], "gas_price": gas_price},
+        )
+        return get_contract_at(AutomatedVaultERC4626, tx.events["VaultCreated"]["vaultAddress"])
+
+    return _create_strategy_vault
+
+
+# Deposits into a vault and approves the strategy worker to spend the depositor's vault shares
+@pytest.fixture()
+def deposit_to_vault(protocol, deposit_token) -> Callable[[Contract, object, int], None]:
+    def _deposit_to_vault(strategy_vault: Contract, wallet: object, amount: int):
+        deposit_token.approve(strategy_vault.address, DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": wallet})
+        strategy_vault.deposit(amount, wallet.address, {"from": wallet})
+        strategy_vault.approve(protocol.strategy_worker.address, DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": wallet})
+
+    return _deposit_to_vault
+
+
+def _default_vault_params(configs: dict, strategy_worker: Contract, strategy_manager: Contract) -> Tuple[Tuple, Tuple]:
+    init_vault_from_factory_params = (
+        configs["vault_name"],
+        configs["vault_symbol"],
+        configs["deposit_token_address"],
+        list(configs["buy_token_addresses"]),
     )
-    infura_api_key = config["rpcs"]["infura_mainnet"]
-    infura_api_endpoint = f"https://{current_network_mainnet}net.infura.io/v3/{infura_api_key}"
-    headers = {"Content-Type": "application/json"}
-    data = {
-        "jsonrpc": "2.0",
-        "method": "eth_gasPrice",
-        "params": [],
-        "id": 1,
-    }
-    response = requests.post(infura_api_endpoint, headers=headers, data=json.dumps(data))
-    return int(response.json()["result"], 16)
+    strategy_params = (
+        list(configs["buy_percentages"]),
+        configs["buy_frequency"],
+        strategy_worker.address,
+        strategy_manager.address,
+    )
+    return strategy_params, init_vault_from_factory_params
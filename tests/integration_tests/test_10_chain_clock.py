@@ -0,0 +1,57 @@
+import pytest
+from scripts.backend.metrics import Metrics
+from scripts.backend.chain_clock import ChainClock
+
+LAST_UPDATE = 1_700_000_000
+BUY_FREQUENCY = 60
+
+
+class WallClockStandIn:
+    now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def observe_blocks(clock: ChainClock, first_block: int, timestamps: list):
+    for block_number, timestamp in enumerate(timestamps, start=first_block):
+        clock.observe(block_number, timestamp)
+
+
+def test_due_in_the_first_valid_block():
+    # Arrange
+    clock = ChainClock(metrics=Metrics())
+    # Act / Assert
+    observe_blocks(clock, 100, [LAST_UPDATE + 12 * index for index in range(4)])
+    assert clock.block_interval == pytest.approx(12)
+    assert not clock.is_due(LAST_UPDATE, BUY_FREQUENCY)
+    # the next block is at LAST_UPDATE + 48 + 12, the first one where the action no longer reverts
+    clock.observe(104, LAST_UPDATE + 48)
+    assert clock.is_due(LAST_UPDATE, BUY_FREQUENCY)
+
+
+def test_repeated_timestamps_wait_for_the_due_block():
+    # Arrange
+    clock = ChainClock(metrics=Metrics())
+    # Act
+    observe_blocks(clock, 100, [LAST_UPDATE + 59, LAST_UPDATE + 59, LAST_UPDATE + 59])
+    # Assert
+    assert clock.min_block_increment == 0
+    assert not clock.is_due(LAST_UPDATE, BUY_FREQUENCY)
+    assert clock.is_due(0, BUY_FREQUENCY)
+
+
+def test_wait_is_predicted_from_chain_time_and_skew():
+    # Arrange
+    wall_clock = WallClockStandIn()
+    clock = ChainClock(wall_clock=wall_clock, metrics=Metrics())
+    # local clock 30 seconds ahead of the chain
+    wall_clock.now = LAST_UPDATE + 30
+    observe_blocks(clock, 100, [LAST_UPDATE, LAST_UPDATE + 10])
+    # Act
+    wall_clock.now += 5
+    seconds_until_due = clock.seconds_until(LAST_UPDATE + BUY_FREQUENCY)
+    # Assert
+    assert clock.skew == 20
+    # 40 seconds of chain time are missing from the next block on, minus the 5 seconds elapsed since the last one
+    assert seconds_until_due == 35
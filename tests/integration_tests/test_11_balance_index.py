@@ -0,0 +1,158 @@
+from web3 import Web3
+from eth_abi import abi
+from types import SimpleNamespace
+from docs.abis import abi_registry
+from scripts.backend.metrics import Metrics
+from scripts.backend.multicall import Multicall
+from scripts.backend.depositor_store import DepositorStore
+from scripts.backend.balance_index import BalanceIndexer, MAX_UINT256, ZERO_ADDRESS
+
+VAULT_ADDRESS = "0x" + "0a" * 20
+WORKER_ADDRESS = "0x" + "0b" * 20
+DEPOSITOR_ADDRESS = "0x" + "0c" * 20
+# deposit asset amounts (6 decimals) and the shares minted for them by the first deposit in the vault
+DEPOSIT_AMOUNT = 1000 * 10**6
+PERIODIC_BUY_AMOUNT = 100 * 10**6
+DEPOSIT_SHARES = DEPOSIT_AMOUNT * 10**18
+PERIODIC_BUY_SHARES = PERIODIC_BUY_AMOUNT * 10**18
+SNAPSHOT_BLOCK = 99
+
+
+def indexed_depositor(balance: int, allowance: int):
+    store = DepositorStore()
+    vault_id = store.addresses.intern(VAULT_ADDRESS)
+    store.set_vault_totals(vault_id, DEPOSIT_SHARES, DEPOSIT_AMOUNT)
+    row = store.add_depositor(vault_id, DEPOSITOR_ADDRESS)
+    store.balances[row], store.allowances[row] = balance, allowance
+    store.periodic_buy_amounts[row] = PERIODIC_BUY_AMOUNT
+    store.refresh_activity(row)
+    return BalanceIndexer(SimpleNamespace(worker_address=WORKER_ADDRESS), store, 0), vault_id, row
+
+
+def test_strategy_action_burn_spends_the_worker_allowance():
+    # Arrange
+    balance_indexer, vault_id, row = indexed_depositor(DEPOSIT_SHARES, PERIODIC_BUY_SHARES * 3 // 2)
+    store = balance_indexer.store
+    burn = {"from": DEPOSITOR_ADDRESS, "to": ZERO_ADDRESS, "value": PERIODIC_BUY_SHARES}
+    # Act
+    balance_indexer.apply_transfer(vault_id, burn, spent_by_worker=True)
+    # Assert
+    assert store.balances[row] == DEPOSIT_SHARES - PERIODIC_BUY_SHARES
+    assert store.allowances[row] == PERIODIC_BUY_SHARES // 2
+    assert store.refresh_activity(row)
+    assert list(store.active_vault_rows(vault_id)) == []
+
+
+def test_full_withdrawal_prunes_the_depositor_and_keeps_an_infinite_allowance():
+    # Arrange
+    balance_indexer, vault_id, row = indexed_depositor(DEPOSIT_SHARES, MAX_UINT256)
+    store = balance_indexer.store
+    burn = {"from": DEPOSITOR_ADDRESS, "to": ZERO_ADDRESS, "value": DEPOSIT_SHARES}
+    # Act
+    balance_indexer.apply_transfer(vault_id, burn, spent_by_worker=True)
+    store.refresh_activity(row)
+    # Assert
+    assert store.allowances[row] == MAX_UINT256
+    assert list(store.active_vault_rows(vault_id)) == []
+
+
+def test_approval_to_the_worker_revives_the_depositor():
+    # Arrange
+    balance_indexer, vault_id, row = indexed_depositor(DEPOSIT_SHARES, 0)
+    store = balance_indexer.store
+    # Act
+    other_spender_rows = balance_indexer.apply_approval(
+        vault_id, {"owner": DEPOSITOR_ADDRESS, "spender": VAULT_ADDRESS, "value": MAX_UINT256}
+    )
+    worker_rows = balance_indexer.apply_approval(
+        vault_id, {"owner": DEPOSITOR_ADDRESS, "spender": WORKER_ADDRESS, "value": MAX_UINT256}
+    )
+    # Assert
+    assert other_spender_rows == []
+    assert worker_rows == [row]
+    assert store.refresh_activity(row)
+    assert list(store.active_vault_rows(vault_id)) == [row]
+
+
+def test_allowance_and_balance_are_compared_in_shares():
+    # Arrange
+    balance_indexer, vault_id, row = indexed_depositor(DEPOSIT_SHARES, PERIODIC_BUY_AMOUNT)
+    store = balance_indexer.store
+    approval = {"owner": DEPOSITOR_ADDRESS, "spender": WORKER_ADDRESS, "value": PERIODIC_BUY_SHARES}
+    burn = {"from": DEPOSITOR_ADDRESS, "to": ZERO_ADDRESS, "value": DEPOSIT_SHARES - PERIODIC_BUY_SHARES + 1}
+    # Act
+    active_with_asset_allowance = store.is_active(row)
+    balance_indexer.apply_approval(vault_id, approval)
+    active_with_share_allowance = store.is_active(row)
+    balance_indexer.apply_transfer(vault_id, burn, spent_by_worker=False)
+    active_below_one_periodic_buy = store.is_active(row)
+    # Assert
+    assert store.withdrawal_shares(vault_id, PERIODIC_BUY_AMOUNT) == PERIODIC_BUY_SHARES
+    assert not active_with_asset_allowance
+    assert active_with_share_allowance
+    assert store.balances[row] == PERIODIC_BUY_SHARES - 1
+    assert not active_below_one_periodic_buy
+
+
+# Node stand-in answering the vault reads aggregated through Multicall3, depositor i deposited (i + 1) * DEPOSIT_AMOUNT
+# and the last one only deposited after SNAPSHOT_BLOCK
+class VaultsNodeStandIn:
+    def __init__(self, depositors_length: int):
+        self.block_identifiers = []
+        self.depositors_length = depositors_length
+        self.selectors = {
+            abi_registry.selector("vault", name): name
+            for name in ("balanceOf", "allowance", "getDepositorTotalPeriodicBuyAmount", "totalSupply", "totalAssets")
+        }
+
+    def get_code(self, address: str) -> bytes:
+        return b"\x01"
+
+    def call(self, transaction: dict, block_identifier) -> bytes:
+        self.block_identifiers.append(block_identifier)
+        (calls,) = abi.decode(["(address,bool,bytes)[]"], transaction["data"][4:])
+        results = [self._answer(call_data, block_identifier) for _, _, call_data in calls]
+        return abi.encode(["(bool,bytes)[]"], [[(True, abi.encode(["uint256"], [result])) for result in results]])
+
+    def _answer(self, call_data: bytes, block_identifier) -> int:
+        function_name = self.selectors[call_data[:4]]
+        if function_name == "totalSupply":
+            return sum(range(1, self.depositors_length)) * DEPOSIT_SHARES
+        if function_name == "totalAssets":
+            return sum(range(1, self.depositors_length)) * DEPOSIT_AMOUNT
+        depositor_index = int.from_bytes(call_data[4:36], "big") - 1
+        if depositor_index == self.depositors_length - 1 and block_identifier == SNAPSHOT_BLOCK:
+            return 0
+        if function_name == "balanceOf":
+            return (depositor_index + 1) * DEPOSIT_SHARES
+        if function_name == "allowance":
+            return MAX_UINT256 if depositor_index % 2 == 0 else 0
+        return PERIODIC_BUY_AMOUNT
+
+
+def test_depositors_are_read_in_multicall_batches_pinned_to_one_block():
+    # Arrange
+    store = DepositorStore()
+    vault_ids = [store.addresses.intern(VAULT_ADDRESS), store.addresses.intern("0x" + "0d" * 20)]
+    rows = [
+        store.add_depositor(vault_ids[index % 2], Web3.to_checksum_address(f"0x{index + 1:040x}")) for index in range(5)
+    ]
+    node = VaultsNodeStandIn(len(rows))
+    multicall = Multicall(SimpleNamespace(eth=node), batch_size=6, metrics=Metrics())
+    balance_indexer = BalanceIndexer(
+        SimpleNamespace(worker_address=WORKER_ADDRESS, multicall=multicall), store, SNAPSHOT_BLOCK + 1
+    )
+    # Act
+    snapshot = balance_indexer.snapshot_rows(rows, SNAPSHOT_BLOCK)
+    initialized_vault_ids = balance_indexer.initialize_rows(rows)
+    # Assert
+    assert node.block_identifiers[:4] == [SNAPSHOT_BLOCK] * 4
+    assert node.block_identifiers[4] == "latest"
+    assert list(snapshot.rows) == rows
+    assert [snapshot.balances[index] for index in range(5)] == [DEPOSIT_SHARES * index for index in (1, 2, 3, 4, 0)]
+    assert snapshot.vault_totals == {vault_id: (10 * DEPOSIT_SHARES, 10 * DEPOSIT_AMOUNT) for vault_id in vault_ids}
+    assert store.withdrawal_shares(vault_ids[0], PERIODIC_BUY_AMOUNT) == PERIODIC_BUY_SHARES
+    assert [snapshot.periodic_buy_amounts[index] for index in range(5)] == [PERIODIC_BUY_AMOUNT] * 5
+    assert initialized_vault_ids == set(vault_ids)
+    assert list(store.active_vault_rows(vault_ids[0])) == [rows[0], rows[2]]
+    assert list(store.active_vault_rows(vault_ids[1])) == []
@@ -0,0 +1,79 @@
+from eth_abi import abi
+from docs.abis import abi_registry
+from scripts.backend.metrics import Metrics
+from scripts.backend.rpc import RpcUnavailableError
+from scripts.backend.depositor_store import DepositorStore
+from scripts.backend.failures import (
+    ERROR_STRING_SELECTOR,
+    NOT_DUE,
+    SLIPPAGE,
+    ALLOWANCE_SHORTFALL,
+    FailureTracker,
+    RevertedTransactionError,
+    classify_failure,
+)
+
+NOW = 1_700_000_000
+BUY_FREQUENCY = 86400
+WORKER_ADDRESS = "0x" + "0b" * 20
+
+
+def custom_error(abi_name: str, error_name: str, types: list, values: list) -> RevertedTransactionError:
+    selector = next(
+        selector for selector, entry in abi_registry.error_selectors(abi_name).items() if entry["name"] == error_name
+    )
+    return RevertedTransactionError("execution reverted", "0x" + (selector + abi.encode(types, values)).hex())
+
+
+def test_revert_reasons_are_classified():
+    # Arrange
+    not_due = custom_error("strategy_worker", "UpdateConditionsNotMet", [], [])
+    allowance = custom_error(
+        "vault", "ERC20InsufficientAllowance", ["address", "uint256", "uint256"], [WORKER_ADDRESS, 1, 2]
+    )
+    slippage = RevertedTransactionError(
+        "execution reverted",
+        "0x" + (ERROR_STRING_SELECTOR + abi.encode(["string"], ["UniswapV2Router: INSUFFICIENT_OUTPUT_AMOUNT"])).hex(),
+    )
+    quote_below_reference = custom_error(
+        "strategy_worker", "SwapQuoteBelowReference", ["uint256", "uint256"], [1, 10**18]
+    )
+    # Act / Assert
+    assert classify_failure(not_due) == NOT_DUE
+    assert classify_failure(allowance) == ALLOWANCE_SHORTFALL
+    assert classify_failure(slippage) == SLIPPAGE
+    assert classify_failure(quote_below_reference) == SLIPPAGE
+    assert classify_failure(RpcUnavailableError("Every RPC endpoint failed")) is None
+
+
+def test_backoff_is_lifted_by_a_store_change():
+    # Arrange
+    store = DepositorStore()
+    row = store.add_depositor(store.addresses.intern("0x" + "0a" * 20), "0x" + "0c" * 20)
+    failures = FailureTracker(store, metrics=Metrics())
+    failures.record_failure(row, ALLOWANCE_SHORTFALL, NOW, BUY_FREQUENCY)
+    # Act
+    backed_off = failures.is_backed_off(row, NOW + 3600)
+    # an Approval log indexed meanwhile
+    store.allowances[row] = 2**256 - 1
+    backed_off_after_approval = failures.is_backed_off(row, NOW + 3600)
+    # Assert
+    assert backed_off
+    assert not backed_off_after_approval
+    assert failures.metrics.get("failures.rearmed_rows") == 1
+
+
+def test_consecutive_slippage_failures_back_off_exponentially():
+    # Arrange
+    store = DepositorStore()
+    row = store.add_depositor(store.addresses.intern("0x" + "0a" * 20), "0x" + "0c" * 20)
+    failures = FailureTracker(store, metrics=Metrics())
+    # Act
+    first_backoff = failures.record_failure(row, SLIPPAGE, NOW, BUY_FREQUENCY)
+    second_backoff = failures.record_failure(row, SLIPPAGE, first_backoff.until, BUY_FREQUENCY)
+    failures.record_success(row)
+    backoff_after_success = failures.record_failure(row, SLIPPAGE, NOW, BUY_FREQUENCY)
+    # Assert
+    assert second_backoff.until - first_backoff.until == 2 * (first_backoff.until - NOW)
+    assert backoff_after_success.until == first_backoff.until
+    assert not failures.is_backed_off(row, backoff_after_success.until)
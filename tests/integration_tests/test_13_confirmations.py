@@ -0,0 +1,109 @@
+import json
+import pytest
+from web3 import Web3
+from eth_abi import abi
+from threading import Thread
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from docs.abis import abi_registry
+from scripts.backend.metrics import Metrics
+from scripts.backend.rpc import PooledRpcProvider
+from scripts.backend.confirmations import DROPPED_AFTER_BLOCKS, ConfirmationTracker
+
+WORKER_ADDRESS = Web3.to_checksum_address("0x" + "0b" * 20)
+VAULT_ADDRESS = Web3.to_checksum_address("0x" + "0a" * 20)
+DEPOSITOR_ADDRESS = Web3.to_checksum_address("0x" + "0c" * 20)
+TOKEN_ADDRESS = Web3.to_checksum_address("0x" + "0d" * 20)
+CONFIRMED_HASH, REVERTED_HASH, PENDING_HASH = ("0x" + digit * 64 for digit in "123")
+SENT_AT_BLOCK = 100
+GAS_LIMIT = 500_000
+
+
+def strategy_action_log() -> dict:
+    decoder = abi_registry.event_decoder("strategy_worker", "StrategyActionExecuted")
+    data = abi.encode(
+        ["address", "uint256", "address[]", "uint256[]", "uint256"], [TOKEN_ADDRESS, 990, [TOKEN_ADDRESS], [5], 10]
+    )
+    topics = [
+        decoder.topic,
+        bytes(12) + bytes.fromhex(VAULT_ADDRESS[2:]),
+        bytes(12) + bytes.fromhex(DEPOSITOR_ADDRESS[2:]),
+    ]
+    return {
+        "address": WORKER_ADDRESS.lower(),
+        "topics": ["0x" + topic.hex() for topic in topics],
+        "data": "0x" + data.hex(),
+    }
+
+
+# JSON-RPC node stand-in holding one mined, one reverted and one still pending transaction
+class ReceiptsNodeStandIn(BaseHTTPRequestHandler):
+    posts = []
+    receipts = {
+        CONFIRMED_HASH: {"status": "0x1", "logs": [strategy_action_log()]},
+        REVERTED_HASH: {"status": "0x0", "logs": []},
+    }
+
+    def do_POST(self):
+        batch = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.posts.append(batch)
+        body = [
+            {"jsonrpc": "2.0", "id": request["id"], "result": self._receipt(request["params"][0])} for request in batch
+        ]
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _receipt(self, tx_hash: str):
+        receipt = self.receipts.get(tx_hash)
+        if receipt is None:
+            return None
+        return dict(receipt, transactionHash=tx_hash, blockNumber=hex(SENT_AT_BLOCK + 1), gasUsed=hex(GAS_LIMIT // 2))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def tracker():
+    ReceiptsNodeStandIn.posts = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReceiptsNodeStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    provider = PooledRpcProvider([f"http://127.0.0.1:{server.server_address[1]}"], metrics=Metrics())
+    runtime = SimpleNamespace(web3=Web3(provider), worker_address=WORKER_ADDRESS)
+    yield ConfirmationTracker(runtime, metrics=Metrics())
+    server.shutdown()
+    server.server_close()
+
+
+def test_pending_transactions_are_confirmed_in_one_batch(tracker):
+    # Arrange
+    for row, tx_hash in enumerate([CONFIRMED_HASH, REVERTED_HASH, PENDING_HASH]):
+        tracker.track(bytes.fromhex(tx_hash[2:]), row, SENT_AT_BLOCK, GAS_LIMIT)
+    # Act
+    confirmations = tracker.poll(SENT_AT_BLOCK + 1)
+    same_block_confirmations = tracker.poll(SENT_AT_BLOCK + 1)
+    # Assert
+    assert len(ReceiptsNodeStandIn.posts) == 1
+    assert [len(batch) for batch in ReceiptsNodeStandIn.posts] == [3]
+    assert [(confirmation.row, confirmation.succeeded) for confirmation in confirmations] == [(0, True), (1, False)]
+    assert confirmations[0].action["depositor"] == DEPOSITOR_ADDRESS.lower()
+    assert confirmations[0].action["tokenInAmount"] == 990
+    assert confirmations[0].receipt["gasUsed"] == GAS_LIMIT // 2
+    assert same_block_confirmations == []
+    assert tracker.is_pending(2)
+
+
+def test_transaction_without_receipt_is_dropped(tracker):
+    # Arrange
+    tracker.track(bytes.fromhex(PENDING_HASH[2:]), 0, SENT_AT_BLOCK, GAS_LIMIT)
+    # Act
+    still_pending = tracker.poll(SENT_AT_BLOCK + DROPPED_AFTER_BLOCKS - 1)
+    dropped = tracker.poll(SENT_AT_BLOCK + DROPPED_AFTER_BLOCKS)
+    # Assert
+    assert still_pending == []
+    assert [(confirmation.row, confirmation.receipt) for confirmation in dropped] == [(0, None)]
+    assert not tracker.is_pending(0)
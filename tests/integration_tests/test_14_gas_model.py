@@ -0,0 +1,54 @@
+from scripts.backend.metrics import Metrics
+from scripts.backend.dataclasses import StrategyVault
+from scripts.backend.depositor_store import DepositorStore
+from scripts.backend.gas_model import GAS_LIMIT_MARGIN, GasModel
+
+WETH_ADDRESS = "0x" + "ee" * 20
+USDC_ADDRESS = "0x" + "0d" * 20
+WBTC_ADDRESS = "0x" + "0f" * 20
+
+
+def strategy_vault(deposit_token_address: str, token_addresses_to_buy: list) -> StrategyVault:
+    return StrategyVault(
+        DepositorStore(), "0x" + "0a" * 20, "0x" + "0c" * 20, deposit_token_address, token_addresses_to_buy, 86400
+    )
+
+
+def test_shape_counts_swaps_through_the_dex_main_token():
+    # Arrange
+    gas_model = GasModel(WETH_ADDRESS, metrics=Metrics())
+    # Act
+    usdc_vault_shape = gas_model.shape(strategy_vault(USDC_ADDRESS, [WETH_ADDRESS, WBTC_ADDRESS]))
+    weth_vault_shape = gas_model.shape(strategy_vault(WETH_ADDRESS, [USDC_ADDRESS, WBTC_ADDRESS]))
+    # Assert
+    assert (usdc_vault_shape.buy_assets, usdc_vault_shape.indirect_swaps) == (2, 1)
+    assert (weth_vault_shape.buy_assets, weth_vault_shape.indirect_swaps) == (2, 0)
+
+
+def test_gas_limit_is_learned_from_receipts():
+    # Arrange
+    gas_model = GasModel(WETH_ADDRESS, metrics=Metrics())
+    shape = gas_model.shape(strategy_vault(USDC_ADDRESS, [WBTC_ADDRESS]))
+    # Act
+    first_gas_limit = gas_model.gas_limit(shape)
+    gas_model.observe(shape, 300_000, 400_000, succeeded=True, predicted=False)
+    gas_model.observe(shape, 250_000, 400_000, succeeded=True, predicted=False)
+    learned_gas_limit = gas_model.gas_limit(shape)
+    # Assert
+    assert first_gas_limit is None
+    assert learned_gas_limit == int(300_000 * GAS_LIMIT_MARGIN)
+    assert gas_model.metrics.get("gas_model.estimates") == 1
+    assert gas_model.metrics.get("gas_model.predictions") == 1
+
+
+def test_out_of_gas_falls_back_to_estimation():
+    # Arrange
+    gas_model = GasModel(WETH_ADDRESS, metrics=Metrics())
+    shape = gas_model.shape(strategy_vault(USDC_ADDRESS, [WBTC_ADDRESS]))
+    gas_model.observe(shape, 300_000, 400_000, succeeded=True, predicted=False)
+    gas_limit = gas_model.gas_limit(shape)
+    # Act
+    gas_model.observe(shape, gas_limit, gas_limit, succeeded=False, predicted=True)
+    # Assert
+    assert gas_model.gas_limit(shape) is None
+    assert gas_model.metrics.get("gas_model.out_of_gas") == 1
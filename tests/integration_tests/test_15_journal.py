@@ -0,0 +1,71 @@
+import json
+from scripts.backend.metrics import Metrics
+from scripts.backend.journal import TransactionJournal
+
+SENDER_ADDRESS = "0x" + "0b" * 20
+VAULT_ADDRESS = "0x" + "0a" * 20
+
+
+def intent(nonce: int) -> dict:
+    return {
+        "vault": VAULT_ADDRESS,
+        "depositor": "0x" + f"{nonce:040x}",
+        "sender": SENDER_ADDRESS,
+        "nonce": nonce,
+        "gas": 500_000,
+        "fee_params": {"maxFeePerGas": 100, "maxPriorityFeePerGas": 1},
+        "hash": "0x" + f"{nonce:064x}",
+        "raw": "0x02",
+    }
+
+
+def test_intents_are_written_in_one_group_commit(tmp_path):
+    # Arrange
+    path = tmp_path / "journal.jsonl"
+    journal_metrics = Metrics()
+    journal = TransactionJournal(path, metrics=journal_metrics)
+    # Act
+    for nonce in (7, 5, 6):
+        journal.record_intent(intent(nonce))
+    uncommitted = path.read_text()
+    journal.commit()
+    # Assert
+    assert uncommitted == ""
+    assert len(path.read_text().splitlines()) == 3
+    assert journal_metrics.get("journal.commits") == 1
+    assert [record["nonce"] for record in journal.in_flight()] == [5, 6, 7]
+
+
+def test_unresolved_intents_are_replayed(tmp_path):
+    # Arrange
+    path = tmp_path / "journal.jsonl"
+    journal = TransactionJournal(path, metrics=Metrics())
+    for nonce in (1, 2, 3):
+        journal.record_intent(intent(nonce))
+    journal.commit()
+    journal.resolve(intent(1)["hash"], "succeeded")
+    journal.resolve(intent(3)["hash"], "dropped")
+    journal.close()
+    # Act
+    replayed = TransactionJournal(path, metrics=Metrics())
+    # Assert
+    assert [record["nonce"] for record in replayed.in_flight()] == [2]
+    assert replayed.in_flight()[0]["fee_params"] == intent(2)["fee_params"]
+
+
+def test_torn_last_record_is_dropped_on_replay(tmp_path):
+    # Arrange
+    path = tmp_path / "journal.jsonl"
+    journal = TransactionJournal(path, metrics=Metrics())
+    journal.record_intent(intent(1))
+    journal.close()
+    with open(path, "a") as file:
+        file.write(json.dumps(dict(intent(2), type="intent"))[:40])
+    replay_metrics = Metrics()
+    # Act
+    replayed = TransactionJournal(path, metrics=replay_metrics)
+    replayed.record_intent(intent(3))
+    replayed.close()
+    # Assert
+    assert replay_metrics.get("journal.torn_records") == 1
+    assert [json.loads(line)["nonce"] for line in path.read_text().splitlines()] == [1, 3]
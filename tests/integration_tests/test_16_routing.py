@@ -0,0 +1,170 @@
+from web3 import Web3
+from eth_abi import abi
+from types import SimpleNamespace
+from docs.abis import abi_registry
+from scripts.backend.metrics import Metrics
+from scripts.backend.dataclasses import StrategyVault
+from scripts.backend.depositor_store import DepositorStore
+from scripts.backend.routing import PlannedAction, ReserveGraph, SwapRoute, SwapRouter, amount_out
+
+DEPOSIT_TOKEN, MAIN_TOKEN, BUY_TOKEN, HUB_TOKEN = (Web3.to_checksum_address("0x" + digit * 40) for digit in "1234")
+VAULT_ADDRESS = Web3.to_checksum_address("0x" + "0a" * 20)
+DEPOSITOR_ADDRESS = Web3.to_checksum_address("0x" + "0c" * 20)
+BUY_PERCENTAGES = (5_000, 2_500)
+TREASURY_FEE_PERCENTAGE = 30
+DEEP, THIN = 10**24, 10**18
+
+
+def pair_address(index: int) -> str:
+    return Web3.to_checksum_address("0x" + f"{index:040x}")
+
+
+def sync_log(address: str, reserve0: int, reserve1: int) -> dict:
+    decoder = abi_registry.event_decoder("univ2_pair", "Sync")
+    return {
+        "address": address,
+        "topics": [decoder.topic],
+        "data": abi.encode(["uint112", "uint112"], [reserve0, reserve1]),
+    }
+
+
+# deposit -> main -> buy is the worker's own path, deposit -> hub -> buy goes through deeper pools
+def reserve_graph(logs: list) -> ReserveGraph:
+    runtime = SimpleNamespace(web3=SimpleNamespace(eth=SimpleNamespace(get_logs=lambda log_filter: logs)))
+    graph = ReserveGraph(runtime, 100, metrics=Metrics())
+    graph.set_pair(pair_address(1), DEPOSIT_TOKEN, MAIN_TOKEN, DEEP, DEEP)
+    graph.set_pair(pair_address(2), MAIN_TOKEN, BUY_TOKEN, THIN, THIN)
+    graph.set_pair(pair_address(3), DEPOSIT_TOKEN, HUB_TOKEN, DEEP, DEEP)
+    graph.set_pair(pair_address(4), HUB_TOKEN, BUY_TOKEN, DEEP, DEEP)
+    return graph
+
+
+class VaultContractStandIn:
+    def __init__(self):
+        self.functions = self
+
+    def getStrategyParams(self):
+        return SimpleNamespace(call=lambda: [list(BUY_PERCENTAGES), 0, None, None])
+
+    def getInitMultiAssetVaultParams(self):
+        return SimpleNamespace(call=lambda: [None] * 9 + [TREASURY_FEE_PERCENTAGE])
+
+
+def test_best_route_avoids_thin_pools():
+    # Arrange
+    graph = reserve_graph([])
+    amount_in = 10**17
+    # Act
+    route = graph.best_route(DEPOSIT_TOKEN, BUY_TOKEN, amount_in)
+    # Assert
+    assert route.path == (DEPOSIT_TOKEN, HUB_TOKEN, BUY_TOKEN)
+    assert route.amount_out == amount_out(amount_out(amount_in, DEEP, DEEP), DEEP, DEEP)
+    assert route.amount_out > graph.quote((DEPOSIT_TOKEN, MAIN_TOKEN, BUY_TOKEN), amount_in)
+
+
+def test_sync_logs_move_the_cached_route():
+    # Arrange
+    graph = reserve_graph([sync_log(pair_address(2), DEEP * 10, DEEP * 10), sync_log(pair_address(4), THIN, THIN)])
+    amount_in = 10**17
+    cached_route = graph.best_route(DEPOSIT_TOKEN, BUY_TOKEN, amount_in)
+    # Act
+    graph.update(110)
+    route = graph.best_route(DEPOSIT_TOKEN, BUY_TOKEN, amount_in)
+    # Assert
+    assert cached_route.path == (DEPOSIT_TOKEN, HUB_TOKEN, BUY_TOKEN)
+    assert route.path == (DEPOSIT_TOKEN, MAIN_TOKEN, BUY_TOKEN)
+    assert graph.block_number == 111
+    assert graph.metrics.get("routing.searches") == 2
+
+
+def test_quote_many_matches_single_quotes():
+    # Arrange
+    graph = reserve_graph([])
+    amounts_in = [10**15, 10**17, 10**20]
+    path = (DEPOSIT_TOKEN, MAIN_TOKEN, BUY_TOKEN)
+    # Act
+    amounts_out = graph.quote_many(path, amounts_in)
+    # Assert
+    assert amounts_out == [amount_out(amount_out(amount, DEEP, DEEP), THIN, THIN) for amount in amounts_in]
+    assert graph.quote_many((DEPOSIT_TOKEN, pair_address(9)), amounts_in) == [0, 0, 0]
+
+
+def test_swap_routes_are_quoted_off_chain():
+    # Arrange
+    runtime = SimpleNamespace(network_settings={"dex_main_token_address": MAIN_TOKEN})
+    runtime.contract = lambda abi_name, address: VaultContractStandIn()
+    store = DepositorStore()
+    vault = StrategyVault(store, VAULT_ADDRESS, DEPOSITOR_ADDRESS, DEPOSIT_TOKEN, [BUY_TOKEN, MAIN_TOKEN], 86400)
+    row = store.add_depositor(vault.vault_id, DEPOSITOR_ADDRESS)
+    store.periodic_buy_amounts[row] = 3 * 10**17
+    graph = reserve_graph([])
+    router = SwapRouter(runtime, graph, metrics=Metrics())
+    # Act
+    buy_amounts = router.buy_amounts_after_fee(vault, row)
+    [planned_action] = router.plan_actions(vault, [row])
+    # Assert
+    assert buy_amounts == [2 * 10**17 - 6 * 10**14, 10**17 - 3 * 10**14]
+    assert planned_action == PlannedAction(
+        row,
+        [
+            SwapRoute(
+                [DEPOSIT_TOKEN, HUB_TOKEN, BUY_TOKEN],
+                graph.quote((DEPOSIT_TOKEN, HUB_TOKEN, BUY_TOKEN), buy_amounts[0]),
+            ),
+            SwapRoute([DEPOSIT_TOKEN, MAIN_TOKEN], graph.quote((DEPOSIT_TOKEN, MAIN_TOKEN), buy_amounts[1])),
+        ],
+    )
+    assert router.metrics.get("routing.quoted_swaps") == 2
+
+
+def test_actions_moving_a_traded_pool_too_much_wait_for_the_next_block():
+    # Arrange
+    runtime = SimpleNamespace(network_settings={"dex_main_token_address": MAIN_TOKEN})
+    runtime.contract = lambda abi_name, address: VaultContractStandIn()
+    store = DepositorStore()
+    vault = StrategyVault(store, VAULT_ADDRESS, DEPOSITOR_ADDRESS, DEPOSIT_TOKEN, [BUY_TOKEN, MAIN_TOKEN], 86400)
+    large_row, small_row, other_small_row = (
+        store.add_depositor(vault.vault_id, pair_address(20 + i)) for i in range(3)
+    )
+    store.periodic_buy_amounts[large_row] = 3 * 10**18
+    store.periodic_buy_amounts[small_row] = store.periodic_buy_amounts[other_small_row] = 3 * 10**17
+    graph = reserve_graph([])
+    graph.set_pair(pair_address(1), DEPOSIT_TOKEN, MAIN_TOKEN, 10**20, 10**20)
+    router = SwapRouter(runtime, graph, metrics=Metrics())
+    # Act
+    planned_actions = router.plan_actions(vault, [large_row, small_row, other_small_row])
+    revert_rate_avoided = router.revert_rate_avoided()
+    graph.update(110)
+    next_block_planned_actions = router.plan_actions(vault, [large_row])
+    # Assert
+    assert [planned_action.row for planned_action in planned_actions] == [small_row, other_small_row]
+    assert planned_actions[1].swap_routes[1].quoted_amount_out < planned_actions[0].swap_routes[1].quoted_amount_out
+    assert [planned_action.row for planned_action in next_block_planned_actions] == [large_row]
+    assert router.metrics.get("impact.deferred_actions") == 1
+    assert router.metrics.get("impact.expected_reverts_avoided") == 2
+    assert revert_rate_avoided == 2 / 3
+
+
+def test_action_moving_a_thin_pool_too_much_on_its_own_waits_for_deeper_reserves():
+    # Arrange
+    runtime = SimpleNamespace(network_settings={"dex_main_token_address": MAIN_TOKEN})
+    runtime.contract = lambda abi_name, address: VaultContractStandIn()
+    store = DepositorStore()
+    vault = StrategyVault(store, VAULT_ADDRESS, DEPOSITOR_ADDRESS, DEPOSIT_TOKEN, [BUY_TOKEN, MAIN_TOKEN], 86400)
+    row = store.add_depositor(vault.vault_id, DEPOSITOR_ADDRESS)
+    store.periodic_buy_amounts[row] = 3 * 10**18
+    graph = reserve_graph([])
+    graph.set_pair(pair_address(1), DEPOSIT_TOKEN, MAIN_TOKEN, 10**19, 10**19)
+    router = SwapRouter(runtime, graph, metrics=Metrics())
+    # Act
+    planned_actions = router.plan_actions(vault, [row])
+    graph.update(110)
+    next_block_planned_actions = router.plan_actions(vault, [row])
+    graph.set_pair(pair_address(1), DEPOSIT_TOKEN, MAIN_TOKEN, DEEP, DEEP)
+    graph.update(120)
+    deeper_reserves_planned_actions = router.plan_actions(vault, [row])
+    # Assert
+    assert planned_actions == []
+    assert next_block_planned_actions == []
+    assert [planned_action.row for planned_action in deeper_reserves_planned_actions] == [row]
+    assert router.metrics.get("impact.deferred_actions") == 2
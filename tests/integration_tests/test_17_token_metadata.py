@@ -0,0 +1,115 @@
+from web3 import Web3
+from eth_abi import abi
+from types import SimpleNamespace
+from docs.abis import abi_registry
+from scripts.backend.metrics import Metrics
+from scripts.backend.routing import ReserveGraph
+from scripts.backend.multicall import MULTICALL3_ADDRESS
+from scripts.backend.token_metadata import TokenMetadata, TokenMetadataCache
+
+CHAIN_ID = 42161
+FACTORY_ADDRESS = Web3.to_checksum_address("0x" + "0f" * 20)
+USDC, WETH, GMX, MKR, NOT_A_TOKEN = (Web3.to_checksum_address("0x" + digit * 40) for digit in "12345")
+PAIR_ADDRESS, CREATED_PAIR_ADDRESS = (Web3.to_checksum_address("0x" + digit * 40) for digit in "ab")
+DECIMALS_SELECTOR, SYMBOL_SELECTOR = (abi_registry.selector("erc20", name) for name in ("decimals", "symbol"))
+GET_PAIR_SELECTOR = abi_registry.selector("univ2_dex_factory", "getPair")
+
+
+# Node stand-in answering the Multicall3.aggregate3 calls of tokens and of a dex factory holding the USDC/WETH pair
+class EthStandIn:
+    def __init__(self):
+        self.calls = []
+        self.pairs = {frozenset((USDC, WETH)): PAIR_ADDRESS}
+
+    def get_code(self, address: str) -> bytes:
+        return b"\x01"
+
+    def call(self, transaction: dict, block_identifier) -> bytes:
+        assert transaction["to"] == MULTICALL3_ADDRESS
+        self.calls.append(transaction)
+        (calls,) = abi.decode(["(address,bool,bytes)[]"], transaction["data"][4:])
+        results = [self._answer(Web3.to_checksum_address(target), call_data) for target, _, call_data in calls]
+        return abi.encode(["(bool,bytes)[]"], [[(result is not None, result or b"") for result in results]])
+
+    def _answer(self, target: str, call_data: bytes):
+        selector = call_data[:4]
+        if target == FACTORY_ADDRESS and selector == GET_PAIR_SELECTOR:
+            token_a, token_b = abi.decode(["address", "address"], call_data[4:])
+            pair_address = self.pairs.get(frozenset(map(Web3.to_checksum_address, (token_a, token_b))), "0x" + "0" * 40)
+            return abi.encode(["address"], [pair_address])
+        if target == NOT_A_TOKEN:
+            return None
+        if selector == DECIMALS_SELECTOR:
+            return abi.encode(["uint8"], [6 if target == USDC else 18])
+        if target == MKR:
+            return b"MKR".ljust(32, b"\0")
+        return abi.encode(["string"], [{USDC: "USDC", WETH: "WETH", GMX: "GMX"}[target]])
+
+
+def token_metadata_cache(path, eth: EthStandIn) -> TokenMetadataCache:
+    return TokenMetadataCache(SimpleNamespace(eth=eth), CHAIN_ID, path, metrics=Metrics())
+
+
+def test_token_metadata_is_read_in_one_batch_and_persisted(tmp_path):
+    # Arrange
+    path = tmp_path / "token_metadata.json"
+    eth = EthStandIn()
+    cache = token_metadata_cache(path, eth)
+    # Act
+    metadata = cache.tokens([USDC, WETH, MKR, NOT_A_TOKEN])
+    reloaded_eth = EthStandIn()
+    reloaded_metadata = token_metadata_cache(path, reloaded_eth).tokens([USDC, WETH, MKR])
+    # Assert
+    assert len(eth.calls) == 1
+    assert metadata == {USDC: TokenMetadata(6, "USDC"), WETH: TokenMetadata(18, "WETH"), MKR: TokenMetadata(18, "MKR")}
+    assert reloaded_metadata == metadata
+    assert reloaded_eth.calls == []
+
+
+def test_missing_pair_is_only_replaced_on_pair_created(tmp_path):
+    # Arrange
+    eth = EthStandIn()
+    cache = token_metadata_cache(tmp_path / "token_metadata.json", eth)
+    pairs = cache.pairs(FACTORY_ADDRESS, [(USDC, WETH), (GMX, WETH)])
+    eth.pairs[frozenset((GMX, WETH))] = CREATED_PAIR_ADDRESS
+    # Act
+    cached_pair = cache.pair(FACTORY_ADDRESS, WETH, GMX)
+    cache.apply_pair_created(FACTORY_ADDRESS, GMX, WETH, CREATED_PAIR_ADDRESS)
+    created_pair = token_metadata_cache(tmp_path / "token_metadata.json", EthStandIn()).pair(FACTORY_ADDRESS, WETH, GMX)
+    # Assert
+    assert pairs == {(USDC, WETH): PAIR_ADDRESS, (GMX, WETH): None}
+    assert cached_pair is None
+    assert created_pair == CREATED_PAIR_ADDRESS
+    assert len(eth.calls) == 1
+
+
+def test_reserve_graph_follows_pairs_created_between_its_tokens():
+    # Arrange
+    eth = EthStandIn()
+    pair_created_decoder = abi_registry.event_decoder("univ2_dex_factory", "PairCreated")
+    pair_created_log = {
+        "address": FACTORY_ADDRESS,
+        "topics": [pair_created_decoder.topic] + [bytes(12) + bytes.fromhex(token[2:]) for token in (USDC, GMX)],
+        "data": abi.encode(["address", "uint256"], [CREATED_PAIR_ADDRESS, 2]),
+    }
+    eth.get_logs = lambda log_filter: [pair_created_log]
+    pair_functions = SimpleNamespace(
+        getReserves=lambda: SimpleNamespace(call=lambda: [10**12, 10**24, 0]),
+        token0=lambda: SimpleNamespace(call=lambda: USDC),
+        token1=lambda: SimpleNamespace(call=lambda: GMX),
+    )
+    runtime = SimpleNamespace(
+        web3=SimpleNamespace(eth=eth),
+        network_settings={"dex_factory_address": FACTORY_ADDRESS},
+        contract=lambda abi_name, address: SimpleNamespace(functions=pair_functions),
+    )
+    runtime.token_metadata = token_metadata_cache(None, eth)
+    graph = ReserveGraph(runtime, 100, metrics=Metrics())
+    graph.add_tokens([USDC, WETH, GMX])
+    # Act
+    graph.update(110)
+    # Assert
+    assert len(eth.calls) == 1
+    assert set(graph.pairs) == {PAIR_ADDRESS, CREATED_PAIR_ADDRESS}
+    assert runtime.token_metadata.pair(FACTORY_ADDRESS, GMX, USDC) == CREATED_PAIR_ADDRESS
+    assert graph.metrics.get("routing.created_pairs") == 1
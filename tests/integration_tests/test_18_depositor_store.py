@@ -0,0 +1,103 @@
+from eth_utils import to_checksum_address
+from scripts.backend.depositor_store import AddressBook, DepositorStore, IdTable, Uint256Column
+
+VAULT_ADDRESS = "0x" + "0a" * 20
+DEPOSITOR_ADDRESSES = ["0x" + f"{index:040x}" for index in range(1, 3001)]
+
+
+def test_addresses_are_interned_once_whatever_their_case():
+    # Arrange
+    address_book = AddressBook()
+    # Act
+    address_id = address_book.intern(DEPOSITOR_ADDRESSES[0])
+    checksum_address_id = address_book.intern(to_checksum_address(DEPOSITOR_ADDRESSES[0]))
+    upper_case_address_id = address_book.intern("0X" + DEPOSITOR_ADDRESSES[0][2:].upper())
+    # Assert
+    assert address_id == checksum_address_id == upper_case_address_id == 0
+    assert len(address_book) == 1
+    assert address_book.address(address_id) == to_checksum_address(DEPOSITOR_ADDRESSES[0])
+    assert address_book.id_of(DEPOSITOR_ADDRESSES[1]) is None
+
+
+def test_depositor_rows_are_appended_once_per_vault():
+    # Arrange
+    store = DepositorStore()
+    vault_id = store.addresses.intern(VAULT_ADDRESS)
+    other_vault_id = store.addresses.intern("0x" + "0b" * 20)
+    # Act
+    rows = store.add_depositors(vault_id, DEPOSITOR_ADDRESSES)
+    repeated_rows = store.add_depositors(vault_id, DEPOSITOR_ADDRESSES[:10])
+    other_vault_row = store.add_depositor(other_vault_id, DEPOSITOR_ADDRESSES[0])
+    # Assert
+    assert rows == list(range(len(DEPOSITOR_ADDRESSES)))
+    assert repeated_rows == rows[:10]
+    assert other_vault_row == len(DEPOSITOR_ADDRESSES)
+    assert list(store.vault_rows(vault_id)) == rows
+    assert store.depositor_ids[other_vault_row] == store.depositor_ids[rows[0]]
+    assert store.row_of(vault_id, store.addresses.id_of(DEPOSITOR_ADDRESSES[-1])) == rows[-1]
+    assert store.depositor_address(rows[-1]) == to_checksum_address(DEPOSITOR_ADDRESSES[-1])
+    assert len(store.bought_amounts) == len(store) * 5
+
+
+def test_id_table_keeps_every_id_when_it_grows():
+    # Arrange
+    keys = [index * 7919 for index in range(5000)]
+    id_table = IdTable(capacity=8)
+    # Act
+    for value, key in enumerate(keys):
+        id_table.insert(key, value, lambda inserted_value: keys[inserted_value])
+    # Assert
+    assert len(id_table) == len(keys)
+    assert len(id_table.slots) >= 2 * len(keys)
+    assert all(id_table.find(key, lambda candidate: candidate == value) == value for value, key in enumerate(keys))
+    assert id_table.find(7, lambda candidate: keys[candidate] == 7) is None
+
+
+def test_mapped_columns_are_copied_before_growing():
+    # Arrange
+    mapped_buffer = memoryview((2**255).to_bytes(32, "big"))
+    column = Uint256Column(mapped_buffer)
+    # Act
+    column.append(1)
+    column[0] += 1
+    # Assert
+    assert isinstance(column.buffer, bytearray)
+    assert bytes(mapped_buffer) == (2**255).to_bytes(32, "big")
+    assert [column[0], column[1]] == [2**255 + 1, 1]
+
+
+def test_active_rows_stay_sorted_as_rows_switch_activity():
+    # Arrange
+    store = DepositorStore()
+    vault_id = store.addresses.intern(VAULT_ADDRESS)
+    rows = store.add_depositors(vault_id, DEPOSITOR_ADDRESSES[:6])
+    for row in rows:
+        store.balances[row] = store.allowances[row] = 10**18
+    # Act
+    switched = [store.refresh_activity(row) for row in reversed(rows)]
+    store.balances[rows[2]] = 0
+    revoked = store.refresh_activity(rows[2])
+    unchanged = store.refresh_activity(rows[3])
+    # Assert
+    assert switched == [True] * len(rows)
+    assert revoked and not unchanged
+    assert list(store.active_vault_rows(vault_id)) == [rows[0], rows[1], rows[3], rows[4], rows[5]]
+    assert store.active_rows_length() == 5
+
+
+def test_activity_is_restored_from_the_columns_without_being_recomputed():
+    # Arrange
+    store = DepositorStore()
+    vault_id = store.addresses.intern(VAULT_ADDRESS)
+    rows = store.add_depositors(vault_id, DEPOSITOR_ADDRESSES[:3])
+    for row in rows[:2]:
+        store.balances[row] = store.allowances[row] = 10**18
+        store.refresh_activity(row)
+    # a balance changed without refresh_activity shows whether the restore re-runs is_active
+    store.balances[rows[0]] = 0
+    # Act
+    restored_store = DepositorStore.from_columns(store.export_columns())
+    # Assert
+    assert list(restored_store.active_vault_rows(vault_id)) == [rows[0], rows[1]]
+    assert restored_store.refresh_activity(rows[0])
+    assert list(restored_store.active_vault_rows(vault_id)) == [rows[1]]
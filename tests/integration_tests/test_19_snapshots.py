@@ -0,0 +1,79 @@
+from scripts.backend.dataclasses import StrategyVault
+from scripts.backend.depositor_store import DepositorStore
+from scripts.backend.snapshots import CURRENT_POINTER, SnapshotManager
+
+VAULT_ADDRESSES = ["0x" + digit * 40 for digit in "ab"]
+TOKEN_ADDRESSES = ["0x" + digit * 40 for digit in "cdef"]
+DEPOSITOR_ADDRESSES = ["0x" + f"{index:040x}" for index in range(1, 101)]
+
+
+def filled_store():
+    store = DepositorStore()
+    vaults = []
+    for vault_address in VAULT_ADDRESSES:
+        vault = StrategyVault(
+            store, vault_address, DEPOSITOR_ADDRESSES[0], TOKEN_ADDRESSES[0], TOKEN_ADDRESSES[1:], 86400
+        )
+        store.set_vault_totals(vault.vault_id, 10**42 + vault.vault_id, 10**24)
+        for index, row in enumerate(store.add_depositors(vault.vault_id, DEPOSITOR_ADDRESSES)):
+            store.last_updates[row] = 1_700_000_000 + index
+            store.balances[row] = 10**42 * (index % 3)
+            store.allowances[row] = 2**256 - 1 - index
+            store.periodic_buy_amounts[row] = 10**21 + index
+            store.add_bought_amount(row, index % 3, 10**18 + index)
+            store.refresh_activity(row)
+        vault.refresh_last_update_timestamp()
+        vaults.append(vault)
+    return store, vaults
+
+
+def raw_columns(store: DepositorStore):
+    return {name: bytes(memoryview(column).cast("B")) for name, column in store.export_columns().items()}
+
+
+def test_snapshot_maps_back_the_store_columns(tmp_path):
+    # Arrange
+    store, vaults = filled_store()
+    snapshot_manager = SnapshotManager(tmp_path)
+    # Act
+    snapshot_manager.write(store, vaults, 120)
+    snapshot = SnapshotManager(tmp_path).load()
+    snapshot_columns = raw_columns(snapshot.store)
+    new_row = snapshot.store.add_depositor(snapshot.vaults[0].vault_id, "0x" + "99" * 20)
+    # Assert
+    assert snapshot.block_number == 120
+    assert snapshot_columns == raw_columns(store)
+    assert [vault.to_record() for vault in snapshot.vaults] == [vault.to_record() for vault in vaults]
+    assert snapshot.vaults[1].address == vaults[1].address
+    assert snapshot.store.vault_share_rates() == store.vault_share_rates()
+    assert len(store.active_vault_rows(vaults[0].vault_id)) == 66
+    assert list(snapshot.store.active_vault_rows(vaults[0].vault_id)) == list(
+        store.active_vault_rows(vaults[0].vault_id)
+    )
+    assert snapshot.store.row_of(vaults[1].vault_id, store.addresses.id_of(DEPOSITOR_ADDRESSES[-1])) == len(store) - 1
+    assert new_row == len(store)
+
+
+def test_rotation_keeps_the_mapped_generation_and_ignores_torn_writes(tmp_path):
+    # Arrange
+    store, vaults = filled_store()
+    snapshot_manager = SnapshotManager(tmp_path, keep=2)
+    snapshot_manager.write(store, vaults, 100)
+    mapped_snapshot = snapshot_manager.load()
+    # Act
+    for block_number in (110, 120, 130):
+        snapshot_manager.write(mapped_snapshot.store, mapped_snapshot.vaults, block_number)
+    torn_generation = tmp_path / ".tmp-000000000140-4242"
+    torn_generation.mkdir()
+    (torn_generation / "balances.bin").write_bytes(b"\x00" * 7)
+    restarted_snapshot = SnapshotManager(tmp_path).load()
+    # Assert
+    assert [generation.name for generation in snapshot_manager.generations()] == [
+        "000000000100",
+        "000000000120",
+        "000000000130",
+    ]
+    assert (tmp_path / CURRENT_POINTER).read_text() == "000000000130"
+    assert restarted_snapshot.block_number == 130
+    assert restarted_snapshot.path == tmp_path / "000000000130"
+    assert mapped_snapshot.store.balances[1] == store.balances[1]
@@ -1,29 +1,16 @@
 import pytest
-from typing import Tuple
 
 from helpers import (
     NULL_ADDRESS,
     RoundingMethod,
-    get_strategy_vault,
     get_account_from_pk,
     convert_assets_to_shares,
     encode_custom_error_data,
     convert_shares_to_assets,
     perc_mul_contracts_simulate,
-    check_network_is_mainnet_fork,
-)
-from scripts.deploy import (
-    deploy_controller,
-    deploy_treasury_vault,
-    deploy_strategy_worker,
-    deploy_strategy_manager,
-    deploy_automated_vaults_factory,
-    deploy_price_feeds_data_consumer,
+    check_network_is_local_or_mainnet_fork,
 )
 from brownie import (
-    TreasuryVault,
-    StrategyWorker,
-    StrategyManager,
     AutomatedVaultERC4626,
     AutomatedVaultsFactory,
     Wei,
@@ -59,70 +46,15 @@ NEGATIVE_AMOUNT_TESTING_VALUE = -1
 ################################ Contract Actions ################################
 
 
-def test_create_new_vault(configs, deposit_token, gas_price):
-    check_network_is_mainnet_fork()
+def test_create_new_vault(configs, protocol, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    verify_flag = config["networks"][network.show_active()]["verify"]
-    wallet_initial_native_balance = dev_wallet.balance()
+    # The protocol deployment and the vault creation are done once per session by the `deployment` fixture
+    vaults_factory = protocol.vaults_factory
+    treasury_vault = protocol.treasury_vault
+    strategy_vault = protocol.strategy_vault
+    tx = protocol.vault_creation_tx
     # Act
-
-    # Protocolo initial contracts deployment + setup
-    treasury_vault = deploy_treasury_vault(dev_wallet, verify_flag)
-    treasury_address = treasury_vault.address
-    controller = deploy_controller(dev_wallet, verify_flag)
-    controller_address = controller.address
-    strategy_worker = deploy_strategy_worker(
-        dev_wallet,
-        verify_flag,
-        configs["dex_router_address"],
-        configs["dex_main_token_address"],
-        controller_address,
-    )
-    price_feeds_data_consumer = deploy_price_feeds_data_consumer(
-        dev_wallet, verify_flag, configs["native_token_data_feed_address"]
-    )
-    price_feeds_data_consumer_address = price_feeds_data_consumer.address
-    strategy_manager = deploy_strategy_manager(dev_wallet, verify_flag, price_feeds_data_consumer_address)
-    strategy_manager_address = strategy_manager.address
-    # setMaxExpectedGasUnits must be changed to a unrealistically low value in order to avoid erros when testing for low balances.
-    # Such a low minimum allowed deposit makes the vaults prone to Inflation attacks if
-    # (see https://github.com/OpenZeppelin/openzeppelin-contracts/blob/master/contracts/token/ERC20/extensions/ERC4626.sol)
-    # Make sure to set maxExpectedGasUnits with a real value in prod!!
-    StrategyManager[-1].setMaxExpectedGasUnits(
-        config["protocol-params"]["worker_max_expected_gas_units_wei"], {"from": dev_wallet}
-    )
-    vaults_factory = deploy_automated_vaults_factory(
-        dev_wallet,
-        verify_flag,
-        configs["dex_factory_address"],
-        configs["dex_main_token_address"],
-        treasury_address,
-        strategy_manager_address,
-        configs["treasury_fixed_fee_on_vault_creation"],
-        configs["creator_percentage_fee_on_deposit"],
-        configs["treasury_percentage_fee_on_balance_update"],
-    )
-    whitelisted_deposit_asset = configs["whitelisted_deposit_assets"][0]
-    strategy_manager.addWhitelistedDepositAssets([whitelisted_deposit_asset], {"from": dev_wallet})
-    treasury_vault_initial_native_balance = treasury_vault.balance()
-    treasury_vault_initial_erc20_balance = deposit_token.balanceOf(treasury_address)
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
-    deposit_token.approve(
-        vaults_factory.address,
-        DEV_WALLET_DEPOSIT_TOKEN_ALLOWANCE_AMOUNT,
-        {"from": dev_wallet},
-    )
-    tx = vaults_factory.createVault(
-        init_vault_from_factory_params,
-        strategy_params,
-        DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
-        {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"], "gas_price": gas_price},
-    )
-    strategy_vault = get_strategy_vault()
-    strategy_vault.approve(strategy_worker.address, DEV_WALLET_DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": dev_wallet})
     final_wallet_lp_balance = strategy_vault.balanceOf(dev_wallet)
     total_shares = strategy_vault.totalSupply()
     total_assets = strategy_vault.totalAssets()
@@ -130,11 +62,12 @@ def test_create_new_vault(configs, deposit_token, gas_price):
         DEV_WALLET_DEPOSIT_TOKEN_AMOUNT, total_shares, total_assets
     )
     final_wallet_assets = strategy_vault.maxWithdraw(dev_wallet)
-    wallet_final_native_balance = dev_wallet.balance()
     treasury_vault_final_native_balance = treasury_vault.balance()
-    treasury_vault_final_erc20_balance = deposit_token.balanceOf(treasury_address)
+    treasury_vault_final_erc20_balance = deposit_token.balanceOf(treasury_vault.address)
     native_token_fee_paid = (
-        wallet_initial_native_balance - wallet_final_native_balance - (tx.gas_price * tx.gas_used)
+        protocol.creator_native_balance_before_vault_creation
+        - protocol.creator_native_balance_after_vault_creation
+        - (tx.gas_price * tx.gas_used)
     )  # gas price is 0 in local forked testnet
     final_vault_depositors_list_length = strategy_vault.allDepositorsLength()
     final_wallet_buy_amounts = strategy_vault.getDepositorBuyAmounts(dev_wallet)
@@ -146,10 +79,10 @@ def test_create_new_vault(configs, deposit_token, gas_price):
     final_depositor_total_periodic_buy_amount = strategy_vault.getDepositorTotalPeriodicBuyAmount(dev_wallet)
     # Assert
     assert vaults_factory.allVaultsLength() == 1
-    assert vaults_factory.getAllVaultsPerStrategyWorker(strategy_params[2]) == [get_strategy_vault().address]
+    assert vaults_factory.getAllVaultsPerStrategyWorker(protocol.strategy_worker.address) == [strategy_vault.address]
     assert bool(vaults_factory.getUserVaults(dev_wallet))
-    assert treasury_vault_initial_native_balance == 0
-    assert treasury_vault_initial_erc20_balance == 0
+    assert protocol.treasury_native_balance_before_vault_creation == 0
+    assert protocol.treasury_erc20_balance_before_vault_creation == 0
     assert treasury_vault_final_native_balance == configs["treasury_fixed_fee_on_vault_creation"]
     assert treasury_vault_final_erc20_balance == 0  # Only native token fee on creation
     assert native_token_fee_paid == configs["treasury_fixed_fee_on_vault_creation"]
@@ -163,10 +96,10 @@ def test_create_new_vault(configs, deposit_token, gas_price):
     assert strategy_vault.getBatchDepositorAddresses(99, 0) == [dev_wallet.address]
 
 
-def test_created_vault_init_params(configs):
-    check_network_is_mainnet_fork()
+def test_created_vault_init_params(configs, protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
     (
         name,
         symbol,
@@ -184,9 +117,9 @@ def test_created_vault_init_params(configs):
     assert strategy_vault.feesAccruedByCreator() == 0
     assert name == configs["vault_name"]
     assert symbol == configs["vault_symbol"]
-    assert treasury_address == TreasuryVault[-1].address
+    assert treasury_address == protocol.treasury_vault.address
     assert dev_wallet == creator_address
-    assert factory_address == AutomatedVaultsFactory[-1].address
+    assert factory_address == protocol.vaults_factory.address
     assert is_active == True
     assert deposit_asset == configs["deposit_token_address"]
     assert buy_assets == configs["buy_token_addresses"]
@@ -194,10 +127,10 @@ def test_created_vault_init_params(configs):
     assert treasury_perc_fee == configs["treasury_percentage_fee_on_balance_update"]
 
 
-def test_created_vault_strategy_params(configs):
-    check_network_is_mainnet_fork()
+def test_created_vault_strategy_params(configs, protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
     (
         buy_percentages,
         buy_frequency,
@@ -208,14 +141,14 @@ def test_created_vault_strategy_params(configs):
     # Assert
     assert buy_percentages == configs["buy_percentages"]
     assert buy_frequency == configs["buy_frequency"]
-    assert strategy_worker_address == StrategyWorker[-1].address
-    assert strategy_manager_address == StrategyManager[-1].address
+    assert strategy_worker_address == protocol.strategy_worker.address
+    assert strategy_manager_address == protocol.strategy_manager.address
 
 
-def test_created_vault_buy_tokens(configs):
-    check_network_is_mainnet_fork()
+def test_created_vault_buy_tokens(configs, protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
     buy_token_addresses = strategy_vault.getBuyAssetAddresses()
     # Act
     # Assert
@@ -224,10 +157,10 @@ def test_created_vault_buy_tokens(configs):
     assert strategy_vault.asset() == configs["deposit_token_address"]
 
 
-def test_transfer_deposit_token_to_vault(deposit_token):
-    check_network_is_mainnet_fork()
+def test_transfer_deposit_token_to_vault(protocol, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
     initial_total_shares = strategy_vault.totalSupply()
     initial_total_assets = strategy_vault.totalAssets()
     initial_wallet_lp_balance = strategy_vault.balanceOf(dev_wallet)
@@ -255,10 +188,12 @@ def test_transfer_deposit_token_to_vault(deposit_token):
     assert final_wallet_assets == expected_final_wallet_assets
 
 
-def test_deposit_owned_vault(deposit_token, gas_price):
-    check_network_is_mainnet_fork()
+def test_deposit_owned_vault(protocol, deposit_token, gas_price):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
+    # Deposit token transfer directly to strategy vault -> assets to shares ratio != 1:1
+    deposit_token.transfer(strategy_vault.address, DEPOSIT_TOKEN_AMOUNT_TRANSFER_TO_VAULT, {"from": dev_wallet})
     initial_total_shares = strategy_vault.totalSupply()
     initial_total_assets = strategy_vault.totalAssets()
     initial_wallet_lp_balance = strategy_vault.balanceOf(dev_wallet)
@@ -305,10 +240,10 @@ def test_deposit_owned_vault(deposit_token, gas_price):
     assert final_depositor_total_periodic_buy_amount == initial_depositor_total_periodic_buy_amount
 
 
-def test_lp_token_transfer_to_future_depositor_before_deposit_not_owned_vault(configs, deposit_token):
-    check_network_is_mainnet_fork()
+def test_lp_token_transfer_to_future_depositor_before_deposit_not_owned_vault(protocol, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
     initial_wallet2_lp_balance = strategy_vault.balanceOf(dev_wallet2)
     initial_wallet2_asset_balance = strategy_vault.maxWithdraw(dev_wallet2)
     initial_wallet_lp_balance = strategy_vault.balanceOf(dev_wallet)
@@ -347,10 +282,10 @@ def test_lp_token_transfer_to_future_depositor_before_deposit_not_owned_vault(co
     assert final_wallet2_total_periodic_buy_amount == initial_wallet2_total_periodic_buy_amount
 
 
-def test_deposit_not_owned_vault(configs, deposit_token, gas_price):
-    check_network_is_mainnet_fork()
+def test_deposit_not_owned_vault(configs, protocol, deposit_token, gas_price):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
     initial_wallet_lp_balance = strategy_vault.balanceOf(dev_wallet)
     initial_wallet2_lp_balance = strategy_vault.balanceOf(dev_wallet2)
     initial_vault_lp_supply = strategy_vault.totalSupply()
@@ -375,7 +310,7 @@ def test_deposit_not_owned_vault(configs, deposit_token, gas_price):
         DEV_WALLET2_DEPOSIT_TOKEN_AMOUNT, dev_wallet2.address, {"from": dev_wallet2, "gas_price": gas_price}
     )
     strategy_vault.approve(
-        StrategyWorker[-1].address, DEV_WALLET2_DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": dev_wallet2}
+        protocol.strategy_worker.address, DEV_WALLET2_DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": dev_wallet2}
     )
     final_wallet_lp_balance = strategy_vault.balanceOf(dev_wallet)
     expected_final_wallet_lp_balance = initial_wallet_lp_balance + convert_assets_to_shares(
@@ -423,10 +358,10 @@ def test_deposit_not_owned_vault(configs, deposit_token, gas_price):
     assert final_depositor_total_periodic_buy_amount == sum(expected_final_wallet2_buy_amounts)
 
 
-def test_partial_withdraw():
-    check_network_is_mainnet_fork()
+def test_partial_withdraw(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
     initial_wallet_lp_balance = strategy_vault.balanceOf(dev_wallet)
     initial_vault_lp_supply = strategy_vault.totalSupply()
     initial_total_assets = strategy_vault.totalAssets()
@@ -455,10 +390,10 @@ def test_partial_withdraw():
     assert final_wallet_assets == expected_final_wallet_assets
 
 
-def test_max_withdraw():
-    check_network_is_mainnet_fork()
+def test_max_withdraw(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
     initial_wallet_lp_balance = strategy_vault.balanceOf(dev_wallet)
     max_deposit_wallet_assets = strategy_vault.maxWithdraw(dev_wallet)
     initial_vault_total_assets = strategy_vault.totalAssets()
@@ -485,24 +420,12 @@ def test_max_withdraw():
     assert final_vault_lp_supply == expected_vault_lp_supply
 
 
-def test_zero_value_withdraw(configs, deposit_token, gas_price):
-    check_network_is_mainnet_fork()
+def test_zero_value_withdraw(protocol, create_strategy_vault, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    # New vault creation is not required for this particular test. This was done in order to have multiple vaults created for further tests.
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
-    vaults_factory.createVault(
-        init_vault_from_factory_params,
-        strategy_params,
-        DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
-        {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"], "gas_price": gas_price},
-    )
-    strategy_vault2 = get_strategy_vault(1)
+    strategy_vault2 = create_strategy_vault()
     strategy_vault2.approve(
-        StrategyWorker[-1].address, DEV_WALLET2_DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": dev_wallet2}
+        protocol.strategy_worker.address, DEV_WALLET2_DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": dev_wallet2}
     )
     deposit_token.approve(
         strategy_vault2.address,
@@ -511,7 +434,7 @@ def test_zero_value_withdraw(configs, deposit_token, gas_price):
     )
     strategy_vault2.deposit(DEV_WALLET_2ND_DEPOSIT_TOKEN_AMOUNT, dev_wallet2.address, {"from": dev_wallet2})
     strategy_vault2.approve(
-        StrategyWorker[-1].address, DEV_WALLET2_DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": dev_wallet2}
+        protocol.strategy_worker.address, DEV_WALLET2_DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": dev_wallet2}
     )
     initial_wallet2_lp_balance = strategy_vault2.balanceOf(dev_wallet2)
     initial_vault_lp_supply = strategy_vault2.totalSupply()
@@ -536,57 +459,58 @@ def test_zero_value_withdraw(configs, deposit_token, gas_price):
     assert final_wallet_buy_amounts == initial_wallet_buy_amounts
 
 
-def test_user_with_vaults_return_vaults(configs):
-    vaults_factory = AutomatedVaultsFactory[-1]
+def test_user_with_vaults_return_vaults(protocol):
+    vaults_factory = protocol.vaults_factory
     assert len(vaults_factory.getUserVaults(dev_wallet.address)) > 0
 
 
-def test_user_without_vault_returns_no_vaults():
-    vaults_factory = AutomatedVaultsFactory[-1]
+def test_user_without_vault_returns_no_vaults(protocol):
+    vaults_factory = protocol.vaults_factory
     assert len(vaults_factory.getUserVaults(empty_wallet.address)) == 0
 
 
-def test_get_all_depositor_addresses():
-    check_network_is_mainnet_fork()
-    # Vaults have been created in previous tests.
-    vault = get_strategy_vault()
+def test_get_all_depositor_addresses(protocol, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
+    vault = protocol.strategy_vault
+    deposit_to_vault(vault, dev_wallet2, DEV_WALLET2_DEPOSIT_TOKEN_AMOUNT)
     depositors_len = vault.allDepositorsLength()
     assert len(vault.getBatchDepositorAddresses(depositors_len, 0)) == depositors_len
 
 
-def test_get_all_depositor_addresses_with_offset():
-    check_network_is_mainnet_fork()
-    # Vaults have been created in previous tests.
-    vault = get_strategy_vault()
+def test_get_all_depositor_addresses_with_offset(protocol, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
+    vault = protocol.strategy_vault
+    deposit_to_vault(vault, dev_wallet2, DEV_WALLET2_DEPOSIT_TOKEN_AMOUNT)
     depositors_len = vault.allDepositorsLength()
     assert len(vault.getBatchDepositorAddresses(depositors_len - 2, 0)) == depositors_len - 2
 
 
-def test_get_all_depositor_addresses_with_limit_bigger_than_length():
-    check_network_is_mainnet_fork()
-    # Vaults have been created in previous tests.
-    vault = get_strategy_vault()
+def test_get_all_depositor_addresses_with_limit_bigger_than_length(protocol, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
+    vault = protocol.strategy_vault
+    deposit_to_vault(vault, dev_wallet2, DEV_WALLET2_DEPOSIT_TOKEN_AMOUNT)
     depositors_len = vault.allDepositorsLength()
     depositors = vault.getBatchDepositorAddresses(depositors_len + 1, 1)
     assert len(depositors) == depositors_len - 1
 
 
-def test_get_all_vaults(configs):
-    check_network_is_mainnet_fork()
-    vaults_factory = AutomatedVaultsFactory[-1]
+def test_get_all_vaults(protocol):
+    check_network_is_local_or_mainnet_fork()
+    vaults_factory = protocol.vaults_factory
     assert len(vaults_factory.getBatchVaults(vaults_factory.allVaultsLength(), 0)) == vaults_factory.allVaultsLength()
 
 
-def test_get_all_vaults_with_offset():
-    check_network_is_mainnet_fork()
-    vaults_factory = AutomatedVaultsFactory[-1]
-    # 2 vaults have been created at this point
+def test_get_all_vaults_with_offset(protocol, create_strategy_vault):
+    check_network_is_local_or_mainnet_fork()
+    vaults_factory = protocol.vaults_factory
+    create_strategy_vault()
     n_requested_vaults = 1
     assert len(vaults_factory.getBatchVaults(99, 1)) == n_requested_vaults
 
 
-def test_get_all_vaults_with_limit_bigger_than_vault_length():
-    vaults_factory = AutomatedVaultsFactory[-1]
+def test_get_all_vaults_with_limit_bigger_than_vault_length(protocol, create_strategy_vault):
+    vaults_factory = protocol.vaults_factory
+    create_strategy_vault()
     vaults_len = vaults_factory.allVaultsLength()
     # Act / Assert
     vaults = vaults_factory.getBatchVaults(vaults_len + 1, 1)
@@ -596,12 +520,14 @@ def test_get_all_vaults_with_limit_bigger_than_vault_length():
 ################################ Contract Validations ################################
 
 
-def test_instantiate_strategy_from_non_factory_address(configs):
-    check_network_is_mainnet_fork()
+def test_instantiate_strategy_from_non_factory_address(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
     verify_flag = config["networks"][network.show_active()]["verify"]
-    strategy_params, _ = __get_default_strategy_and_init_vault_params(configs)
-    init_vault_params = __get_init_vault_params(configs, dev_wallet)
+    strategy_params, _ = vault_params
+    init_vault_params = __get_init_vault_params(
+        configs, protocol.treasury_vault.address, protocol.vaults_factory.address, dev_wallet
+    )
     # Act / Assert
     with reverts(encode_custom_error_data(AutomatedVaultERC4626, "Forbidden", ["string"], ["Not factory"])):
         AutomatedVaultERC4626.deploy(
@@ -612,14 +538,11 @@ def test_instantiate_strategy_from_non_factory_address(configs):
         )
 
 
-def test_create_strategy_with_insufficient_ether_balance(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_insufficient_ether_balance(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     # Act / Assert
     assert empty_wallet.balance() == 0
     with pytest.raises(ValueError):
@@ -630,14 +553,11 @@ def test_create_strategy_with_insufficient_ether_balance(configs):
         )
 
 
-def test_create_strategy_with_insufficient_ether_sent_as_fee(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_insufficient_ether_sent_as_fee(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     # Act / Assert
     with reverts(
         encode_custom_error_data(
@@ -652,16 +572,12 @@ def test_create_strategy_with_insufficient_ether_sent_as_fee(configs):
         )
 
 
-def test_create_strategy_with_null_deposit_asset_address(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_null_deposit_asset_address(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     init_vault_from_factory_params = list(init_vault_from_factory_params)
-    old_deposit_asset_address = init_vault_from_factory_params[2]
     init_vault_from_factory_params[2] = NULL_ADDRESS
     # Act / Assert
     with reverts(
@@ -675,19 +591,14 @@ def test_create_strategy_with_null_deposit_asset_address(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    init_vault_from_factory_params[2] = old_deposit_asset_address
 
 
-def test_create_strategy_with_null_buy_asset_address(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_null_buy_asset_address(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     init_vault_from_factory_params = list(init_vault_from_factory_params)
-    old_buy_asset_address = init_vault_from_factory_params[3][0]
     init_vault_from_factory_params[3][0] = NULL_ADDRESS
     # Act / Assert
     with reverts(
@@ -701,19 +612,14 @@ def test_create_strategy_with_null_buy_asset_address(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    init_vault_from_factory_params[3][0] = old_buy_asset_address
 
 
-def test_buy_asset_list_contains_deposit_asset(configs):
-    check_network_is_mainnet_fork()
+def test_buy_asset_list_contains_deposit_asset(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     init_vault_from_factory_params = list(init_vault_from_factory_params)
-    old_buy_asset_address = init_vault_from_factory_params[3][0]
     init_vault_from_factory_params[3][0] = init_vault_from_factory_params[2]
     # Act / Assert
     with reverts(
@@ -727,19 +633,14 @@ def test_buy_asset_list_contains_deposit_asset(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    init_vault_from_factory_params[3][0] = old_buy_asset_address
 
 
-def test_create_strategy_with_invalid_swap_path_for_buy_token(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_invalid_swap_path_for_buy_token(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     init_vault_from_factory_params = list(init_vault_from_factory_params)
-    old_buy_asset_address = init_vault_from_factory_params[3][0]
     init_vault_from_factory_params[3][0] = configs["token_not_paired_with_weth_address"]
     # Act / Assert
     with reverts(
@@ -753,20 +654,15 @@ def test_create_strategy_with_invalid_swap_path_for_buy_token(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    init_vault_from_factory_params[3][0] = old_buy_asset_address
 
 
-def test_create_strategy_with_invalid_swap_path_for_deposit_token(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_invalid_swap_path_for_deposit_token(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    strategy_manager = protocol.strategy_manager
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     init_vault_from_factory_params = list(init_vault_from_factory_params)
-    old_deposit_asset_address = init_vault_from_factory_params[2]
     init_vault_from_factory_params[2] = configs["token_not_paired_with_weth_address"]
     strategy_manager.addWhitelistedDepositAssets(
         [(init_vault_from_factory_params[2], 0, "0x50834f3163758fcc1df9973b6e91f0f0f0434ad3", True)],
@@ -787,19 +683,14 @@ def test_create_strategy_with_invalid_swap_path_for_deposit_token(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    init_vault_from_factory_params[2] = old_deposit_asset_address
 
 
-def test_create_strategy_with_different_length_for_buy_tokens_and_percentages(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_different_length_for_buy_tokens_and_percentages(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     strategy_params = list(strategy_params)
-    old_buy_percentages = strategy_params[0]
     strategy_params[0] = [strategy_params[0][1]]
     # Act / Assert
     assert len(strategy_params[0]) != len(init_vault_from_factory_params[3])
@@ -817,19 +708,14 @@ def test_create_strategy_with_different_length_for_buy_tokens_and_percentages(co
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    strategy_params[0] = old_buy_percentages
 
 
-def test_create_strategy_with_to_many_buy_tokens(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_to_many_buy_tokens(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     init_vault_from_factory_params = list(init_vault_from_factory_params)
-    old_buy_token_addresses = init_vault_from_factory_params[3]
     init_vault_from_factory_params[3] = configs["too_many_buy_token_addresses"]
     # Act / Assert
     with reverts(
@@ -843,19 +729,14 @@ def test_create_strategy_with_to_many_buy_tokens(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    init_vault_from_factory_params[3] = old_buy_token_addresses
 
 
-def test_create_strategy_with_sum_of_buy_percentages_gt_100(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_sum_of_buy_percentages_gt_100(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     strategy_params = list(strategy_params)
-    old_buy_token_percentages = strategy_params[0]
     strategy_params[0] = [10_000, 10_000]  # 100%, 100%
     # Act / Assert
     with reverts(
@@ -869,19 +750,14 @@ def test_create_strategy_with_sum_of_buy_percentages_gt_100(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    strategy_params[0] = old_buy_token_percentages
 
 
-def test_create_strategy_with_buy_percentage_eq_zero(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_buy_percentage_eq_zero(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     strategy_params = list(strategy_params)
-    old_buy_token_percentages = strategy_params[0]
     strategy_params[0] = [0, 10_000]  # 0%, 100%
     # Act / Assert
     with reverts(
@@ -895,19 +771,14 @@ def test_create_strategy_with_buy_percentage_eq_zero(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    strategy_params[0] = old_buy_token_percentages
 
 
-def test_create_strategy_with_buy_percentage_lt_zero(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_buy_percentage_lt_zero(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     strategy_params = list(strategy_params)
-    old_deposit_token_address = strategy_params[2]
     strategy_params[0] = [-1, 10_000]  # -1%, 100%
     # Act / Assert
     with pytest.raises(OverflowError):
@@ -917,19 +788,14 @@ def test_create_strategy_with_buy_percentage_lt_zero(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    strategy_params[2] = old_deposit_token_address
 
 
-def test_create_strategy_with_not_whitelisted_asset(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_not_whitelisted_asset(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     init_vault_from_factory_params = list(init_vault_from_factory_params)
-    old_deposit_asset_address = init_vault_from_factory_params[2]
     init_vault_from_factory_params[2] = configs["not_whitelisted_token_address_example"]
     # Act / Assert
     with reverts(
@@ -943,20 +809,15 @@ def test_create_strategy_with_not_whitelisted_asset(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    init_vault_from_factory_params[2] = old_deposit_asset_address
 
 
-def test_create_strategy_with_deactivated_deposit_asset(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_deactivated_deposit_asset(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    strategy_manager = StrategyManager[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_manager = protocol.strategy_manager
+    strategy_params, init_vault_from_factory_params = vault_params
     init_vault_from_factory_params = list(init_vault_from_factory_params)
-    old_deposit_asset_address = init_vault_from_factory_params[2]
     init_vault_from_factory_params[2] = configs["not_whitelisted_token_address_example"]
     # Act / Assert
     strategy_manager.deactivateWhitelistedDepositAsset(
@@ -973,22 +834,14 @@ def test_create_strategy_with_deactivated_deposit_asset(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    # Return to old state:
-    init_vault_from_factory_params[2] = old_deposit_asset_address
-    deposit_asset_to_whitelist = configs["whitelisted_deposit_assets"][4]
-    strategy_manager.addWhitelistedDepositAssets([deposit_asset_to_whitelist], {"from": dev_wallet})
 
 
-def test_create_strategy_exceeding_max_number_of_actions(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_exceeding_max_number_of_actions(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     strategy_params = list(strategy_params)
-    old_buy_token_percentages = strategy_params[0]
     strategy_params[0] = [50, 50]  # 0.5%, 0.5% -> 100 Actions
     # Act / Assert
     with reverts(
@@ -1002,39 +855,26 @@ def test_create_strategy_exceeding_max_number_of_actions(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    strategy_params[0] = old_buy_token_percentages
 
 
-def test_negative_value_deposit():
-    check_network_is_mainnet_fork()
+def test_negative_value_deposit(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
     # Act / Assert
     with pytest.raises(OverflowError):
         strategy_vault.deposit(-1, dev_wallet.address, {"from": dev_wallet})
 
 
-def test_deposit_lt_min_deposit_value(configs, deposit_token, gas_price):
-    check_network_is_mainnet_fork()
+def test_deposit_lt_min_deposit_value(protocol, create_strategy_vault, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
-    vaults_factory.createVault(
-        init_vault_from_factory_params,
-        strategy_params,
-        DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
-        {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"], "gas_price": gas_price},
-    )
-    strategy_vault3 = get_strategy_vault(2)
+    strategy_vault3 = create_strategy_vault()
     deposit_token.approve(
         strategy_vault3.address,
         DEV_WALLET_DEPOSIT_TOKEN_ALLOWANCE_AMOUNT,
         {"from": dev_wallet2},
     )
-    deposit_token.approve(strategy_vault3.address, DEV_WALLET_DEPOSIT_TOKEN_ALLOWANCE_AMOUNT, {"from": dev_wallet2})
     # Act / Assert
     with reverts(
         encode_custom_error_data(
@@ -1044,24 +884,21 @@ def test_deposit_lt_min_deposit_value(configs, deposit_token, gas_price):
         strategy_vault3.deposit(1, dev_wallet2.address, {"from": dev_wallet2})
 
 
-def test_negative_value_withdraw():
-    check_network_is_mainnet_fork()
+def test_negative_value_withdraw(protocol, create_strategy_vault, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault2 = get_strategy_vault(1)
+    strategy_vault2 = create_strategy_vault()
+    deposit_to_vault(strategy_vault2, dev_wallet2, DEV_WALLET_2ND_DEPOSIT_TOKEN_AMOUNT)
     # Act / Assert
     with pytest.raises(OverflowError):
         strategy_vault2.withdraw(NEGATIVE_AMOUNT_TESTING_VALUE, dev_wallet2, dev_wallet2, {"from": dev_wallet2})
 
 
-def test_withdraw_gt_deposited_balance(deposit_token):
-    check_network_is_mainnet_fork()
+def test_withdraw_gt_deposited_balance(protocol, create_strategy_vault, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault2 = get_strategy_vault(1)
-    deposit_token.approve(
-        strategy_vault2.address,
-        DEV_WALLET_DEPOSIT_TOKEN_ALLOWANCE_AMOUNT,
-        {"from": dev_wallet2},
-    )
+    strategy_vault2 = create_strategy_vault()
+    deposit_to_vault(strategy_vault2, dev_wallet2, DEV_WALLET_2ND_DEPOSIT_TOKEN_AMOUNT)
     # Act / Assert (owner, assets, maxAssets)
     with reverts(
         encode_custom_error_data(
@@ -1074,16 +911,12 @@ def test_withdraw_gt_deposited_balance(deposit_token):
         strategy_vault2.withdraw(GT_BALANCE_TESTING_VALUE, dev_wallet2, dev_wallet2, {"from": dev_wallet2})
 
 
-def test_create_strategy_with_invalid_buy_frequency_enum_value(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_invalid_buy_frequency_enum_value(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     strategy_params = list(strategy_params)
-    old_buy_frequency_enum_value = strategy_params[1]
     strategy_params[1] = 99
     # Act / Assert
     with reverts(""):
@@ -1093,19 +926,14 @@ def test_create_strategy_with_invalid_buy_frequency_enum_value(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    strategy_params[1] = old_buy_frequency_enum_value
 
 
-def test_create_strategy_with_null_strategy_worker_address(configs):
-    check_network_is_mainnet_fork()
+def test_create_strategy_with_null_strategy_worker_address(configs, protocol, vault_params):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    vaults_factory = AutomatedVaultsFactory[-1]
-    (
-        strategy_params,
-        init_vault_from_factory_params,
-    ) = __get_default_strategy_and_init_vault_params(configs)
+    vaults_factory = protocol.vaults_factory
+    strategy_params, init_vault_from_factory_params = vault_params
     strategy_params = list(strategy_params)
-    old_buy_frequency_enum_value = strategy_params[2]
     strategy_params[2] = NULL_ADDRESS
     # Act / Assert
     with reverts(
@@ -1119,54 +947,51 @@ def test_create_strategy_with_null_strategy_worker_address(configs):
             DEV_WALLET_DEPOSIT_TOKEN_AMOUNT,
             {"from": dev_wallet, "value": configs["treasury_fixed_fee_on_vault_creation"]},
         )
-    strategy_params[2] = old_buy_frequency_enum_value
 
 
-def test_set_last_update_by_not_worker_address():
-    check_network_is_mainnet_fork()
+def test_set_last_update_by_not_worker_address(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
     # Act / Assert
     with pytest.raises(exceptions.VirtualMachineError):
         strategy_vault.setLastUpdatePerDepositor(dev_wallet, {"from": dev_wallet})
 
 
-def test_get_all_vaults_with_start_after_equal_to_vault_length():
-    vaults_factory = AutomatedVaultsFactory[-1]
+def test_get_all_vaults_with_start_after_equal_to_vault_length(protocol):
+    vaults_factory = protocol.vaults_factory
     n_vaults = vaults_factory.allVaultsLength()
     # Act / Assert
     with pytest.raises(exceptions.VirtualMachineError):
         vaults = vaults_factory.getBatchVaults(1, n_vaults)
 
 
-def test_get_all_vaults_with_start_after_bigger_than_vault_length():
-    vaults_factory = AutomatedVaultsFactory[-1]
+def test_get_all_vaults_with_start_after_bigger_than_vault_length(protocol):
+    vaults_factory = protocol.vaults_factory
     n_vaults = vaults_factory.allVaultsLength()
     # Act / Assert
     with pytest.raises(exceptions.VirtualMachineError):
         vaults_factory.getBatchVaults(1, n_vaults + 1)
 
 
-def test_get_all_depositors_with_start_after_equal_to_length():
-    check_network_is_mainnet_fork()
-    # Vaults have been created in previous tests.
-    vault = get_strategy_vault()
+def test_get_all_depositors_with_start_after_equal_to_length(protocol):
+    check_network_is_local_or_mainnet_fork()
+    vault = protocol.strategy_vault
     depositors_len = vault.allDepositorsLength()
     with pytest.raises(exceptions.VirtualMachineError):
         vault.getBatchDepositorAddresses(0, depositors_len)
 
 
-def test_get_all_depositors_with_start_after_bigger_than_length():
-    check_network_is_mainnet_fork()
-    # Vaults have been created in previous tests.
-    vault = get_strategy_vault()
+def test_get_all_depositors_with_start_after_bigger_than_length(protocol):
+    check_network_is_local_or_mainnet_fork()
+    vault = protocol.strategy_vault
     depositors_len = vault.allDepositorsLength()
     with pytest.raises(exceptions.VirtualMachineError):
         vault.getBatchDepositorAddresses(1, depositors_len + 1)
 
 
-def test_transfer_ether_to_vault(deposit_token):
-    vault = get_strategy_vault()
+def test_transfer_ether_to_vault(protocol, deposit_token):
+    vault = protocol.strategy_vault
     with pytest.raises(exceptions.VirtualMachineError):
         dev_wallet.transfer(vault.address, Wei("0.0001 ether"))
 
@@ -1174,26 +999,15 @@ def test_transfer_ether_to_vault(deposit_token):
 ################################ Helper Functions ################################
 
 
-def __get_default_strategy_and_init_vault_params(configs: dict) -> Tuple[Tuple, Tuple]:
-    worker_address = StrategyWorker[-1].address
-    strategy_manager = StrategyManager[-1].address
-    init_vault_from_factory_params = (
-        configs["vault_name"],
-        configs["vault_symbol"],
-        configs["deposit_token_address"],
-        configs["buy_token_addresses"],
-    )
-    strategy_params = (configs["buy_percentages"], configs["buy_frequency"], worker_address, strategy_manager)
-    return strategy_params, init_vault_from_factory_params
-
-
-def __get_init_vault_params(configs: dict, wallet_address: str) -> tuple:
+def __get_init_vault_params(
+    configs: dict, treasury_address: str, vaults_factory_address: str, wallet_address: str
+) -> tuple:
     return (
         configs["vault_name"],
         configs["vault_symbol"],
-        TreasuryVault[-1].address,
+        treasury_address,
         wallet_address,
-        AutomatedVaultsFactory[-1].address,
+        vaults_factory_address,
         False,
         configs["deposit_token_address"],
         configs["buy_token_addresses"],
@@ -0,0 +1,90 @@
+from scripts.backend.sharding import HashRing, LeaseTable, ShardCoordinator
+
+LEASE_SECONDS = 30
+WORKER_IDS = ["keeper-a", "keeper-b", "keeper-c"]
+VAULT_ADDRESSES = ["0x" + f"{index:040x}" for index in range(1, 301)]
+
+
+def shard_coordinators(tmp_path, now: float):
+    lease_table = LeaseTable(tmp_path / "leases.sqlite", LEASE_SECONDS)
+    coordinators = [ShardCoordinator(lease_table, worker_id) for worker_id in WORKER_IDS]
+    for coordinator in coordinators + coordinators:
+        coordinator.refresh(now)
+    return coordinators
+
+
+def owned_vaults(coordinator: ShardCoordinator):
+    return {vault_address for vault_address in VAULT_ADDRESSES if coordinator.owns(vault_address)}
+
+
+def test_ring_spreads_vaults_and_only_moves_the_ones_of_a_removed_worker():
+    # Arrange
+    ring = HashRing(WORKER_IDS)
+    # Act
+    owners = {vault_address: ring.owner(vault_address) for vault_address in VAULT_ADDRESSES}
+    survivors_ring = HashRing(WORKER_IDS[:2])
+    # Assert
+    assert all(list(owners.values()).count(worker_id) > len(VAULT_ADDRESSES) / 6 for worker_id in WORKER_IDS)
+    assert HashRing(list(reversed(WORKER_IDS))).owner(VAULT_ADDRESSES[0]) == owners[VAULT_ADDRESSES[0]]
+    assert ring.owner(VAULT_ADDRESSES[0].upper().replace("0X", "0x")) == owners[VAULT_ADDRESSES[0]]
+    for vault_address, owner in owners.items():
+        if owner != WORKER_IDS[2]:
+            assert survivors_ring.owner(vault_address) == owner
+
+
+def test_lease_expiry_removes_the_worker_and_bumps_the_epoch(tmp_path):
+    # Arrange
+    lease_table = LeaseTable(tmp_path / "leases.sqlite", LEASE_SECONDS)
+    first_membership = lease_table.heartbeat("keeper-a", now=0)
+    joined_membership = lease_table.heartbeat("keeper-b", now=1)
+    # Act
+    renewed_membership = lease_table.heartbeat("keeper-a", now=10)
+    expired_membership = lease_table.heartbeat("keeper-a", now=40)
+    # Assert
+    assert first_membership.workers == ["keeper-a"]
+    assert joined_membership.workers == ["keeper-a", "keeper-b"]
+    assert joined_membership.epoch > first_membership.epoch
+    assert renewed_membership == joined_membership
+    assert expired_membership.workers == ["keeper-a"]
+    assert expired_membership.epoch > renewed_membership.epoch
+
+
+def test_dead_worker_vaults_move_to_the_survivors(tmp_path):
+    # Arrange
+    coordinators = shard_coordinators(tmp_path, now=0)
+    vaults_before = [owned_vaults(coordinator) for coordinator in coordinators]
+    survivors = coordinators[:2]
+    renewed = [survivor.refresh(now=LEASE_SECONDS / 2) for survivor in survivors]
+    # Act
+    rebalanced = [survivor.refresh(now=LEASE_SECONDS + 1) for survivor in survivors]
+    vaults_after = [owned_vaults(survivor) for survivor in survivors]
+    # Assert
+    assert set().union(*vaults_before) == set(VAULT_ADDRESSES)
+    assert sum(map(len, vaults_before)) == len(VAULT_ADDRESSES)
+    assert renewed == [False, False]
+    assert rebalanced == [True, True]
+    assert vaults_after[0] | vaults_after[1] == set(VAULT_ADDRESSES)
+    assert not vaults_after[0] & vaults_after[1]
+    assert vaults_before[0] <= vaults_after[0] and vaults_before[1] <= vaults_after[1]
+
+
+def test_worker_stalled_past_its_lease_is_fenced(tmp_path):
+    # Arrange
+    stalled, *survivors = shard_coordinators(tmp_path, now=0)
+    stalled_assignment = stalled.assignment()
+    for survivor in survivors:
+        survivor.refresh(now=LEASE_SECONDS / 2)
+    # Act
+    holds_lease_while_renewed = stalled.holds_lease(stalled_assignment, now=1)
+    holds_lease_close_to_expiry = stalled.holds_lease(stalled_assignment, now=LEASE_SECONDS - 1)
+    survivors[0].refresh(now=LEASE_SECONDS + 1)
+    holds_lease_after_takeover = stalled.holds_lease(stalled_assignment, now=LEASE_SECONDS + 2)
+    stalled.refresh(now=LEASE_SECONDS + 2)
+    holds_lease_after_rejoining = stalled.holds_lease(stalled_assignment, now=LEASE_SECONDS + 2)
+    # Assert
+    assert holds_lease_while_renewed
+    assert not holds_lease_close_to_expiry
+    assert not holds_lease_after_takeover
+    assert not holds_lease_after_rejoining
+    assert stalled.holds_lease(stalled.assignment(), now=LEASE_SECONDS + 2)
+    assert not survivors[0].holds_lease(survivors[0].assignment(), now=LEASE_SECONDS + 2)
@@ -0,0 +1,48 @@
+import pytest
+from scripts.deployment import DeploymentStep, Ref, deployment_levels
+
+
+def step_names(levels):
+    return [[step.name for step in level] for level in levels]
+
+
+def test_steps_are_grouped_after_their_dependencies():
+    # Arrange
+    steps = [
+        DeploymentStep("Resolver", None, (Ref("AutomatedVaultsFactory"), Ref("StrategyWorker"))),
+        DeploymentStep("TreasuryVault", None),
+        DeploymentStep("Controller", None),
+        DeploymentStep("StrategyWorker", None, ("0x" + "01" * 20, Ref("Controller"))),
+        DeploymentStep("StrategyManager", None, (Ref("PriceFeedsDataConsumer"),)),
+        DeploymentStep("PriceFeedsDataConsumer", None, ("0x" + "02" * 20,)),
+        DeploymentStep("AutomatedVaultsFactory", None, (Ref("TreasuryVault"), Ref("StrategyManager"), 25)),
+    ]
+    # Act
+    levels = deployment_levels(steps)
+    # Assert
+    assert step_names(levels) == [
+        ["TreasuryVault", "Controller", "PriceFeedsDataConsumer"],
+        ["StrategyWorker", "StrategyManager"],
+        ["AutomatedVaultsFactory"],
+        ["Resolver"],
+    ]
+
+
+def test_unknown_dependency_is_rejected():
+    # Arrange
+    steps = [DeploymentStep("StrategyWorker", None, (Ref("Controller"),)), DeploymentStep("TreasuryVault", None)]
+    # Act / Assert
+    with pytest.raises(ValueError, match=r"StrategyWorker depends on unknown steps \['Controller'\]"):
+        deployment_levels(steps)
+
+
+def test_dependency_cycle_is_rejected():
+    # Arrange
+    steps = [
+        DeploymentStep("TreasuryVault", None),
+        DeploymentStep("Controller", None, (Ref("StrategyWorker"),)),
+        DeploymentStep("StrategyWorker", None, (Ref("Controller"),)),
+    ]
+    # Act / Assert
+    with pytest.raises(ValueError, match=r"Dependency cycle between \['Controller', 'StrategyWorker'\]"):
+        deployment_levels(steps)
@@ -0,0 +1,147 @@
+from eth_abi import abi
+from types import SimpleNamespace
+from docs.abis import abi_registry
+from scripts.backend.metrics import Metrics
+from scripts.backend.helpers import LOG_BLOCK_RANGE
+from scripts.backend.depositor_store import DepositorStore
+from scripts.backend.action_indexer import ActionIndexer
+
+VAULT_ADDRESS = "0x" + "0a" * 20
+OTHER_VAULT_ADDRESS = "0x" + "0d" * 20
+WORKER_ADDRESS = "0x" + "0b" * 20
+DEPOSITOR_ADDRESS = "0x" + "0c" * 20
+OTHER_DEPOSITOR_ADDRESS = "0x" + "0e" * 20
+DEPOSIT_TOKEN_ADDRESS = "0x" + "01" * 20
+BUY_TOKEN_ADDRESSES = ["0x" + "02" * 20, "0x" + "03" * 20]
+FROM_BLOCK = 100
+BLOCK_TIME = 12
+
+
+def action_log(block_number: int, vault_address: str, depositor_address: str, spent: int, bought: list) -> dict:
+    decoder = abi_registry.event_decoder("strategy_worker", "StrategyActionExecuted")
+    return {
+        "blockNumber": block_number,
+        "topics": [
+            decoder.topic,
+            abi.encode(["address"], [vault_address]),
+            abi.encode(["address"], [depositor_address]),
+        ],
+        "data": abi.encode(
+            ["address", "uint256", "address[]", "uint256[]", "uint256"],
+            [DEPOSIT_TOKEN_ADDRESS, spent, BUY_TOKEN_ADDRESSES, bought, spent // 100],
+        ),
+    }
+
+
+# Node stand-in serving the worker logs of the requested block range and the timestamp of every block
+class WorkerNodeStandIn:
+    def __init__(self, logs: list):
+        self.logs = logs
+        self.last_updates = {}
+        self.log_filters = []
+        self.block_reads = []
+
+    def get_logs(self, log_filter: dict) -> list:
+        self.log_filters.append(log_filter)
+        return [log for log in self.logs if log_filter["fromBlock"] <= log["blockNumber"] <= log_filter["toBlock"]]
+
+    def get_block(self, block_number: int) -> dict:
+        self.block_reads.append(block_number)
+        return {"timestamp": block_number * BLOCK_TIME}
+
+    def contract(self, abi_name: str, address: str):
+        last_update_of = lambda depositor_address: SimpleNamespace(call=lambda: self.last_updates[depositor_address])
+        return SimpleNamespace(functions=SimpleNamespace(lastUpdateOf=last_update_of))
+
+
+def action_indexer(node: WorkerNodeStandIn):
+    store = DepositorStore()
+    vault_id = store.addresses.intern(VAULT_ADDRESS)
+    row = store.add_depositor(vault_id, DEPOSITOR_ADDRESS)
+    runtime = SimpleNamespace(web3=SimpleNamespace(eth=node), worker_address=WORKER_ADDRESS, contract=node.contract)
+    return ActionIndexer(runtime, store, FROM_BLOCK, metrics=Metrics()), vault_id, row
+
+
+def test_action_logs_are_applied_to_the_followed_rows():
+    # Arrange
+    node = WorkerNodeStandIn(
+        [
+            action_log(101, VAULT_ADDRESS, DEPOSITOR_ADDRESS, 10**6, [3, 4]),
+            action_log(101, VAULT_ADDRESS, OTHER_DEPOSITOR_ADDRESS, 10**6, [5, 6]),
+            action_log(105, VAULT_ADDRESS, DEPOSITOR_ADDRESS, 2 * 10**6, [7, 8]),
+            action_log(105, OTHER_VAULT_ADDRESS, DEPOSITOR_ADDRESS, 10**6, [9, 10]),
+        ]
+    )
+    indexer, vault_id, row = action_indexer(node)
+    store = indexer.store
+    # Act
+    updated_vault_ids = indexer.update(110)
+    # Assert
+    assert updated_vault_ids == {vault_id}
+    assert store.last_updates[row] == 105 * BLOCK_TIME
+    assert store.spent_amounts[row] == 3 * 10**6
+    assert [store.bought_amount(row, 0), store.bought_amount(row, 1)] == [10, 12]
+    assert sorted(node.block_reads) == [101, 105]
+    assert indexer.block_number == 111
+    assert indexer.metrics.get("action_indexer.events") == 4
+    assert indexer.metrics.get("action_indexer.ignored_events") == 2
+
+
+def test_only_the_logs_of_the_range_not_yet_indexed_are_read():
+    # Arrange
+    node = WorkerNodeStandIn(
+        [
+            action_log(FROM_BLOCK - 1, VAULT_ADDRESS, DEPOSITOR_ADDRESS, 10**6, [1, 1]),
+            action_log(FROM_BLOCK + LOG_BLOCK_RANGE, VAULT_ADDRESS, DEPOSITOR_ADDRESS, 10**6, [1, 1]),
+        ]
+    )
+    indexer, _, row = action_indexer(node)
+    store = indexer.store
+    to_block = FROM_BLOCK + LOG_BLOCK_RANGE + 10
+    # Act
+    indexer.update(to_block)
+    indexed_twice = indexer.update(to_block)
+    indexed_backwards = indexer.update(FROM_BLOCK)
+    # Assert
+    assert [(log_filter["fromBlock"], log_filter["toBlock"]) for log_filter in node.log_filters] == [
+        (FROM_BLOCK, FROM_BLOCK + LOG_BLOCK_RANGE - 1),
+        (FROM_BLOCK + LOG_BLOCK_RANGE, to_block),
+    ]
+    assert indexed_twice == indexed_backwards == set()
+    assert indexer.block_number == to_block + 1
+    assert store.spent_amounts[row] == 10**6
+    assert store.last_updates[row] == (FROM_BLOCK + LOG_BLOCK_RANGE) * BLOCK_TIME
+
+
+def test_older_action_log_never_moves_the_last_update_back():
+    # Arrange
+    node = WorkerNodeStandIn([action_log(101, VAULT_ADDRESS, DEPOSITOR_ADDRESS, 10**6, [1, 1])])
+    indexer, _, row = action_indexer(node)
+    store = indexer.store
+    store.last_updates[row] = 200 * BLOCK_TIME
+    # Act
+    indexer.update(110)
+    # Assert
+    assert store.last_updates[row] == 200 * BLOCK_TIME
+    assert store.spent_amounts[row] == 10**6
+
+
+def test_reconcile_after_takeover_reads_the_actions_missing_from_the_indexed_logs():
+    # Arrange
+    node = WorkerNodeStandIn([])
+    indexer, vault_id, row = action_indexer(node)
+    store = indexer.store
+    # actions executed by the previous owner of the vault were never indexed by this keeper
+    other_row = store.add_depositor(vault_id, OTHER_DEPOSITOR_ADDRESS)
+    node.last_updates[store.depositor_address(row)] = 90 * BLOCK_TIME
+    node.last_updates[store.depositor_address(other_row)] = 0
+    # Act
+    corrected_vault_ids = indexer.reconcile([row, other_row])
+    reconciled_again = indexer.reconcile([row, other_row])
+    # Assert
+    assert corrected_vault_ids == {vault_id}
+    assert reconciled_again == set()
+    assert store.last_updates[row] == 90 * BLOCK_TIME
+    assert store.last_updates[other_row] == 0
+    assert indexer.metrics.get("action_indexer.reconciled_rows") == 4
+    assert indexer.metrics.get("action_indexer.reconcile_mismatches") == 1
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+from scripts.backend.metrics import Metrics
+from scripts.backend.contract_cache import ContractHandleCache
+
+NETWORK_NAME = "arbitrum-main"
+OTHER_NETWORK_NAME = "arbitrum-main-fork"
+VAULT_ADDRESSES = ["0x" + f"{index:040x}" for index in range(1, 4)]
+
+
+def handle_factory(built_handles: list, network_name: str, address: str):
+    def _build():
+        handle = SimpleNamespace(network_name=network_name, address=address)
+        built_handles.append(handle)
+        return handle
+
+    return _build
+
+
+def test_handles_are_built_once_per_key_whatever_the_address_case():
+    # Arrange
+    cache = ContractHandleCache(metrics=Metrics())
+    built_handles = []
+    address = VAULT_ADDRESSES[0]
+    # Act
+    handle = cache.get(NETWORK_NAME, "vault", address, handle_factory(built_handles, NETWORK_NAME, address))
+    cached_handle = cache.get(NETWORK_NAME, "vault", address.upper().replace("0X", "0x"), lambda: None)
+    other_type_handle = cache.get(NETWORK_NAME, "erc20", address, handle_factory(built_handles, NETWORK_NAME, address))
+    # Assert
+    assert cached_handle is handle
+    assert other_type_handle is not handle
+    assert len(built_handles) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.hit_rate() == 1 / 3
+    assert cache.metrics.get("contract_handles.hits") == 1
+
+
+def test_handles_are_scoped_to_their_network():
+    # Arrange
+    cache = ContractHandleCache(metrics=Metrics())
+    built_handles = []
+    address = VAULT_ADDRESSES[0]
+    # Act
+    handle = cache.get(NETWORK_NAME, "vault", address, handle_factory(built_handles, NETWORK_NAME, address))
+    other_network_handle = cache.get(
+        OTHER_NETWORK_NAME, "vault", address, handle_factory(built_handles, OTHER_NETWORK_NAME, address)
+    )
+    # Assert
+    assert handle.network_name == NETWORK_NAME
+    assert other_network_handle.network_name == OTHER_NETWORK_NAME
+    assert cache.misses == 2
+    assert len(cache) == 2
+
+
+def test_least_recently_used_handle_is_evicted():
+    # Arrange
+    cache = ContractHandleCache(maxsize=2, metrics=Metrics())
+    built_handles = []
+    for address in VAULT_ADDRESSES[:2]:
+        cache.get(NETWORK_NAME, "vault", address, handle_factory(built_handles, NETWORK_NAME, address))
+    # Act
+    cache.get(NETWORK_NAME, "vault", VAULT_ADDRESSES[0], lambda: None)
+    cache.get(
+        NETWORK_NAME, "vault", VAULT_ADDRESSES[2], handle_factory(built_handles, NETWORK_NAME, VAULT_ADDRESSES[2])
+    )
+    rebuilt_handle = cache.get(
+        NETWORK_NAME, "vault", VAULT_ADDRESSES[1], handle_factory(built_handles, NETWORK_NAME, VAULT_ADDRESSES[1])
+    )
+    # Assert
+    assert rebuilt_handle is built_handles[-1]
+    assert [handle.address for handle in built_handles] == [
+        VAULT_ADDRESSES[0],
+        VAULT_ADDRESSES[1],
+        VAULT_ADDRESSES[2],
+        VAULT_ADDRESSES[1],
+    ]
+    assert cache.evictions == 2
+    assert len(cache) == 2
+
+
+def test_clear_drops_the_handles_and_resets_the_counters():
+    # Arrange
+    cache = ContractHandleCache(maxsize=1, metrics=Metrics())
+    built_handles = []
+    for address in VAULT_ADDRESSES[:2] + VAULT_ADDRESSES[:1]:
+        cache.get(NETWORK_NAME, "vault", address, handle_factory(built_handles, NETWORK_NAME, address))
+    # Act
+    cache.clear()
+    # Assert
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses, cache.evictions) == (0, 0, 0)
+    assert cache.hit_rate() == 0.0
@@ -0,0 +1,92 @@
+from eth_abi import abi
+from hexbytes import HexBytes
+from types import SimpleNamespace
+from web3.exceptions import ContractLogicError
+from docs.abis import abi_registry
+from scripts.backend.controller_executor import METHOD_NOT_FOUND_CODE, ControllerExecutor
+from scripts.backend.failures import NOT_DUE, NOT_REPRODUCED, SLIPPAGE, classify_failure
+
+TX_HASH = HexBytes("0x" + "ab" * 32)
+RECEIPT = {"blockNumber": 200, "status": 0}
+SENDER_ADDRESS = "0x" + "0a" * 20
+CONTROLLER_ADDRESS = "0x" + "0b" * 20
+
+
+def custom_error_data(error_name: str, types: list, values: list) -> str:
+    selector = next(
+        selector
+        for selector, entry in abi_registry.error_selectors("strategy_worker").items()
+        if entry["name"] == error_name
+    )
+    return "0x" + (selector + abi.encode(types, values)).hex()
+
+
+# Node stand-in answering the traces of the reverted transaction (or refusing them) and replaying it with eth_call
+class RevertNodeStandIn:
+    def __init__(self, trace_response: dict, replay_error_data: str = None):
+        self.trace_response = trace_response
+        self.replay_error_data = replay_error_data
+        self.requests = []
+        self.calls = []
+
+    def make_request(self, method: str, params: list) -> dict:
+        self.requests.append((method, params))
+        return self.trace_response
+
+    def get_transaction(self, tx_hash: HexBytes) -> dict:
+        return {"from": SENDER_ADDRESS, "to": CONTROLLER_ADDRESS, "input": "0x", "gas": 500_000}
+
+    def call(self, transaction: dict, block_identifier: int):
+        self.calls.append(block_identifier)
+        if self.replay_error_data is not None:
+            raise ContractLogicError("execution reverted", self.replay_error_data)
+        return b""
+
+
+def controller_executor(node: RevertNodeStandIn) -> ControllerExecutor:
+    return ControllerExecutor(SimpleNamespace(web3=SimpleNamespace(provider=node, eth=node)))
+
+
+def test_revert_is_traced_at_its_position_in_its_block():
+    # Arrange
+    # the transaction only reverted because of an earlier swap of the same block, the state before it would pass
+    output = custom_error_data("SwapQuoteBelowReference", ["uint256", "uint256"], [1, 10**18])
+    node = RevertNodeStandIn({"jsonrpc": "2.0", "id": 1, "result": {"error": "execution reverted", "output": output}})
+    executor = controller_executor(node)
+    # Act
+    error = executor.revert_error(TX_HASH, RECEIPT)
+    # Assert
+    assert classify_failure(error) == SLIPPAGE
+    assert [method for method, _ in node.requests] == ["debug_traceTransaction"]
+    assert node.requests[0][1][0] == "0x" + "ab" * 32
+    assert node.calls == []
+
+
+def test_revert_is_replayed_before_its_block_without_traces():
+    # Arrange
+    unsupported = {"jsonrpc": "2.0", "id": 1, "error": {"code": METHOD_NOT_FOUND_CODE, "message": "method not found"}}
+    node = RevertNodeStandIn(unsupported, custom_error_data("UpdateConditionsNotMet", [], []))
+    executor = controller_executor(node)
+    # Act
+    error = executor.revert_error(TX_HASH, RECEIPT)
+    other_error = executor.revert_error(TX_HASH, RECEIPT)
+    # Assert
+    assert classify_failure(error) == classify_failure(other_error) == NOT_DUE
+    # the node does not serve traces, it is not asked again
+    assert len(node.requests) == 1
+    assert node.calls == [RECEIPT["blockNumber"] - 1] * 2
+
+
+def test_revert_not_reproduced_before_its_block_is_classified_as_such():
+    # Arrange
+    # a trace failing for another reason (pruned state) only falls back for this transaction
+    pruned = {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "historical state not available"}}
+    node = RevertNodeStandIn(pruned)
+    executor = controller_executor(node)
+    # Act
+    error = executor.revert_error(TX_HASH, RECEIPT)
+    executor.revert_error(TX_HASH, RECEIPT)
+    # Assert
+    assert classify_failure(error) == NOT_REPRODUCED
+    assert error.reproduced is False
+    assert len(node.requests) == 2
@@ -2,13 +2,12 @@ from math import floor
 from helpers import encode_custom_error_data
 
 from helpers import (
-    get_strategy_vault,
     get_account_from_pk,
-    check_network_is_mainnet_fork,
+    get_token_metadata,
+    check_network_is_local_or_mainnet_fork,
 )
 from brownie import (
     StrategyManager,
-    PriceFeedsDataConsumer,
     config,
     reverts,
 )
@@ -26,31 +25,31 @@ DEV_WALLET_WITHDRAW_TOKEN_AMOUNT = 29_900
 ################################ Contract Actions ################################
 
 
-def test_whitelist_new_address_by_owner(configs):
-    check_network_is_mainnet_fork()
+def test_whitelist_new_address_by_owner(configs, protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
+    strategy_manager = protocol.strategy_manager
     deposit_asset_to_whitelist = configs["whitelisted_deposit_assets"][4]
     # Act
     strategy_manager.addWhitelistedDepositAssets([deposit_asset_to_whitelist], {"from": dev_wallet})
     # Assert
     assert strategy_manager.getWhitelistedDepositAssetAddresses() == [
         configs["whitelisted_deposit_assets"][0][0],
-        configs["token_not_paired_with_weth_address"],
         configs["whitelisted_deposit_assets"][4][0],
     ]
 
 
-def test_repeated_address_by_owner(configs):
-    check_network_is_mainnet_fork()
+def test_repeated_address_by_owner(configs, protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
+    strategy_manager = protocol.strategy_manager
     deposit_asset_to_whitelist = configs["whitelisted_deposit_assets"][4]
+    strategy_manager.addWhitelistedDepositAssets([deposit_asset_to_whitelist], {"from": dev_wallet})
     # Act
     strategy_manager.addWhitelistedDepositAssets([deposit_asset_to_whitelist], {"from": dev_wallet})
     # Assert
     assert (
-        len(strategy_manager.getWhitelistedDepositAssetAddresses()) == 3
+        len(strategy_manager.getWhitelistedDepositAssetAddresses()) == 2
     )  # repeated address shoudn't be added to the list
     assert (
         strategy_manager.getWhitelistedDepositAsset(configs["whitelisted_deposit_assets"][4][0])
@@ -58,20 +57,21 @@ def test_repeated_address_by_owner(configs):
     )
 
 
-def test_deactivate_whitelisted_address_by_owner(configs):
-    check_network_is_mainnet_fork()
+def test_deactivate_whitelisted_address_by_owner(configs, protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
+    strategy_manager = protocol.strategy_manager
+    strategy_manager.addWhitelistedDepositAssets([configs["whitelisted_deposit_assets"][4]], {"from": dev_wallet})
     # Act
     whitelisted_deposit_asset_address = configs["whitelisted_deposit_assets"][4][0]
     strategy_manager.deactivateWhitelistedDepositAsset(whitelisted_deposit_asset_address, {"from": dev_wallet})
     assert strategy_manager.getWhitelistedDepositAsset(whitelisted_deposit_asset_address)[3] == False
 
 
-def test_strategy_manager_default_parameters():
-    check_network_is_mainnet_fork()
+def test_strategy_manager_default_parameters(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
+    strategy_manager = protocol.strategy_manager
     max_number_of_actions_per_frequency = config["protocol-params"]["max_number_of_actions_per_frequency"]
     gas_cost_safety_factors = config["protocol-params"]["gas_cost_safety_factors"]
     deposit_token_price_safety_factor = config["protocol-params"]["deposit_token_price_safety_factor"]
@@ -124,10 +124,10 @@ def test_strategy_manager_default_parameters():
     )  # 11 MONTHS/BLUE_CHIP
 
 
-def test_set_gas_cost_safety_factor_by_owner():
-    check_network_is_mainnet_fork()
+def test_set_gas_cost_safety_factor_by_owner(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
+    strategy_manager = protocol.strategy_manager
     new_gas_cost_safety_factor = 900
     # Act
     strategy_manager.setGasCostSafetyFactor(0, new_gas_cost_safety_factor, {"from": dev_wallet})  # <= 30 DAYS
@@ -135,10 +135,10 @@ def test_set_gas_cost_safety_factor_by_owner():
     assert strategy_manager.getGasCostSafetyFactor(1, 1) == new_gas_cost_safety_factor  # 1 DAY
 
 
-def test_set_deposit_token_price_safety_factor_by_owner():
-    check_network_is_mainnet_fork()
+def test_set_deposit_token_price_safety_factor_by_owner(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
+    strategy_manager = protocol.strategy_manager
     new_deposit_token_price_safety_factor = 100
     # Act
     strategy_manager.setDepositTokenPriceSafetyFactor(
@@ -150,14 +150,14 @@ def test_set_deposit_token_price_safety_factor_by_owner():
     )  # 7 MONTH
 
 
-def test_simulate_min_deposit_value(configs, deposit_token, gas_price):
-    check_network_is_mainnet_fork()
+def test_simulate_min_deposit_value(configs, protocol, deposit_token, gas_price):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
-    strategy_vault = get_strategy_vault(0)
+    strategy_manager = protocol.strategy_manager
+    strategy_vault = protocol.strategy_vault
     # Deposit in order to test simulateMinDepositValue with maxWithdraw(dev_wallet) > 0:
     strategy_vault.deposit(DEV_WALLET_LOW_DEPOSIT_TOKEN_AMOUNT, dev_wallet.address, {"from": dev_wallet})
-    price_feeds_data_consumer = PriceFeedsDataConsumer[-1]
+    price_feeds_data_consumer = protocol.price_feeds_data_consumer
     (
         native_token_price,
         native_token_price_decimals,
@@ -177,7 +177,7 @@ def test_simulate_min_deposit_value(configs, deposit_token, gas_price):
         whitelisted_deposit_asset[1], max_number_of_strategy_actions, configs["buy_frequency"]
     )
     current_network_gas_price = gas_price
-    deposit_token_decimals = deposit_token.decimals()
+    deposit_token_decimals = get_token_metadata().token(deposit_token.address).decimals
     expected_min_deposit_value = floor(
         int(
             int(
@@ -217,15 +217,15 @@ def test_simulate_min_deposit_value(configs, deposit_token, gas_price):
     )
 
 
-def test_simulate_min_deposit_value_after_wallet_deposit(configs, deposit_token, gas_price):
-    check_network_is_mainnet_fork()
+def test_simulate_min_deposit_value_after_wallet_deposit(configs, protocol, deposit_token, gas_price):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
-    strategy_vault = get_strategy_vault(0)
+    strategy_manager = protocol.strategy_manager
+    strategy_vault = protocol.strategy_vault
     depositor_previous_balance = strategy_vault.balanceOf(dev_wallet)
     max_number_of_strategy_actions = 12
     whitelisted_deposit_asset = configs["whitelisted_deposit_assets"][0]  # USDC.e
-    deposit_token_decimals = deposit_token.decimals()
+    deposit_token_decimals = get_token_metadata().token(deposit_token.address).decimals
     current_network_gas_price = gas_price
     min_deposit_balance_before = strategy_manager.simulateMinDepositValue(
         whitelisted_deposit_asset,
@@ -260,10 +260,10 @@ def test_simulate_min_deposit_value_after_wallet_deposit(configs, deposit_token,
 ################################ Contract Validations ################################
 
 
-def test_whitelist_addresses_by_non_owner(configs):
-    check_network_is_mainnet_fork()
+def test_whitelist_addresses_by_non_owner(configs, protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
+    strategy_manager = protocol.strategy_manager
     deposit_asset_to_whitelist = configs["whitelisted_deposit_assets"][1]
     # Act/ Assert
     with reverts(
@@ -272,10 +272,10 @@ def test_whitelist_addresses_by_non_owner(configs):
         strategy_manager.addWhitelistedDepositAssets([deposit_asset_to_whitelist], {"from": dev_wallet2})
 
 
-def test_deactivate_whitelisted_address_by_non_owner(configs):
-    check_network_is_mainnet_fork()
+def test_deactivate_whitelisted_address_by_non_owner(configs, protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
+    strategy_manager = protocol.strategy_manager
     deposit_asset_to_deactivate = configs["whitelisted_deposit_assets"][4][0]
     # Act / Assert
     with reverts(
@@ -284,10 +284,10 @@ def test_deactivate_whitelisted_address_by_non_owner(configs):
         strategy_manager.deactivateWhitelistedDepositAsset(deposit_asset_to_deactivate, {"from": dev_wallet2})
 
 
-def test_change_max_expected_gas_units_by_non_owner(configs):
-    check_network_is_mainnet_fork()
+def test_change_max_expected_gas_units_by_non_owner(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
+    strategy_manager = protocol.strategy_manager
     # Act / Assert
     with reverts(
         encode_custom_error_data(StrategyManager, "OwnableUnauthorizedAccount", ["address"], [dev_wallet2.address])
@@ -295,10 +295,10 @@ def test_change_max_expected_gas_units_by_non_owner(configs):
         strategy_manager.setMaxExpectedGasUnits(1, {"from": dev_wallet2})
 
 
-def test_set_gas_cost_safety_factor_by_non_owner():
-    check_network_is_mainnet_fork()
+def test_set_gas_cost_safety_factor_by_non_owner(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
+    strategy_manager = protocol.strategy_manager
     new_gas_cost_safety_factor = 800
     # Act / Assert
     with reverts(
@@ -307,10 +307,10 @@ def test_set_gas_cost_safety_factor_by_non_owner():
         strategy_manager.setGasCostSafetyFactor(0, new_gas_cost_safety_factor, {"from": dev_wallet2})  # <= 30 DAYS
 
 
-def test_set_deposit_token_price_safety_factor_by_non_owner():
-    check_network_is_mainnet_fork()
+def test_set_deposit_token_price_safety_factor_by_non_owner(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
+    strategy_manager = protocol.strategy_manager
     new_deposit_token_price_safety_factor = 200
     # Act/Assert
     with reverts(
@@ -321,11 +321,11 @@ def test_set_deposit_token_price_safety_factor_by_non_owner():
         )  # > 180 DAYS/BLUE_CHIP
 
 
-def test_deposit_generating_to_many_actions(configs):
-    check_network_is_mainnet_fork()
+def test_deposit_generating_to_many_actions(configs, protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_manager = StrategyManager[-1]
-    strategy_vault = get_strategy_vault(0)
+    strategy_manager = protocol.strategy_manager
+    strategy_vault = protocol.strategy_vault
     max_number_of_actions_per_frequency = strategy_manager.getMaxNumberOfActionsPerFrequency(configs["buy_frequency"])
     depositor_total_periodic_buy_amount = strategy_vault.getDepositorTotalPeriodicBuyAmount(dev_wallet)
     max_wallet_deposit_balance = max_number_of_actions_per_frequency * depositor_total_periodic_buy_amount
@@ -1,17 +1,19 @@
+import pytest
 from helpers import (
-    check_network_is_mainnet_fork,
-)
-from brownie import (
-    PriceFeedsDataConsumer,
+    get_account_from_pk,
+    check_network_is_local_or_mainnet_fork,
 )
+from scripts.local_market import PRICE_FEED_DECIMALS, set_price_feed_answer, to_price_feed_answer
+
+dev_wallet = get_account_from_pk(1)
 
 ################################ Contract Actions ################################
 
 
-def test_get_prices_for_all_whitelisted_addresses(configs):
-    check_network_is_mainnet_fork()
+def test_get_prices_for_all_whitelisted_addresses(configs, protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    price_feeds_data_consumer = PriceFeedsDataConsumer[-1]
+    price_feeds_data_consumer = protocol.price_feeds_data_consumer
     # Act/Assert
     for _, _, oracle_address, _ in configs["whitelisted_deposit_assets"]:
         token_price, token_price_decimals = price_feeds_data_consumer.getDataFeedLatestPriceAndDecimals(oracle_address)
@@ -19,10 +21,10 @@ def test_get_prices_for_all_whitelisted_addresses(configs):
         assert token_price_decimals > 0
 
 
-def test_get_native_token_price():
-    check_network_is_mainnet_fork()
+def test_get_native_token_price(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    price_feeds_data_consumer = PriceFeedsDataConsumer[-1]
+    price_feeds_data_consumer = protocol.price_feeds_data_consumer
     # Act
     (
         native_token_price,
@@ -31,3 +33,23 @@ def test_get_native_token_price():
     # Assert
     assert native_token_price > 0
     assert native_token_price_decimals > 0
+
+
+def test_get_price_after_local_price_feed_update(protocol, local_market):
+    check_network_is_local_or_mainnet_fork()
+    if local_market is None:
+        pytest.skip("Only for local testing!")
+    # Arrange
+    price_feeds_data_consumer = protocol.price_feeds_data_consumer
+    native_token_price_feed = local_market.price_feeds["WETH"]
+    # Act
+    set_price_feed_answer(native_token_price_feed, 1_234.5, dev_wallet)
+    # Assert
+    assert price_feeds_data_consumer.getNativeTokenDataFeedLatestPriceAndDecimals() == (
+        to_price_feed_answer(1_234.5),
+        PRICE_FEED_DECIMALS,
+    )
+    assert price_feeds_data_consumer.getDataFeedLatestPriceAndDecimals(native_token_price_feed.address) == (
+        to_price_feed_answer(1_234.5),
+        PRICE_FEED_DECIMALS,
+    )
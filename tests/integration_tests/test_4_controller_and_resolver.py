@@ -1,26 +1,20 @@
 import pytest
-from typing import List
-from scripts.deploy import deploy_resolver
+from typing import List, Tuple
 
 from helpers import (
     RoundingMethod,
-    get_strategy_vault,
     NULL_ADDRESS,
     get_account_from_pk,
     encode_custom_error,
     encode_custom_error_data,
     convert_assets_to_shares,
     perc_mul_contracts_simulate,
-    check_network_is_mainnet_fork,
+    check_network_is_local_or_mainnet_fork,
 )
 from brownie import (
     Contract,
-    Resolver,
     Controller,
-    TreasuryVault,
     StrategyWorker,
-    AutomatedVaultERC4626,
-    AutomatedVaultsFactory,
     web3,
     config,
     network,
@@ -33,6 +27,7 @@ dev_wallet2 = get_account_from_pk(2)
 
 DEV_WALLET_VAULT_LP_TOKEN_ALLOWANCE_TO_WORKER_AMOUNT = 999_999_999_999_999_999_999_999_999_999
 DEV_WALLET_DEPOSIT_TOKEN_AMOUNT = 20_000
+DEV_WALLET_2ND_DEPOSIT_TOKEN_AMOUNT = 10_000
 
 CONTROLLER_CALLER_BYTES_ROLE = web3.keccak(text="CONTROLLER_CALLER")
 ENCODER_SEPARATOR = "0000000000000000000000000000000000000000000000000000000000000000"
@@ -40,20 +35,18 @@ ENCODER_SEPARATOR = "00000000000000000000000000000000000000000000000000000000000
 ################################ Contract Actions ################################
 
 
-def test_resolver_checker_before_controller_first_action():
-    check_network_is_mainnet_fork()
+def test_resolver_checker_before_controller_first_action(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    verify_flag = config["networks"][network.show_active()]["verify"]
-    strategy_worker_address = StrategyWorker[-1].address
-    automated_vaults_factory_address = AutomatedVaultsFactory[-1].address
-    controller = Controller[-1]
-    first_deployed_vault_address = AutomatedVaultERC4626[0].address
+    strategy_worker_address = protocol.strategy_worker.address
+    controller = protocol.controller
+    first_deployed_vault_address = protocol.strategy_vault.address
     expected_decoded_payload = (
         "triggerStrategyAction(address,address,address)",
         [strategy_worker_address, first_deployed_vault_address, dev_wallet.address],
     )
+    resolver = protocol.resolver
     # Act
-    resolver = deploy_resolver(dev_wallet, verify_flag, automated_vaults_factory_address, strategy_worker_address)
     can_exec, payload = resolver.checker()
     decoded_payload = controller.decode_input(payload)
     # Assert
@@ -61,14 +54,14 @@ def test_resolver_checker_before_controller_first_action():
     assert decoded_payload == expected_decoded_payload
 
 
-def test_trigger_strategy_action_by_owner_address(configs, deposit_token, buy_tokens, dex_router):
-    check_network_is_mainnet_fork()
+def test_trigger_strategy_action_by_owner_address(configs, protocol, deposit_token, buy_tokens, dex_router):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    controller = Controller[-1]
-    strategy_worker_address = StrategyWorker[-1].address
-    strategy_vault = get_strategy_vault()
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
     strategy_vault_address = strategy_vault.address
-    treasury_vault_address = TreasuryVault[-1].address
+    treasury_vault_address = protocol.treasury_vault.address
     initial_vault_balance_of_deposit_asset = deposit_token.balanceOf(strategy_vault_address)
     initial_depositor_vault_lp_balance = strategy_vault.balanceOf(dev_wallet)
     initial_depositor_balances_of_buy_assets = [buy_token.balanceOf(dev_wallet) for buy_token in buy_tokens]
@@ -127,17 +120,202 @@ def test_trigger_strategy_action_by_owner_address(configs, deposit_token, buy_to
         ) >= min_buy_assets_amounts_out[i] * (1 - (configs["max_slippage_perc"] / 10_000))
 
 
-def test_resolver_checker_after_controller_first_action():
-    check_network_is_mainnet_fork()
+def test_trigger_strategy_action_with_paths_by_owner_address(configs, protocol, buy_tokens, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_worker_address = StrategyWorker[-1].address
-    controller = Controller[-1]
-    first_deployed_vault_address = get_strategy_vault()
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
+    strategy_vault_address = strategy_vault.address
+    deposit_to_vault(strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    swap_paths = [
+        __get_path(buy_token_address, configs["deposit_token_address"], configs["dex_main_token_address"])
+        for buy_token_address in configs["buy_token_addresses"]
+    ]
+    initial_depositor_balances_of_buy_assets = [buy_token.balanceOf(dev_wallet2) for buy_token in buy_tokens]
+    # Act
+    tx = controller.triggerStrategyActionWithPaths(
+        strategy_worker_address, strategy_vault_address, dev_wallet2, swap_paths, {"from": dev_wallet}
+    )
+    final_depositor_balances_of_buy_assets = [buy_token.balanceOf(dev_wallet2) for buy_token in buy_tokens]
+    # Assert
+    assert strategy_vault.lastUpdateOf(dev_wallet2) == tx.timestamp
+    assert list(tx.events["StrategyActionExecuted"]["buyAssets"]) == configs["buy_token_addresses"]
+    for i in range(strategy_vault.buyAssetsLength()):
+        assert final_depositor_balances_of_buy_assets[i] > initial_depositor_balances_of_buy_assets[i]
+
+
+def test_trigger_strategy_action_with_path_not_ending_at_buy_asset(configs, protocol, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
+    # Arrange
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
+    deposit_to_vault(strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    swap_paths = [
+        [configs["deposit_token_address"], configs["dex_main_token_address"]] for _ in configs["buy_token_addresses"]
+    ]
+    swap_paths[0] = list(reversed(swap_paths[0]))
+    # Act / Assert
+    with reverts(
+        encode_custom_error_data(
+            StrategyWorker, "SwapPathNotFound", ["string"], ["Swap path doesn't go from deposit asset to buy asset"]
+        )
+    ):
+        controller.triggerStrategyActionWithPaths(
+            strategy_worker_address, strategy_vault.address, dev_wallet2, swap_paths, {"from": dev_wallet}
+        )
+
+
+def test_trigger_strategy_action_with_path_worse_than_default_path(configs, protocol, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
+    # Arrange
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
+    deposit_to_vault(strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    deposit_token_address, dex_main_token_address = configs["deposit_token_address"], configs["dex_main_token_address"]
+    # a round trip through the dex main token pays the swap fees twice before taking the default path
+    swap_paths = [
+        [deposit_token_address, dex_main_token_address]
+        + __get_path(buy_token_address, deposit_token_address, dex_main_token_address)
+        for buy_token_address in configs["buy_token_addresses"]
+    ]
+    # Act / Assert
+    with reverts("UniswapV2Router: INSUFFICIENT_OUTPUT_AMOUNT"):
+        controller.triggerStrategyActionWithPaths(
+            strategy_worker_address, strategy_vault.address, dev_wallet2, swap_paths, {"from": dev_wallet}
+        )
+
+
+def test_trigger_strategy_action_with_routes_by_owner_address(
+    configs, protocol, buy_tokens, dex_router, deposit_to_vault
+):
+    check_network_is_local_or_mainnet_fork()
+    # Arrange
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
+    deposit_to_vault(strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    wallet_buy_amounts = strategy_vault.getDepositorBuyAmounts(dev_wallet2)
+    swap_routes = [
+        (
+            __get_path(buy_token_address, configs["deposit_token_address"], configs["dex_main_token_address"]),
+            __get_min_amount_out(buy_token_address, buy_amount, configs, dex_router),
+        )
+        for buy_token_address, buy_amount in zip(configs["buy_token_addresses"], wallet_buy_amounts)
+    ]
+    initial_depositor_balances_of_buy_assets = [buy_token.balanceOf(dev_wallet2) for buy_token in buy_tokens]
+    # Act
+    tx = controller.triggerStrategyActionWithRoutes(
+        strategy_worker_address, strategy_vault.address, dev_wallet2, swap_routes, {"from": dev_wallet}
+    )
+    final_depositor_balances_of_buy_assets = [buy_token.balanceOf(dev_wallet2) for buy_token in buy_tokens]
+    # Assert
+    assert strategy_vault.lastUpdateOf(dev_wallet2) == tx.timestamp
+    for i in range(strategy_vault.buyAssetsLength()):
+        assert (final_depositor_balances_of_buy_assets[i] - initial_depositor_balances_of_buy_assets[i]) >= swap_routes[
+            i
+        ][1] * (1 - (configs["max_slippage_perc"] / 10_000))
+
+
+def test_trigger_strategy_action_with_routes_quoted_above_pool_output(configs, protocol, dex_router, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
+    # Arrange
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
+    deposit_to_vault(strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    wallet_buy_amounts = strategy_vault.getDepositorBuyAmounts(dev_wallet2)
+    swap_routes = [
+        (
+            __get_path(buy_token_address, configs["deposit_token_address"], configs["dex_main_token_address"]),
+            2 * __get_min_amount_out(buy_token_address, buy_amount, configs, dex_router),
+        )
+        for buy_token_address, buy_amount in zip(configs["buy_token_addresses"], wallet_buy_amounts)
+    ]
+    # Act / Assert
+    with reverts("UniswapV2Router: INSUFFICIENT_OUTPUT_AMOUNT"):
+        controller.triggerStrategyActionWithRoutes(
+            strategy_worker_address, strategy_vault.address, dev_wallet2, swap_routes, {"from": dev_wallet}
+        )
+
+
+def test_trigger_strategy_action_with_routes_quoted_below_reference(configs, protocol, dex_router, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
+    # Arrange
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
+    deposit_to_vault(strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    wallet_buy_amounts = strategy_vault.getDepositorBuyAmounts(dev_wallet2)
+    reference_amounts_out = __get_min_buy_assets_amounts_out(configs, dex_router, wallet_buy_amounts)
+    # a 1 wei quote would otherwise accept any swap output, checked against the router quote as the buy assets
+    # aren't whitelisted with a price feed
+    swap_routes = [
+        (__get_path(buy_token_address, configs["deposit_token_address"], configs["dex_main_token_address"]), 1)
+        for buy_token_address in configs["buy_token_addresses"]
+    ]
+    # Act / Assert
+    with reverts(
+        encode_custom_error_data(
+            StrategyWorker, "SwapQuoteBelowReference", ["uint256", "uint256"], [1, reference_amounts_out[0]]
+        )
+    ):
+        controller.triggerStrategyActionWithRoutes(
+            strategy_worker_address, strategy_vault.address, dev_wallet2, swap_routes, {"from": dev_wallet}
+        )
+
+
+def test_trigger_strategy_action_with_routes_quoted_below_oracle_price(
+    configs, protocol, deposit_token, buy_tokens, deposit_to_vault
+):
+    check_network_is_local_or_mainnet_fork()
+    # Arrange
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
+    whitelisted_buy_assets = [
+        whitelisted_deposit_asset
+        for whitelisted_deposit_asset in configs["whitelisted_deposit_assets"]
+        if whitelisted_deposit_asset[0].lower() == configs["buy_token_addresses"][0].lower()
+    ]
+    protocol.strategy_manager.addWhitelistedDepositAssets(whitelisted_buy_assets, {"from": dev_wallet})
+    deposit_to_vault(strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    buy_amount_after_fee = __get_buy_amount_after_fee(
+        strategy_vault.getDepositorBuyAmounts(dev_wallet2)[0], configs["treasury_percentage_fee_on_balance_update"]
+    )
+    oracle_amount_out = __get_oracle_amount_out(protocol, deposit_token, buy_tokens[0], buy_amount_after_fee)
+    swap_routes = [
+        (__get_path(buy_token_address, configs["deposit_token_address"], configs["dex_main_token_address"]), 1)
+        for buy_token_address in configs["buy_token_addresses"]
+    ]
+    # Act / Assert
+    with reverts(
+        encode_custom_error_data(
+            StrategyWorker, "SwapQuoteBelowReference", ["uint256", "uint256"], [1, oracle_amount_out]
+        )
+    ):
+        controller.triggerStrategyActionWithRoutes(
+            strategy_worker_address, strategy_vault.address, dev_wallet2, swap_routes, {"from": dev_wallet}
+        )
+
+
+def test_resolver_checker_after_controller_first_action(protocol, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
+    # Arrange
+    strategy_worker_address = protocol.strategy_worker.address
+    controller = protocol.controller
+    first_deployed_vault_address = protocol.strategy_vault.address
+    deposit_to_vault(protocol.strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    controller.triggerStrategyAction(
+        strategy_worker_address, first_deployed_vault_address, dev_wallet, {"from": dev_wallet}
+    )
     expected_decoded_payload = (
         "triggerStrategyAction(address,address,address)",
         [strategy_worker_address, first_deployed_vault_address, dev_wallet2.address],
     )
-    resolver = Resolver[-1]
+    resolver = protocol.resolver
     # Act
     can_exec, payload = resolver.checker()
     decoded_payload = controller.decode_input(payload)
@@ -146,22 +324,27 @@ def test_resolver_checker_after_controller_first_action():
     assert decoded_payload == expected_decoded_payload
 
 
-def test_resolver_checker_after_controller_update_all_vaults(deposit_token):
-    check_network_is_mainnet_fork()
+def test_resolver_checker_after_controller_update_all_vaults(protocol, create_strategy_vault, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    first_deployed_strategy_vault = get_strategy_vault()
-    second_deployed_strategy_vault = get_strategy_vault(1)
-    third_deployed_strategy_vault = get_strategy_vault(2)
+    first_deployed_strategy_vault = protocol.strategy_vault
+    second_deployed_strategy_vault = create_strategy_vault()
+    third_deployed_strategy_vault = create_strategy_vault()
+    deposit_to_vault(first_deployed_strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    deposit_to_vault(second_deployed_strategy_vault, dev_wallet2, DEV_WALLET_2ND_DEPOSIT_TOKEN_AMOUNT)
     first_deployed_strategy_vault_address = first_deployed_strategy_vault.address
     second_deployed_strategy_vault_address = second_deployed_strategy_vault.address
     third_deployed_strategy_vault_address = third_deployed_strategy_vault.address
-    strategy_worker_address = StrategyWorker[-1].address
-    controller = Controller[-1]
-    resolver = Resolver[-1]
+    strategy_worker_address = protocol.strategy_worker.address
+    controller = protocol.controller
+    resolver = protocol.resolver
     expected_decoded_last_payload = (
         "triggerStrategyAction(address,address,address)",
         [strategy_worker_address, third_deployed_strategy_vault_address, dev_wallet.address],
     )
+    controller.triggerStrategyAction(
+        strategy_worker_address, first_deployed_strategy_vault_address, dev_wallet, {"from": dev_wallet}
+    )
     # Act
     first_deployed_strategy_vault.approve(
         strategy_worker_address, DEV_WALLET_VAULT_LP_TOKEN_ALLOWANCE_TO_WORKER_AMOUNT, {"from": dev_wallet2}
@@ -194,13 +377,15 @@ def test_resolver_checker_after_controller_update_all_vaults(deposit_token):
     assert decoded_last_payload == expected_decoded_last_payload
 
 
-def test_trigger_strategy_action_before_next_valid_timestamp():
-    check_network_is_mainnet_fork()
+def test_trigger_strategy_action_before_next_valid_timestamp(protocol, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    controller = Controller[-1]
-    strategy_worker_address = StrategyWorker[-1].address
-    strategy_vault = get_strategy_vault()
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
     strategy_vault_address = strategy_vault.address
+    deposit_to_vault(strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    controller.triggerStrategyAction(strategy_worker_address, strategy_vault_address, dev_wallet2, {"from": dev_wallet})
     # Act / Assert
     with reverts(encode_custom_error(StrategyWorker, "UpdateConditionsNotMet", [])):
         controller.triggerStrategyAction(
@@ -208,12 +393,12 @@ def test_trigger_strategy_action_before_next_valid_timestamp():
         )
 
 
-def test_trigger_strategy_action_by_address_without_controller_role():
-    check_network_is_mainnet_fork()
+def test_trigger_strategy_action_by_address_without_controller_role(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    controller = Controller[-1]
-    strategy_worker_address = StrategyWorker[-1].address
-    strategy_vault = get_strategy_vault()
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
     strategy_vault_address = strategy_vault.address
     # Act / Assert
     with reverts(
@@ -229,13 +414,15 @@ def test_trigger_strategy_action_by_address_without_controller_role():
         )
 
 
-def test_add_controller_role_to_address():
-    check_network_is_mainnet_fork()
+def test_add_controller_role_to_address(protocol, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    controller = Controller[-1]
-    strategy_worker_address = StrategyWorker[-1].address
-    strategy_vault = get_strategy_vault()
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
     strategy_vault_address = strategy_vault.address
+    deposit_to_vault(strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    controller.triggerStrategyAction(strategy_worker_address, strategy_vault_address, dev_wallet2, {"from": dev_wallet})
     # Act
     controller.grantRole(CONTROLLER_CALLER_BYTES_ROLE, dev_wallet2, {"from": dev_wallet})
     # Assert
@@ -246,13 +433,14 @@ def test_add_controller_role_to_address():
     assert controller.hasRole(CONTROLLER_CALLER_BYTES_ROLE, dev_wallet) == True
 
 
-def test_remove_controller_role_from_address():
-    check_network_is_mainnet_fork()
+def test_remove_controller_role_from_address(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    controller = Controller[-1]
-    strategy_worker_address = StrategyWorker[-1].address
-    strategy_vault = get_strategy_vault()
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
     strategy_vault_address = strategy_vault.address
+    controller.grantRole(CONTROLLER_CALLER_BYTES_ROLE, dev_wallet2, {"from": dev_wallet})
     # Act
     controller.revokeRole(CONTROLLER_CALLER_BYTES_ROLE, dev_wallet2, {"from": dev_wallet})
     # Assert
@@ -273,33 +461,34 @@ def test_remove_controller_role_from_address():
 ################################ Contract Validations ################################
 
 
-def test_trigger_strategy_action_by_owner_address_for_insufficient_lp_balance_wallet():
-    check_network_is_mainnet_fork()
+def test_trigger_strategy_action_by_owner_address_for_insufficient_lp_balance_wallet(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    controller = Controller[-1]
-    strategy_worker_address = StrategyWorker[-1].address
-    strategy_vault = get_strategy_vault()
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
     strategy_vault_address = strategy_vault.address
+    # dev_wallet withdraws the full vault lp balance (keeping some dust shares), so it shoudn't have enough balance
+    # to cover total_buy_amount_in_deposit_asset
+    strategy_vault.withdraw(strategy_vault.maxWithdraw(dev_wallet), dev_wallet, dev_wallet, {"from": dev_wallet})
     # Act / Assert
     strategy_vault.approve(
         strategy_worker_address, DEV_WALLET_VAULT_LP_TOKEN_ALLOWANCE_TO_WORKER_AMOUNT, {"from": dev_wallet}
     )
-    # dev_wallet withdrew the full vault lp balance in a previous test: "test_total_withdraw" and received some dust
-    # amount in "test_balance_of_creator_without_deposit_after_another_wallet_deposit".
-    # Thus, at this point, shoudn't have enough balance to cover total_buy_amount_in_deposit_asset
     with reverts(encode_custom_error(StrategyWorker, "UpdateConditionsNotMet", [])):
         controller.triggerStrategyAction(
             strategy_worker_address, strategy_vault_address, dev_wallet, {"from": dev_wallet}
         )
 
 
-def test_trigger_strategy_action_by_owner_address_for_insufficient_lp_allowance_wallet():
-    check_network_is_mainnet_fork()
+def test_trigger_strategy_action_by_owner_address_for_insufficient_lp_allowance_wallet(protocol, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    controller = Controller[-1]
-    strategy_worker_address = StrategyWorker[-1].address
-    strategy_vault = get_strategy_vault()
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
     strategy_vault_address = strategy_vault.address
+    deposit_to_vault(strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
     # Act / Assert
     strategy_vault.approve(strategy_worker_address, 0, {"from": dev_wallet2})
     with reverts(encode_custom_error(StrategyWorker, "UpdateConditionsNotMet", [])):
@@ -308,10 +497,10 @@ def test_trigger_strategy_action_by_owner_address_for_insufficient_lp_allowance_
         )
 
 
-def test_trigger_strategy_action_with_invalid_worker_address():
-    controller = Controller[-1]
+def test_trigger_strategy_action_with_invalid_worker_address(protocol):
+    controller = protocol.controller
     invalid_worker_address = config["networks"][network.show_active()]["treasury_address"]
-    strategy_vault = get_strategy_vault()
+    strategy_vault = protocol.strategy_vault
     strategy_vault_address = strategy_vault.address
     # Act / Assert
     strategy_vault.approve(
@@ -323,9 +512,9 @@ def test_trigger_strategy_action_with_invalid_worker_address():
         )
 
 
-def test_trigger_strategy_action_with_invalid_vault_address():
-    controller = Controller[-1]
-    strategy_worker_address = StrategyWorker[-1].address
+def test_trigger_strategy_action_with_invalid_vault_address(protocol):
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
     invalid_vault_address = config["networks"][network.show_active()]["treasury_address"]
     # Act / Assert
     with pytest.raises(exceptions.VirtualMachineError):  # Reverts with empty string
@@ -334,10 +523,10 @@ def test_trigger_strategy_action_with_invalid_vault_address():
         )
 
 
-def test_trigger_strategy_action_with_null_depositor_address():
-    controller = Controller[-1]
-    strategy_worker_address = StrategyWorker[-1].address
-    strategy_vault = get_strategy_vault()
+def test_trigger_strategy_action_with_null_depositor_address(protocol):
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
     strategy_vault_address = strategy_vault.address
     # Act / Assert
     with reverts(encode_custom_error(StrategyWorker, "ZeroOrNegativeVaultWithdrawAmount", [])):
@@ -346,10 +535,10 @@ def test_trigger_strategy_action_with_null_depositor_address():
         )
 
 
-def test_add_controller_role_to_address_by_non_admin():
-    check_network_is_mainnet_fork()
+def test_add_controller_role_to_address_by_non_admin(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    controller = Controller[-1]
+    controller = protocol.controller
     # Act/Assert
     controller.revokeRole(CONTROLLER_CALLER_BYTES_ROLE, dev_wallet2, {"from": dev_wallet})
     with reverts(
@@ -360,10 +549,10 @@ def test_add_controller_role_to_address_by_non_admin():
     assert controller.hasRole(CONTROLLER_CALLER_BYTES_ROLE, dev_wallet2) == False
 
 
-def test_remove_controller_role_from_address_by_non_admin():
-    check_network_is_mainnet_fork()
+def test_remove_controller_role_from_address_by_non_admin(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    controller = Controller[-1]
+    controller = protocol.controller
     # Act/Assert
     controller.grantRole(CONTROLLER_CALLER_BYTES_ROLE, dev_wallet2, {"from": dev_wallet})
     with reverts(
@@ -374,10 +563,10 @@ def test_remove_controller_role_from_address_by_non_admin():
     assert controller.hasRole(CONTROLLER_CALLER_BYTES_ROLE, dev_wallet2) == True
 
 
-def test_remove_controller_role_from_admin_by_non_admin():
-    check_network_is_mainnet_fork()
+def test_remove_controller_role_from_admin_by_non_admin(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    controller = Controller[-1]
+    controller = protocol.controller
     # Act/Assert
     with reverts(
         encode_custom_error_data(StrategyWorker, "AccessControlUnauthorizedAccount", ["address"], [dev_wallet2.address])
@@ -387,10 +576,10 @@ def test_remove_controller_role_from_admin_by_non_admin():
     assert controller.hasRole(CONTROLLER_CALLER_BYTES_ROLE, dev_wallet) == True
 
 
-def test_add_controller_role_to_null_address_by_non_admin():
-    check_network_is_mainnet_fork()
+def test_add_controller_role_to_null_address_by_non_admin(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    controller = Controller[-1]
+    controller = protocol.controller
     # Act/Assert
     with reverts(
         encode_custom_error_data(StrategyWorker, "AccessControlUnauthorizedAccount", ["address"], [dev_wallet2.address])
@@ -425,6 +614,18 @@ def __get_buy_amount_after_fee(buy_amount: int, perc_fee: int) -> int:
     return perc_mul_contracts_simulate(buy_amount, one_hunderd_percent_minus_perc_fee)
 
 
+def __get_oracle_amount_out(protocol, deposit_token: Contract, buy_token: Contract, amount_in: int) -> int:
+    deposit_asset_price, deposit_asset_unit = __get_oracle_price(protocol, deposit_token)
+    buy_asset_price, buy_asset_unit = __get_oracle_price(protocol, buy_token)
+    return amount_in * deposit_asset_price * buy_asset_unit // (buy_asset_price * deposit_asset_unit)
+
+
+def __get_oracle_price(protocol, asset: Contract) -> Tuple[int, int]:
+    oracle_address = protocol.strategy_manager.getWhitelistedDepositAsset(asset.address)[2]
+    price, price_decimals = protocol.price_feeds_data_consumer.getDataFeedLatestPriceAndDecimals(oracle_address)
+    return price, 10 ** (price_decimals + asset.decimals())
+
+
 def __get_path(buy_token_address: str, deposit_token_address: str, dex_main_token_address: str) -> List[str]:
     if buy_token_address != dex_main_token_address and deposit_token_address != dex_main_token_address:
         return [deposit_token_address, dex_main_token_address, buy_token_address]
@@ -1,22 +1,27 @@
-from brownie import StrategyWorker, reverts, web3
+from typing import List
+from brownie import StrategyWorker, chain, project, reverts, web3
+from docs.abis import abi_registry
+from scripts.export_abis import EXPORTED_CONTRACTS
 
 from helpers import (
-    get_strategy_vault,
     get_account_from_pk,
     encode_custom_error_data,
-    check_network_is_mainnet_fork,
+    perc_mul_contracts_simulate,
+    check_network_is_local_or_mainnet_fork,
 )
 
 dev_wallet = get_account_from_pk(1)
+dev_wallet2 = get_account_from_pk(2)
 
 CONTROLLER_CALLER_BYTES_ROLE = web3.keccak(text="CONTROLLER")
+DEV_WALLET_DEPOSIT_TOKEN_AMOUNT = 20_000
 
 
-def test_execute_strategy_action_by_non_controller_address():
-    check_network_is_mainnet_fork()
+def test_execute_strategy_action_by_non_controller_address(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    strategy_worker = StrategyWorker[-1]
-    strategy_vault_address = get_strategy_vault().address
+    strategy_worker = protocol.strategy_worker
+    strategy_vault_address = protocol.strategy_vault.address
     # Act / Assert
     with reverts(
         encode_custom_error_data(
@@ -27,3 +32,104 @@ def test_execute_strategy_action_by_non_controller_address():
         )
     ):
         strategy_worker.executeStrategyAction(strategy_vault_address, dev_wallet, {"from": dev_wallet})
+
+
+def test_execute_strategy_action_with_routes_by_non_controller_address(configs, protocol):
+    check_network_is_local_or_mainnet_fork()
+    # Arrange
+    strategy_worker = protocol.strategy_worker
+    strategy_vault_address = protocol.strategy_vault.address
+    swap_routes = [
+        (__get_path(buy_token_address, configs["deposit_token_address"], configs["dex_main_token_address"]), 0)
+        for buy_token_address in configs["buy_token_addresses"]
+    ]
+    # Act / Assert
+    with reverts(
+        encode_custom_error_data(
+            StrategyWorker,
+            "AccessControlUnauthorizedAccount",
+            ["address", "bytes32"],
+            [dev_wallet.address, CONTROLLER_CALLER_BYTES_ROLE],
+        )
+    ):
+        strategy_worker.executeStrategyActionWithRoutes(
+            strategy_vault_address, dev_wallet, swap_routes, {"from": dev_wallet}
+        )
+
+
+def test_exported_abis_match_the_compiled_contracts():
+    # Arrange
+    active_project = project.get_loaded_projects()[0]
+    # Act
+    compiled_abis = {
+        abi_name: active_project[contract_name].abi for abi_name, contract_name in EXPORTED_CONTRACTS.items()
+    }
+    # Assert
+    for abi_name, compiled_abi in compiled_abis.items():
+        assert abi_registry.get(abi_name) == compiled_abi, f"run scripts/export_abis.py to refresh {abi_name}.json"
+
+
+def test_quoted_swaps_dont_call_the_router_before_swapping(configs, protocol, dex_router, deposit_to_vault):
+    check_network_is_local_or_mainnet_fork()
+    # Arrange
+    controller = protocol.controller
+    strategy_worker_address = protocol.strategy_worker.address
+    strategy_vault = protocol.strategy_vault
+    update_frequency = strategy_vault.getUpdateFrequencyTimestamp()
+    buy_token_addresses = configs["buy_token_addresses"]
+    protocol.strategy_manager.addWhitelistedDepositAssets(
+        __get_whitelisted_buy_assets(configs, buy_token_addresses), {"from": dev_wallet}
+    )
+    deposit_to_vault(strategy_vault, dev_wallet2, DEV_WALLET_DEPOSIT_TOKEN_AMOUNT)
+    # the first action warms the treasury and depositor balances both measured actions write to
+    controller.triggerStrategyAction(strategy_worker_address, strategy_vault.address, dev_wallet2, {"from": dev_wallet})
+    chain.sleep(update_frequency)
+    router_tx = controller.triggerStrategyAction(
+        strategy_worker_address, strategy_vault.address, dev_wallet2, {"from": dev_wallet}
+    )
+    chain.sleep(update_frequency)
+    paths = [
+        __get_path(buy_token_address, configs["deposit_token_address"], configs["dex_main_token_address"])
+        for buy_token_address in buy_token_addresses
+    ]
+    buy_amounts_after_fee = [
+        __get_buy_amount_after_fee(buy_amount, configs["treasury_percentage_fee_on_balance_update"])
+        for buy_amount in strategy_vault.getDepositorBuyAmounts(dev_wallet2)
+    ]
+    swap_routes = [
+        (path, dex_router.getAmountsOut(buy_amount_after_fee, path)[-1])
+        for path, buy_amount_after_fee in zip(paths, buy_amounts_after_fee)
+    ]
+    # Act
+    quoted_tx = controller.triggerStrategyActionWithRoutes(
+        strategy_worker_address, strategy_vault.address, dev_wallet2, swap_routes, {"from": dev_wallet}
+    )
+    gas_saved_per_swap = (router_tx.gas_used - quoted_tx.gas_used) // len(buy_token_addresses)
+    print(f"gas saved per quoted swap: {gas_saved_per_swap}")
+    # Assert
+    assert quoted_tx.status == 1
+    assert [
+        subcall
+        for subcall in quoted_tx.subcalls
+        if subcall["to"] == dex_router.address and subcall.get("function", "").startswith("getAmountsOut")
+    ] == []
+
+
+def __get_whitelisted_buy_assets(configs: dict, buy_token_addresses: List[str]) -> List[list]:
+    buy_token_addresses = [buy_token_address.lower() for buy_token_address in buy_token_addresses]
+    return [
+        whitelisted_deposit_asset
+        for whitelisted_deposit_asset in configs["whitelisted_deposit_assets"]
+        if whitelisted_deposit_asset[0].lower() in buy_token_addresses
+    ]
+
+
+def __get_buy_amount_after_fee(buy_amount: int, perc_fee: int) -> int:
+    one_hunderd_percent_minus_perc_fee = 10_000 - perc_fee
+    return perc_mul_contracts_simulate(buy_amount, one_hunderd_percent_minus_perc_fee)
+
+
+def __get_path(buy_token_address: str, deposit_token_address: str, dex_main_token_address: str) -> List[str]:
+    if buy_token_address != dex_main_token_address and deposit_token_address != dex_main_token_address:
+        return [deposit_token_address, dex_main_token_address, buy_token_address]
+    return [deposit_token_address, buy_token_address]
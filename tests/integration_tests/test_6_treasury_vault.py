@@ -1,6 +1,6 @@
 import pytest
 from brownie import TreasuryVault, reverts
-from helpers import get_account_from_pk, check_network_is_mainnet_fork, encode_custom_error_data
+from helpers import get_account_from_pk, check_network_is_local_or_mainnet_fork, encode_custom_error_data
 
 dev_wallet = get_account_from_pk(1)
 dev_wallet2 = get_account_from_pk(2)
@@ -15,10 +15,10 @@ NEGATIVE_AMOUNT_TESTING_VALUE = -1
 ################################ Contract Actions ################################
 
 
-def test_send_ether_to_vault():
-    check_network_is_mainnet_fork()
+def test_send_ether_to_vault(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     treasury_vault_address = treasury_vault.address
     initial_treasury_vault_native_balance = treasury_vault.balance()
     # Act
@@ -30,10 +30,10 @@ def test_send_ether_to_vault():
     )
 
 
-def test_send_erc20_to_treasury_vault(deposit_token):
-    check_network_is_mainnet_fork()
+def test_send_erc20_to_treasury_vault(protocol, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     treasury_vault_address = treasury_vault.address
     initial_treasury_vault_deposit_token_balance = deposit_token.balanceOf(treasury_vault_address)
     # Act
@@ -46,10 +46,10 @@ def test_send_erc20_to_treasury_vault(deposit_token):
     )
 
 
-def test_deposit_erc20(deposit_token):
-    check_network_is_mainnet_fork()
+def test_deposit_erc20(protocol, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     treasury_vault_address = treasury_vault.address
     initial_treasury_vault_deposit_token_balance = deposit_token.balanceOf(treasury_vault_address)
     # Act
@@ -63,10 +63,10 @@ def test_deposit_erc20(deposit_token):
     )
 
 
-def test_withdraw_native_by_owner():
-    check_network_is_mainnet_fork()
+def test_withdraw_native_by_owner(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     initial_treasury_vault_native_balance = treasury_vault.balance()
     # Act
     treasury_vault.withdrawNative(DEV_WALLET_NATIVE_AMOUNT_TO_WITHDRAW, {"from": dev_wallet})
@@ -78,11 +78,12 @@ def test_withdraw_native_by_owner():
     )
 
 
-def test_withdraw_erc20_by_owner(deposit_token):
-    check_network_is_mainnet_fork()
+def test_withdraw_erc20_by_owner(protocol, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     treasury_vault_address = treasury_vault.address
+    deposit_token.transfer(treasury_vault_address, DEV_WALLET_ERC20_AMOUNT_TO_SEND, {"from": dev_wallet})
     initial_treasury_vault_deposit_token_balance = deposit_token.balanceOf(treasury_vault_address)
     # Act
     treasury_vault.withdrawERC20(deposit_token.address, DEV_WALLET_ERC20_AMOUNT_TO_WITHDRAW, {"from": dev_wallet})
@@ -94,10 +95,10 @@ def test_withdraw_erc20_by_owner(deposit_token):
     )
 
 
-def test_withdraw_native_amount_eq_zero_by_owner():
-    check_network_is_mainnet_fork()
+def test_withdraw_native_amount_eq_zero_by_owner(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     initial_treasury_vault_native_balance = treasury_vault.balance()
     # Act
     treasury_vault.withdrawNative(0, {"from": dev_wallet})
@@ -106,10 +107,10 @@ def test_withdraw_native_amount_eq_zero_by_owner():
     assert initial_treasury_vault_native_balance == final_treasury_vault_native_balance
 
 
-def test_withdraw_erc20_amount_eq_zero_by_owner(deposit_token):
-    check_network_is_mainnet_fork()
+def test_withdraw_erc20_amount_eq_zero_by_owner(protocol, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     treasury_vault_address = treasury_vault.address
     initial_treasury_vault_deposit_token_balance = deposit_token.balanceOf(treasury_vault_address)
     # Act
@@ -122,10 +123,10 @@ def test_withdraw_erc20_amount_eq_zero_by_owner(deposit_token):
 ################################ Contract Validations ################################
 
 
-def test_withdraw_native_by_non_owner():
-    check_network_is_mainnet_fork()
+def test_withdraw_native_by_non_owner(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     # Act / Assert
     with reverts(
         encode_custom_error_data(TreasuryVault, "OwnableUnauthorizedAccount", ["address"], [dev_wallet2.address])
@@ -133,10 +134,10 @@ def test_withdraw_native_by_non_owner():
         treasury_vault.withdrawNative(DEV_WALLET_NATIVE_AMOUNT_TO_WITHDRAW, {"from": dev_wallet2})
 
 
-def test_withdraw_erc20_by_non_owner(deposit_token):
-    check_network_is_mainnet_fork()
+def test_withdraw_erc20_by_non_owner(protocol, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     # Act / Assert
     with reverts(
         encode_custom_error_data(TreasuryVault, "OwnableUnauthorizedAccount", ["address"], [dev_wallet2.address])
@@ -144,20 +145,20 @@ def test_withdraw_erc20_by_non_owner(deposit_token):
         treasury_vault.withdrawERC20(deposit_token.address, DEV_WALLET_ERC20_AMOUNT_TO_WITHDRAW, {"from": dev_wallet2})
 
 
-def test_withdraw_native_amount_gt_total_balance_by_owner():
-    check_network_is_mainnet_fork()
+def test_withdraw_native_amount_gt_total_balance_by_owner(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     treasury_vault_native_balance = treasury_vault.balance()
     # Act / Assert
     with reverts(encode_custom_error_data(TreasuryVault, "NotEnoughEther", ["string"], ["Insufficient balance"])):
         treasury_vault.withdrawNative(treasury_vault_native_balance + 1, {"from": dev_wallet})
 
 
-def test_withdraw_erc20_amount_gt_total_balance_by_owner(deposit_token):
-    check_network_is_mainnet_fork()
+def test_withdraw_erc20_amount_gt_total_balance_by_owner(protocol, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     treasury_vault_address = treasury_vault.address
     treasury_vault_deposit_token_balance = deposit_token.balanceOf(treasury_vault_address)
     # Act / Assert
@@ -167,19 +168,19 @@ def test_withdraw_erc20_amount_gt_total_balance_by_owner(deposit_token):
         )
 
 
-def test_withdraw_native_amount_lt_zero_by_owner():
-    check_network_is_mainnet_fork()
+def test_withdraw_native_amount_lt_zero_by_owner(protocol):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     # Act / Assert
     with pytest.raises(OverflowError):
         treasury_vault.withdrawNative(NEGATIVE_AMOUNT_TESTING_VALUE, {"from": dev_wallet})
 
 
-def test_withdraw_erc20_amount_lt_zero_by_owner(deposit_token):
-    check_network_is_mainnet_fork()
+def test_withdraw_erc20_amount_lt_zero_by_owner(protocol, deposit_token):
+    check_network_is_local_or_mainnet_fork()
     # Arrange
-    treasury_vault = TreasuryVault[-1]
+    treasury_vault = protocol.treasury_vault
     # Act / Assert
     with pytest.raises(OverflowError):
         treasury_vault.withdrawERC20(deposit_token.address, NEGATIVE_AMOUNT_TESTING_VALUE, {"from": dev_wallet})
@@ -0,0 +1,122 @@
+import json
+import pytest
+from threading import Thread
+from urllib.parse import parse_qs, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from scripts.explorer import FAILED, VERIFIED, ExplorerClient, ExplorerError, VerificationProgress
+
+VERIFICATION_INFO = {
+    "standard_json_input": {"language": "Solidity", "sources": {}},
+    "compiler_version": "0.8.21+commit.d9974bed",
+    "optimizer_enabled": True,
+    "optimizer_runs": 200,
+    "license_identifier": "MIT",
+}
+CONTRACT_NAME = "contracts/protocol/AutomatedVaultERC4626.sol:AutomatedVaultERC4626"
+VERIFIED_ADDRESS = "0x" + "11" * 20
+REJECTED_ADDRESS = "0x" + "22" * 20
+PENDING_POLLS = 2
+
+
+# Etherscan style api stand-in: verifysourcecode returns a guid which stays pending for PENDING_POLLS polls
+class ExplorerStandIn(BaseHTTPRequestHandler):
+    submissions = []
+    polls = {}
+
+    def _respond(self, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+        self.submissions.append(form)
+        if form["contractaddress"] == REJECTED_ADDRESS:
+            self._respond({"status": "0", "message": "NOTOK", "result": "Invalid constructor arguments"})
+        else:
+            self._respond({"status": "1", "message": "OK", "result": f"guid-{form['contractaddress']}"})
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        if params["action"] == "checkverifystatus":
+            self.polls[params["guid"]] = self.polls.get(params["guid"], 0) + 1
+            if self.polls[params["guid"]] <= PENDING_POLLS:
+                self._respond({"status": "0", "message": "NOTOK", "result": "Pending in queue"})
+            else:
+                self._respond({"status": "1", "message": "OK", "result": "Pass - Verified"})
+        else:
+            self._respond({"status": "1", "message": "OK", "result": [{"SourceCode": ""}]})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def explorer_client():
+    ExplorerStandIn.submissions, ExplorerStandIn.polls = [], {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ExplorerStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield ExplorerClient(f"http://127.0.0.1:{server.server_address[1]}/api", "api-key", poll_interval=0)
+    server.shutdown()
+    server.server_close()
+
+
+################################ Explorer Client ################################
+
+
+def test_publish_source_waits_for_pending_verification(explorer_client):
+    # Act
+    published = explorer_client.publish_source(VERIFIED_ADDRESS, VERIFICATION_INFO, CONTRACT_NAME, "00" * 32)
+    # Assert
+    assert published
+    assert ExplorerStandIn.polls[f"guid-{VERIFIED_ADDRESS}"] == PENDING_POLLS + 1
+    submission = ExplorerStandIn.submissions[0]
+    assert submission["contractname"] == CONTRACT_NAME
+    assert submission["compilerversion"] == "v0.8.21+commit.d9974bed"
+    assert submission["constructorArguements"] == "00" * 32
+    assert submission["licenseType"] == "3"
+
+
+def test_publish_source_rejected_submission(explorer_client):
+    # Act / Assert
+    with pytest.raises(ExplorerError):
+        explorer_client.publish_source(REJECTED_ADDRESS, VERIFICATION_INFO, CONTRACT_NAME, "")
+
+
+def test_publish_source_pending_timeout(explorer_client):
+    # Arrange
+    explorer_client.max_polls = PENDING_POLLS
+    # Act / Assert
+    with pytest.raises(ExplorerError):
+        explorer_client.publish_source(VERIFIED_ADDRESS, VERIFICATION_INFO, CONTRACT_NAME, "")
+
+
+def test_is_verified(explorer_client):
+    assert not explorer_client.is_verified(VERIFIED_ADDRESS)
+
+
+################################ Verification Progress ################################
+
+
+def test_verification_progress_resumes_after_interruption(tmp_path):
+    # Arrange
+    progress_path = tmp_path / "script_data.json"
+    progress_path.write_text(json.dumps({"last_verified_vault": -1}))
+    progress = VerificationProgress(progress_path)
+    # Act: vaults complete out of order and the run stops before vault 1 is verified
+    progress.record(2, "0x" + "03" * 20, VERIFIED)
+    progress.record(0, "0x" + "01" * 20, VERIFIED)
+    progress.record(3, "0x" + "04" * 20, FAILED, "Invalid constructor arguments")
+    resumed_progress = VerificationProgress(progress_path)
+    # Assert
+    assert resumed_progress.last_verified_vault == 0
+    assert [index for index in range(5) if not resumed_progress.is_verified(index)] == [1, 3, 4]
+    # Act: once vault 1 is verified the contiguous watermark moves past vault 2
+    resumed_progress.record(1, "0x" + "02" * 20, VERIFIED)
+    # Assert
+    assert VerificationProgress(progress_path).last_verified_vault == 2
+    assert list(json.loads(progress_path.read_text())["vaults"]) == ["3"]
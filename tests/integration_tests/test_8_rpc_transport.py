@@ -0,0 +1,198 @@
+import json
+import time
+import pytest
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from scripts.backend.metrics import Metrics
+from scripts.backend.rpc import PooledRpcProvider, RpcUnavailableError, pinned_block
+
+SLOW_ENDPOINT_DELAY = 1
+
+
+# JSON-RPC node stand-in answering eth_blockNumber with its own block number (so the endpoint that answered is
+# known) after `delay` seconds, or failing every request with `status`
+class RpcNodeStandIn(BaseHTTPRequestHandler):
+    block_number = 0
+    delay = 0
+    status = 200
+    error = None
+    posts = []
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.posts.append(request)
+        time.sleep(self.delay)
+        if self.status != 200:
+            self.send_response(self.status)
+            self.end_headers()
+            return
+        if isinstance(request, list):
+            body = [self._answer(item) for item in reversed(request)]
+        else:
+            body = self._answer(request)
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _answer(self, request: dict) -> dict:
+        if self.error is not None:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": self.error}
+        result = hex(self.block_number) if request["method"] == "eth_blockNumber" else request["params"]
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def rpc_nodes():
+    servers, handlers = [], []
+
+    def _start(block_number: int, **behaviour) -> str:
+        handler = type(f"RpcNode{block_number}", (RpcNodeStandIn,), {"block_number": block_number, "posts": []})
+        for name, value in behaviour.items():
+            setattr(handler, name, value)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        handlers.append(handler)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield _start, handlers
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+################################ Routing ################################
+
+
+def test_failover_to_next_endpoint(rpc_nodes):
+    # Arrange
+    start, handlers = rpc_nodes
+    provider = PooledRpcProvider([start(1, status=503), start(2)], hedge=False, metrics=Metrics())
+    # Act
+    response = provider.make_request("eth_blockNumber", [])
+    # Assert
+    assert response["result"] == hex(2)
+    assert len(handlers[0].posts) == 1
+    assert provider.metrics.get("rpc.failovers") == 1
+    assert provider.endpoints[0].error_rate > 0
+    assert provider.endpoints[1].error_rate == 0
+
+
+def test_every_endpoint_failing(rpc_nodes):
+    # Arrange
+    start, _ = rpc_nodes
+    provider = PooledRpcProvider([start(1, status=503), start(2, status=502)], metrics=Metrics())
+    # Act / Assert
+    with pytest.raises(RpcUnavailableError):
+        provider.make_request("eth_blockNumber", [])
+
+
+def test_node_errors_are_not_failed_over(rpc_nodes):
+    # Arrange
+    start, handlers = rpc_nodes
+    revert = {"code": -32000, "message": "execution reverted"}
+    provider = PooledRpcProvider([start(1, error=revert), start(2)], metrics=Metrics())
+    # Act
+    response = provider.make_request("eth_call", [{"to": "0x" + "11" * 20, "data": "0x"}, "latest"])
+    # Assert
+    assert response["error"] == revert
+    assert handlers[1].posts == []
+
+
+def test_slow_read_is_hedged(rpc_nodes):
+    # Arrange
+    start, _ = rpc_nodes
+    provider = PooledRpcProvider([start(1, delay=SLOW_ENDPOINT_DELAY), start(2)], metrics=Metrics())
+    # Act
+    started_at = time.monotonic()
+    response = provider.make_request("eth_blockNumber", [])
+    elapsed = time.monotonic() - started_at
+    # Assert
+    assert response["result"] == hex(2)
+    assert elapsed < SLOW_ENDPOINT_DELAY
+    assert provider.metrics.get("rpc.hedged") == 1
+
+
+def test_writes_are_not_hedged(rpc_nodes):
+    # Arrange
+    start, handlers = rpc_nodes
+    provider = PooledRpcProvider([start(1, delay=0.2), start(2)], metrics=Metrics())
+    # Act
+    response = provider.make_request("eth_sendRawTransaction", ["0x00"])
+    # Assert
+    assert response["result"] == ["0x00"]
+    assert handlers[1].posts == []
+
+
+def test_logs_are_not_read_from_an_endpoint_behind_to_block(rpc_nodes):
+    # Arrange
+    start, handlers = rpc_nodes
+    provider = PooledRpcProvider([start(5), start(10)], metrics=Metrics())
+    log_filter = {"fromBlock": hex(6), "toBlock": hex(10)}
+    # Act
+    response = provider.make_request("eth_getLogs", [log_filter])
+    # Assert
+    assert response["result"] == [log_filter]
+    assert [post["method"] for post in handlers[0].posts] == ["eth_blockNumber"]
+    assert provider.endpoints[0].head == 5
+    assert provider.endpoints[0].error_rate == 0
+    assert provider.metrics.get("rpc.lagging") == 1
+
+
+def test_pinned_reads_go_first_to_endpoints_known_to_have_reached_the_block(rpc_nodes):
+    # Arrange
+    start, handlers = rpc_nodes
+    provider = PooledRpcProvider([start(5), start(10)], hedge=False, metrics=Metrics())
+    provider.make_request("eth_getBlockByNumber", [hex(8), False])
+    handlers[0].posts.clear()
+    # Act
+    response = provider.make_request("eth_getBlockByNumber", [hex(9), False])
+    # Assert
+    assert response["result"] == [hex(9), False]
+    assert handlers[0].posts == []
+
+
+def test_pinned_read_fails_when_every_endpoint_lags(rpc_nodes):
+    # Arrange
+    start, _ = rpc_nodes
+    provider = PooledRpcProvider([start(5), start(6)], metrics=Metrics())
+    # Act / Assert
+    with pytest.raises(RpcUnavailableError):
+        provider.make_request("eth_getLogs", [{"fromBlock": hex(6), "toBlock": hex(7)}])
+
+
+def test_log_reads_are_not_hedged(rpc_nodes):
+    # Arrange
+    start, handlers = rpc_nodes
+    provider = PooledRpcProvider([start(10, delay=0.2), start(10)], metrics=Metrics())
+    provider.endpoints[0].head = 10
+    # Act
+    provider.make_request("eth_getLogs", [{"fromBlock": hex(1), "toBlock": hex(10)}])
+    # Assert
+    assert handlers[1].posts == []
+
+
+def test_pinned_block_of_reads():
+    # Arrange / Act / Assert
+    assert pinned_block("eth_getLogs", [{"fromBlock": hex(1), "toBlock": hex(10)}]) == 10
+    assert pinned_block("eth_getLogs", [{"fromBlock": hex(1), "toBlock": "latest"}]) is None
+    assert pinned_block("eth_call", [{"to": "0x" + "11" * 20, "data": "0x"}, hex(7)]) == 7
+    assert pinned_block("eth_getBlockByNumber", ["latest", False]) is None
+    assert pinned_block("eth_sendRawTransaction", ["0x00"]) is None
+
+
+def test_batch_request_keeps_call_order(rpc_nodes):
+    # Arrange
+    start, handlers = rpc_nodes
+    provider = PooledRpcProvider([start(1)], metrics=Metrics())
+    # Act
+    responses = provider.make_batch_request([("eth_blockNumber", []), ("eth_getBalance", ["0x" + "11" * 20, "latest"])])
+    # Assert
+    assert [response.get("result") for response in responses] == [hex(1), ["0x" + "11" * 20, "latest"]]
+    assert len(handlers[0].posts) == 1
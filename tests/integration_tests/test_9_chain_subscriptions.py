@@ -0,0 +1,82 @@
+import json
+import asyncio
+import pytest
+import websockets
+from queue import Queue
+from threading import Thread
+from eth_utils import to_checksum_address
+from scripts.backend.metrics import Metrics
+from scripts.backend.subscriptions import ChainSubscriber
+
+FACTORY_ADDRESS = "0x" + "fa" * 20
+VAULT_ADDRESS = "0x" + "0a" * 20
+VAULT_CREATED_TOPIC = bytes.fromhex("11" * 32)
+DEPOSIT_TOPIC = bytes.fromhex("22" * 32)
+WAIT_TIMEOUT = 5
+
+
+# Websocket node stand-in: the first connection pushes head 10 and drops, the next ones push head 12 and, once the
+# deposit subscription is made, a Deposit log of the subscribed vault
+async def node_stand_in(socket, *args):
+    node_stand_in.connections += 1
+    first_connection = node_stand_in.connections == 1
+    async for raw_message in socket:
+        message = json.loads(raw_message)
+        node_stand_in.requests.append(message)
+        params = message["params"]
+        if message["method"] != "eth_subscribe":
+            await socket.send(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": True}))
+            continue
+        subscription_id = "0xheads" if params[0] == "newHeads" else f"0x{params[1]['topics'][0][2:6]}"
+        await socket.send(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": subscription_id}))
+        if params[0] == "newHeads":
+            await socket.send(notification("0xheads", {"number": hex(10 if first_connection else 12)}))
+            if first_connection:
+                await socket.close()
+                return
+        elif params[1]["topics"][0] == "0x" + DEPOSIT_TOPIC.hex():
+            await socket.send(notification(subscription_id, {"address": params[1]["address"][0], "removed": False}))
+
+
+def notification(subscription_id: str, result: dict) -> str:
+    return json.dumps(
+        {"jsonrpc": "2.0", "method": "eth_subscription", "params": {"subscription": subscription_id, "result": result}}
+    )
+
+
+@pytest.fixture()
+def ws_url():
+    node_stand_in.connections, node_stand_in.requests = 0, []
+    started, server_loop = Queue(), asyncio.new_event_loop()
+
+    async def serve():
+        async with websockets.serve(node_stand_in, "127.0.0.1", 0) as server:
+            stopped = asyncio.Future()
+            started.put((server.sockets[0].getsockname()[1], stopped))
+            await stopped
+
+    Thread(target=server_loop.run_until_complete, args=(serve(),), daemon=True).start()
+    port, stopped = started.get(timeout=WAIT_TIMEOUT)
+    yield f"ws://127.0.0.1:{port}"
+    server_loop.call_soon_threadsafe(stopped.set_result, None)
+
+
+def test_reconnect_reports_gap_and_resubscribes_deposits(ws_url, monkeypatch):
+    # Arrange
+    monkeypatch.setattr("scripts.backend.subscriptions.RECONNECT_DELAY", 0.01)
+    subscriber = ChainSubscriber(ws_url, FACTORY_ADDRESS, VAULT_CREATED_TOPIC, DEPOSIT_TOPIC, metrics=Metrics())
+    subscriber.watch_vaults([VAULT_ADDRESS])
+    subscriber.start()
+    try:
+        # Act
+        pushed = [subscriber.wait(WAIT_TIMEOUT)]
+        while not pushed[-1].deposit_vaults and len(pushed) < 10:
+            pushed.append(subscriber.wait(WAIT_TIMEOUT))
+    finally:
+        subscriber.stop()
+    # Assert
+    assert node_stand_in.connections == 2
+    assert any(events.backfill_from == 11 for events in pushed)
+    assert pushed[-1].head == 12
+    assert pushed[-1].deposit_vaults == {to_checksum_address(VAULT_ADDRESS)}
+    assert subscriber.metrics.get("subscriptions.disconnects") == 1